@@ -4,15 +4,16 @@ Collective Memory REST API Server
 Modern Flask API with WebSocket support for real-time communication
 """
 from dataclasses import dataclass
+import atexit
 import os
 import sys
 import json
 import logging
 import platform
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from werkzeug.exceptions import BadRequest, NotFound, InternalServerError
@@ -22,13 +23,14 @@ import psutil
 
 from src.database_manager import DatabaseManager
 from src.enhanced_query_engine import EnhancedQueryEngine, EnhancedSearchQuery
-from src.query_engine import SearchQuery
+from src.query_engine import SearchQuery, SearchResult
 from src.content_indexer import ContentIndexer
 from src.file_monitor import DataFolderMonitor
 from src.cursor_reader import EnhancedCursorDatabaseReader
 from src.enterprise_api import enterprise_bp, websocket_handlers
 from src.chat_api import register_chat_api, ChatAPI
 from src.performance_monitor import get_monitor
+from src.search_side_effects import PromptSuggestionCache, PromptTracker, SideEffectQueue
 
 # Configure logging
 logging.basicConfig(
@@ -113,9 +115,22 @@ class CollectiveMemoryAPI:
             self.collective_memory_dir, "database", "collective_memory.db"
         )
         self.db_manager = DatabaseManager(db_path)
+        # Embedding model is preloaded by the engine's shared service at startup
         self.query_engine = EnhancedQueryEngine(self.db_manager)
         self.content_indexer = ContentIndexer()
-        self.file_monitor = DataFolderMonitor(self.data_folder)
+        self.file_monitor = DataFolderMonitor(
+            self.data_folder, database_manager=self.db_manager
+        )
+
+        # Post-search side effects (prompt logging, relationships, events) run
+        # on a background worker; suggestions are served from memory
+        self.side_effects = SideEffectQueue(max_size=1000)
+        self.prompt_suggestions = PromptSuggestionCache(stopwords=self.db_manager.stopwords)
+        self.prompt_tracker = PromptTracker(db_path, self.prompt_suggestions)
+        self.side_effects.submit(self.prompt_tracker.warm_up)
+        # Queued prompt logs are written before the process exits (also when
+        # the app is served by gunicorn instead of run())
+        atexit.register(self.shutdown)
 
         # Initialize JSON Chat Manager
         self.chat_api = register_chat_api(self.app, self.data_folder)
@@ -347,6 +362,13 @@ class CollectiveMemoryAPI:
                     "memoryUsage": memory.percent,
                     "diskUsage": disk.percent,
                     "uptime": str(datetime.now(timezone.utc) - self.start_time),
+                    "sideEffects": self.side_effects.get_stats(),
+                    "promptSuggestions": self.prompt_suggestions.get_stats(),
+                    "embeddingService": (
+                        self.query_engine.embedding_service.get_stats()
+                        if self.query_engine.embedding_service
+                        else None
+                    ),
                 }
 
                 return jsonify(APIResponse(success=True, data=data).__dict__)
@@ -598,7 +620,7 @@ class CollectiveMemoryAPI:
         @self.app.route("/search/export", methods=["POST"])
         def export_search_results():
             try:
-                data = request.get_json()
+                data = request.get_json() or {}
                 query = data.get("query", "").strip()
                 format_type = data.get("format", "markdown").lower()
 
@@ -612,15 +634,17 @@ class CollectiveMemoryAPI:
                         400,
                     )
 
-                # Perform search
-                results = self.query_engine.search(query)
-
-                # Generate export content
                 if format_type == "markdown":
-                    content = self._generate_markdown_export(query, results)
+                    chunks = self._generate_markdown_export(
+                        query, self._iter_search_results(query)
+                    )
+                    mimetype = "text/markdown"
                     filename = f"search-results-{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.md"
                 elif format_type == "text":
-                    content = self._generate_text_export(query, results)
+                    chunks = self._generate_text_export(
+                        query, self._iter_search_results(query)
+                    )
+                    mimetype = "text/plain"
                     filename = f"search-results-{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.txt"
                 else:
                     return (
@@ -633,16 +657,12 @@ class CollectiveMemoryAPI:
                         400,
                     )
 
-                # Return file content
-                response_data = {
-                    "content": content,
-                    "filename": filename,
-                    "query": query,
-                    "results_count": len(results),
-                    "format": format_type,
-                }
-
-                return jsonify(APIResponse(success=True, data=response_data).__dict__)
+                # Stream the export page by page (bounded memory)
+                return Response(
+                    stream_with_context(chunks),
+                    mimetype=mimetype,
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+                )
 
             except Exception as e:
                 logger.error(f"Error exporting search results: {e}")
@@ -962,59 +982,68 @@ class CollectiveMemoryAPI:
         except:
             return 0.0
 
-    def _generate_markdown_export(self, query: str, results: List[Dict]) -> str:
-        """Generate markdown export of search results"""
-        content = f"""# Search Results for "{query}"
+    def _iter_search_results(self, query: str, page_size: int = 100) -> Iterator[SearchResult]:
+        """Iterate over all results ranked once (one page of rows in memory)"""
+        search_query = SearchQuery(text=query, sort_by="relevance")
+        return self.query_engine.iter_results(search_query, page_size=page_size)
+
+    def _generate_markdown_export(
+        self, query: str, results: Iterable[SearchResult]
+    ) -> Iterator[str]:
+        """Generate markdown export of search results (chunk per result)"""
+        yield f"""# Search Results for "{query}"
 
 Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Total results: {len(results)}
 
 ---
 
 """
 
-        for i, result in enumerate(results, 1):
-            content += f"""## {i}. {result.get('filename', 'Unknown File')}
+        total = 0
+        for total, result in enumerate(results, 1):
+            yield f"""## {total}. {result.file_name or 'Unknown File'}
 
-**Path:** `{result.get('path', 'Unknown')}`
-**Score:** {result.get('score', 0):.2f}
-**Last Modified:** {result.get('last_modified', 'Unknown')}
+**Path:** `{result.file_path or 'Unknown'}`
+**Score:** {result.relevance_score:.2f}
+**Last Modified:** {result.modified_at or 'Unknown'}
 
 ### Content Preview:
 ```
-{result.get('snippet', result.get('content', 'No content available')[:500])}
+{(result.content_preview or 'No content available')[:500]}
 ```
 
 ---
 
 """
 
-        return content
+        yield f"Total results: {total}\n"
 
-    def _generate_text_export(self, query: str, results: List[Dict]) -> str:
-        """Generate text export of search results"""
-        content = f"""Search Results for "{query}"
+    def _generate_text_export(
+        self, query: str, results: Iterable[SearchResult]
+    ) -> Iterator[str]:
+        """Generate text export of search results (chunk per result)"""
+        yield f"""Search Results for "{query}"
 Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Total results: {len(results)}
 
 {'='*80}
 
 """
 
-        for i, result in enumerate(results, 1):
-            content += f"""{i}. {result.get('filename', 'Unknown File')}
-   Path: {result.get('path', 'Unknown')}
-   Score: {result.get('score', 0):.2f}
-   Last Modified: {result.get('last_modified', 'Unknown')}
+        total = 0
+        for total, result in enumerate(results, 1):
+            yield f"""{total}. {result.file_name or 'Unknown File'}
+   Path: {result.file_path or 'Unknown'}
+   Score: {result.relevance_score:.2f}
+   Last Modified: {result.modified_at or 'Unknown'}
    
    Content:
-   {result.get('snippet', result.get('content', 'No content available')[:300])}
+   {(result.content_preview or 'No content available')[:300]}
    
 {'-'*80}
 
 """
 
-        return content
+        yield f"Total results: {total}\n"
 
     def _handle_get_search(self):
         """Handle GET requests with query parameters"""
@@ -1033,8 +1062,10 @@ Total results: {len(results)}
         semantic = request.args.get("semantic", "false").lower() == "true"
         limit = min(int(request.args.get("limit", 50)), 200)
         offset = max(int(request.args.get("offset", 0)), 0)
+        cursor = request.args.get("cursor") or None
+        include_content = request.args.get("include_content", "false").lower() == "true"
         
-        return self._perform_search(query, semantic, limit, offset)
+        return self._perform_search(query, semantic, limit, offset, cursor, include_content)
 
     def _handle_post_search(self):
         """Handle POST requests with JSON body"""
@@ -1054,133 +1085,121 @@ Total results: {len(results)}
         semantic = data.get("semantic", False)
         limit = min(int(data.get("limit", 50)), 200)
         offset = max(int(data.get("offset", 0)), 0)
+        cursor = data.get("cursor") or None
+        include_content = bool(data.get("include_content", False))
         
-        return self._perform_search(query, semantic, limit, offset)
-
-    def _perform_search(self, query: str, semantic: bool = False, limit: int = 50, offset: int = 0):
-        """Common search logic for both GET and POST"""
+        return self._perform_search(query, semantic, limit, offset, cursor, include_content)
+
+    def _perform_search(
+        self,
+        query: str,
+        semantic: bool = False,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_content: bool = False,
+    ):
+        """Common search logic for both GET and POST
+
+        Pages are addressed with the opaque ``cursor`` token returned as
+        ``nextCursor``; ``offset`` is still honoured for the first request.
+        Full file bodies are only returned when ``include_content`` is set.
+        """
         try:
             # Track search
             self.search_count += 1
             self.last_search_time = datetime.now(timezone.utc)
             search_start = datetime.now(timezone.utc)
+            user_session = request.headers.get("X-Session-ID", "anonymous")
 
-            # Emit search started event via WebSocket
-            if self.websocket_enabled and hasattr(self, 'websocket_manager'):
-                try:
-                    self.websocket_manager.emit_to_all("search_started", {
-                        "query": query,
-                        "semantic": semantic,
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                        "user": request.headers.get("X-Session-ID", "anonymous")
-                    })
-                except Exception as e:
-                    logger.error(f"Error emitting search started event: {e}")
-                    if hasattr(self, 'websocket_error_handler'):
-                        self.websocket_error_handler.analyze_error(str(e))
+            # Emit search started event (background)
+            self.side_effects.submit(
+                self._emit_search_event,
+                "search_started",
+                {
+                    "query": query,
+                    "semantic": semantic,
+                    "timestamp": search_start.isoformat(),
+                    "user": user_session,
+                },
+            )
 
             # Perform search
             from src.query_engine import SearchQuery
 
-            search_query = SearchQuery(text=query, limit=limit, sort_by="relevance")
-            results = self.query_engine.search(search_query)
+            search_query = SearchQuery(
+                text=query,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                include_content=include_content,
+                sort_by="relevance",
+            )
+            try:
+                page = self.query_engine.search_page(search_query)
+            except ValueError as e:
+                return jsonify(APIResponse(success=False, error=str(e)).__dict__), 400
 
             # Calculate search time
             search_time = (datetime.now(timezone.utc) - search_start).total_seconds() * 1000
 
             # Format results
-            formatted_results = []
-            for result in results:
-                formatted_results.append(
-                    {
-                        "id": result.get("id", ""),
-                        "title": result.get("title", ""),
-                        "filename": result.get("filename", ""),
-                        "path": result.get("path", ""),
-                        "content": result.get("content", ""),
-                        "snippet": result.get("snippet", ""),
-                        "score": result.get("score", 0),
-                        "lastModified": result.get("last_modified", ""),
-                        "size": result.get("size", 0),
-                    }
-                )
+            formatted_results = [
+                self._format_search_result(result, include_content)
+                for result in page.results
+            ]
 
             response_data = {
                 "results": formatted_results,
                 "total": len(formatted_results),
                 "limit": limit,
                 "offset": offset,
+                "nextCursor": page.next_cursor,
+                "hasMore": page.has_more,
                 "searchTime": f"{search_time:.0f}ms",
                 "semantic": semantic,
             }
 
-            # Emit search completed event via WebSocket
-            if self.websocket_enabled and hasattr(self, 'websocket_manager'):
-                try:
-                    self.websocket_manager.emit_to_all("search_completed", {
-                        "query": query,
-                        "results_count": len(formatted_results),
-                        "search_time": search_time,
-                        "semantic": semantic,
-                        "timestamp": datetime.now(timezone.utc).isoformat()
-                    })
-                except Exception as e:
-                    logger.error(f"Error emitting search completed event: {e}")
-                    if hasattr(self, 'websocket_error_handler'):
-                        self.websocket_error_handler.analyze_error(str(e))
-
-            # Add prompt to database and get related prompts
+            # Prompt suggestions from the in-memory cache (no database access)
             try:
-                search_type = "semantic" if semantic else "basic"
-                user_session = request.headers.get("X-Session-ID", "anonymous")
-
-                # Save current prompt
-                prompt_id = self.db_manager.add_prompt(
-                    prompt_text=query,
-                    search_type=search_type,
-                    results_count=len(formatted_results),
-                    response_time_ms=int(search_time),
-                    user_session=user_session,
-                )
-
-                # Get similar prompts for context suggestions
-                similar_prompts = self.db_manager.get_similar_prompts(
-                    prompt_text=query, limit=3, similarity_threshold=0.6
-                )
-
-                # Get context suggestions
-                context_suggestions = (
-                    self.db_manager.get_prompt_context_suggestions(
-                        current_prompt=query, limit=3
-                    )
-                )
-
-                # Add prompt relationship data to response
                 response_data["promptRelationships"] = {
-                    "promptId": prompt_id,
-                    "similarPrompts": similar_prompts,
-                    "contextSuggestions": context_suggestions,
+                    "promptId": self.prompt_suggestions.get_prompt_id(query),
+                    "similarPrompts": self.prompt_suggestions.get_similar_prompts(
+                        prompt_text=query, limit=3, similarity_threshold=0.6
+                    ),
+                    "contextSuggestions": self.prompt_suggestions.get_context_suggestions(
+                        current_prompt=query, limit=3
+                    ),
                 }
-
             except Exception as e:
-                logger.warning(f"Prompt tracking failed: {e}")
-                # Don't fail the search if prompt tracking fails
+                logger.warning(f"Prompt suggestions failed: {e}")
+                # Don't fail the search if prompt suggestions fail
                 response_data["promptRelationships"] = {
                     "promptId": None,
                     "similarPrompts": [],
                     "contextSuggestions": [],
                 }
 
-            # Emit WebSocket event
-            if self.socketio:
-                self.socketio.emit(
-                    "search_performed",
-                    {
-                        "query": query,
-                        "results_count": len(formatted_results),
-                        "search_time": search_time,
-                    },
-                )
+            # Prompt logging, relationship updates and event fan-out (background)
+            self.side_effects.submit(
+                self.prompt_tracker.record,
+                prompt_text=query,
+                search_type="semantic" if semantic else "basic",
+                results_count=len(formatted_results),
+                response_time_ms=int(search_time),
+                user_session=user_session,
+            )
+            self.side_effects.submit(
+                self._emit_search_event,
+                "search_completed",
+                {
+                    "query": query,
+                    "results_count": len(formatted_results),
+                    "search_time": search_time,
+                    "semantic": semantic,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                },
+            )
 
             return jsonify(APIResponse(success=True, data=response_data).__dict__)
 
@@ -1188,6 +1207,43 @@ Total results: {len(results)}
             logger.error(f"Error performing search: {e}")
             return jsonify(APIResponse(success=False, error=str(e)).__dict__), 500
 
+    @staticmethod
+    def _format_search_result(result: SearchResult, include_content: bool = False) -> Dict:
+        """Search result -> API payload (body only when requested)"""
+        formatted = {
+            "id": result.file_id,
+            "title": result.file_name,
+            "filename": result.file_name,
+            "path": result.file_path,
+            "snippet": result.content_preview,
+            "score": result.relevance_score,
+            "lastModified": result.modified_at,
+            "size": result.file_size,
+        }
+        if include_content:
+            formatted["content"] = result.content or ""
+        return formatted
+
+    def _emit_search_event(self, event_name: str, data: Dict):
+        """WebSocket fan-out for search events (runs on the side effect worker)"""
+        if self.websocket_enabled and getattr(self, "websocket_manager", None):
+            try:
+                self.websocket_manager.emit_to_all(event_name, data)
+            except Exception as e:
+                logger.error(f"Error emitting {event_name} event: {e}")
+                if getattr(self, "websocket_error_handler", None):
+                    self.websocket_error_handler.analyze_error(str(e))
+
+        if event_name == "search_completed" and self.socketio:
+            self.socketio.emit(
+                "search_performed",
+                {
+                    "query": data["query"],
+                    "results_count": data["results_count"],
+                    "search_time": data["search_time"],
+                },
+            )
+
     def _apply_config_changes(self, config: Dict):
         """Apply configuration changes to system components"""
         try:
@@ -1320,11 +1376,21 @@ Total results: {len(results)}
     def run(self, host="127.0.0.1", port=8000, debug=False):
         """Run the API server"""
         logger.info(f"Starting Collective Memory API server on {host}:{port}")
-        if self.socketio and self.websocket_enabled:
-            self.socketio.run(self.app, host=host, port=port, debug=debug)
-        else:
-            logger.info("Running without WebSocket support")
-            self.app.run(host=host, port=port, debug=debug)
+        try:
+            if self.socketio and self.websocket_enabled:
+                self.socketio.run(self.app, host=host, port=port, debug=debug)
+            else:
+                logger.info("Running without WebSocket support")
+                self.app.run(host=host, port=port, debug=debug)
+        finally:
+            self.shutdown()
+
+    def shutdown(self, timeout: float = 10.0):
+        """Drain post-search side effects and close the prompt tracker"""
+        # The tracker's SQLite connection belongs to the worker thread, so it
+        # is closed as the last queued task (no-op once stopped)
+        self.side_effects.submit(self.prompt_tracker.close)
+        self.side_effects.stop(timeout=timeout)
 
 
 def main():
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Fact Extraction Benchmark
+Kayıtlı Cursor konuşmaları üzerinde FactExtractor verimini ölçer ve
+eski kalıp-kalıp re.findall döngüsüyle karşılaştırır
+"""
+import argparse
+import json
+import re
+import time
+from typing import Dict, List, Tuple
+
+from src.cursor.cursor_integration import CursorDatabaseReader
+from src.memory.mem0_evolution import FactExtractor
+
+Interaction = Tuple[str, str, Dict]
+
+
+def load_interactions(corpus_path: str = None) -> List[Interaction]:
+    """(user, assistant) mesaj çiftleri; JSON dosyası ya da Cursor veritabanları"""
+    if corpus_path:
+        with open(corpus_path, encoding="utf-8") as f:
+            conversations = json.load(f)
+    else:
+        conversations = [
+            {"messages": c.messages, "project_path": c.project_path}
+            for c in CursorDatabaseReader().get_all_conversations()
+        ]
+
+    interactions = []
+    for conversation in conversations:
+        context = {"project_path": conversation.get("project_path")}
+        pending_user = None
+        for message in conversation.get("messages", []):
+            if message.get("role") == "user":
+                pending_user = message.get("content", "")
+            elif message.get("role") == "assistant" and pending_user is not None:
+                interactions.append((pending_user, message.get("content", ""), context))
+                pending_user = None
+    return interactions
+
+
+def legacy_extract(extractor: FactExtractor, text: str) -> int:
+    """Eski yol: her kalıp için tüm metin üzerinde derlenmemiş re.findall"""
+    found = 0
+    for patterns in extractor.fact_patterns.values():
+        for pattern in patterns:
+            for match in re.findall(pattern, text, re.IGNORECASE):
+                content = " ".join(match) if isinstance(match, tuple) else match
+                if len(content.strip()) > 3:
+                    extractor._extract_entities(content)
+                    extractor._extract_keywords(content)
+                    found += 1
+    return found
+
+
+def run_benchmark(interactions: List[Interaction], batch_size: int, compare: bool):
+    extractor = FactExtractor()
+    total_chars = sum(len(u) + len(a) for u, a, _ in interactions)
+    print(
+        f"📚 {len(interactions)} etkileşim, {total_chars / 1024:.1f} KB metin "
+        f"(spaCy: {'açık' if extractor.nlp else 'kapalı'})"
+    )
+
+    start = time.perf_counter()
+    facts = 0
+    for i in range(0, len(interactions), batch_size):
+        for batch_facts in extractor.extract_facts_batch(interactions[i : i + batch_size]):
+            facts += len(batch_facts)
+    elapsed = time.perf_counter() - start
+    print(
+        f"⚡ Tek geçiş: {elapsed:.3f}s, {len(interactions) / max(elapsed, 1e-9):.0f} etkileşim/s, "
+        f"{total_chars / 1024 / max(elapsed, 1e-9):.0f} KB/s, {facts} fact, "
+        f"{extractor.lines_skipped} uzun satır atlandı"
+    )
+
+    if compare:
+        start = time.perf_counter()
+        for user_input, ai_response, _ in interactions:
+            legacy_extract(extractor, user_input)
+            legacy_extract(extractor, ai_response)
+        legacy_elapsed = time.perf_counter() - start
+        print(
+            f"🐢 Eski findall döngüsü (spaCy hariç): {legacy_elapsed:.3f}s "
+            f"({legacy_elapsed / max(elapsed, 1e-9):.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FactExtractor verim ölçümü")
+    parser.add_argument(
+        "--corpus",
+        help="Konuşma JSON dosyası ([{messages: [{role, content}]}]); "
+        "verilmezse Cursor workspace veritabanları okunur",
+    )
+    parser.add_argument("--batch-size", type=int, default=64, help="nlp.pipe batch boyutu")
+    parser.add_argument(
+        "--compare", action="store_true", help="Eski kalıp döngüsüyle karşılaştır"
+    )
+    args = parser.parse_args()
+
+    corpus = load_interactions(args.corpus)
+    if not corpus:
+        print("⚠️  Ölçülecek konuşma bulunamadı")
+    else:
+        run_benchmark(corpus, args.batch_size, args.compare)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Memory Compaction Script
+Aynı (normalize edilmiş) içeriğe sahip aktif bellekleri birleştirir ve
+memory_links kayıtlarını korunan belleğe yönlendirir
+"""
+import argparse
+import os
+
+from src.memory.memory_database import MemoryDatabase
+
+
+def compact_memories(db_path: str):
+    """Tek seferlik duplicate birleştirme"""
+    if not os.path.exists(db_path):
+        print(f"⚠️  {db_path} bulunamadı")
+        return
+
+    print(f"🔧 {db_path} içindeki kopya bellekler birleştiriliyor...")
+
+    db = MemoryDatabase(db_path)
+    try:
+        result = db.compact_duplicates()
+        print(
+            f"✅ {result['merged']} kopya {result['groups']} grupta birleştirildi, "
+            f"{result['links_removed']} gereksiz link silindi"
+        )
+    except Exception as e:
+        print(f"❌ Compaction sırasında hata: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kopya bellekleri birleştir")
+    parser.add_argument(
+        "--db",
+        default="data/memory_system.db",
+        help="Memory veritabanı yolu (varsayılan: data/memory_system.db)",
+    )
+    args = parser.parse_args()
+    compact_memories(args.db)
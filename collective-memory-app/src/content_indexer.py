@@ -273,7 +273,7 @@ class ContentIndexer:
 
         # Kelimeleri ayır
         words = re.findall(
-            r"\b[a-zA-ZçğıöşüÇĞIİÖŞÜ]{" + str(min_length) + ",}\b",
+            r"\b[a-zA-ZçğıöşüÇĞIİÖŞÜ]{" + str(min_length) + r",}\b",
             clean_content.lower(),
         )
 
@@ -6,8 +6,11 @@ Real-time Cursor chat monitoring and analysis system
 import os
 import sqlite3
 import json
+import hashlib
 import logging
-from typing import List, Dict, Optional, Set
+from collections import Counter
+from contextlib import closing
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 import threading
@@ -53,11 +56,24 @@ class CursorDatabaseReader:
     - Linux: ~/.config/Cursor/User/workspaceStorage/
     """
 
-    def __init__(self):
+    def __init__(self, state_path: Optional[str] = None):
         self.base_path = self._get_cursor_data_path()
         self.workspace_storage_path = None
         self.conversation_cache = {}
 
+        # Incremental ingestion state: db_path -> {"watermark", "keys"}
+        # keys: ItemTable key -> {"hash": value hash, "messages": {fingerprint: count}}
+        self.state_path = state_path
+        self.state_lock = threading.RLock()
+        self.ingest_state: Dict[str, Dict] = self._load_state()
+        self.ingest_stats = {
+            "incremental_reads": 0,
+            "unchanged_reads": 0,
+            "keys_changed": 0,
+            "keys_skipped": 0,
+            "messages_emitted": 0,
+        }
+
         if self.base_path and os.path.exists(self.base_path):
             self.workspace_storage_path = os.path.join(
                 self.base_path, "workspaceStorage"
@@ -165,54 +181,56 @@ class CursorDatabaseReader:
 
         return workspace_info
 
+    CHAT_KEYS_QUERY = """
+        SELECT key, value 
+        FROM ItemTable 
+        WHERE key LIKE '%chat%' OR key LIKE '%aichat%' OR key LIKE '%prompts%'
+    """
+
     def _extract_chat_data(self, cursor: sqlite3.Cursor) -> List[Dict]:
         """Extract chat messages from database."""
         messages = []
 
         try:
             # Look for chat-related keys
-            cursor.execute(
-                """
-                SELECT key, value 
-                FROM ItemTable 
-                WHERE key LIKE '%chat%' OR key LIKE '%aichat%' OR key LIKE '%prompts%'
-            """
-            )
+            cursor.execute(self.CHAT_KEYS_QUERY)
 
             for row in cursor.fetchall():
-                key = row["key"]
-                value = row["value"]
-
-                if value:
-                    try:
-                        # Parse JSON value
-                        data = json.loads(value)
-
-                        # Extract messages from various formats
-                        parsed_messages = self._parse_chat_messages(data, key)
-                        messages.extend(parsed_messages)
-
-                    except json.JSONDecodeError:
-                        # Try to extract plain text
-                        if len(value) > 10:  # Ignore very short values
-                            messages.append(
-                                {
-                                    "role": "unknown",
-                                    "content": str(value)[
-                                        :500
-                                    ],  # Truncate long content
-                                    "timestamp": datetime.now().isoformat(),
-                                    "source_key": key,
-                                }
-                            )
-                    except Exception as e:
-                        logger.debug(f"Error parsing chat data from key {key}: {e}")
+                messages.extend(self._parse_item(row["key"], row["value"]))
 
         except Exception as e:
             logger.error(f"Error extracting chat data: {e}")
 
         return messages
 
+    def _parse_item(self, key: str, value) -> List[Dict]:
+        """Parse the messages stored under a single ItemTable key."""
+        if not value:
+            return []
+
+        try:
+            # Parse JSON value
+            data = json.loads(value)
+
+            # Extract messages from various formats
+            return self._parse_chat_messages(data, key)
+
+        except json.JSONDecodeError:
+            # Try to extract plain text
+            if len(value) > 10:  # Ignore very short values
+                return [
+                    {
+                        "role": "unknown",
+                        "content": str(value)[:500],  # Truncate long content
+                        "timestamp": datetime.now().isoformat(),
+                        "source_key": key,
+                    }
+                ]
+        except Exception as e:
+            logger.debug(f"Error parsing chat data from key {key}: {e}")
+
+        return []
+
     def _parse_chat_messages(self, data: any, source_key: str) -> List[Dict]:
         """Parse chat messages from various data formats."""
         messages = []
@@ -335,6 +353,153 @@ class CursorDatabaseReader:
 
         return hashlib.md5(db_path.encode()).hexdigest()[:12]
 
+    # ================================
+    # INCREMENTAL INGESTION
+    # ================================
+
+    def _load_state(self) -> Dict[str, Dict]:
+        """Load persisted ingestion state (watermarks and key hashes)."""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Cursor ingest state unreadable, starting fresh: {e}")
+            return {}
+
+    def save_state(self):
+        """Persist ingestion state atomically."""
+        if not self.state_path:
+            return
+        with self.state_lock:
+            try:
+                os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+                tmp_path = f"{self.state_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.ingest_state, f)
+                os.replace(tmp_path, self.state_path)
+            except Exception as e:
+                logger.error(f"Error saving Cursor ingest state: {e}")
+
+    @staticmethod
+    def _get_watermark(db_path: str) -> Optional[List[int]]:
+        """File watermark: (mtime_ns, size) of the database and its WAL file."""
+        watermark = []
+        for path in (db_path, f"{db_path}-wal"):
+            try:
+                stat = os.stat(path)
+                watermark.extend([stat.st_mtime_ns, stat.st_size])
+            except OSError:
+                if path == db_path:
+                    return None
+                watermark.extend([0, 0])
+        return watermark
+
+    @staticmethod
+    def _hash_value(value) -> str:
+        """Hash of a raw ItemTable value."""
+        if value is None:
+            return ""
+        if isinstance(value, str):
+            value = value.encode("utf-8", errors="replace")
+        return hashlib.sha1(value).hexdigest()
+
+    @staticmethod
+    def _message_fingerprint(message: Dict) -> str:
+        """Identity of a parsed message (generated timestamps are ignored)."""
+        raw = f"{message.get('role', '')}\0{message.get('content', '')}"
+        return hashlib.sha1(raw.encode("utf-8", errors="replace")).hexdigest()[:16]
+
+    def _new_messages_for_key(self, key_state: Dict, messages: List[Dict]) -> List[Dict]:
+        """Messages not seen in the previous version of the key (multiset diff)."""
+        seen = Counter(key_state.get("messages", {}))
+        fresh = []
+        for message in messages:
+            fingerprint = self._message_fingerprint(message)
+            if seen[fingerprint] > 0:
+                seen[fingerprint] -= 1
+            else:
+                fresh.append(message)
+        return fresh
+
+    def extract_new_conversations(
+        self, db_path: str, force: bool = False
+    ) -> List[CursorConversation]:
+        """
+        Incremental extraction: only new/changed ItemTable keys are parsed and
+        only messages that were not emitted before are returned.
+        """
+        watermark = self._get_watermark(db_path)
+        if watermark is None:
+            return []
+
+        with self.state_lock:
+            state = self.ingest_state.setdefault(db_path, {"watermark": None, "keys": {}})
+            if not force and state["watermark"] == watermark:
+                self.ingest_stats["unchanged_reads"] += 1
+                return []
+
+            self.ingest_stats["incremental_reads"] += 1
+            changed: List[Tuple[str, object, str]] = []
+            present_keys: Set[str] = set()
+            project_path = state.get("project_path", "Unknown")
+
+            try:
+                with closing(sqlite3.connect(db_path)) as conn:
+                    conn.row_factory = sqlite3.Row
+                    cursor = conn.cursor()
+
+                    cursor.execute(self.CHAT_KEYS_QUERY)
+                    for row in cursor.fetchall():
+                        key = row["key"]
+                        present_keys.add(key)
+                        value_hash = self._hash_value(row["value"])
+                        if state["keys"].get(key, {}).get("hash") == value_hash:
+                            self.ingest_stats["keys_skipped"] += 1
+                            continue
+                        changed.append((key, row["value"], value_hash))
+
+                    if changed:
+                        workspace_info = self._get_workspace_info(cursor)
+                        project_path = workspace_info.get("folder_path", project_path)
+            except Exception as e:
+                logger.error(f"Error reading database {db_path}: {e}")
+                return []
+
+            new_messages = []
+            for key, value, value_hash in changed:
+                messages = self._parse_item(key, value)
+                key_state = state["keys"].get(key, {})
+                new_messages.extend(self._new_messages_for_key(key_state, messages))
+                state["keys"][key] = {
+                    "hash": value_hash,
+                    "messages": dict(Counter(self._message_fingerprint(m) for m in messages)),
+                }
+
+            for key in set(state["keys"]) - present_keys:
+                del state["keys"][key]
+
+            state["watermark"] = watermark
+            state["project_path"] = project_path
+            self.ingest_stats["keys_changed"] += len(changed)
+            self.ingest_stats["messages_emitted"] += len(new_messages)
+            self.save_state()
+
+        if not new_messages:
+            return []
+
+        now = datetime.now()
+        return [
+            CursorConversation(
+                session_id=self._generate_session_id(db_path),
+                project_path=project_path,
+                messages=new_messages,
+                created_at=now,
+                updated_at=now,
+            )
+        ]
+
     def get_all_conversations(self) -> List[CursorConversation]:
         """Get all conversations from all workspace databases."""
         all_conversations = []
@@ -352,14 +517,36 @@ class CursorDatabaseReader:
 class CursorMonitor(FileSystemEventHandler):
     """
     Real-time monitoring of Cursor database changes
+
+    Write bursts to the same database (including its -wal/-journal files)
+    are debounced and coalesced into a single incremental read.
     """
 
-    def __init__(self, callback_function=None):
+    DB_SUFFIXES = ("-wal", "-journal", "-shm")
+
+    def __init__(
+        self,
+        callback_function=None,
+        reader: Optional[CursorDatabaseReader] = None,
+        debounce_seconds: float = 1.0,
+        max_delay_seconds: float = 10.0,
+    ):
         self.callback_function = callback_function
-        self.reader = CursorDatabaseReader()
+        self.reader = reader or CursorDatabaseReader()
         self.observer = Observer()
         self.monitoring = False
 
+        # Debounce state: db_path -> pending timer / first event time
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._timers: Dict[str, threading.Timer] = {}
+        self._first_event: Dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+        self._process_lock = threading.Lock()
+
+        self.events_received = 0
+        self.reads_performed = 0
+
     def start_monitoring(self):
         """Start monitoring Cursor database changes."""
         if not self.reader.workspace_storage_path:
@@ -384,25 +571,99 @@ class CursorMonitor(FileSystemEventHandler):
             self.observer.stop()
             self.observer.join()
             self.monitoring = False
+            self.flush_pending()
             logger.info("Cursor monitoring stopped")
 
+    def _database_path(self, src_path: str) -> Optional[str]:
+        """Map a modified file (.vscdb, -wal, -journal) to its database path."""
+        for suffix in self.DB_SUFFIXES:
+            if src_path.endswith(".vscdb" + suffix):
+                return src_path[: -len(suffix)]
+        if src_path.endswith(".vscdb"):
+            return src_path
+        return None
+
     def on_modified(self, event):
         """Handle file modification events."""
-        if not event.is_directory and event.src_path.endswith(".vscdb"):
-            logger.info(f"Cursor database modified: {event.src_path}")
+        if event.is_directory:
+            return
 
-            # Extract new conversations
+        db_path = self._database_path(event.src_path)
+        if db_path:
+            logger.debug(f"Cursor database modified: {event.src_path}")
+            self.schedule_read(db_path)
+
+    def schedule_read(self, db_path: str):
+        """
+        Debounce reads of a database: the timer is restarted on every event
+        but a read happens at most max_delay_seconds after the first event.
+        """
+        with self._pending_lock:
+            self.events_received += 1
+            now = time.monotonic()
+            first_event = self._first_event.setdefault(db_path, now)
+            deadline = first_event + self.max_delay_seconds
+
+            timer = self._timers.get(db_path)
+            if timer is not None:
+                if now >= deadline:
+                    return  # Already due, the pending read covers this event
+                timer.cancel()
+
+            delay = max(0.0, min(self.debounce_seconds, deadline - now))
+            timer = threading.Timer(delay, self._flush, args=(db_path,))
+            timer.daemon = True
+            self._timers[db_path] = timer
+            timer.start()
+
+    def _flush(self, db_path: str):
+        """Timer callback: run the coalesced read if this timer is still current."""
+        with self._pending_lock:
+            if self._timers.get(db_path) is not threading.current_thread():
+                return
+            del self._timers[db_path]
+            self._first_event.pop(db_path, None)
+
+        self._process_database(db_path)
+
+    def flush_pending(self):
+        """Run all pending reads immediately."""
+        with self._pending_lock:
+            pending = list(self._timers.items())
+            self._timers.clear()
+            self._first_event.clear()
+
+        for db_path, timer in pending:
+            timer.cancel()
+            self._process_database(db_path)
+
+    def _process_database(self, db_path: str):
+        """Read only the new messages of a database and pass them downstream."""
+        with self._process_lock:
+            self.reads_performed += 1
             try:
-                conversations = self.reader.extract_conversations_from_db(
-                    event.src_path
-                )
+                conversations = self.reader.extract_new_conversations(db_path)
 
                 if conversations and self.callback_function:
+                    logger.info(
+                        f"Cursor database updated: {db_path} "
+                        f"({len(conversations[0].messages)} new messages)"
+                    )
                     self.callback_function(conversations)
 
             except Exception as e:
                 logger.error(f"Error processing database update: {e}")
 
+    def get_stats(self) -> Dict:
+        """Monitoring and incremental ingestion statistics."""
+        return {
+            "monitoring": self.monitoring,
+            "events_received": self.events_received,
+            "reads_performed": self.reads_performed,
+            "pending_reads": len(self._timers),
+            **self.reader.ingest_stats,
+        }
+
 
 class CursorAnalyzer:
     """
@@ -500,10 +761,12 @@ class CursorIntegrationManager:
     Main manager for Cursor integration
     """
 
-    def __init__(self, memory_database=None):
-        self.reader = CursorDatabaseReader()
+    def __init__(self, memory_database=None, state_path: Optional[str] = None):
+        self.reader = CursorDatabaseReader(state_path=state_path)
         self.analyzer = CursorAnalyzer()
-        self.monitor = CursorMonitor(callback_function=self._on_conversation_update)
+        self.monitor = CursorMonitor(
+            callback_function=self._on_conversation_update, reader=self.reader
+        )
         self.memory_db = memory_database
 
     def _on_conversation_update(self, conversations: List[CursorConversation]):
@@ -522,41 +785,61 @@ class CursorIntegrationManager:
             except Exception as e:
                 logger.error(f"Error processing conversation: {e}")
 
+    # Analyzer fact types -> memories.memory_type (schema CHECK list)
+    FACT_MEMORY_TYPES = {
+        "question": "fact",
+        "instruction": "fact",
+        "explanation": "insight",
+        "solution": "solution",
+    }
+
     def _store_conversation_memories(self, analysis: Dict):
-        """Store conversation analysis in memory database."""
+        """Store conversation analysis in memory database (one batch, deduplicated)."""
         if not self.memory_db:
             return
 
-        # Store extracted facts
+        source = {
+            "project_path": analysis["project_path"],
+            "cursor_session_id": analysis["session_id"],
+        }
+        memories = []
+
+        # Extracted facts
         for fact in analysis["extracted_facts"]:
-            self.memory_db.store_memory(
-                content=fact["content"],
-                memory_type=fact["type"],
-                importance_score=fact["importance"],
-                project_path=analysis["project_path"],
-                cursor_session_id=analysis["session_id"],
+            memories.append(
+                {
+                    "content": fact["content"],
+                    "memory_type": self.FACT_MEMORY_TYPES.get(fact["type"], "fact"),
+                    "importance_score": fact["importance"],
+                    **source,
+                }
             )
 
-        # Store code snippets
+        # Code snippets
         for code in analysis["code_snippets"]:
-            self.memory_db.store_memory(
-                content=f"Code snippet: {code[:200]}...",
-                memory_type="code",
-                importance_score=0.8,
-                project_path=analysis["project_path"],
-                cursor_session_id=analysis["session_id"],
+            memories.append(
+                {
+                    "content": f"Code snippet: {code[:200]}...",
+                    "memory_type": "code",
+                    "importance_score": 0.8,
+                    **source,
+                }
             )
 
-        # Store decisions
+        # Decisions
         for decision in analysis["decisions"]:
-            self.memory_db.store_memory(
-                content=f"Decision: {decision}",
-                memory_type="decision",
-                importance_score=0.9,
-                project_path=analysis["project_path"],
-                cursor_session_id=analysis["session_id"],
+            memories.append(
+                {
+                    "content": f"Decision: {decision}",
+                    "memory_type": "decision",
+                    "importance_score": 0.9,
+                    **source,
+                }
             )
 
+        if memories:
+            self.memory_db.store_memories(memories)
+
     def start_real_time_monitoring(self):
         """Start real-time monitoring of Cursor."""
         return self.monitor.start_monitoring()
@@ -565,6 +848,10 @@ class CursorIntegrationManager:
         """Stop real-time monitoring."""
         self.monitor.stop_monitoring()
 
+    def get_ingest_stats(self) -> Dict:
+        """Incremental ingestion statistics."""
+        return self.monitor.get_stats()
+
     def get_recent_conversations(self, limit: int = 10) -> List[CursorConversation]:
         """Get recent conversations from Cursor."""
         conversations = self.reader.get_all_conversations()
@@ -27,6 +27,8 @@ CREATE TABLE IF NOT EXISTS memories (
     importance_score REAL DEFAULT 0.5 CHECK(importance_score >= 0.0 AND importance_score <= 1.0),
     relevance_score REAL DEFAULT 0.5 CHECK(relevance_score >= 0.0 AND relevance_score <= 1.0),
     access_count INTEGER DEFAULT 0,
+    importance_rescored_at TIMESTAMP, -- set only by the bulk rescoring job
+    importance_base REAL, -- caller-set importance; rescoring only decays/boosts it
     
     -- Memory evolution tracking (Mem0 inspired)
     version INTEGER DEFAULT 1,
@@ -39,6 +41,9 @@ CREATE TABLE IF NOT EXISTS memories (
     project_path TEXT,
     cursor_session_id TEXT,
     
+    -- Normalized content hash (deduplication, unique among active memories)
+    content_hash TEXT,
+    
     -- Embedding for semantic search
     embedding_vector BLOB,
     embedding_model TEXT DEFAULT 'sentence-transformers',
@@ -228,14 +233,31 @@ CREATE TABLE IF NOT EXISTS memory_events (
     processing_time_ms INTEGER,
     memory_usage_bytes INTEGER,
     
-    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    
-    -- Indexing for performance
-    INDEX idx_memory_events_timestamp(timestamp),
-    INDEX idx_memory_events_type(event_type),
-    INDEX idx_memory_events_memory_id(memory_id)
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Time-independent importance factors, recomputed only when content changes
+-- (recency, frequency and usage decay are recomputed by the rescoring job)
+CREATE TABLE IF NOT EXISTS memory_importance_factors (
+    memory_id INTEGER PRIMARY KEY REFERENCES memories(id) ON DELETE CASCADE,
+    content_hash TEXT,
+    memory_type TEXT,
+    base_type REAL NOT NULL,
+    content_quality REAL NOT NULL,
+    context_relevance REAL NOT NULL,
+    user_interaction REAL NOT NULL,
+    code_complexity REAL NOT NULL,
+    error_criticality REAL NOT NULL,
+    decision_impact REAL NOT NULL,
+    keyword_bonus REAL NOT NULL,
+    scored_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Indexing for performance
+CREATE INDEX IF NOT EXISTS idx_memory_events_timestamp ON memory_events(timestamp);
+CREATE INDEX IF NOT EXISTS idx_memory_events_type ON memory_events(event_type);
+CREATE INDEX IF NOT EXISTS idx_memory_events_memory_id ON memory_events(memory_id);
+
 -- =====================================
 -- 5. PERFORMANCE INDEXES
 -- =====================================
@@ -290,18 +312,20 @@ INSERT OR IGNORE INTO memory_config (config_key, config_value, config_type, desc
 -- 7. TRIGGERS FOR AUTOMATION
 -- =====================================
 
--- Update timestamp trigger for memories
+-- Update timestamp trigger for memories (bulk rescoring writes are not edits)
 CREATE TRIGGER IF NOT EXISTS update_memories_timestamp 
     AFTER UPDATE ON memories
     FOR EACH ROW
+    WHEN NEW.importance_rescored_at IS OLD.importance_rescored_at
     BEGIN
         UPDATE memories SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
     END;
 
--- Update access timestamp and count
+-- Update access timestamp and count (bulk rescoring writes are not accesses)
 CREATE TRIGGER IF NOT EXISTS update_memory_access 
     AFTER UPDATE OF importance_score, relevance_score ON memories
     FOR EACH ROW
+    WHEN NEW.importance_rescored_at IS OLD.importance_rescored_at
     BEGIN
         UPDATE memories SET 
             accessed_at = CURRENT_TIMESTAMP,
@@ -8,6 +8,8 @@ import sqlite3
 import hashlib
 import json
 import os
+import re
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
@@ -17,6 +19,61 @@ import logging
 # Colorama initialize
 init()
 
+logger = logging.getLogger(__name__)
+
+
+def read_file_record(
+    file_path: str, content: Optional[str] = None, stat: Optional[os.stat_result] = None
+) -> Optional[Dict[str, Any]]:
+    """Dosya bilgisini tek geçişte toplar (tek stat, tek okuma, aynı buffer'dan hash)
+
+    Modül seviyesinde tutulur; tarama worker process'lerinden de çağrılır.
+    Önceden alınmış stat sonucu verilirse tekrar stat yapılmaz.
+    """
+    path = Path(file_path)
+
+    try:
+        stat = stat or path.stat()
+        data = path.read_bytes() if content is None else None
+    except OSError as e:
+        if path.exists():
+            logger.error(f"Content reading failed for {file_path}: {e}")
+        return None
+
+    if data is not None:
+        try:
+            # Text mode ile aynı satır sonu normalizasyonu
+            content = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        except UnicodeDecodeError as e:
+            logger.error(f"Content reading failed for {file_path}: {e}")
+            content = ""
+        content_hash = hashlib.md5(data).hexdigest()
+    else:
+        # İçerik dışarıdan verildi - hash diskteki dosyadan hesaplanır
+        hash_md5 = hashlib.md5()
+        try:
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(65536), b""):
+                    hash_md5.update(chunk)
+            content_hash = hash_md5.hexdigest()
+        except OSError as e:
+            logger.error(f"Hash calculation failed for {file_path}: {e}")
+            content_hash = ""
+
+    return {
+        "file_path": str(path.resolve()),
+        "file_name": path.name,
+        "file_extension": path.suffix.lower(),
+        "directory_path": str(path.parent),
+        "file_size": stat.st_size,
+        "content_hash": content_hash,
+        "created_at": datetime.fromtimestamp(stat.st_ctime),
+        "modified_at": datetime.fromtimestamp(stat.st_mtime),
+        "mtime_ns": stat.st_mtime_ns,
+        "inode": stat.st_ino,
+        "content": content,
+    }
+
 
 class DatabaseManager:
     """Dosya metadata ve içerik veritabanı yöneticisi"""
@@ -24,6 +81,7 @@ class DatabaseManager:
     def __init__(self, db_path: str = "data/collective_memory.db"):
         self.db_path = Path(db_path).resolve()
         self.connection = None
+        self.fts_enabled = False
 
         # Logging setup
         logging.basicConfig(
@@ -126,7 +184,9 @@ class DatabaseManager:
                     created_at TIMESTAMP NOT NULL,
                     modified_at TIMESTAMP NOT NULL,
                     indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_active INTEGER DEFAULT 1
+                    is_active INTEGER DEFAULT 1,
+                    mtime_ns INTEGER,
+                    inode INTEGER
                 )
             """,
             "file_contents": """
@@ -205,8 +265,43 @@ class DatabaseManager:
                     FOREIGN KEY (prompt_id) REFERENCES prompt_history (id) ON DELETE CASCADE
                 )
             """,
+            "document_embeddings": """
+                CREATE TABLE IF NOT EXISTS document_embeddings (
+                    content_hash TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    dimension INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (content_hash, model_name)
+                )
+            """,
+            "index_state": """
+                CREATE TABLE IF NOT EXISTS index_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    generation INTEGER NOT NULL DEFAULT 0
+                )
+            """,
         }
 
+        # İndeks içeriği değiştiğinde generation sayacını artıran tablolar
+        # (arama sonuç önbelleği anahtarlarında kullanılır)
+        self.generation_tables = ("files", "file_contents", "document_embeddings")
+
+        # Full-text index (FTS5) - files.file_name/file_path ve file_contents aynası
+        # rowid = files.id
+        self.fts_schema = """
+            CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+                file_name,
+                file_path,
+                content_text,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            )
+        """
+
+        # bm25 kolon ağırlıkları: file_name, file_path, content_text
+        self.fts_weights = (10.0, 5.0, 1.0)
+
     def connect(self) -> bool:
         """Veritabanına bağlanır"""
         try:
@@ -248,11 +343,15 @@ class DatabaseManager:
                     f"{Fore.CYAN}[*] Table created/verified: {table_name}{Style.RESET_ALL}"
                 )
 
+            # Eski veritabanları için scan manifest kolonları
+            self._migrate_scan_manifest(cursor)
+
             # İndeksleri oluştur
             indexes = [
                 "CREATE INDEX IF NOT EXISTS idx_files_path ON files(file_path)",
                 "CREATE INDEX IF NOT EXISTS idx_files_modified ON files(modified_at)",
                 "CREATE INDEX IF NOT EXISTS idx_files_extension ON files(file_extension)",
+                "CREATE INDEX IF NOT EXISTS idx_files_content_hash ON files(content_hash)",
                 "CREATE INDEX IF NOT EXISTS idx_search_keyword ON search_index(keyword)",
                 "CREATE INDEX IF NOT EXISTS idx_changes_timestamp ON file_changes(change_timestamp)",
             ]
@@ -260,6 +359,12 @@ class DatabaseManager:
             for index in indexes:
                 cursor.execute(index)
 
+            # İndeks generation sayacı - tüm bağlantıların yazmalarını izler
+            self._initialize_index_generation(cursor)
+
+            # Full-text index
+            self._initialize_fts(cursor)
+
             self.connection.commit()
             print(f"{Fore.GREEN}[+] Database initialized successfully{Style.RESET_ALL}")
             return True
@@ -268,6 +373,211 @@ class DatabaseManager:
             print(f"{Fore.RED}❌ Database initialization failed: {e}{Style.RESET_ALL}")
             return False
 
+    def _initialize_index_generation(self, cursor) -> None:
+        """index_state satırını ve generation tetikleyicilerini oluşturur"""
+        cursor.execute("INSERT OR IGNORE INTO index_state (id, generation) VALUES (1, 0)")
+        for table in self.generation_tables:
+            for operation in ("INSERT", "UPDATE", "DELETE"):
+                cursor.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_{operation.lower()}_generation
+                    AFTER {operation} ON {table}
+                    BEGIN
+                        UPDATE index_state SET generation = generation + 1 WHERE id = 1;
+                    END
+                """
+                )
+
+    def get_index_generation(self) -> int:
+        """İndeks generation sayacı (dosya/içerik/embedding yazmalarında artar)"""
+        if not self.connection:
+            return 0
+
+        try:
+            row = self.connection.execute(
+                "SELECT generation FROM index_state WHERE id = 1"
+            ).fetchone()
+            return row[0] if row else 0
+        except sqlite3.Error:
+            return 0
+
+    def _migrate_scan_manifest(self, cursor) -> None:
+        """files tablosuna mtime_ns/inode kolonlarını ekler (yoksa)"""
+        cursor.execute("PRAGMA table_info(files)")
+        columns = {row["name"] for row in cursor.fetchall()}
+
+        for column in ("mtime_ns", "inode"):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE files ADD COLUMN {column} INTEGER")
+
+    @staticmethod
+    def manifest_matches(entry, stat: os.stat_result) -> bool:
+        """Manifest kaydı (size, mtime_ns, inode) stat ile aynı mı - fast path kontrolü"""
+        if entry is None or entry["mtime_ns"] is None:
+            return False
+
+        return (
+            entry["file_size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["inode"] == stat.st_ino
+        )
+
+    def get_scan_manifest(
+        self, file_paths: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Aktif dosyaların scan manifest'ini döndürür: path -> id/size/mtime_ns/inode/hash"""
+        if not self.connection:
+            return {}
+
+        base_query = """
+            SELECT id, file_path, file_size, mtime_ns, inode, content_hash
+            FROM files WHERE is_active = 1
+        """
+
+        try:
+            cursor = self.connection.cursor()
+            manifest = {}
+
+            if file_paths is None:
+                cursor.execute(base_query)
+                rows = cursor.fetchall()
+            else:
+                rows = []
+                paths = list(file_paths)
+                for start in range(0, len(paths), 500):
+                    chunk = paths[start : start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor.execute(
+                        base_query + f" AND file_path IN ({placeholders})", chunk
+                    )
+                    rows.extend(cursor.fetchall())
+
+            for row in rows:
+                manifest[row["file_path"]] = {
+                    "id": row["id"],
+                    "file_size": row["file_size"],
+                    "mtime_ns": row["mtime_ns"],
+                    "inode": row["inode"],
+                    "content_hash": row["content_hash"],
+                }
+
+            return manifest
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error in get_scan_manifest: {e}")
+            return {}
+
+    def _initialize_fts(self, cursor) -> None:
+        """FTS5 indeksini oluşturur, ilk oluşturmada mevcut veriyi aktarır (migration)"""
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'files_fts'"
+        )
+        already_exists = cursor.fetchone() is not None
+
+        try:
+            cursor.execute(self.fts_schema)
+        except sqlite3.OperationalError as e:
+            # SQLite FTS5 desteği olmadan derlenmiş - LIKE aramasına geri dön
+            self.fts_enabled = False
+            self.logger.warning(f"FTS5 not available, using LIKE search: {e}")
+            return
+
+        self.fts_enabled = True
+
+        if not already_exists:
+            # Tek seferlik backfill - eski veritabanları için
+            indexed = self.rebuild_fts_index(commit=False)
+            print(
+                f"{Fore.CYAN}[*] Full-text index created: {indexed} files indexed{Style.RESET_ALL}"
+            )
+
+    def rebuild_fts_index(self, commit: bool = True) -> int:
+        """FTS5 indeksini files/file_contents tablolarından yeniden oluşturur"""
+        if not self.connection or not self.fts_enabled:
+            return 0
+
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM files_fts")
+        cursor.execute(
+            """
+            INSERT INTO files_fts (rowid, file_name, file_path, content_text)
+            SELECT f.id, f.file_name, f.file_path,
+                   COALESCE((SELECT fc.content_text FROM file_contents fc
+                             WHERE fc.file_id = f.id
+                             ORDER BY fc.id DESC LIMIT 1), '')
+            FROM files f
+            WHERE f.is_active = 1
+        """
+        )
+        indexed = cursor.rowcount
+
+        if commit:
+            self.connection.commit()
+
+        return indexed
+
+    def _index_file_text(self, file_id: int):
+        """Dosyanın FTS kaydını files/file_contents ile eşitler"""
+        if not self.fts_enabled:
+            return
+
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM files_fts WHERE rowid = ?", (file_id,))
+        cursor.execute(
+            """
+            INSERT INTO files_fts (rowid, file_name, file_path, content_text)
+            SELECT f.id, f.file_name, f.file_path, COALESCE(fc.content_text, '')
+            FROM files f
+            LEFT JOIN file_contents fc ON fc.file_id = f.id
+            WHERE f.id = ? AND f.is_active = 1
+            LIMIT 1
+        """,
+            (file_id,),
+        )
+
+    def _unindex_file_text(self, file_id: int):
+        """Dosyayı FTS indeksinden çıkarır"""
+        if not self.fts_enabled:
+            return
+
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM files_fts WHERE rowid = ?", (file_id,))
+
+    @staticmethod
+    def build_fts_query(
+        terms: List[str], column: Optional[str] = None, prefix: bool = True
+    ) -> str:
+        """Arama terimlerinden FTS5 MATCH ifadesi oluşturur
+
+        Tek kelimeler prefix sorgusu ("term"*), boşluk içeren terimler
+        phrase sorgusu ("exact phrase") olarak eklenir. Tüm terimler AND ile
+        birleştirilir. Terimler tırnaklandığı için FTS5 operatörleri
+        (AND, OR, NEAR, *, :) kullanıcı girdisinden enjekte edilemez.
+        """
+        expressions = []
+        for term in terms:
+            term = term.strip()
+            if not term:
+                continue
+
+            quoted = '"' + term.replace('"', '""') + '"'
+            if prefix and not any(ch.isspace() for ch in term):
+                quoted += "*"
+            if column:
+                quoted = f"{column} : {quoted}"
+
+            expressions.append(quoted)
+
+        return " AND ".join(expressions)
+
+    def parse_fts_terms(self, text: str) -> List[str]:
+        """Serbest metinden FTS terimlerini çıkarır (tırnak içi ifadeler korunur)"""
+        phrases = [p.strip() for p in re.findall(r'"([^"]*)"', text) if p.strip()]
+        remainder = re.sub(r'"[^"]*"', " ", text)
+        words = re.findall(r"\w+", remainder.lower())
+
+        return words + phrases
+
     def calculate_file_hash(self, file_path: str) -> str:
         """Dosya hash'ini hesaplar"""
         hash_md5 = hashlib.md5()
@@ -287,51 +597,54 @@ class DatabaseManager:
 
         try:
             path = Path(file_path)
-            if not path.exists():
+            try:
+                stat = path.stat()
+            except OSError:
                 return None
 
-            # Dosya bilgilerini topla
-            file_info = {
-                "file_path": str(path.resolve()),
-                "file_name": path.name,
-                "file_extension": path.suffix.lower(),
-                "directory_path": str(path.parent),
-                "file_size": path.stat().st_size,
-                "content_hash": self.calculate_file_hash(file_path),
-                "created_at": datetime.fromtimestamp(path.stat().st_ctime),
-                "modified_at": datetime.fromtimestamp(path.stat().st_mtime),
-            }
-
-            # İçeriği oku
-            if content is None:
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                except Exception as e:
-                    self.logger.error(f"Content reading failed for {file_path}: {e}")
-                    content = ""
-
             cursor = self.connection.cursor()
 
             # Dosya zaten var mı kontrol et
             cursor.execute(
-                "SELECT id, content_hash FROM files WHERE file_path = ?",
-                (file_info["file_path"],),
+                """
+                SELECT id, content_hash, file_size, mtime_ns, inode, is_active
+                FROM files WHERE file_path = ?
+            """,
+                (str(path.resolve()),),
             )
             existing_file = cursor.fetchone()
 
+            # Silinip geri gelen dosya içerik aynı olsa da yeniden indekslenir
+            restored = existing_file is not None and not existing_file["is_active"]
+
+            # Fast path: size/mtime/inode değişmemişse okuma ve hash atlanır
+            if (
+                content is None
+                and not restored
+                and self.manifest_matches(existing_file, stat)
+            ):
+                return existing_file["id"]
+
+            # Tek geçiş: tek okuma, hash aynı buffer'dan
+            file_info = self._load_file_record(file_path, content, stat)
+            if file_info is None:
+                return None
+
+            content = file_info["content"]
+
             if existing_file:
                 # Dosya var - güncelle
                 file_id = existing_file["id"]
                 old_hash = existing_file["content_hash"]
 
-                if old_hash != file_info["content_hash"]:
-                    # İçerik değişmiş - güncelle
+                if restored or old_hash != file_info["content_hash"]:
+                    # İçerik değişmiş (veya dosya geri gelmiş) - güncelle
                     cursor.execute(
                         """
                         UPDATE files SET
                             file_name = ?, file_extension = ?, directory_path = ?,
                             file_size = ?, content_hash = ?, modified_at = ?,
+                            mtime_ns = ?, inode = ?, is_active = 1,
                             indexed_at = CURRENT_TIMESTAMP
                         WHERE id = ?
                     """,
@@ -342,6 +655,8 @@ class DatabaseManager:
                             file_info["file_size"],
                             file_info["content_hash"],
                             file_info["modified_at"],
+                            file_info["mtime_ns"],
+                            file_info["inode"],
                             file_id,
                         ),
                     )
@@ -354,10 +669,16 @@ class DatabaseManager:
                         file_id, "modified", old_hash, file_info["content_hash"]
                     )
 
+                    self.connection.commit()
                     print(
                         f"{Fore.YELLOW}📝 File updated: {file_info['file_name']}{Style.RESET_ALL}"
                     )
 
+                else:
+                    # İçerik aynı (touch vb.) - sadece manifest'i güncelle
+                    self._update_manifest(cursor, [{**file_info, "file_id": file_id}])
+                    self.connection.commit()
+
                 return file_id
 
             else:
@@ -366,8 +687,9 @@ class DatabaseManager:
                     """
                     INSERT INTO files (
                         file_path, file_name, file_extension, directory_path,
-                        file_size, content_hash, created_at, modified_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        file_size, content_hash, created_at, modified_at,
+                        mtime_ns, inode
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                     (
                         file_info["file_path"],
@@ -378,6 +700,8 @@ class DatabaseManager:
                         file_info["content_hash"],
                         file_info["created_at"],
                         file_info["modified_at"],
+                        file_info["mtime_ns"],
+                        file_info["inode"],
                     ),
                 )
 
@@ -391,9 +715,10 @@ class DatabaseManager:
                     file_id, "created", None, file_info["content_hash"]
                 )
 
-                print(                    f"{Fore.GREEN}[+] File added: {file_info['file_name']}{Style.RESET_ALL}"                )
-
                 self.connection.commit()
+                print(
+                    f"{Fore.GREEN}[+] File added: {file_info['file_name']}{Style.RESET_ALL}"
+                )
                 return file_id
 
         except sqlite3.Error as e:
@@ -405,10 +730,7 @@ class DatabaseManager:
         cursor = self.connection.cursor()
 
         # İçerik istatistiklerini hesapla
-        lines = content.count("\n") + 1 if content else 0
-        words = len(content.split()) if content else 0
-        chars = len(content) if content else 0
-        preview = content[:500] + "..." if len(content) > 500 else content
+        preview, lines, words, chars = self._content_stats(content)
 
         # Mevcut içeriği sil
         cursor.execute("DELETE FROM file_contents WHERE file_id = ?", (file_id,))
@@ -424,6 +746,351 @@ class DatabaseManager:
             (file_id, content, preview, lines, words, chars),
         )
 
+        # Full-text index senkronizasyonu
+        self._index_file_text(file_id)
+
+    @staticmethod
+    def _content_stats(content: str) -> Tuple[str, int, int, int]:
+        """İçerik önizlemesi ve satır/kelime/karakter sayılarını hesaplar"""
+        lines = content.count("\n") + 1 if content else 0
+        words = len(content.split()) if content else 0
+        chars = len(content) if content else 0
+        preview = content[:500] + "..." if len(content) > 500 else content
+
+        return preview, lines, words, chars
+
+    def _load_file_record(
+        self,
+        file_path: str,
+        content: Optional[str] = None,
+        stat: Optional[os.stat_result] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Dosya bilgisini tek geçişte toplar (tek stat, tek okuma, aynı buffer'dan hash)"""
+        return read_file_record(file_path, content, stat)
+
+    def _update_manifest(self, cursor, records: List[Dict[str, Any]]):
+        """İçeriği değişmemiş dosyaların size/mtime_ns/inode bilgisini günceller"""
+        cursor.executemany(
+            "UPDATE files SET file_size = ?, mtime_ns = ?, inode = ? WHERE id = ?",
+            [
+                (r["file_size"], r["mtime_ns"], r["inode"], r["file_id"])
+                for r in records
+            ],
+        )
+
+    def add_or_update_files(
+        self, file_paths: List[str], batch_size: int = 500
+    ) -> Dict[str, Any]:
+        """Toplu dosya ekleme/güncelleme - batch başına tek transaction
+
+        Her dosya tek geçişte okunur; yazma işlemleri executemany ile
+        batch_size'lık transaction'larda yapılır. Batch başına throughput
+        (files/s, MB/s) raporlanır.
+        """
+        summary = {
+            "total_files": 0,
+            "added": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "failed": 0,
+            "bytes": 0,
+            "seconds": 0.0,
+            "files_per_second": 0.0,
+            "mb_per_second": 0.0,
+            "batches": [],
+            "file_ids": {},
+        }
+
+        if not self.connection:
+            return summary
+
+        paths = [str(p) for p in file_paths]
+        batch_size = max(1, batch_size)
+
+        for batch_number, start in enumerate(range(0, len(paths), batch_size), 1):
+            batch = self._ingest_batch(paths[start : start + batch_size])
+
+            for key in ("added", "updated", "unchanged", "failed", "bytes"):
+                summary[key] += batch[key]
+            summary["seconds"] += batch["seconds"]
+            summary["file_ids"].update(batch.pop("file_ids"))
+            summary["batches"].append(batch)
+
+            print(
+                f"{Fore.CYAN}[*] Batch {batch_number}: {batch['files']} files, "
+                f"{batch['bytes'] / (1024 * 1024):.1f} MB in {batch['seconds']:.2f}s "
+                f"({batch['files_per_second']:.0f} files/s, "
+                f"{batch['mb_per_second']:.1f} MB/s){Style.RESET_ALL}"
+            )
+
+        summary["total_files"] = len(paths)
+        if summary["seconds"] > 0:
+            summary["files_per_second"] = len(paths) / summary["seconds"]
+            summary["mb_per_second"] = (
+                summary["bytes"] / (1024 * 1024) / summary["seconds"]
+            )
+
+        return summary
+
+    def _ingest_batch(self, paths: List[str]) -> Dict[str, Any]:
+        """Bir batch dosyayı okur ve tek transaction içinde yazar"""
+        batch_start = time.perf_counter()
+
+        stats = {}
+        failed = 0
+        for file_path in paths:
+            try:
+                stats[file_path] = Path(file_path).stat()
+            except OSError:
+                failed += 1
+
+        # Fast path: manifest ile aynı stat'a sahip dosyalar okunmaz
+        resolved = {file_path: str(Path(file_path).resolve()) for file_path in stats}
+        manifest = self.get_scan_manifest(list(resolved.values()))
+
+        records = []
+        skipped = {}
+        for file_path, stat in stats.items():
+            entry = manifest.get(resolved[file_path])
+            if self.manifest_matches(entry, stat):
+                skipped[resolved[file_path]] = entry["id"]
+                continue
+
+            record = self._load_file_record(file_path, stat=stat)
+            if record is None:
+                failed += 1
+            else:
+                records.append(record)
+
+        batch = self.write_file_records(records)
+        batch["failed"] += failed
+        batch["unchanged"] += len(skipped)
+        batch["file_ids"].update(skipped)
+
+        elapsed = time.perf_counter() - batch_start
+        batch.update(
+            {
+                "files": len(paths),
+                "seconds": elapsed,
+                "files_per_second": len(paths) / elapsed if elapsed > 0 else 0.0,
+                "mb_per_second": (
+                    batch["bytes"] / (1024 * 1024) / elapsed if elapsed > 0 else 0.0
+                ),
+            }
+        )
+
+        return batch
+
+    def write_file_records(self, file_records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Önceden okunmuş dosya kayıtlarını tek transaction içinde yazar
+
+        Kayıtlar read_file_record çıktısıdır; opsiyonel "keywords" alanı
+        ([(keyword, count), ...]) search_index tablosuna yazılır.
+        """
+        records = {record["file_path"]: record for record in file_records}
+        failed = 0
+
+        cursor = self.connection.cursor()
+        file_ids = {}
+        added = updated = unchanged = 0
+
+        try:
+            existing = {}
+            if records:
+                placeholders = ",".join("?" * len(records))
+                cursor.execute(
+                    f"""
+                    SELECT id, file_path, content_hash, is_active FROM files
+                    WHERE file_path IN ({placeholders})
+                """,
+                    list(records),
+                )
+                existing = {row["file_path"]: row for row in cursor.fetchall()}
+
+            new_records = [r for p, r in records.items() if p not in existing]
+            changed_records = []
+            touched_records = []
+            for file_path, record in records.items():
+                row = existing.get(file_path)
+                if row is None:
+                    continue
+                record["file_id"] = row["id"]
+                record["old_hash"] = row["content_hash"]
+                # Pasif (silinip geri gelen) dosyalar içerik aynı olsa da
+                # yeniden aktifleştirilir ve içerik/FTS kayıtları yazılır
+                record["is_active"] = 1
+                content_changed = row["content_hash"] != record["content_hash"]
+                if content_changed or not row["is_active"]:
+                    changed_records.append(record)
+                else:
+                    touched_records.append(record)
+                    file_ids[file_path] = row["id"]
+                    unchanged += 1
+
+            # Yeni dosyalar
+            if new_records:
+                cursor.executemany(
+                    """
+                    INSERT INTO files (
+                        file_path, file_name, file_extension, directory_path,
+                        file_size, content_hash, created_at, modified_at,
+                        mtime_ns, inode
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    [
+                        (
+                            r["file_path"],
+                            r["file_name"],
+                            r["file_extension"],
+                            r["directory_path"],
+                            r["file_size"],
+                            r["content_hash"],
+                            r["created_at"],
+                            r["modified_at"],
+                            r.get("mtime_ns"),
+                            r.get("inode"),
+                        )
+                        for r in new_records
+                    ],
+                )
+
+                placeholders = ",".join("?" * len(new_records))
+                cursor.execute(
+                    f"SELECT id, file_path FROM files WHERE file_path IN ({placeholders})",
+                    [r["file_path"] for r in new_records],
+                )
+                new_ids = {row["file_path"]: row["id"] for row in cursor.fetchall()}
+                for record in new_records:
+                    record["file_id"] = new_ids[record["file_path"]]
+                    record["old_hash"] = None
+                    record["is_active"] = 1
+
+            # Değişen dosyalar
+            if changed_records:
+                cursor.executemany(
+                    """
+                    UPDATE files SET
+                        file_name = ?, file_extension = ?, directory_path = ?,
+                        file_size = ?, content_hash = ?, modified_at = ?,
+                        mtime_ns = ?, inode = ?, is_active = 1,
+                        indexed_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """,
+                    [
+                        (
+                            r["file_name"],
+                            r["file_extension"],
+                            r["directory_path"],
+                            r["file_size"],
+                            r["content_hash"],
+                            r["modified_at"],
+                            r.get("mtime_ns"),
+                            r.get("inode"),
+                            r["file_id"],
+                        )
+                        for r in changed_records
+                    ],
+                )
+
+            if touched_records:
+                self._update_manifest(cursor, touched_records)
+
+            written = new_records + changed_records
+            if written:
+                self._write_contents_batch(cursor, written)
+
+                cursor.executemany(
+                    """
+                    INSERT INTO file_changes (
+                        file_id, change_type, old_content_hash, new_content_hash
+                    ) VALUES (?, ?, ?, ?)
+                """,
+                    [
+                        (
+                            r["file_id"],
+                            "modified" if r["old_hash"] else "created",
+                            r["old_hash"],
+                            r["content_hash"],
+                        )
+                        for r in written
+                    ],
+                )
+
+            self.connection.commit()
+
+            for record in written:
+                file_ids[record["file_path"]] = record["file_id"]
+            added = len(new_records)
+            updated = len(changed_records)
+
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            self.logger.error(f"Database error in write_file_records: {e}")
+            failed += len(records) - unchanged
+
+        return {
+            "added": added,
+            "updated": updated,
+            "unchanged": unchanged,
+            "failed": failed,
+            "bytes": sum(r["file_size"] for r in records.values()),
+            "file_ids": file_ids,
+        }
+
+    def _write_contents_batch(self, cursor, records: List[Dict[str, Any]]):
+        """file_contents ve FTS kayıtlarını executemany ile yazar"""
+        content_rows = []
+        for record in records:
+            preview, lines, words, chars = self._content_stats(record["content"])
+            content_rows.append(
+                (record["file_id"], record["content"], preview, lines, words, chars)
+            )
+
+        file_id_rows = [(r["file_id"],) for r in records]
+
+        cursor.executemany("DELETE FROM file_contents WHERE file_id = ?", file_id_rows)
+        cursor.executemany(
+            """
+            INSERT INTO file_contents (
+                file_id, content_text, content_preview,
+                line_count, word_count, char_count
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            content_rows,
+        )
+
+        keyword_records = [r for r in records if "keywords" in r]
+        if keyword_records:
+            cursor.executemany(
+                "DELETE FROM search_index WHERE file_id = ?",
+                [(r["file_id"],) for r in keyword_records],
+            )
+            cursor.executemany(
+                """
+                INSERT INTO search_index (file_id, keyword, keyword_count)
+                VALUES (?, ?, ?)
+            """,
+                [
+                    (record["file_id"], keyword, count)
+                    for record in keyword_records
+                    for keyword, count in record["keywords"]
+                ],
+            )
+
+        if self.fts_enabled:
+            cursor.executemany("DELETE FROM files_fts WHERE rowid = ?", file_id_rows)
+            cursor.executemany(
+                """
+                INSERT INTO files_fts (rowid, file_name, file_path, content_text)
+                VALUES (?, ?, ?, ?)
+            """,
+                [
+                    (r["file_id"], r["file_name"], r["file_path"], r["content"])
+                    for r in records
+                    if r["is_active"]
+                ],
+            )
+
     def _record_file_change(
         self, file_id: int, change_type: str, old_hash: str, new_hash: str
     ):
@@ -460,6 +1127,9 @@ class DatabaseManager:
                     (file_id,),
                 )
 
+                # Full-text index'ten çıkar
+                self._unindex_file_text(file_id)
+
                 # Değişiklik kaydı
                 self._record_file_change(file_id, "deleted", None, None)
 
@@ -474,31 +1144,53 @@ class DatabaseManager:
             return False
 
     def search_files(self, query: str, limit: int = 50) -> List[Dict]:
-        """Dosyalarda arama yapar"""
+        """Dosyalarda arama yapar (FTS5 + bm25, yoksa LIKE)"""
         if not self.connection:
             return []
 
         try:
             cursor = self.connection.cursor()
 
-            # Basit full-text search
-            search_query = f"%{query}%"
+            match_expression = (
+                self.build_fts_query(self.parse_fts_terms(query))
+                if self.fts_enabled
+                else ""
+            )
 
-            cursor.execute(
-                """
-                SELECT f.*, fc.content_preview, fc.line_count, fc.word_count
-                FROM files f
-                LEFT JOIN file_contents fc ON f.id = fc.file_id
-                WHERE f.is_active = 1 AND (
-                    f.file_name LIKE ? OR
-                    f.file_path LIKE ? OR
-                    fc.content_text LIKE ?
+            if match_expression:
+                # Full-text search - bm25 ile sıralama
+                cursor.execute(
+                    """
+                    SELECT f.*, fc.content_preview, fc.line_count, fc.word_count,
+                           bm25(files_fts, ?, ?, ?) AS rank
+                    FROM files_fts
+                    JOIN files f ON f.id = files_fts.rowid
+                    LEFT JOIN file_contents fc ON f.id = fc.file_id
+                    WHERE files_fts MATCH ? AND f.is_active = 1
+                    ORDER BY rank, f.modified_at DESC
+                    LIMIT ?
+                """,
+                    (*self.fts_weights, match_expression, limit),
+                )
+            else:
+                # Basit full-text search
+                search_query = f"%{query}%"
+
+                cursor.execute(
+                    """
+                    SELECT f.*, fc.content_preview, fc.line_count, fc.word_count
+                    FROM files f
+                    LEFT JOIN file_contents fc ON f.id = fc.file_id
+                    WHERE f.is_active = 1 AND (
+                        f.file_name LIKE ? OR
+                        f.file_path LIKE ? OR
+                        fc.content_text LIKE ?
+                    )
+                    ORDER BY f.modified_at DESC
+                    LIMIT ?
+                """,
+                    (search_query, search_query, search_query, limit),
                 )
-                ORDER BY f.modified_at DESC
-                LIMIT ?
-            """,
-                (search_query, search_query, search_query, limit),
-            )
 
             results = []
             for row in cursor.fetchall():
@@ -719,27 +1411,26 @@ class DatabaseManager:
             if not important_words:
                 return []
 
-            # LIKE sorgusu oluştur
-            like_conditions = []
-            params = []
-            for word in important_words:
-                like_conditions.append("LOWER(prompt_text) LIKE ?")
-                params.append(f"%{word}%")
-
-            params.append(limit)
+            # LIKE sorgusu oluştur (eşleşen anahtar kelime sayısı skor olur)
+            like_conditions = ["LOWER(prompt_text) LIKE ?"] * len(important_words)
+            like_params = [f"%{word}%" for word in important_words]
+            match_count = " + ".join(
+                f"(CASE WHEN {condition} THEN 1 ELSE 0 END)"
+                for condition in like_conditions
+            )
 
             query = f"""
                 SELECT ph.*, 
-                       COUNT(*) as keyword_matches,
+                       {match_count} as keyword_matches,
                        (julianday('now') - julianday(ph.last_used_at)) * 24 as hours_ago
                 FROM prompt_history ph
                 WHERE ({' OR '.join(like_conditions)})
                 AND prompt_text != ?
-                GROUP BY ph.id
                 ORDER BY keyword_matches DESC, hours_ago ASC
                 LIMIT ?
             """
-            params.insert(-1, prompt_text)  # Aynı prompt'u hariç tut
+            # Aynı prompt'u hariç tut
+            params = like_params + like_params + [prompt_text, limit]
 
             cursor.execute(query, params)
             results = []
@@ -814,39 +1505,41 @@ class DatabaseManager:
             similar_prompts = self.get_similar_prompts(
                 prompt_text, limit=10, similarity_threshold=0.5
             )
+            if not similar_prompts:
+                return
 
             cursor = self.connection.cursor()
 
-            for similar in similar_prompts:
-                similarity_score = similar["similarity_score"]
-                other_id = similar["id"]
-
-                # Zaman mesafesi hesapla
-                cursor.execute(
-                    """
-                    SELECT (julianday('now') - julianday(created_at)) * 24 as hours_ago
-                    FROM prompt_history WHERE id = ?
-                """,
-                    (other_id,),
-                )
-                result = cursor.fetchone()
-                time_distance = result["hours_ago"] if result else 0
+            # Zaman mesafelerini tek sorguda hesapla
+            other_ids = [similar["id"] for similar in similar_prompts]
+            placeholders = ",".join("?" * len(other_ids))
+            cursor.execute(
+                f"""
+                SELECT id, (julianday('now') - julianday(created_at)) * 24 as hours_ago
+                FROM prompt_history WHERE id IN ({placeholders})
+            """,
+                other_ids,
+            )
+            time_distances = {row["id"]: row["hours_ago"] for row in cursor.fetchall()}
 
-                # İlişki kaydı ekle/güncelle
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO prompt_relationships
-                    (prompt_id_1, prompt_id_2, similarity_score, relationship_type, 
-                     time_distance_hours)
-                    VALUES (?, ?, ?, 'semantic', ?)
-                """,
+            # İlişki kayıtlarını ekle/güncelle
+            cursor.executemany(
+                """
+                INSERT OR REPLACE INTO prompt_relationships
+                (prompt_id_1, prompt_id_2, similarity_score, relationship_type, 
+                 time_distance_hours)
+                VALUES (?, ?, ?, 'semantic', ?)
+            """,
+                [
                     (
-                        min(prompt_id, other_id),
-                        max(prompt_id, other_id),
-                        similarity_score,
-                        time_distance,
-                    ),
-                )
+                        min(prompt_id, similar["id"]),
+                        max(prompt_id, similar["id"]),
+                        similar["similarity_score"],
+                        time_distances.get(similar["id"], 0),
+                    )
+                    for similar in similar_prompts
+                ],
+            )
 
             self.connection.commit()
 
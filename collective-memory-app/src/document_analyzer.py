@@ -5,10 +5,16 @@ Analyzes documentation files to extract issues and tasks
 """
 
 import re
+from bisect import bisect_right
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Set
 from datetime import datetime
 
+try:
+    from .keyword_matcher import get_keyword_matcher
+except ImportError:
+    from keyword_matcher import get_keyword_matcher
+
 
 class DocumentAnalyzer:
     """Dokümantasyon analiz sistemi"""
@@ -65,6 +71,11 @@ class DocumentAnalyzer:
             "DÜŞÜK": ["minor", "enhancement", "nice to have", "gelecek"],
         }
 
+        # Satır regex'lerinin çapa kelimeleri: regex yalnızca bunlardan
+        # birini içeren satırlarda çalışır (tüm doküman tek geçişte taranır)
+        self.error_keywords = ("port", "fail", "başarısız", "error", "econnrefused")
+        self.task_keywords = ("todo", "fix", "düzelt", "çöz", "implement")
+
     def analyze_document(self, file_path: str) -> Dict:
         """Doküman analiz eder"""
         try:
@@ -90,16 +101,29 @@ class DocumentAnalyzer:
                 "analyzed_at": datetime.now().isoformat(),
             }
 
+    def _keyword_lines(self, content: str, keywords: Iterable[str]) -> Dict[int, Set[str]]:
+        """Satır numarası -> o satırda geçen anahtar kelimeler"""
+        newlines = [match.start() for match in re.finditer("\n", content)]
+        line_hits: Dict[int, Set[str]] = {}
+        for hit in get_keyword_matcher(keywords).iter_hits(content):
+            line_hits.setdefault(bisect_right(newlines, hit.start), set()).add(hit.keyword)
+        return line_hits
+
     def _extract_errors(self, content: str, file_path: str) -> List[Dict]:
         """İçerikten hataları çıkarır"""
         errors = []
         lines = content.split("\n")
+        line_hits = self._keyword_lines(content, self.error_keywords)
 
-        for i, line in enumerate(lines):
+        for i in sorted(line_hits):
+            line = lines[i]
             line_lower = line.lower()
+            hits = line_hits[i]
 
             # Port conflicts
-            if re.search(r"port.*(?:3000|8000).*(?:in use|çakış)", line_lower):
+            if "port" in hits and re.search(
+                r"port.*(?:3000|8000).*(?:in use|çakış)", line_lower
+            ):
                 errors.append(
                     {
                         "error_code": f"DOC_PORT_CONFLICT_{i}",
@@ -114,7 +138,9 @@ class DocumentAnalyzer:
                 )
 
             # Test failures
-            if re.search(r"(\d+)\/(\d+).*(?:fail|başarısız|error)", line_lower):
+            if hits & {"fail", "başarısız", "error"} and re.search(
+                r"(\d+)\/(\d+).*(?:fail|başarısız|error)", line_lower
+            ):
                 match = re.search(r"(\d+)\/(\d+)", line)
                 if match:
                     passed, total = match.groups()
@@ -134,7 +160,7 @@ class DocumentAnalyzer:
                     )
 
             # ECONNREFUSED errors
-            if "econnrefused" in line_lower:
+            if "econnrefused" in hits:
                 errors.append(
                     {
                         "error_code": f"DOC_CONNECTION_REFUSED_{i}",
@@ -154,12 +180,15 @@ class DocumentAnalyzer:
         """İçerikten görevleri çıkarır"""
         tasks = []
         lines = content.split("\n")
+        line_hits = self._keyword_lines(content, self.task_keywords)
 
-        for i, line in enumerate(lines):
+        for i in sorted(line_hits):
+            line = lines[i]
             line_lower = line.lower()
+            hits = line_hits[i]
 
             # TODO tasks
-            if re.search(r"todo:?\s*(.{10,100})", line_lower):
+            if "todo" in hits and re.search(r"todo:?\s*(.{10,100})", line_lower):
                 match = re.search(r"todo:?\s*(.{10,100})", line, re.IGNORECASE)
                 if match:
                     task_desc = match.group(1).strip()
@@ -175,7 +204,7 @@ class DocumentAnalyzer:
                     )
 
             # Fix patterns
-            if re.search(r"(?:fix|düzelt|çöz)\s+(.{10,100})", line_lower):
+            if hits & {"fix", "düzelt", "çöz"} and re.search(r"(?:fix|düzelt|çöz)\s+(.{10,100})", line_lower):
                 match = re.search(
                     r"(?:fix|düzelt|çöz)\s+(.{10,100})", line, re.IGNORECASE
                 )
@@ -193,7 +222,7 @@ class DocumentAnalyzer:
                     )
 
             # Implementation tasks
-            if re.search(r"implement\s+(.{10,100})", line_lower):
+            if "implement" in hits and re.search(r"implement\s+(.{10,100})", line_lower):
                 match = re.search(r"implement\s+(.{10,100})", line, re.IGNORECASE)
                 if match:
                     impl_desc = match.group(1).strip()
@@ -212,11 +241,13 @@ class DocumentAnalyzer:
 
     def _determine_priority(self, text: str) -> str:
         """Metinden öncelik seviyesi belirler"""
-        text_lower = text.lower()
+        matched = get_keyword_matcher(
+            keyword for keywords in self.priority_keywords.values() for keyword in keywords
+        ).matched(text)
 
         for priority, keywords in self.priority_keywords.items():
             for keyword in keywords:
-                if keyword in text_lower:
+                if keyword in matched:
                     return priority
 
         return "ORTA"  # Default priority
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Embedding Service - Önceden yüklenen (warm) ortak embedding modeli
+Model süreç başına bir kez, başlangıçta arka plan thread'inde yüklenir;
+eşzamanlı encode istekleri tek kuyruktan mikro-batch'ler halinde işlenir
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Model yükleyici: model adı -> encode(texts, **kwargs) metodu olan nesne
+ModelLoader = Callable[[str], Any]
+
+# NLTK kaynakları: (paket adı, nltk.data yolu)
+NLTK_RESOURCES = (
+    ("punkt", "tokenizers/punkt"),
+    ("stopwords", "corpora/stopwords"),
+    ("averaged_perceptron_tagger", "taggers/averaged_perceptron_tagger"),
+    ("wordnet", "corpora/wordnet"),
+)
+
+_nltk_checked = False
+_nltk_lock = threading.Lock()
+
+
+def ensure_nltk_data(resources: Iterable[Tuple[str, str]] = NLTK_RESOURCES) -> bool:
+    """NLTK verisini süreç başına bir kez kontrol eder, yalnızca eksikleri indirir
+
+    Sonuç önbelleğe alınır; sonraki çağrılar diske/ağa gitmez.
+    """
+    global _nltk_checked
+    if _nltk_checked:
+        return True
+
+    with _nltk_lock:
+        if _nltk_checked:
+            return True
+        try:
+            import nltk
+        except ImportError:
+            return False
+
+        for package, path in resources:
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                try:
+                    nltk.download(package, quiet=True)
+                except Exception as e:
+                    logger.warning(f"NLTK download failed for {package}: {e}")
+        _nltk_checked = True
+    return True
+
+
+def load_sentence_transformer(model_name: str):
+    """Varsayılan yükleyici (sentence-transformers)"""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+class _EncodeRequest:
+    __slots__ = ("texts", "future")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+
+
+class EmbeddingService:
+    """
+    Shared embedding model served by a single worker thread
+
+    - start() modeli arka planda yükler (preload); ilk sorgu yükleme beklemez
+    - encode() istekleri kuyruğa girer; worker bekleyen istekleri
+      max_batch_size metne ya da max_wait_ms süresine kadar birleştirip
+      tek model çağrısı yapar
+    - encode() arayüzü SentenceTransformer.encode ile uyumludur
+    """
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        loader: Optional[ModelLoader] = None,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        request_timeout: float = 120.0,
+    ):
+        self.model_name = model_name
+        self.loader = loader or load_sentence_transformer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.request_timeout = request_timeout
+
+        self.load_error: Optional[Exception] = None
+        self.load_time = 0.0
+        self._model = None
+        self._ready = threading.Event()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._running = False
+
+        # Metrics
+        self.requests = 0
+        self.batches = 0
+        self.texts_encoded = 0
+        self.max_coalesced = 0
+
+    # ================================
+    # LIFECYCLE
+    # ================================
+
+    def start(self) -> "EmbeddingService":
+        """Worker thread'ini başlatır ve modeli yüklemeye başlar (idempotent)"""
+        with self._start_lock:
+            if self._worker is None:
+                self._running = True
+                self._worker = threading.Thread(
+                    target=self._run, name=f"embedding-{self.model_name}", daemon=True
+                )
+                self._worker.start()
+        return self
+
+    @property
+    def ready(self) -> bool:
+        """Model yüklendi ve istek kabul ediliyor mu"""
+        return self._ready.is_set() and self.load_error is None
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Model yüklenene kadar bekler (yükleme başarısızsa False)"""
+        self.start()
+        return self._ready.wait(timeout) and self.load_error is None
+
+    def stop(self, timeout: float = 5.0):
+        """Bekleyen istekleri işleyip worker'ı durdurur"""
+        if not self._running:
+            return
+        self._running = False
+        self._queue.put(None)
+        if self._worker is not None:
+            self._worker.join(timeout=timeout)
+
+    # ================================
+    # ENCODING
+    # ================================
+
+    def submit(self, texts: List[str]) -> Future:
+        """Encode isteğini kuyruğa ekler; sonuç (n, dim) float32 matris"""
+        request = _EncodeRequest(list(texts))
+        if self.load_error is not None:
+            request.future.set_exception(self.load_error)
+            return request.future
+        if not self._running:
+            self.start()
+
+        self.requests += 1
+        self._queue.put(request)
+        return request.future
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        """Metinleri encode eder (SentenceTransformer.encode uyumlu)"""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self.submit(texts).result(timeout=self.request_timeout)
+
+    def _run(self):
+        started = time.time()
+        try:
+            self._model = self.loader(self.model_name)
+            self.load_time = time.time() - started
+            logger.info(f"Embedding model {self.model_name} loaded in {self.load_time:.2f}s")
+        except Exception as e:
+            self.load_error = e
+            logger.error(f"Embedding model {self.model_name} could not be loaded: {e}")
+        finally:
+            self._ready.set()
+
+        while True:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._encode_batch(batch)
+            if stopping:
+                return
+
+    def _next_batch(self) -> Tuple[List[_EncodeRequest], bool]:
+        """İlk isteği bekler, ardından kısa süre gelen istekleri birleştirir"""
+        first = self._queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        count = len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+        while count < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            count += len(item.texts)
+        return batch, False
+
+    def _encode_batch(self, batch: List[_EncodeRequest]):
+        if self.load_error is not None:
+            for request in batch:
+                request.future.set_exception(self.load_error)
+            return
+
+        texts = [text for request in batch for text in request.texts]
+        try:
+            matrix = np.asarray(
+                self._model.encode(texts, convert_to_numpy=True), dtype=np.float32
+            )
+        except Exception as e:
+            logger.error(f"Embedding batch failed: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.texts_encoded += len(texts)
+        self.max_coalesced = max(self.max_coalesced, len(batch))
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(matrix[offset : offset + len(request.texts)])
+            offset += len(request.texts)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Servis metrikleri"""
+        return {
+            "model": self.model_name,
+            "ready": self.ready,
+            "load_error": str(self.load_error) if self.load_error else None,
+            "load_time": self.load_time,
+            "queue_size": self._queue.qsize(),
+            "requests": self.requests,
+            "batches": self.batches,
+            "texts_encoded": self.texts_encoded,
+            "max_coalesced": self.max_coalesced,
+        }
+
+
+_services: Dict[str, EmbeddingService] = {}
+_services_lock = threading.Lock()
+
+
+def get_embedding_service(
+    model_name: str = "all-MiniLM-L6-v2", loader: Optional[ModelLoader] = None
+) -> EmbeddingService:
+    """Model adı başına süreç içinde paylaşılan (başlatılmış) servis"""
+    with _services_lock:
+        service = _services.get(model_name)
+        if service is None:
+            service = EmbeddingService(model_name, loader=loader).start()
+            _services[model_name] = service
+        return service
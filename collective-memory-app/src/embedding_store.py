@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Embedding Store - Doküman embedding'lerinin kalıcı saklanması
+Vektörler content_hash ile anahtarlanır; dosya değişmedikçe yeniden hesaplanmaz
+"""
+
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from colorama import init, Fore, Style
+
+# Colorama initialize
+init()
+
+# Encoder: metin listesi -> (n, dim) matris
+Encoder = Callable[[List[str]], np.ndarray]
+
+
+class EmbeddingStore:
+    """content_hash -> embedding vektörü deposu (document_embeddings tablosu)"""
+
+    def __init__(
+        self,
+        database_manager,
+        encoder: Encoder,
+        model_name: str = "all-MiniLM-L6-v2",
+        max_chars: int = 2000,
+        batch_size: int = 64,
+    ):
+        self.db_manager = database_manager
+        self.encoder = encoder
+        self.model_name = model_name
+        self.max_chars = max_chars
+        self.batch_size = batch_size
+
+        self.logger = logging.getLogger(__name__)
+
+        # Statistics
+        self.documents_embedded = 0
+        self.queries_embedded = 0
+
+    @staticmethod
+    def to_blob(vector: np.ndarray) -> bytes:
+        """float32 vektörü BLOB'a çevirir"""
+        return np.asarray(vector, dtype=np.float32).tobytes()
+
+    @staticmethod
+    def from_blob(blob: bytes) -> np.ndarray:
+        """BLOB'u float32 vektöre çevirir"""
+        return np.frombuffer(blob, dtype=np.float32)
+
+    @staticmethod
+    def normalize(matrix: np.ndarray) -> np.ndarray:
+        """Satırları birim uzunluğa getirir (cosine = dot product)"""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Metinleri batch'ler halinde encode eder"""
+        chunks = [
+            np.asarray(self.encoder(texts[i : i + self.batch_size]), dtype=np.float32)
+            for i in range(0, len(texts), self.batch_size)
+        ]
+        return self.normalize(np.vstack(chunks))
+
+    def encode_query(self, text: str) -> np.ndarray:
+        """Sorgu metnini encode eder (sorgu başına tek model çağrısı)"""
+        self.queries_embedded += 1
+        return self._encode([text])[0]
+
+    def get_vectors(self, content_hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Kayıtlı vektörleri content_hash ile getirir"""
+        hashes = list(dict.fromkeys(h for h in content_hashes if h))
+        vectors = {}
+        cursor = self.db_manager.connection.cursor()
+
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(
+                f"""
+                SELECT content_hash, vector FROM document_embeddings
+                WHERE model_name = ? AND content_hash IN ({placeholders})
+            """,
+                [self.model_name, *chunk],
+            )
+            for row in cursor.fetchall():
+                vectors[row["content_hash"]] = self.from_blob(row["vector"])
+
+        return vectors
+
+    def _load_texts(self, content_hashes: List[str]) -> Dict[str, str]:
+        """Embedding'i olmayan hash'ler için indekslenmiş içeriği getirir"""
+        texts = {}
+        cursor = self.db_manager.connection.cursor()
+
+        for i in range(0, len(content_hashes), 500):
+            chunk = content_hashes[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(
+                f"""
+                SELECT f.content_hash, fc.content_text
+                FROM files f
+                JOIN file_contents fc ON f.id = fc.file_id
+                WHERE f.is_active = 1 AND f.content_hash IN ({placeholders})
+                GROUP BY f.content_hash
+            """,
+                chunk,
+            )
+            for row in cursor.fetchall():
+                texts[row["content_hash"]] = (row["content_text"] or "")[: self.max_chars]
+
+        return texts
+
+    def store_vectors(self, texts: Dict[str, str]) -> Dict[str, np.ndarray]:
+        """Metinleri encode edip tek transaction'da kaydeder"""
+        if not texts:
+            return {}
+
+        hashes = list(texts)
+        matrix = self._encode([texts[h] for h in hashes])
+
+        self.db_manager.connection.executemany(
+            """
+            INSERT OR REPLACE INTO document_embeddings
+                (content_hash, model_name, dimension, vector)
+            VALUES (?, ?, ?, ?)
+        """,
+            [
+                (h, self.model_name, matrix.shape[1], self.to_blob(vector))
+                for h, vector in zip(hashes, matrix)
+            ],
+        )
+        self.db_manager.connection.commit()
+
+        self.documents_embedded += len(hashes)
+        return dict(zip(hashes, matrix))
+
+    def ensure_vectors(self, content_hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Kayıtlı vektörleri döndürür, eksik olanları bir kez hesaplar"""
+        hashes = list(dict.fromkeys(h for h in content_hashes if h))
+        vectors = self.get_vectors(hashes)
+
+        missing = [h for h in hashes if h not in vectors]
+        if missing:
+            vectors.update(self.store_vectors(self._load_texts(missing)))
+
+        return vectors
+
+    def similarities(self, query_text: str, content_hashes: List[str]) -> np.ndarray:
+        """Sorgu ile dokümanlar arasındaki cosine benzerlikleri (tek matris çarpımı)"""
+        if not content_hashes:
+            return np.zeros(0, dtype=np.float32)
+
+        vectors = self.ensure_vectors(content_hashes)
+        query_vector = self.encode_query(query_text)
+
+        matrix = np.zeros((len(content_hashes), query_vector.shape[0]), dtype=np.float32)
+        for i, content_hash in enumerate(content_hashes):
+            vector = vectors.get(content_hash)
+            if vector is not None and vector.shape == query_vector.shape:
+                matrix[i] = vector
+
+        return matrix @ query_vector
+
+    def index_pending(self, limit: Optional[int] = None) -> int:
+        """Embedding'i olmayan (yeni veya değişmiş) aktif dosyaları encode eder"""
+        cursor = self.db_manager.connection.cursor()
+        sql = """
+            SELECT DISTINCT f.content_hash
+            FROM files f
+            LEFT JOIN document_embeddings e
+                ON e.content_hash = f.content_hash AND e.model_name = ?
+            WHERE f.is_active = 1 AND e.content_hash IS NULL
+        """
+        params: List = [self.model_name]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        cursor.execute(sql, params)
+        pending = [row["content_hash"] for row in cursor.fetchall()]
+
+        embedded = 0
+        step = self.batch_size * 8
+        for i in range(0, len(pending), step):
+            embedded += len(self.store_vectors(self._load_texts(pending[i : i + step])))
+
+        if embedded:
+            print(
+                f"{Fore.GREEN}[+] Embedded {embedded} documents "
+                f"({self.model_name}){Style.RESET_ALL}"
+            )
+        return embedded
+
+    def prune(self) -> int:
+        """Artık hiçbir aktif dosyaya ait olmayan vektörleri siler"""
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute(
+            """
+            DELETE FROM document_embeddings
+            WHERE content_hash NOT IN (
+                SELECT content_hash FROM files WHERE is_active = 1
+            )
+        """
+        )
+        self.db_manager.connection.commit()
+        return cursor.rowcount
+
+    def get_stats(self) -> Dict:
+        """Embedding deposu istatistikleri"""
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM document_embeddings WHERE model_name = ?",
+            (self.model_name,),
+        )
+        return {
+            "model_name": self.model_name,
+            "stored_vectors": cursor.fetchone()[0],
+            "documents_embedded": self.documents_embedded,
+            "queries_embedded": self.queries_embedded,
+        }
@@ -17,12 +17,13 @@ from collections import defaultdict, Counter
 import hashlib
 import pickle
 import time
-from functools import lru_cache
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import copy
+from dataclasses import asdict
+
+import numpy as np
 
 # AI/ML imports
 try:
-    import numpy as np
     from sklearn.feature_extraction.text import TfidfVectorizer
     from sklearn.metrics.pairwise import cosine_similarity
     from sentence_transformers import SentenceTransformer
@@ -40,18 +41,29 @@ from colorama import init, Fore, Style
 
 # Fixed import - using relative import
 try:
-    from .query_engine import QueryEngine, SearchQuery, SearchResult
+    from .query_engine import QueryEngine, SearchPage, SearchQuery, SearchResult
+    from .embedding_store import EmbeddingStore
+    from .embedding_service import EmbeddingService, ensure_nltk_data, get_embedding_service
+    from .relevance_scoring import ResultFeatures
+    from .result_cache import ResultCache
 except ImportError:
     # Fallback for when running as main module
-    from query_engine import QueryEngine, SearchQuery, SearchResult
+    from query_engine import QueryEngine, SearchPage, SearchQuery, SearchResult
+    from embedding_store import EmbeddingStore
+    from embedding_service import EmbeddingService, ensure_nltk_data, get_embedding_service
+    from relevance_scoring import ResultFeatures
+    from result_cache import ResultCache
 
 # Colorama initialize
 init()
 
-# Performance cache
-_SEMANTIC_CACHE = {}
-_SCORING_CACHE = {}
-_CACHE_MAX_SIZE = 1000
+# Default result cache limits (entries, total cached results, seconds)
+RESULT_CACHE_MAX_ENTRIES = 1000
+RESULT_CACHE_MAX_RESULTS = 20000
+RESULT_CACHE_TTL_SECONDS = 300.0
+
+# İlk semantic sorgunun model yüklemesini bekleyeceği en uzun süre
+MODEL_LOAD_TIMEOUT_SECONDS = 120.0
 
 
 @dataclass
@@ -111,14 +123,34 @@ class EnhancedSearchResult(SearchResult):
 class EnhancedQueryEngine(QueryEngine):
     """Gelişmiş query engine - Semantic search ve AI-powered scoring"""
 
-    def __init__(self, database_manager):
+    def __init__(
+        self,
+        database_manager,
+        result_cache: Optional[ResultCache] = None,
+        embedding_service: Optional[EmbeddingService] = None,
+    ):
         super().__init__(database_manager)
 
+        # Thread-safe LRU/TTL sonuç önbelleği (API thread'leri arasında paylaşılabilir)
+        if result_cache is None:
+            result_cache = ResultCache(
+                max_entries=RESULT_CACHE_MAX_ENTRIES,
+                ttl_seconds=RESULT_CACHE_TTL_SECONDS,
+                max_weight=RESULT_CACHE_MAX_RESULTS,
+            )
+        self.result_cache = result_cache
+
         self.ml_available = ML_AVAILABLE
         self.sentence_model = None
+        self.embedding_model_name = (
+            embedding_service.model_name if embedding_service else "all-MiniLM-L6-v2"
+        )
+        self.embedding_service = embedding_service
+        self.embedding_store = None
         self.tfidf_vectorizer = None
         self.document_vectors = None
         self.stemmer = PorterStemmer() if ML_AVAILABLE else None
+        self._models_initialized = False
 
         # Performance tracking
         self.query_count = 0
@@ -126,50 +158,53 @@ class EnhancedQueryEngine(QueryEngine):
         self.cache_hits = 0
         self.cache_misses = 0
 
-        # Download NLTK data if available
+        # NLTK data is checked once per process; the model starts loading now
         if ML_AVAILABLE:
             self._initialize_nltk()
             self._initialize_models()
 
     def _initialize_nltk(self):
-        """Initialize NLTK data"""
+        """Initialize NLTK data (eksik paketler süreç başına bir kez indirilir)"""
         try:
-            nltk.download("punkt", quiet=True)
-            nltk.download("stopwords", quiet=True)
-            nltk.download("averaged_perceptron_tagger", quiet=True)
-            nltk.download("wordnet", quiet=True)
+            ensure_nltk_data()
         except Exception as e:
             logging.warning(f"NLTK initialization failed: {e}")
 
     def _initialize_models(self):
-        """Initialize ML models for semantic search with lazy loading"""
+        """Paylaşılan embedding servisini başlatır (model arka planda önceden yüklenir)"""
         if not self.ml_available:
             return
 
         try:
-            # Initialize models as None - they will be loaded on first use
-            self.sentence_model = None
-            self.tfidf_vectorizer = None
-            self._models_initialized = False
-            logging.info("✅ ML models configured for lazy loading")
+            if self.embedding_service is None:
+                self.embedding_service = get_embedding_service(self.embedding_model_name)
+            else:
+                self.embedding_service.start()
+            logging.info("✅ Embedding model preloading in background")
 
         except Exception as e:
             logging.error(f"❌ Model initialization failed: {e}")
             self.ml_available = False
 
     def _ensure_models_loaded(self):
-        """Ensure models are loaded (lazy loading)"""
+        """Ensure models are loaded (servis hazır olana kadar bekler)"""
         if not self.ml_available or self._models_initialized:
             return
 
         try:
-            # Load sentence transformer model (lightweight model for faster processing)
             if self.sentence_model is None:
-                self.sentence_model = SentenceTransformer("all-MiniLM-L6-v2")
-                logging.info("✅ Sentence transformer model loaded")
+                service = self.embedding_service or get_embedding_service(
+                    self.embedding_model_name
+                )
+                if not service.wait_until_ready(timeout=MODEL_LOAD_TIMEOUT_SECONDS):
+                    raise RuntimeError(service.load_error or "model load timed out")
+                # Servis SentenceTransformer.encode arayüzünü sağlar
+                self.embedding_service = service
+                self.sentence_model = service
+                logging.info("✅ Sentence transformer model ready")
 
             # Initialize TF-IDF vectorizer
-            if self.tfidf_vectorizer is None:
+            if self.tfidf_vectorizer is None and ML_AVAILABLE:
                 self.tfidf_vectorizer = TfidfVectorizer(
                     max_features=5000,
                     stop_words="english",
@@ -185,124 +220,142 @@ class EnhancedQueryEngine(QueryEngine):
             logging.error(f"❌ Model loading failed: {e}")
             self.ml_available = False
 
-    def _get_cache_key(self, query: EnhancedSearchQuery) -> str:
-        """Generate cache key for query"""
-        key_data = {
-            "text": query.text,
-            "use_semantic_search": query.use_semantic_search,
-            "semantic_similarity_threshold": query.semantic_similarity_threshold,
-            "use_ai_scoring": query.use_ai_scoring,
-            "extract_entities": query.extract_entities,
-        }
-        return hashlib.md5(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+    def _encode_texts(self, texts: List[str]):
+        """Encoder used by the embedding store"""
+        return self.sentence_model.encode(texts, convert_to_numpy=True)
 
-    def _clean_cache(self):
-        """Clean cache if it gets too large"""
-        global _SEMANTIC_CACHE, _SCORING_CACHE
+    def _get_embedding_store(self) -> Optional[EmbeddingStore]:
+        """Embedding deposunu döndürür (model yüklendikten sonra)"""
+        self._ensure_models_loaded()
+        if not self.ml_available or self.sentence_model is None:
+            return None
 
-        if len(_SEMANTIC_CACHE) > _CACHE_MAX_SIZE:
-            # Remove oldest entries
-            _SEMANTIC_CACHE = dict(
-                list(_SEMANTIC_CACHE.items())[-_CACHE_MAX_SIZE // 2 :]
+        if self.embedding_store is None:
+            self.embedding_store = EmbeddingStore(
+                self.db_manager, self._encode_texts, model_name=self.embedding_model_name
             )
+        return self.embedding_store
+
+    def index_embeddings(self) -> int:
+        """Yeni veya değişmiş dosyaların embedding'lerini indeksleme anında hesaplar"""
+        try:
+            store = self._get_embedding_store()
+            if store is None:
+                return 0
+            embedded = store.index_pending()
+            store.prune()
+            return embedded
+        except Exception as e:
+            logging.error(f"❌ Embedding indexing failed: {e}")
+            return 0
 
-        if len(_SCORING_CACHE) > _CACHE_MAX_SIZE:
-            _SCORING_CACHE = dict(list(_SCORING_CACHE.items())[-_CACHE_MAX_SIZE // 2 :])
+    def _index_generation(self) -> int:
+        """Veritabanı indeks generation'ı (yeniden indekslemede değişir)"""
+        get_generation = getattr(self.db_manager, "get_index_generation", None)
+        return get_generation() if get_generation else 0
+
+    def _get_cache_key(self, query: SearchQuery, index_generation: int) -> str:
+        """Generate cache key from every query field plus the index generation"""
+        key_data = {
+            "query_type": type(query).__name__,
+            "query": asdict(query),
+            "index_generation": index_generation,
+            "ml_available": self.ml_available,
+            "model": self.embedding_model_name,
+        }
+        return hashlib.sha256(
+            json.dumps(key_data, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    @staticmethod
+    def _freeze_page(page: SearchPage) -> SearchPage:
+        """Önbelleğe konan kopya (çağıranın nesneleriyle paylaşılmaz)"""
+        return SearchPage(
+            results=tuple(copy.deepcopy(result) for result in page.results),
+            next_cursor=page.next_cursor,
+            has_more=page.has_more,
+            scanned=page.scanned,
+        )
+
+    @staticmethod
+    def _thaw_page(page: SearchPage) -> SearchPage:
+        """Önbellekteki sayfanın cache_hit işaretli kopyası"""
+        results = []
+        for cached in page.results:
+            result = copy.deepcopy(cached)
+            result.cache_hit = True
+            results.append(result)
+        return SearchPage(
+            results=results,
+            next_cursor=page.next_cursor,
+            has_more=page.has_more,
+            scanned=page.scanned,
+        )
 
     def search(self, query: EnhancedSearchQuery) -> List[EnhancedSearchResult]:
         """Gelişmiş arama işlemi - Performance optimized"""
+        return self.search_page(query).results
+
+    def search_page(self, query: SearchQuery) -> SearchPage:
+        """Keyset sayfalamalı gelişmiş arama
 
+        Cursor temel relevance skoruna göre ilerler; semantic/AI skorlaması
+        yalnızca sayfa içindeki sırayı değiştirir, böylece sayfalar çakışmaz
+        ve arada sonuç atlanmaz. Sayfalar sorgunun tüm alanları ve indeks
+        generation'ı ile anahtarlanarak önbelleğe alınır.
+        """
         start_time = time.time()
         self.query_count += 1
 
         # Check cache first
-        cache_key = self._get_cache_key(query) if query.use_caching else None
-        if cache_key and cache_key in _SEMANTIC_CACHE:
-            cached_results = _SEMANTIC_CACHE[cache_key]
-            for result in cached_results:
-                result.cache_hit = True
-            self.cache_hits += 1
-            return cached_results
-
-        # Basic search first
-        basic_results = super().search(query)
-
-        # Convert to enhanced results
-        enhanced_results = [
-            self._convert_to_enhanced_result(result) for result in basic_results
-        ]
-
-        if not self.ml_available or not query.use_semantic_search:
-            processing_time = time.time() - start_time
-            self.total_query_time += processing_time
-            for result in enhanced_results:
-                result.processing_time = processing_time
-            return enhanced_results
-
-        # Apply semantic search enhancements
-        try:
-            if query.parallel_processing and len(enhanced_results) > 10:
-                enhanced_results = self._parallel_enhance_results(
-                    enhanced_results, query
-                )
-            else:
-                enhanced_results = self._sequential_enhance_results(
-                    enhanced_results, query
-                )
-
-        except Exception as e:
-            logging.error(f"❌ Enhanced search failed: {e}")
-            # Fall back to basic results
+        cache_key = None
+        if query.use_caching:
+            cache_generation = self.result_cache.generation
+            cache_key = self._get_cache_key(query, self._index_generation())
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                self.cache_hits += 1
+                return self._thaw_page(cached)
+            self.cache_misses += 1
 
-        # Sort by enhanced relevance
-        enhanced_results = self._sort_enhanced_results(enhanced_results, query)
+        page = self._fetch_page(query)
+        results = [self._convert_to_enhanced_result(result) for result in page.results]
 
-        # Cache results
-        if query.use_caching and cache_key:
-            _SEMANTIC_CACHE[cache_key] = enhanced_results[: query.limit]
-            self._clean_cache()
-            self.cache_misses += 1
+        if (
+            self.ml_available
+            and getattr(query, "use_semantic_search", False)
+            and results
+        ):
+            try:
+                # Semantic skorlar tek toplu çağrıyla, AI skorları dizi olarak hesaplanır
+                results = self._sequential_enhance_results(results, query)
+            except Exception as e:
+                logging.error(f"❌ Enhanced search failed: {e}")
+                # Fall back to basic results
+            results = self._sort_enhanced_results(results, query)
 
-        # Update performance metrics
         processing_time = time.time() - start_time
         self.total_query_time += processing_time
-        for result in enhanced_results:
+        for result in results:
             result.processing_time = processing_time
 
-        return enhanced_results[: query.limit]
+        page.results = results
 
-    def _parallel_enhance_results(
-        self, results: List[EnhancedSearchResult], query: EnhancedSearchQuery
-    ) -> List[EnhancedSearchResult]:
-        """Parallel processing for large result sets"""
-
-        def process_result(result):
-            result = self._apply_semantic_search_single(result, query)
-            result = self._apply_ai_scoring_single(result, query)
-            result = self._extract_contextual_information_single(result, query)
-            return result
-
-        with ThreadPoolExecutor(max_workers=query.max_workers) as executor:
-            future_to_result = {
-                executor.submit(process_result, result): result for result in results
-            }
-
-            enhanced_results = []
-            for future in as_completed(future_to_result):
-                try:
-                    enhanced_result = future.result()
-                    enhanced_results.append(enhanced_result)
-                except Exception as e:
-                    logging.error(f"Parallel processing error: {e}")
-                    # Add original result if enhancement fails
-                    enhanced_results.append(future_to_result[future])
-
-        return enhanced_results
+        # Cache results (skipped if the cache was cleared meanwhile)
+        if cache_key:
+            self.result_cache.put(
+                cache_key,
+                self._freeze_page(page),
+                generation=cache_generation,
+                weight=max(1, len(results)),
+            )
+
+        return page
 
     def _sequential_enhance_results(
         self, results: List[EnhancedSearchResult], query: EnhancedSearchQuery
     ) -> List[EnhancedSearchResult]:
-        """Sequential processing for smaller result sets"""
+        """Semantic, AI scoring and context passes over the whole result list"""
 
         results = self._apply_semantic_search(results, query)
         results = self._apply_ai_scoring(results, query)
@@ -310,48 +363,6 @@ class EnhancedQueryEngine(QueryEngine):
 
         return results
 
-    @lru_cache(maxsize=256)
-    def _calculate_content_quality_cached(
-        self, content_hash: str, content: str
-    ) -> float:
-        """Cached content quality calculation"""
-        return self._calculate_content_quality_impl(content)
-
-    def _calculate_content_quality_impl(self, content: str) -> float:
-        """Implementation of content quality calculation"""
-
-        score = 0.0
-
-        # Word count factor
-        word_count = len(content.split())
-        if word_count > 50:
-            score += 0.3
-        if word_count > 200:
-            score += 0.2
-
-        # Structure indicators
-        if any(
-            indicator in content.lower() for indicator in ["#", "##", "###", "####"]
-        ):
-            score += 0.2  # Has headings
-
-        if any(indicator in content for indicator in ["```", "`", "code"]):
-            score += 0.1  # Has code examples
-
-        if any(indicator in content for indicator in ["http", "https", "[", "]"]):
-            score += 0.1  # Has links or references
-
-        # Language quality (simple heuristic)
-        sentences = content.split(".")
-        if len(sentences) > 3:
-            avg_sentence_length = sum(len(s.split()) for s in sentences) / len(
-                sentences
-            )
-            if 10 <= avg_sentence_length <= 25:  # Good sentence length
-                score += 0.1
-
-        return min(score, 1.0)
-
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get performance statistics"""
 
@@ -371,15 +382,18 @@ class EnhancedQueryEngine(QueryEngine):
             "cache_hits": self.cache_hits,
             "cache_misses": self.cache_misses,
             "cache_hit_rate": cache_hit_rate,
-            "cache_size": len(_SEMANTIC_CACHE),
+            "cache_size": len(self.result_cache),
+            "result_cache": self.result_cache.get_stats(),
+            "embedding_service": (
+                self.embedding_service.get_stats() if self.embedding_service else None
+            ),
             "ml_available": self.ml_available,
         }
 
     def clear_cache(self):
         """Clear all caches"""
-        global _SEMANTIC_CACHE, _SCORING_CACHE
-        _SEMANTIC_CACHE.clear()
-        _SCORING_CACHE.clear()
+        self.result_cache.clear()
+        self.result_cache.bump_generation()
         self.cache_hits = 0
         self.cache_misses = 0
         logging.info("✅ Cache cleared")
@@ -399,6 +413,9 @@ class EnhancedQueryEngine(QueryEngine):
             content_type=result.content_type,
             line_count=result.line_count,
             word_count=result.word_count,
+            text_rank=result.text_rank,
+            content_hash=result.content_hash,
+            content=result.content,
         )
 
     def _apply_semantic_search(
@@ -411,21 +428,16 @@ class EnhancedQueryEngine(QueryEngine):
 
         try:
             # Ensure models are loaded before use
-            self._ensure_models_loaded()
-            
-            if not self._models_initialized:
+            store = self._get_embedding_store()
+
+            if store is None:
                 logging.warning("Models not available, skipping semantic search")
                 return results
 
-            # Generate query embedding
-            query_embedding = self.sentence_model.encode([query.text])
-
-            # Generate document embeddings for content previews
-            documents = [result.content_preview for result in results]
-            document_embeddings = self.sentence_model.encode(documents)
-
-            # Calculate semantic similarities
-            similarities = cosine_similarity(query_embedding, document_embeddings)[0]
+            # Only the query is embedded; document vectors come from the store
+            similarities = store.similarities(
+                query.text, [result.content_hash for result in results]
+            )
 
             # Update results with semantic scores
             for i, result in enumerate(results):
@@ -445,145 +457,27 @@ class EnhancedQueryEngine(QueryEngine):
     def _apply_ai_scoring(
         self, results: List[EnhancedSearchResult], query: EnhancedSearchQuery
     ) -> List[EnhancedSearchResult]:
-        """Apply AI-powered scoring"""
-
-        for result in results:
-            try:
-                # Content quality scoring
-                result.content_quality_score = self._calculate_content_quality(result)
-
-                # Freshness scoring
-                result.freshness_score = self._calculate_freshness_score(result)
-
-                # Popularity scoring (based on file access patterns)
-                result.popularity_score = self._calculate_popularity_score(result)
+        """Apply AI-powered scoring (vectorized over all results)"""
 
-                # Context relevance scoring
-                result.context_relevance = self._calculate_context_relevance(
-                    result, query
-                )
-
-                # Combine scores into enhanced relevance
-                ai_boost = (
-                    result.content_quality_score * 0.3
-                    + result.freshness_score * 0.2
-                    + result.popularity_score * 0.2
-                    + result.context_relevance * 0.3
-                )
+        if not results:
+            return results
 
-                result.relevance_score *= 1.0 + ai_boost
+        components = self.scorer.ai_components(
+            ResultFeatures.from_results(results), query.text
+        )
+        boosted = np.array([r.relevance_score for r in results]) * (
+            1.0 + components["boost"]
+        )
 
-            except Exception as e:
-                logging.warning(f"AI scoring failed for {result.file_name}: {e}")
+        for i, result in enumerate(results):
+            result.content_quality_score = float(components["content_quality"][i])
+            result.freshness_score = float(components["freshness"][i])
+            result.popularity_score = float(components["popularity"][i])
+            result.context_relevance = float(components["context_relevance"][i])
+            result.relevance_score = float(boosted[i])
 
         return results
 
-    def _calculate_content_quality(self, result: EnhancedSearchResult) -> float:
-        """Calculate content quality score"""
-
-        score = 0.0
-        content = result.content_preview
-
-        # Word count factor
-        if result.word_count > 50:
-            score += 0.3
-        if result.word_count > 200:
-            score += 0.2
-
-        # Structure indicators
-        if any(
-            indicator in content.lower() for indicator in ["#", "##", "###", "####"]
-        ):
-            score += 0.2  # Has headings
-
-        if any(indicator in content for indicator in ["```", "`", "code"]):
-            score += 0.1  # Has code examples
-
-        if any(indicator in content for indicator in ["http", "https", "[", "]"]):
-            score += 0.1  # Has links or references
-
-        # Language quality (simple heuristic)
-        sentences = content.split(".")
-        if len(sentences) > 3:
-            avg_sentence_length = sum(len(s.split()) for s in sentences) / len(
-                sentences
-            )
-            if 10 <= avg_sentence_length <= 25:  # Good sentence length
-                score += 0.1
-
-        return min(score, 1.0)
-
-    def _calculate_freshness_score(self, result: EnhancedSearchResult) -> float:
-        """Calculate freshness score based on modification date"""
-
-        try:
-            modified_date = datetime.fromisoformat(
-                result.modified_at.replace("Z", "+00:00")
-            )
-            days_ago = (datetime.now() - modified_date.replace(tzinfo=None)).days
-
-            # Fresher files get higher scores
-            if days_ago <= 1:
-                return 1.0
-            elif days_ago <= 7:
-                return 0.8
-            elif days_ago <= 30:
-                return 0.6
-            elif days_ago <= 90:
-                return 0.4
-            elif days_ago <= 365:
-                return 0.2
-            else:
-                return 0.1
-
-        except Exception:
-            return 0.5  # Default score if date parsing fails
-
-    def _calculate_popularity_score(self, result: EnhancedSearchResult) -> float:
-        """Calculate popularity score (placeholder for future implementation)"""
-
-        # For now, use simple heuristics
-        score = 0.0
-
-        # Common important files
-        important_keywords = ["readme", "index", "main", "config", "setup", "guide"]
-        for keyword in important_keywords:
-            if keyword in result.file_name.lower():
-                score += 0.2
-
-        # File type popularity
-        popular_extensions = {
-            ".md": 0.8,
-            ".txt": 0.6,
-            ".py": 0.7,
-            ".js": 0.6,
-            ".json": 0.5,
-        }
-        score += popular_extensions.get(result.file_extension.lower(), 0.3)
-
-        return min(score, 1.0)
-
-    def _calculate_context_relevance(
-        self, result: EnhancedSearchResult, query: EnhancedSearchQuery
-    ) -> float:
-        """Calculate contextual relevance"""
-
-        if not query.text:
-            return 0.5
-
-        # Simple TF-IDF like scoring for context
-        query_terms = set(query.text.lower().split())
-        content_terms = set(result.content_preview.lower().split())
-
-        # Jaccard similarity
-        intersection = len(query_terms.intersection(content_terms))
-        union = len(query_terms.union(content_terms))
-
-        if union == 0:
-            return 0.0
-
-        return intersection / union
-
     def _extract_contextual_information(
         self, results: List[EnhancedSearchResult], query: EnhancedSearchQuery
     ) -> List[EnhancedSearchResult]:
@@ -701,17 +595,15 @@ class EnhancedQueryEngine(QueryEngine):
         """Sort results using enhanced scoring"""
 
         if query.sort_by == "relevance":
-            # Enhanced relevance sorting
-            return sorted(
-                results,
-                key=lambda x: (
-                    x.relevance_score * 0.4
-                    + x.semantic_score * 0.3
-                    + x.content_quality_score * 0.2
-                    + x.freshness_score * 0.1
-                ),
-                reverse=True,
+            # Enhanced relevance sorting (stable: ties keep base ranking order)
+            combined = (
+                np.array([r.relevance_score for r in results]) * 0.4
+                + np.array([r.semantic_score for r in results]) * 0.3
+                + np.array([r.content_quality_score for r in results]) * 0.2
+                + np.array([r.freshness_score for r in results]) * 0.1
             )
+            order = np.argsort(-combined, kind="stable")
+            return [results[i] for i in order]
         else:
             # Use parent class sorting for other criteria
             return super()._sort_results(results, query)
@@ -6,25 +6,234 @@ Markdown dosyalarını izler ve değişiklikleri tespit eder
 
 import os
 import time
+import queue
 import logging
 import threading
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from colorama import init, Fore, Style
-from typing import Dict, List, Callable, Optional, Union
+from typing import Any, Dict, Iterable, List, Callable, Optional, Tuple, Union
+
+try:
+    from .content_indexer import ContentIndexer
+    from .database_manager import DatabaseManager, read_file_record
+except ImportError:
+    # Fallback for when running as main module
+    from content_indexer import ContentIndexer
+    from database_manager import DatabaseManager, read_file_record
 
 # Colorama initialize
 init()
 
+MONITORED_EXTENSIONS = {".md", ".markdown", ".txt"}
+
+# Worker process başına bir ContentIndexer
+_worker_indexer = None
+
+
+def _init_scan_worker():
+    """Scan worker process'ini hazırlar"""
+    global _worker_indexer
+    _worker_indexer = ContentIndexer()
+
+
+def _scan_file(
+    file_path: str, stat: Optional[os.stat_result] = None
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Worker: dosyayı okur, hash'ler ve ContentIndexer ile analiz eder"""
+    record = read_file_record(file_path, stat=stat)
+    if record is None:
+        return file_path, None
+
+    indexer = _worker_indexer or ContentIndexer()
+    search_index = indexer.create_search_index(record["file_path"], record["content"])
+    record["keywords"] = search_index["analysis"]["keywords"][:20]
+
+    return file_path, record
+
+
+class ScanPipeline:
+    """Paralel tarama hattı
+
+    Hash ve ContentIndexer analizi bir process pool'da yapılır. Sonuçlar
+    sınırlı bir kuyruk üzerinden tek bir writer thread'e aktarılır ve
+    batch'ler halinde SQLite'a yazılır. Havuzdaki bekleyen iş sayısı ve
+    kuyruk boyutu sınırlı olduğu için yavaş bir yazıcı okuyucuyu durdurur.
+
+    skip_unchanged açıkken scan manifest'teki (size, mtime_ns, inode) ile
+    aynı stat'a sahip dosyalar worker'lara hiç gönderilmez.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        max_workers: Optional[int] = None,
+        queue_size: int = 1000,
+        batch_size: int = 500,
+        progress_callback: Optional[Callable[[int, str], None]] = None,
+        skip_unchanged: bool = True,
+    ):
+        self.db_path = str(db_path)
+        self.skip_unchanged = skip_unchanged
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = self.max_workers * 4
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.progress_callback = progress_callback
+
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, file_paths: Iterable[Union[str, Path]]) -> Dict[str, Any]:
+        """Dosyaları tarar ve veritabanına yazar, özet istatistik döndürür"""
+        summary = {
+            "total_files": 0,
+            "added": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "failed": 0,
+            "bytes": 0,
+            "seconds": 0.0,
+            "files_per_second": 0.0,
+            "mb_per_second": 0.0,
+            "workers": self.max_workers,
+        }
+
+        results = queue.Queue(maxsize=self.queue_size)
+        writer = threading.Thread(
+            target=self._writer_loop, args=(results, summary), daemon=True
+        )
+
+        start_time = time.perf_counter()
+        manifest = self._load_manifest() if self.skip_unchanged else {}
+        skipped = 0
+        writer.start()
+
+        def dirty_files():
+            """Manifest'e göre değişmiş (veya yeni) dosyaları stat'larıyla üretir"""
+            nonlocal skipped
+            for file_path in file_paths:
+                file_path = str(file_path)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    stat = None
+
+                entry = manifest.get(str(Path(file_path).resolve()))
+                if stat is not None and DatabaseManager.manifest_matches(entry, stat):
+                    skipped += 1
+                    continue
+
+                yield file_path, stat
+
+        try:
+            if self.max_workers <= 1:
+                _init_scan_worker()
+                for file_path, stat in dirty_files():
+                    results.put(_scan_file(file_path, stat))
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=self.max_workers, initializer=_init_scan_worker
+                ) as executor:
+                    pending = set()
+                    for file_path, stat in dirty_files():
+                        if len(pending) >= self.max_pending:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            self._forward_results(done, results)
+                        pending.add(executor.submit(_scan_file, file_path, stat))
+
+                    done, _ = wait(pending)
+                    self._forward_results(done, results)
+        finally:
+            results.put(None)
+            writer.join()
+
+        summary["total_files"] += skipped
+        summary["unchanged"] += skipped
+
+        summary["seconds"] = time.perf_counter() - start_time
+        if summary["seconds"] > 0:
+            summary["files_per_second"] = summary["total_files"] / summary["seconds"]
+            summary["mb_per_second"] = (
+                summary["bytes"] / (1024 * 1024) / summary["seconds"]
+            )
+
+        return summary
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Scan manifest'ini ayrı bir bağlantı ile okur"""
+        db_manager = DatabaseManager(self.db_path)
+        if not db_manager.connect():
+            return {}
+
+        try:
+            return db_manager.get_scan_manifest()
+        finally:
+            db_manager.disconnect()
+
+    def _forward_results(self, futures, results: queue.Queue):
+        """Tamamlanan worker sonuçlarını writer kuyruğuna aktarır"""
+        for future in futures:
+            try:
+                results.put(future.result())
+            except Exception as e:
+                self.logger.error(f"Scan worker failed: {e}")
+                results.put(("", None))
+
+    def _writer_loop(self, results: queue.Queue, summary: Dict[str, Any]):
+        """Tek writer thread - sonuçları batch'ler halinde SQLite'a yazar"""
+        db_manager = DatabaseManager(self.db_path)
+        if not db_manager.initialize_database():
+            # Kuyruğu boşalt ki üretici bloklanmasın
+            while results.get() is not None:
+                summary["total_files"] += 1
+                summary["failed"] += 1
+            return
+
+        batch = []
+        processed = 0
+
+        def flush():
+            if not batch:
+                return
+            stats = db_manager.write_file_records(batch)
+            for key in ("added", "updated", "unchanged", "failed", "bytes"):
+                summary[key] += stats[key]
+            batch.clear()
+
+        try:
+            while True:
+                item = results.get()
+                if item is None:
+                    break
+
+                file_path, record = item
+                processed += 1
+                summary["total_files"] += 1
+
+                if record is None:
+                    summary["failed"] += 1
+                else:
+                    batch.append(record)
+                    if len(batch) >= self.batch_size:
+                        flush()
+
+                if self.progress_callback:
+                    self.progress_callback(processed, file_path)
+
+            flush()
+        finally:
+            db_manager.disconnect()
+
 
 class FileChangeHandler(FileSystemEventHandler):
     """Dosya değişikliklerini handle eden sınıf"""
 
     def __init__(self, callback: Optional[Callable] = None):
         self.callback = callback
-        self.file_extensions = {".md", ".markdown", ".txt"}
+        self.file_extensions = MONITORED_EXTENSIONS
         self.ignored_paths = {"__pycache__", ".git", ".vscode", "node_modules"}
 
     def _should_process(self, file_path: str) -> bool:
@@ -88,13 +297,30 @@ class FileChangeHandler(FileSystemEventHandler):
 class DataFolderMonitor:
     """Data klasörü monitoring sistemi"""
 
-    def __init__(self, data_path: str = "./data", callback: Optional[Callable] = None):
+    def __init__(
+        self,
+        data_path: str = "./data",
+        callback: Optional[Callable] = None,
+        database_manager: Optional[DatabaseManager] = None,
+        scan_workers: Optional[int] = None,
+    ):
         self.data_path = Path(data_path).resolve()
         self.callback = callback
         self.observer = None
         self.is_running = False
         self.file_stats = {}
 
+        # İlk tarama / yeniden indeksleme (database_manager verilirse)
+        self.database_manager = database_manager
+        self.scan_workers = scan_workers
+        self._scan_thread = None
+        self._indexing = False
+        self._progress = 0
+        self._current_file = None
+        self._processed_files = 0
+        self._total_files = 0
+        self.last_scan_summary = None
+
         # Logging setup
         logging.basicConfig(
             level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -138,22 +364,144 @@ class DataFolderMonitor:
             print(f"{Fore.YELLOW}⏹️  File monitoring stopped{Style.RESET_ALL}")
 
     def _initial_scan(self):
-        """İlk tarama - mevcut dosyaları tespit eder"""
+        """İlk tarama - mevcut dosyaları tespit eder ve indeksler"""
         print(f"{Fore.CYAN}🔍 Performing initial scan...{Style.RESET_ALL}")
 
-        file_count = 0
-        for root, dirs, files in os.walk(self.data_path):
+        file_paths = self._collect_files(self.data_path)
+
+        print(f"{Fore.GREEN}📊 Found {len(file_paths)} markdown files{Style.RESET_ALL}")
+
+        # İndeksleme arka planda; start_monitoring soğuk indekste bloklanmaz
+        if self.database_manager is not None and not self._indexing:
+            self._index_in_background(lambda: file_paths)
+
+    def _collect_files(self, root_path: Path) -> List[str]:
+        """İzlenen uzantılı dosyaları bulur ve file_stats'ı doldurur"""
+        file_paths = []
+        for root, dirs, files in os.walk(root_path):
             for file in files:
                 file_path = Path(root) / file
-                if file_path.suffix.lower() in {".md", ".markdown", ".txt"}:
-                    file_count += 1
+                if file_path.suffix.lower() in MONITORED_EXTENSIONS:
+                    try:
+                        stat = file_path.stat()
+                    except OSError:
+                        continue
+
+                    file_paths.append(str(file_path))
                     self.file_stats[str(file_path)] = {
-                        "size": file_path.stat().st_size,
-                        "modified": datetime.fromtimestamp(file_path.stat().st_mtime),
-                        "created": datetime.fromtimestamp(file_path.stat().st_ctime),
+                        "size": stat.st_size,
+                        "modified": datetime.fromtimestamp(stat.st_mtime),
+                        "created": datetime.fromtimestamp(stat.st_ctime),
                     }
 
-        print(f"{Fore.GREEN}📊 Found {file_count} markdown files{Style.RESET_ALL}")
+        return file_paths
+
+    def scan_directory(self, path: Optional[str] = None, background: bool = True):
+        """Dizini tarar ve paralel pipeline ile indeksler"""
+        if self.database_manager is None:
+            self.logger.warning("scan_directory requires a database_manager")
+            return None
+
+        if self._indexing:
+            print(f"{Fore.YELLOW}⚠️  Indexing already in progress{Style.RESET_ALL}")
+            return None
+
+        root_path = Path(path).resolve() if path else self.data_path
+
+        if not background:
+            return self._index_files(self._collect_files(root_path))
+
+        self._index_in_background(lambda: self._collect_files(root_path))
+        return None
+
+    def _index_in_background(self, get_file_paths: Callable[[], List[str]]):
+        """Dosyaları toplayıp _index_files ile arka plan thread'inde indeksler"""
+
+        def run_scan():
+            try:
+                self._index_files(get_file_paths())
+            except Exception as e:
+                self._indexing = False
+                self.logger.error(f"Background indexing failed: {e}")
+
+        self._indexing = True
+        self._scan_thread = threading.Thread(
+            target=run_scan, name="file-monitor-index", daemon=True
+        )
+        self._scan_thread.start()
+
+    def rescan(self, since: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Ağacı gezer, yalnızca değişen (dirty) dosyaları indeksler
+
+        Değişiklik tespiti scan manifest (size, mtime_ns, inode) ile yapılır;
+        since verilirse bu zamandan önce değiştirilmiş dosyalara hiç bakılmaz.
+        Diskten silinmiş dosyalar veritabanından kaldırılır.
+        """
+        if self.database_manager is None:
+            self.logger.warning("rescan requires a database_manager")
+            return None
+
+        file_paths = self._collect_files(self.data_path)
+        on_disk = {str(Path(file_path).resolve()) for file_path in file_paths}
+
+        # Silinen dosyalar
+        root_prefix = str(self.data_path) + os.sep
+        removed = 0
+        manifest = self.database_manager.get_scan_manifest()
+        for indexed_path in manifest:
+            if indexed_path.startswith(root_prefix) and indexed_path not in on_disk:
+                if self.database_manager.remove_file(indexed_path):
+                    removed += 1
+
+        # Aktif manifest'te olmayan (yeni veya geri gelen) dosyalar since'ten
+        # bağımsız olarak indekslenir
+        if since is not None:
+            file_paths = [
+                file_path
+                for file_path in file_paths
+                if self.file_stats[file_path]["modified"] >= since
+                or str(Path(file_path).resolve()) not in manifest
+            ]
+
+        summary = self._index_files(file_paths)
+        summary["removed"] = removed
+        return summary
+
+    def _index_files(self, file_paths: List[str]) -> Dict[str, Any]:
+        """Dosyaları ScanPipeline ile indeksler, ilerleme durumunu günceller"""
+        self._indexing = True
+        self._progress = 0
+        self._processed_files = 0
+        self._total_files = len(file_paths)
+
+        def on_progress(processed: int, file_path: str):
+            self._processed_files = processed
+            self._current_file = file_path
+            if self._total_files:
+                self._progress = int(processed * 100 / self._total_files)
+
+        try:
+            pipeline = ScanPipeline(
+                self.database_manager.db_path,
+                max_workers=self.scan_workers,
+                progress_callback=on_progress,
+            )
+            summary = pipeline.run(file_paths)
+            self.last_scan_summary = summary
+
+            print(
+                f"{Fore.GREEN}✅ Indexed {summary['total_files']} files "
+                f"({summary['added']} added, {summary['updated']} updated, "
+                f"{summary['unchanged']} unchanged, {summary['failed']} failed) "
+                f"in {summary['seconds']:.2f}s with {summary['workers']} workers "
+                f"({summary['files_per_second']:.0f} files/s){Style.RESET_ALL}"
+            )
+            return summary
+
+        finally:
+            self._indexing = False
+            self._progress = 100
+            self._current_file = None
 
     def _on_file_change(
         self, event_type: str, src_path: str, dest_path: Optional[str] = None
@@ -1,15 +1,17 @@
 #!/usr/bin/env python3
 """
-JSON Chat Manager - Konuşma JSON Depolama Sistemi
-Collective Memory için JSON tabanlı konuşma saklama ve yönetim modülü
+JSON Chat Manager - Konuşma Depolama Sistemi
+Collective Memory için SQLite tabanlı konuşma saklama ve yönetim modülü
+(eski daily/ JSON dosyaları ilk açılışta içe aktarılır)
 """
 
 import json
 import os
-import hashlib
+import re
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Iterable
 from dataclasses import dataclass, asdict
 from collections import defaultdict
 import uuid
@@ -62,19 +64,103 @@ class ChatConversation:
 
 
 class JSONChatManager:
-    """JSON tabanlı konuşma yönetim sistemi"""
-
-    def __init__(self, data_folder: str = None):
+    """
+    Konuşma yönetim sistemi (SQLite backend)
+
+    - conversations / messages tabloları, mesaj ekleme append-only (O(1) I/O)
+    - messages_fts (FTS5) ile mesaj içeriğinde arama
+    - project_path ve conversation_tags üzerinde index'li filtreler
+    - Eski JSON dosya ağacı (daily/) için import_json_tree()
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS conversations (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            project_path TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            message_count INTEGER NOT NULL DEFAULT 0,
+            metadata TEXT
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_conversations_project
+            ON conversations(project_path, updated_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_conversations_updated
+            ON conversations(updated_at DESC);
+
+        CREATE TABLE IF NOT EXISTS messages (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            conversation_id TEXT NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+            role TEXT NOT NULL,
+            content TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            metadata TEXT
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_messages_conversation
+            ON messages(conversation_id, seq);
+
+        CREATE TABLE IF NOT EXISTS conversation_tags (
+            conversation_id TEXT NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (conversation_id, tag)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS idx_conversation_tags_tag
+            ON conversation_tags(tag, conversation_id);
+
+        CREATE TABLE IF NOT EXISTS chat_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    # External content FTS5 tablosu; messages'a trigger'larla bağlı
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+            content, content='messages', content_rowid='seq'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages
+        BEGIN
+            INSERT INTO messages_fts (rowid, content) VALUES (new.seq, new.content);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages
+        BEGIN
+            INSERT INTO messages_fts (messages_fts, rowid, content)
+            VALUES ('delete', old.seq, old.content);
+        END;
+    """
+
+    def __init__(self, data_folder: str = None, db_path: str = None):
         self.data_folder = Path(data_folder) if data_folder else Path.cwd()
         self.collective_memory_dir = self.data_folder / ".collective-memory"
         self.conversations_dir = self.collective_memory_dir / "conversations"
-        self.index_file = self.conversations_dir / "index.json"
+        self.db_path = (
+            Path(db_path) if db_path else self.conversations_dir / "conversations.db"
+        )
 
         # Directory structure oluştur
         self._ensure_directories()
 
-        # Index dosyası yükle
-        self.conversation_index = self._load_index()
+        # SQLite bağlantısı (Flask thread'leri arasında kilit ile paylaşılır)
+        self._lock = threading.RLock()
+        self.fts_enabled = False
+        self.connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self._initialize_database()
+
+        # Eski JSON ağacını bir kez içe aktar
+        if self._get_meta("json_tree_imported") is None:
+            imported = self.import_json_tree()
+            self._set_meta("json_tree_imported", datetime.now(timezone.utc).isoformat())
+            if imported:
+                print(
+                    f"{Fore.CYAN}[*] {imported} JSON konuşması SQLite'a aktarıldı{Style.RESET_ALL}"
+                )
 
         print(
             f"{Fore.GREEN}[+] JSON Chat Manager initialized: {self.conversations_dir}{Style.RESET_ALL}"
@@ -93,41 +179,51 @@ class JSONChatManager:
         for directory in directories:
             directory.mkdir(parents=True, exist_ok=True)
 
-    def _load_index(self) -> Dict[str, Any]:
-        """Konuşma index'ini yükle"""
-        if self.index_file.exists():
+    def _initialize_database(self):
+        """Tabloları, index'leri ve FTS5 indeksini oluştur"""
+        with self._lock:
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+            self.connection.execute("PRAGMA foreign_keys = ON")
+            self.connection.executescript(self.SCHEMA)
+
             try:
-                with open(self.index_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
+                self.connection.executescript(self.FTS_SCHEMA)
+                self.fts_enabled = True
+            except sqlite3.OperationalError as e:
+                # SQLite FTS5 desteği olmadan derlenmiş - LIKE aramasına geri dön
                 print(
-                    f"{Fore.YELLOW}⚠️  Index dosyası yüklenemedi: {e}{Style.RESET_ALL}"
+                    f"{Fore.YELLOW}⚠️  FTS5 not available, using LIKE search: {e}{Style.RESET_ALL}"
                 )
 
-        # Varsayılan index
-        return {
-            "version": "1.0.0",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "total_conversations": 0,
-            "conversations": {},
-            "projects": {},
-            "tags": {},
-            "daily_stats": {},
-        }
+            self.connection.commit()
 
-    def _save_index(self):
-        """Index dosyasını kaydet"""
-        try:
-            self.conversation_index["updated_at"] = datetime.now(
-                timezone.utc
-            ).isoformat()
-            with open(self.index_file, "w", encoding="utf-8") as f:
-                json.dump(self.conversation_index, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"{Fore.RED}❌ Index kaydedilemedi: {e}{Style.RESET_ALL}")
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT value FROM chat_meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO chat_meta (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+            self.connection.commit()
+
+    def close(self):
+        """Veritabanı bağlantısını kapat"""
+        with self._lock:
+            self.connection.close()
 
     def create_conversation(
-        self, title: str, project_path: str = None, initial_message: str = None
+        self,
+        title: str,
+        project_path: str = None,
+        initial_message: str = None,
+        tags: List[str] = None,
     ) -> str:
         """Yeni konuşma oluştur"""
         conversation_id = str(uuid.uuid4())
@@ -152,13 +248,13 @@ class JSONChatManager:
             created_at=now,
             updated_at=now,
             messages=messages,
+            tags=list(tags or []),
         )
 
-        # Dosyaya kaydet
-        self._save_conversation(conversation)
-
-        # Index'i güncelle
-        self._update_index_for_conversation(conversation)
+        # Veritabanına kaydet
+        with self._lock:
+            self._save_conversation(conversation)
+            self.connection.commit()
 
         print(
             f"{Fore.GREEN}✅ Yeni konuşma oluşturuldu: {title} ({conversation_id}){Style.RESET_ALL}"
@@ -172,53 +268,94 @@ class JSONChatManager:
         content: str,
         metadata: Dict[str, Any] = None,
     ) -> str:
-        """Konuşmaya mesaj ekle"""
-        conversation = self.load_conversation(conversation_id)
-        if not conversation:
-            raise ValueError(f"Konuşma bulunamadı: {conversation_id}")
-
-        message_id = str(uuid.uuid4())
+        """Konuşmaya mesaj ekle (tek INSERT + sayaç güncellemesi)"""
         message = ChatMessage(
-            id=message_id,
+            id=str(uuid.uuid4()),
             role=role,
             content=content,
             timestamp=datetime.now(timezone.utc).isoformat(),
             metadata=metadata or {},
         )
 
-        conversation.messages.append(message)
-        conversation.updated_at = message.timestamp
+        with self._lock:
+            cursor = self.connection.execute(
+                """
+                UPDATE conversations
+                SET updated_at = ?, message_count = message_count + 1
+                WHERE id = ?
+            """,
+                (message.timestamp, conversation_id),
+            )
+            if cursor.rowcount == 0:
+                self.connection.rollback()
+                raise ValueError(f"Konuşma bulunamadı: {conversation_id}")
+
+            self._insert_messages(conversation_id, [message])
+            self.connection.commit()
 
-        # Kaydet
-        self._save_conversation(conversation)
-        self._update_index_for_conversation(conversation)
+        return message.id
 
-        return message_id
+    def add_tags(self, conversation_id: str, tags: Iterable[str]):
+        """Konuşmaya etiket ekle"""
+        with self._lock:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO conversation_tags (conversation_id, tag) VALUES (?, ?)",
+                [(conversation_id, tag) for tag in tags],
+            )
+            self.connection.commit()
 
     def load_conversation(self, conversation_id: str) -> Optional[ChatConversation]:
         """Konuşmayı yükle"""
-        if conversation_id not in self.conversation_index["conversations"]:
-            return None
-
-        file_path = self._get_conversation_file_path(conversation_id)
-        if not file_path.exists():
-            return None
-
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            # Messages'i ChatMessage objelerine dönüştür
-            messages = [ChatMessage(**msg) for msg in data["messages"]]
-            data["messages"] = messages
-
-            return ChatConversation(**data)
+            with self._lock:
+                row = self.connection.execute(
+                    "SELECT * FROM conversations WHERE id = ?", (conversation_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                message_rows = self.connection.execute(
+                    """
+                    SELECT id, role, content, timestamp, metadata FROM messages
+                    WHERE conversation_id = ? ORDER BY seq
+                """,
+                    (conversation_id,),
+                ).fetchall()
+                tags = self._get_tags([conversation_id]).get(conversation_id, [])
+
+            messages = [
+                ChatMessage(
+                    id=m["id"],
+                    role=m["role"],
+                    content=m["content"],
+                    timestamp=m["timestamp"],
+                    metadata=json.loads(m["metadata"]) if m["metadata"] else {},
+                )
+                for m in message_rows
+            ]
+
+            return ChatConversation(
+                id=row["id"],
+                title=row["title"],
+                project_path=row["project_path"],
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
+                messages=messages,
+                tags=tags,
+                metadata=json.loads(row["metadata"]) if row["metadata"] else {},
+            )
         except Exception as e:
             print(
                 f"{Fore.RED}❌ Konuşma yüklenemedi {conversation_id}: {e}{Style.RESET_ALL}"
             )
             return None
 
+    @staticmethod
+    def _build_fts_query(query: str) -> str:
+        """Serbest metinden güvenli FTS5 MATCH ifadesi (prefix terimler, AND)"""
+        words = re.findall(r"\w+", query.lower())
+        return " AND ".join('"' + word + '"*' for word in words)
+
     def search_conversations(
         self,
         query: str = None,
@@ -226,51 +363,65 @@ class JSONChatManager:
         tags: List[str] = None,
         limit: int = 50,
     ) -> List[Dict[str, Any]]:
-        """Konuşmalarda arama yap"""
-        results = []
-
-        for conv_id, conv_info in self.conversation_index["conversations"].items():
-            # Project filter
-            if project_path and conv_info.get("project_path") != project_path:
-                continue
-
-            # Tags filter
-            if tags and not any(tag in conv_info.get("tags", []) for tag in tags):
-                continue
-
-            # Text search
-            if query:
-                query_lower = query.lower()
-                title_match = query_lower in conv_info.get("title", "").lower()
-
-                # Load conversation for content search
-                conversation = self.load_conversation(conv_id)
-                content_match = False
-                if conversation:
-                    content_match = any(
-                        query_lower in msg.content.lower()
-                        for msg in conversation.messages
-                    )
-
-                if not (title_match or content_match):
-                    continue
-
-            results.append(
-                {
-                    "id": conv_id,
-                    "title": conv_info.get("title"),
-                    "project_path": conv_info.get("project_path"),
-                    "created_at": conv_info.get("created_at"),
-                    "updated_at": conv_info.get("updated_at"),
-                    "message_count": conv_info.get("message_count", 0),
-                    "tags": conv_info.get("tags", []),
-                }
-            )
+        """Konuşmalarda arama yap (başlık LIKE + mesaj içeriği FTS5)"""
+        sql = "SELECT c.* FROM conversations c WHERE 1 = 1"
+        params: List[Any] = []
+
+        # Project filter
+        if project_path:
+            sql += " AND c.project_path = ?"
+            params.append(project_path)
+
+        # Tags filter
+        if tags:
+            placeholders = ",".join("?" * len(tags))
+            sql += f"""
+                AND c.id IN (
+                    SELECT conversation_id FROM conversation_tags
+                    WHERE tag IN ({placeholders})
+                )"""
+            params.extend(tags)
+
+        # Text search
+        if query:
+            like = f"%{query}%"
+            fts_query = self._build_fts_query(query) if self.fts_enabled else ""
+            if fts_query:
+                content_filter = """
+                    c.id IN (
+                        SELECT m.conversation_id FROM messages_fts
+                        JOIN messages m ON m.seq = messages_fts.rowid
+                        WHERE messages_fts MATCH ?
+                    )"""
+                content_param = fts_query
+            else:
+                content_filter = """
+                    c.id IN (SELECT conversation_id FROM messages WHERE content LIKE ?)"""
+                content_param = like
+
+            sql += f" AND (c.title LIKE ? OR {content_filter})"
+            params.extend([like, content_param])
 
         # Sort by updated_at (newest first)
-        results.sort(key=lambda x: x["updated_at"], reverse=True)
-
-        return results[:limit]
+        sql += " ORDER BY c.updated_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self.connection.execute(sql, params).fetchall()
+            tag_map = self._get_tags([row["id"] for row in rows])
+
+        return [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "project_path": row["project_path"],
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+                "message_count": row["message_count"],
+                "tags": tag_map.get(row["id"], []),
+            }
+            for row in rows
+        ]
 
     def export_conversation(
         self, conversation_id: str, format: str = "json"
@@ -306,34 +457,38 @@ class JSONChatManager:
 
     def get_conversation_stats(self) -> Dict[str, Any]:
         """Konuşma istatistikleri"""
-        total_conversations = len(self.conversation_index["conversations"])
-        total_messages = sum(
-            conv.get("message_count", 0)
-            for conv in self.conversation_index["conversations"].values()
-        )
+        with self._lock:
+            totals = self.connection.execute(
+                """
+                SELECT COUNT(*) AS total_conversations,
+                       COALESCE(SUM(message_count), 0) AS total_messages,
+                       MAX(updated_at) AS last_activity
+                FROM conversations
+            """
+            ).fetchone()
+            project_rows = self.connection.execute(
+                "SELECT project_path, COUNT(*) AS n FROM conversations GROUP BY project_path"
+            ).fetchall()
+            tag_rows = self.connection.execute(
+                "SELECT tag, COUNT(*) AS n FROM conversation_tags GROUP BY tag"
+            ).fetchall()
 
         # Project statistics
         project_stats = defaultdict(int)
-        for conv in self.conversation_index["conversations"].values():
-            project_path = conv.get("project_path", "unknown")
+        for row in project_rows:
+            project_path = row["project_path"] or "unknown"
             project_name = (
                 Path(project_path).name if project_path != "unknown" else "unknown"
             )
-            project_stats[project_name] += 1
-
-        # Tag statistics
-        tag_stats = defaultdict(int)
-        for conv in self.conversation_index["conversations"].values():
-            for tag in conv.get("tags", []):
-                tag_stats[tag] += 1
+            project_stats[project_name] += row["n"]
 
         return {
-            "total_conversations": total_conversations,
-            "total_messages": total_messages,
+            "total_conversations": totals["total_conversations"],
+            "total_messages": totals["total_messages"],
             "projects": dict(project_stats),
-            "tags": dict(tag_stats),
+            "tags": {row["tag"]: row["n"] for row in tag_rows},
             "storage_size": self._calculate_storage_size(),
-            "last_activity": self._get_last_activity(),
+            "last_activity": totals["last_activity"],
         }
 
     def import_from_cursor(self, cursor_reader) -> int:
@@ -366,60 +521,120 @@ class JSONChatManager:
         return imported_count
 
     def _save_conversation(self, conversation: ChatConversation):
-        """Konuşmayı dosyaya kaydet"""
-        file_path = self._get_conversation_file_path(conversation.id)
-
-        # Messages'i dict'e dönüştür
-        conversation_dict = asdict(conversation)
-
-        try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(conversation_dict, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"{Fore.RED}❌ Konuşma kaydedilemedi: {e}{Style.RESET_ALL}")
-
-    def _get_conversation_file_path(self, conversation_id: str) -> Path:
-        """Konuşma dosya yolunu al"""
-        # Daily organization
-        today = datetime.now().strftime("%Y-%m-%d")
-        daily_dir = self.conversations_dir / "daily" / today
-        daily_dir.mkdir(parents=True, exist_ok=True)
-
-        return daily_dir / f"{conversation_id}.json"
-
-    def _update_index_for_conversation(self, conversation: ChatConversation):
-        """Index'i konuşma için güncelle"""
-        self.conversation_index["conversations"][conversation.id] = {
-            "title": conversation.title,
-            "project_path": conversation.project_path,
-            "created_at": conversation.created_at,
-            "updated_at": conversation.updated_at,
-            "message_count": len(conversation.messages),
-            "tags": conversation.tags,
-            "file_path": str(self._get_conversation_file_path(conversation.id)),
-        }
-
-        # Project index
-        project_name = Path(conversation.project_path).name
-        if project_name not in self.conversation_index["projects"]:
-            self.conversation_index["projects"][project_name] = []
-
-        if conversation.id not in self.conversation_index["projects"][project_name]:
-            self.conversation_index["projects"][project_name].append(conversation.id)
+        """Konuşma başlığını, etiketlerini ve mesajlarını yaz (commit çağırana ait)"""
+        self.connection.execute(
+            """
+            INSERT INTO conversations (
+                id, title, project_path, created_at, updated_at, message_count, metadata
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                title = excluded.title,
+                project_path = excluded.project_path,
+                updated_at = MAX(updated_at, excluded.updated_at),
+                metadata = excluded.metadata
+        """,
+            (
+                conversation.id,
+                conversation.title,
+                conversation.project_path,
+                conversation.created_at,
+                conversation.updated_at,
+                len(conversation.messages),
+                json.dumps(conversation.metadata, ensure_ascii=False)
+                if conversation.metadata
+                else None,
+            ),
+        )
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO conversation_tags (conversation_id, tag) VALUES (?, ?)",
+            [(conversation.id, tag) for tag in conversation.tags],
+        )
+        self._insert_messages(conversation.id, conversation.messages)
+
+    def _insert_messages(self, conversation_id: str, messages: List[ChatMessage]):
+        """Mesajları append-only ekle (aynı id'li mesaj tekrar eklenmez)"""
+        self.connection.executemany(
+            """
+            INSERT OR IGNORE INTO messages (
+                id, conversation_id, role, content, timestamp, metadata
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            [
+                (
+                    msg.id,
+                    conversation_id,
+                    msg.role,
+                    msg.content,
+                    msg.timestamp,
+                    json.dumps(msg.metadata, ensure_ascii=False) if msg.metadata else None,
+                )
+                for msg in messages
+            ],
+        )
 
-        # Tag index
-        for tag in conversation.tags:
-            if tag not in self.conversation_index["tags"]:
-                self.conversation_index["tags"][tag] = []
-            if conversation.id not in self.conversation_index["tags"][tag]:
-                self.conversation_index["tags"][tag].append(conversation.id)
+    def _get_tags(self, conversation_ids: List[str]) -> Dict[str, List[str]]:
+        """Konuşma id'leri için etiketleri tek sorguda getir"""
+        tags: Dict[str, List[str]] = defaultdict(list)
+        for i in range(0, len(conversation_ids), 500):
+            chunk = conversation_ids[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in self.connection.execute(
+                f"""
+                SELECT conversation_id, tag FROM conversation_tags
+                WHERE conversation_id IN ({placeholders})
+                ORDER BY conversation_id, tag
+            """,
+                chunk,
+            ):
+                tags[row["conversation_id"]].append(row["tag"])
+        return tags
+
+    def import_json_tree(self, root: str = None, batch_size: int = 200) -> int:
+        """
+        Eski JSON dosya ağacını (conversations/daily/YYYY-MM-DD/*.json) içe aktar.
+
+        Dosyalar tarih sırasıyla işlenir; aynı konuşmanın farklı günlerdeki
+        kopyaları mesaj id'leri üzerinden birleştirilir. Tekrar çalıştırmak güvenlidir.
+        """
+        root_dir = Path(root) if root else self.conversations_dir / "daily"
+        if not root_dir.exists():
+            return 0
+
+        imported = set()
+        pending = 0
+
+        with self._lock:
+            for file_path in sorted(root_dir.rglob("*.json")):
+                try:
+                    with open(file_path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+
+                    data["messages"] = [ChatMessage(**msg) for msg in data.get("messages", [])]
+                    self._save_conversation(ChatConversation(**data))
+                    imported.add(data["id"])
+                    pending += 1
+                except Exception as e:
+                    print(
+                        f"{Fore.YELLOW}⚠️  JSON konuşması aktarılamadı {file_path}: {e}{Style.RESET_ALL}"
+                    )
+                    continue
 
-        # Total count
-        self.conversation_index["total_conversations"] = len(
-            self.conversation_index["conversations"]
-        )
+                if pending >= batch_size:
+                    self.connection.commit()
+                    pending = 0
+
+            # Birleştirilen konuşmaların mesaj sayılarını düzelt
+            self.connection.executemany(
+                """
+                UPDATE conversations SET message_count = (
+                    SELECT COUNT(*) FROM messages WHERE conversation_id = conversations.id
+                ) WHERE id = ?
+            """,
+                [(conversation_id,) for conversation_id in imported],
+            )
+            self.connection.commit()
 
-        self._save_index()
+        return len(imported)
 
     def _conversation_to_markdown(self, conversation: ChatConversation) -> str:
         """Konuşmayı Markdown'a dönüştür"""
@@ -468,17 +683,6 @@ class JSONChatManager:
             total_size /= 1024
         return f"{total_size:.1f} TB"
 
-    def _get_last_activity(self) -> Optional[str]:
-        """Son aktivite tarihini al"""
-        if not self.conversation_index["conversations"]:
-            return None
-
-        last_updated = max(
-            conv.get("updated_at", "")
-            for conv in self.conversation_index["conversations"].values()
-        )
-        return last_updated
-
     def _import_cursor_chat(
         self, chat_data: Dict[str, Any], workspace_info: Dict[str, Any]
     ) -> Optional[str]:
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher - Aho–Corasick ile tek geçişte çoklu anahtar kelime taraması
+Skorlayıcılar ve analizörler "bu N kelimeden hangisi metinde geçiyor"
+sorusunu kelime başına ayrı tarama yerine tek bir otomatla cevaplar
+"""
+
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+import numpy as np
+
+# Bu uzunluktan itibaren tarama NumPy ile yapılır (kısa metinde döngü daha hızlı)
+VECTORIZE_MIN_CHARS = 2048
+
+
+class KeywordHit(NamedTuple):
+    """Bir anahtar kelime eşleşmesi (orijinal metindeki [start, end) aralığı)"""
+
+    start: int
+    end: int
+    keyword: str
+
+
+def is_word_char(char: str) -> bool:
+    """re modülündeki \\w ile aynı tanım (Unicode harf/rakam ve alt çizgi)"""
+    return char.isalnum() or char == "_"
+
+
+def is_whole_word(text: str, hit: KeywordHit) -> bool:
+    """Eşleşme iki yandan kelime sınırında mı (re'deki \\b)"""
+    return (hit.start == 0 or not is_word_char(text[hit.start - 1])) and (
+        hit.end == len(text) or not is_word_char(text[hit.end])
+    )
+
+
+def fold_case(text: str) -> str:
+    """Küçük harfe çevirir; karakter konumlarını korur
+
+    str.lower() bazı karakterleri uzatır (ör. 'İ' -> 'i̇'); o durumda her
+    karakterin küçük harfinin ilk karakteri alınır.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(char.lower()[0] for char in text)
+
+
+class KeywordMatcher:
+    """
+    Aho–Corasick otomatı (büyük/küçük harf duyarsız)
+
+    - Geçiş tablosu kurulumda tam DFA'ya açılır: tarama karakter başına tek
+      sözlük erişimi, geri dönüş (failure) zinciri yürütülmez
+    - Tüm eşleşmeler (çakışanlar dahil) konumlarıyla tek geçişte bulunur
+    - Uzun metinlerde aynı trie geçişleri (goto) her başlangıç konumundan
+      NumPy ile eşzamanlı yürütülür; ölen konumlar her adımda elenir, adım
+      sayısı en uzun anahtar kelime uzunluğudur
+    - whole_words=True, re'deki \\bkelime\\b sınırlarıyla aynı filtreyi uygular
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(
+            sorted({keyword.lower() for keyword in keywords if keyword})
+        )
+
+        # Trie: her durum için karakter -> durum
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[str, ...]] = [()]
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append(())
+                state = next_state
+            outputs[state] = (keyword,)
+
+        # BFS ile failure bağlantıları; tablo DFA'ya açılır ve çıktılar birleşir
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions = dict(delta[fail[state]])
+            transitions.update(goto[state])
+            delta[state] = transitions
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0)
+                queue.append(child)
+
+        # Kökteki geçişler .get(char, 0) varsayılanıyla karşılanır
+        self._delta = [
+            {char: target for char, target in transitions.items() if target}
+            for transitions in delta
+        ]
+        self._outputs = outputs
+        self._lengths = {keyword: len(keyword) for keyword in self.keywords}
+
+        # NumPy tabloları: karakter kodu -> sütun (alfabe dışı 0), düz goto
+        # tablosunda -1 = geçiş yok; 0. sütunun hiç geçişi olmadığından metin
+        # sonuna eklenen 0'lar yolları kendiliğinden bitirir
+        alphabet = sorted({char for keyword in self.keywords for char in keyword})
+        self._code_table = np.zeros(
+            max((ord(char) for char in alphabet), default=0) + 1, dtype=np.int32
+        )
+        for column, char in enumerate(alphabet, start=1):
+            self._code_table[ord(char)] = column
+        self._width = len(alphabet) + 1
+        goto_table = np.full((len(goto), self._width), -1, dtype=np.int32)
+        for state, transitions in enumerate(goto):
+            for char, child in transitions.items():
+                goto_table[state, self._code_table[ord(char)]] = child
+        self._goto_table = goto_table.ravel()
+        self._max_length = max((len(keyword) for keyword in self.keywords), default=0)
+        self._terminal = np.full(len(goto), -1, dtype=np.int32)
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                state = goto[state][char]
+            self._terminal[state] = index
+
+    @property
+    def state_count(self) -> int:
+        return len(self._delta)
+
+    def iter_hits(self, text: str) -> Iterator[KeywordHit]:
+        """Tüm eşleşmeleri bitiş konumuna göre sırayla üretir."""
+        if not self.keywords or not text:
+            return
+        if len(text) >= VECTORIZE_MIN_CHARS:
+            yield from self._scan_vectorized(text)
+            return
+        delta = self._delta
+        outputs = self._outputs
+        lengths = self._lengths
+        state = 0
+        for position, char in enumerate(fold_case(text)):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                end = position + 1
+                for keyword in outputs[state]:
+                    yield KeywordHit(end - lengths[keyword], end, keyword)
+
+    def _encode(self, text: str) -> np.ndarray:
+        """Sütun kodları (alfabe dışı 0), sonunda en uzun kelime kadar 0"""
+        points = np.frombuffer(
+            fold_case(text).encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+        )
+        codes = np.zeros(len(points) + self._max_length, dtype=np.int32)
+        known = points < len(self._code_table)
+        codes[: len(points)][known] = self._code_table[points[known]]
+        return codes
+
+    def _scan_vectorized(self, text: str) -> Iterator[KeywordHit]:
+        codes = self._encode(text)
+        goto = self._goto_table
+        width = self._width
+
+        # Adım 0: kökten geçişi olan konumlar
+        states = goto[codes]
+        starts = np.flatnonzero(states >= 0)
+        states = states[starts]
+        depth = 1
+        found_starts, found_keywords = [], []
+        while len(starts):
+            keywords = self._terminal[states]
+            hit = keywords >= 0
+            if hit.any():
+                found_starts.append(starts[hit])
+                found_keywords.append(keywords[hit])
+
+            # Bir sonraki karakterle ilerle; geçişi olmayan yollar elenir
+            states = goto[states * width + codes[starts + depth]]
+            alive = states >= 0
+            starts, states = starts[alive], states[alive]
+            depth += 1
+
+        if not found_starts:
+            return
+        hit_starts = np.concatenate(found_starts)
+        hit_keywords = np.concatenate(found_keywords)
+        lengths = np.array([len(keyword) for keyword in self.keywords], dtype=np.int64)
+        hit_ends = hit_starts + lengths[hit_keywords]
+
+        # Döngü yolu ile aynı sıra: bitişe göre, aynı bitişte uzun olan önce
+        order = np.lexsort((hit_starts, hit_ends))
+        for start, end, index in zip(
+            hit_starts[order].tolist(), hit_ends[order].tolist(), hit_keywords[order].tolist()
+        ):
+            yield KeywordHit(start, end, self.keywords[index])
+
+    def find_all(self, text: str, whole_words: bool = False) -> List[KeywordHit]:
+        """Tüm eşleşmeler; whole_words ile kelime sınırındakiler."""
+        if not whole_words:
+            return list(self.iter_hits(text))
+        return [hit for hit in self.iter_hits(text) if is_whole_word(text, hit)]
+
+    def matched(self, text: str, whole_words: bool = False) -> Set[str]:
+        """Metinde geçen anahtar kelimeler."""
+        return {hit.keyword for hit in self.find_all(text, whole_words)}
+
+    def count(self, text: str, whole_words: bool = False) -> Counter:
+        """Anahtar kelime başına eşleşme sayısı."""
+        return Counter(hit.keyword for hit in self.find_all(text, whole_words))
+
+    def __repr__(self) -> str:
+        return f"KeywordMatcher({len(self.keywords)} keywords, {self.state_count} states)"
+
+
+@lru_cache(maxsize=64)
+def _cached_matcher(keywords: FrozenSet[str]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def get_keyword_matcher(keywords: Iterable[str]) -> KeywordMatcher:
+    """Anahtar kelime kümesi başına bir kez kurulan paylaşımlı matcher."""
+    return _cached_matcher(frozenset(keyword.lower() for keyword in keywords if keyword))
@@ -112,6 +112,7 @@ class CollectiveMemory:
                 or args.search
                 or args.monitor
                 or args.index
+                or args.rescan
                 or args.stats
             ):
                 return self.run_query_system(args)
@@ -185,6 +186,11 @@ class CollectiveMemory:
                 terminal._reindex_all_files()
                 return True
 
+            elif args.rescan:
+                # Sadece değişen dosyalar (scan manifest)
+                terminal._rescan_changed_files(since=args.since)
+                return True
+
             elif args.stats:
                 # İstatistikler
                 terminal._show_statistics()
@@ -237,6 +243,16 @@ def main():
     parser.add_argument(
         "--index", action="store_true", help="Tüm dosyaları yeniden indeksle"
     )
+    parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Sadece değişen dosyaları indeksle (scan manifest)",
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="--rescan için: bu tarihten sonra değişen dosyalar (örn. 2025-07-18T10:00)",
+    )
     parser.add_argument(
         "--stats", action="store_true", help="Sistem istatistiklerini göster"
     )
@@ -265,6 +281,7 @@ def main():
         or args.search
         or args.monitor
         or args.index
+        or args.rescan
         or args.stats
     ):
         print(
@@ -6,21 +6,31 @@ Dynamic memory creation and automatic linking system
 import json
 import logging
 import threading
-from typing import Dict, List, Optional, Tuple, Set
+import time
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Set, Iterable
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from enum import Enum
 import re
 import hashlib
 import networkx as nx
-from collections import defaultdict, deque
+from collections import Counter, OrderedDict, defaultdict, deque
 import numpy as np
 
+# Project imports (relative)
+from ..keyword_matcher import get_keyword_matcher
+from .graph_store import CSRGraphStore
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Keywords that raise node importance (+0.1 each, substring match)
+NODE_IMPORTANCE_KEYWORDS = ("critical", "important", "key", "main", "core", "essential")
+
+
 class MemoryNodeType(Enum):
     """Types of memory nodes in the A-Mem system."""
 
@@ -43,6 +53,14 @@ class LinkType(Enum):
     SUPPORTIVE = "supportive"  # Supporting evidence
 
 
+# Link type <-> uint8 code in the graph store (enum order, append-only)
+LINK_TYPES = list(LinkType)
+LINK_TYPE_CODES = {link_type: code for code, link_type in enumerate(LINK_TYPES)}
+
+# Feature dict keys holding sets (stored as sorted JSON lists)
+FEATURE_SET_KEYS = ("words", "entities", "concepts", "code_elements")
+
+
 @dataclass
 class MemoryNode:
     """Represents a memory node in the A-Mem system."""
@@ -57,6 +75,8 @@ class MemoryNode:
     tags: Set[str]
     context: Dict
     metadata: Dict
+    # Cached output of AMemEngine._extract_features (computed once per node)
+    features: Optional[Dict] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
         """Post-initialization processing."""
@@ -83,6 +103,62 @@ class MemoryLink:
     metadata: Dict
 
 
+class MemoryNodeCache(Mapping):
+    """
+    node_id -> MemoryNode view over the graph store payloads
+
+    Recently used nodes are kept in an LRU of max_size; others are loaded
+    from SQLite on access, so memory stays bounded as the network grows.
+    """
+
+    def __init__(
+        self,
+        store: CSRGraphStore,
+        loader: Callable[[object], "MemoryNode"],
+        max_size: int = 10000,
+    ):
+        self.store = store
+        self.loader = loader
+        self.max_size = max_size
+        self._nodes: "OrderedDict[str, MemoryNode]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, node: "MemoryNode"):
+        with self._lock:
+            self._nodes[node.id] = node
+            self._nodes.move_to_end(node.id)
+            while len(self._nodes) > self.max_size:
+                self._nodes.popitem(last=False)
+
+    def __getitem__(self, node_id: str) -> "MemoryNode":
+        with self._lock:
+            node = self._nodes.get(node_id)
+            if node is not None:
+                self._nodes.move_to_end(node_id)
+                return node
+
+        idx = self.store.index_of(node_id)
+        if idx is None:
+            raise KeyError(node_id)
+        node = self.loader(self.store.get_node(idx))
+        self.put(node)
+        return node
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._nodes or self.store.index_of(node_id) is not None
+
+    def __len__(self) -> int:
+        return self.store.node_count
+
+    def __iter__(self) -> Iterator[str]:
+        for row in self.store.iter_nodes(("node_id",)):
+            yield row["node_id"]
+
+    @property
+    def cached(self) -> int:
+        return len(self._nodes)
+
+
 class AMemEngine:
     """
     A-Mem Inspired Memory Engine
@@ -95,18 +171,36 @@ class AMemEngine:
     5. Emergent organization
     """
 
-    def __init__(self, database_manager=None):
-        """Initialize A-Mem engine."""
+    def __init__(
+        self,
+        database_manager=None,
+        graph_path: Optional[str] = None,
+        node_cache_size: int = 10000,
+    ):
+        """Initialize A-Mem engine (graph_path=None keeps the network in memory)."""
         self.database = database_manager
-        self.memory_graph = nx.DiGraph()
-        self.memory_nodes = {}
-        self.memory_links = {}
+
+        # Links: CSR arrays + append log; node payloads: SQLite (graph_path/graph.db)
+        self.graph_store = CSRGraphStore(graph_path)
+        self.memory_nodes = MemoryNodeCache(
+            self.graph_store, self._node_from_row, node_cache_size
+        )
+
+        # Inverted index: feature token -> node ids ("w:", "e:", "c:", "k:")
+        # Reloaded nodes are indexed lazily from their stored features
+        self.feature_index: Dict[str, Set[str]] = defaultdict(set)
+        self._feature_index_ready = self.graph_store.node_count == 0
 
         # Linking parameters
         self.linking_threshold = 0.6
         self.max_links_per_memory = 10
         self.link_decay_rate = 0.1
 
+        # Candidate generation limits
+        self.max_candidates = 100  # Exact similarity is computed for these only
+        self.max_postings_scanned = 20000  # Rare tokens first, common ones last
+        self.common_token_ratio = 0.05  # Tokens in >5% of nodes act as stopwords
+
         # Pattern detection
         self.pattern_detector = PatternDetector()
         self.insight_generator = InsightGenerator()
@@ -114,15 +208,30 @@ class AMemEngine:
         # Thread safety
         self.lock = threading.RLock()
 
+        # Centrality cache: graph_version her node/link değişikliğinde artar
+        self.graph_version = 0
+        self.centrality_max_staleness = 30.0  # seconds a stale snapshot may be served
+        self.centrality_background_refresh = True
+        self._centrality = self._empty_centrality_snapshot()
+        self._graph_dirty_since: Optional[float] = None
+        # (version, monotonic time) of the first mutation after each version a
+        # refresh started from, so a snapshot of an older version keeps an
+        # accurate staleness start
+        self._mutation_times: deque = deque()
+        self._refresh_started_version = -1
+        self._centrality_refresh_thread: Optional[threading.Thread] = None
+
         # Statistics
         self.stats = {
-            "total_memories": 0,
-            "total_links": 0,
+            "total_memories": self.graph_store.node_count,
+            "total_links": self.graph_store.edge_count,
             "avg_connections": 0.0,
             "patterns_detected": 0,
             "insights_generated": 0,
         }
 
+        self._update_network_stats()
+
         logger.info("A-Mem engine initialized")
 
     def create_memory_node(
@@ -137,6 +246,8 @@ class AMemEngine:
         """Create a new memory node."""
 
         with self.lock:
+            self._ensure_feature_index()
+
             # Generate unique ID
             node_id = self._generate_memory_id(content)
 
@@ -158,11 +269,12 @@ class AMemEngine:
                 metadata=metadata or {},
             )
 
-            # Store in memory
-            self.memory_nodes[node_id] = node
-
-            # Add to graph
-            self.memory_graph.add_node(node_id, **asdict(node))
+            # Extract features once, store the payload and index it
+            self._get_node_features(node)
+            self.graph_store.add_node(node_id, self._node_payload(node))
+            self.memory_nodes.put(node)
+            self._mark_graph_changed()
+            self._index_node(node)
 
             # Auto-link to existing memories
             self._auto_link_memory(node)
@@ -198,17 +310,9 @@ class AMemEngine:
         importance += length_factor
 
         # Keyword importance
-        important_keywords = [
-            "critical",
-            "important",
-            "key",
-            "main",
-            "core",
-            "essential",
-        ]
-        for keyword in important_keywords:
-            if keyword in content.lower():
-                importance += 0.1
+        matched = get_keyword_matcher(NODE_IMPORTANCE_KEYWORDS).matched(content)
+        for _ in matched:
+            importance += 0.1
 
         # Context importance
         if context.get("project_path"):
@@ -249,18 +353,17 @@ class AMemEngine:
         candidates = []
 
         # Extract features from the node
-        node_features = self._extract_features(node.content)
-
-        # Compare with existing memories
-        for existing_id, existing_node in self.memory_nodes.items():
-            if existing_id != node.id:
-                # Calculate similarity
-                similarity = self._calculate_similarity(
-                    node_features, existing_node.content
-                )
+        node_features = self._get_node_features(node)
 
-                if similarity > 0.3:  # Minimum similarity threshold
-                    candidates.append((existing_id, similarity))
+        # Compare only with memories that share at least one token
+        for existing_id in self._candidate_node_ids(node_features, exclude=node.id):
+            # Calculate similarity
+            similarity = self._feature_similarity(
+                node_features, self._get_node_features(self.memory_nodes[existing_id])
+            )
+
+            if similarity > 0.3:  # Minimum similarity threshold
+                candidates.append((existing_id, similarity))
 
         # Sort by similarity
         candidates.sort(key=lambda x: x[1], reverse=True)
@@ -268,6 +371,125 @@ class AMemEngine:
         # Return top candidates
         return candidates[: self.max_links_per_memory]
 
+    @staticmethod
+    def _node_payload(node: MemoryNode) -> Dict:
+        """Graph store row for a node (JSON columns, features included)."""
+        features = {
+            key: sorted(value) if key in FEATURE_SET_KEYS else value
+            for key, value in (node.features or {}).items()
+        }
+        return {
+            "node_type": node.node_type.value,
+            "importance": node.importance,
+            "created_at": node.created_at.isoformat(),
+            "last_accessed": node.last_accessed.isoformat(),
+            "access_count": node.access_count,
+            "tags": json.dumps(sorted(node.tags)),
+            "context": json.dumps(node.context, default=str),
+            "metadata": json.dumps(node.metadata, default=str),
+            "content": node.content,
+            "features": json.dumps(features) if node.features is not None else None,
+        }
+
+    @staticmethod
+    def _features_from_json(value: Optional[str]) -> Optional[Dict]:
+        if not value:
+            return None
+        features = json.loads(value)
+        for key in FEATURE_SET_KEYS:
+            features[key] = set(features.get(key, ()))
+        return features
+
+    def _node_from_row(self, row) -> MemoryNode:
+        """Rebuild a MemoryNode from its graph store row."""
+        return MemoryNode(
+            id=row["node_id"],
+            content=row["content"],
+            node_type=MemoryNodeType(row["node_type"]),
+            importance=row["importance"],
+            created_at=row["created_at"],
+            last_accessed=row["last_accessed"],
+            access_count=row["access_count"],
+            tags=set(json.loads(row["tags"] or "[]")),
+            context=json.loads(row["context"] or "{}"),
+            metadata=json.loads(row["metadata"] or "{}"),
+            features=self._features_from_json(row["features"]),
+        )
+
+    def _get_node_features(self, node: MemoryNode) -> Dict:
+        """Return cached features for a node, extracting them on first use."""
+        if node.features is None:
+            node.features = self._extract_features(node.content)
+        return node.features
+
+    @staticmethod
+    def _feature_tokens(features: Dict) -> Iterable[str]:
+        """Inverted index keys for a feature dict."""
+        for prefix, key in (
+            ("w", "words"),
+            ("e", "entities"),
+            ("c", "concepts"),
+            ("k", "code_elements"),
+        ):
+            for token in features[key]:
+                yield f"{prefix}:{token}"
+
+    def _index_node(self, node: MemoryNode):
+        """Add a node to the inverted feature index."""
+        for token in self._feature_tokens(self._get_node_features(node)):
+            self.feature_index[token].add(node.id)
+
+    def rebuild_feature_index(self):
+        """Rebuild the inverted index from the stored node features."""
+        with self.lock:
+            self.feature_index = defaultdict(set)
+            for row in self.graph_store.iter_nodes(("node_id", "content", "features")):
+                features = self._features_from_json(row["features"])
+                if features is None:
+                    features = self._extract_features(row["content"] or "")
+                for token in self._feature_tokens(features):
+                    self.feature_index[token].add(row["node_id"])
+            self._feature_index_ready = True
+
+    def _ensure_feature_index(self):
+        """Index reloaded nodes on first use (cold start stays cheap)."""
+        if not self._feature_index_ready:
+            self.rebuild_feature_index()
+
+    def _candidate_node_ids(self, features: Dict, exclude: str = None) -> List[str]:
+        """
+        Candidate generation from the inverted index.
+
+        Posting listeleri küçükten büyüğe taranır; çok yaygın token'lar
+        (the, if, ...) yalnızca daha nadir bir token yoksa kullanılır ve tarama
+        bütçesi aşılınca durulur. Adaylar ortak token sayısına göre sıralanır.
+        """
+        common_limit = max(50, int(len(self.memory_nodes) * self.common_token_ratio))
+        postings = sorted(
+            (
+                self.feature_index[token]
+                for token in set(self._feature_tokens(features))
+                if token in self.feature_index
+            ),
+            key=len,
+        )
+
+        shared_counts = Counter()
+        scanned = 0
+        for posting in postings:
+            if scanned and (
+                len(posting) > common_limit
+                or scanned + len(posting) > self.max_postings_scanned
+            ):
+                break
+            shared_counts.update(posting)
+            scanned += len(posting)
+
+        shared_counts.pop(exclude, None)
+        return [
+            node_id for node_id, _ in shared_counts.most_common(self.max_candidates)
+        ]
+
     def _extract_features(self, content: str) -> Dict:
         """Extract features from content for similarity calculation."""
         features = {
@@ -392,8 +614,10 @@ class AMemEngine:
     def _calculate_similarity(self, features1: Dict, content2: str) -> float:
         """Calculate similarity between two pieces of content."""
         # Extract features from second content
-        features2 = self._extract_features(content2)
+        return self._feature_similarity(features1, self._extract_features(content2))
 
+    def _feature_similarity(self, features1: Dict, features2: Dict) -> float:
+        """Calculate similarity between two extracted feature sets."""
         # Calculate different types of similarity
 
         # Word overlap
@@ -515,40 +739,14 @@ class AMemEngine:
             metadata={},
         )
 
-        # Store link
-        self.memory_links[link_id] = link
-
-        # Add to graph
-        self.memory_graph.add_edge(
-            source_id,
-            target_id,
-            link_type=link_type.value,
-            strength=strength,
-            confidence=confidence,
-        )
-
-        # Create reverse link for bidirectional connection
-        reverse_link_id = f"{target_id[:8]}_{source_id[:8]}_{link_type.value}_rev"
-        reverse_link = MemoryLink(
-            id=reverse_link_id,
-            source_id=target_id,
-            target_id=source_id,
-            link_type=link_type,
-            strength=strength,
-            confidence=confidence,
-            created_at=datetime.now(),
-            context={},
-            metadata={},
-        )
+        # Add to graph (both directions; the store logs them)
+        source = self.graph_store.index_of(source_id)
+        target = self.graph_store.index_of(target_id)
+        code = LINK_TYPE_CODES[link_type]
+        self.graph_store.add_edge(source, target, code, strength, confidence)
+        self.graph_store.add_edge(target, source, code, strength, confidence)
 
-        self.memory_links[reverse_link_id] = reverse_link
-        self.memory_graph.add_edge(
-            target_id,
-            source_id,
-            link_type=link_type.value,
-            strength=strength,
-            confidence=confidence,
-        )
+        self._mark_graph_changed()
 
         # Update statistics
         self.stats["total_links"] += 2  # Bidirectional
@@ -557,7 +755,7 @@ class AMemEngine:
 
     def _detect_patterns(self, node: MemoryNode):
         """Detect patterns in the memory network."""
-        patterns = self.pattern_detector.detect_patterns(node, self.memory_graph)
+        patterns = self.pattern_detector.detect_patterns(node, self.graph_store)
 
         for pattern in patterns:
             # Create pattern node
@@ -572,16 +770,20 @@ class AMemEngine:
             self.stats["patterns_detected"] += 1
 
     def _store_in_database(self, node: MemoryNode):
-        """Store memory node in database."""
+        """Store memory node in database (the graph store keeps its memory id)."""
         if self.database:
             try:
-                self.database.store_memory(
+                memory_id = self.database.store_memory(
                     content=node.content,
                     context=json.dumps(node.context),
                     memory_type=node.node_type.value,
                     importance_score=node.importance,
                     metadata=node.metadata,
                 )
+                if isinstance(memory_id, int):
+                    self.graph_store.set_memory_id(
+                        self.graph_store.index_of(node.id), memory_id
+                    )
             except Exception as e:
                 logger.error(f"Error storing memory in database: {e}")
 
@@ -595,54 +797,42 @@ class AMemEngine:
     def get_memory_network(self, center_node_id: str, depth: int = 2) -> Dict:
         """Get the memory network around a specific node."""
 
-        if center_node_id not in self.memory_nodes:
+        center = self.graph_store.index_of(center_node_id)
+        if center is None:
             return {}
 
-        # Get subgraph
-        subgraph_nodes = set([center_node_id])
-        current_level = {center_node_id}
-
-        for _ in range(depth):
-            next_level = set()
-            for node_id in current_level:
-                neighbors = set(self.memory_graph.neighbors(node_id))
-                next_level.update(neighbors)
-
-            subgraph_nodes.update(next_level)
-            current_level = next_level
-
-        # Create subgraph
-        subgraph = self.memory_graph.subgraph(subgraph_nodes)
+        # Neighbourhood and induced links (CSR slices), payloads by index
+        subgraph_nodes = self.graph_store.neighborhood(center, depth)
+        edges = self.graph_store.edges_among(subgraph_nodes)
+        rows = self.graph_store.get_nodes(
+            subgraph_nodes, ("node_id", "content", "node_type", "importance", "tags")
+        )
 
         # Format for output
         network = {"center_node": center_node_id, "nodes": {}, "links": []}
 
         # Add nodes
-        for node_id in subgraph.nodes():
-            if node_id in self.memory_nodes:
-                node = self.memory_nodes[node_id]
-                network["nodes"][node_id] = {
-                    "id": node.id,
-                    "content": (
-                        node.content[:100] + "..."
-                        if len(node.content) > 100
-                        else node.content
-                    ),
-                    "type": node.node_type.value,
-                    "importance": node.importance,
-                    "tags": list(node.tags),
-                }
+        node_ids = {}
+        for row in rows:
+            node_ids[row["idx"]] = row["node_id"]
+            content = row["content"] or ""
+            network["nodes"][row["node_id"]] = {
+                "id": row["node_id"],
+                "content": content[:100] + "..." if len(content) > 100 else content,
+                "type": row["node_type"],
+                "importance": row["importance"],
+                "tags": json.loads(row["tags"] or "[]"),
+            }
 
         # Add links
-        for edge in subgraph.edges(data=True):
-            source, target, data = edge
+        for source, target, kind, strength, confidence in edges.tolist():
             network["links"].append(
                 {
-                    "source": source,
-                    "target": target,
-                    "type": data.get("link_type", "semantic"),
-                    "strength": data.get("strength", 0.5),
-                    "confidence": data.get("confidence", 0.5),
+                    "source": node_ids[source],
+                    "target": node_ids[target],
+                    "type": LINK_TYPES[kind].value,
+                    "strength": strength,
+                    "confidence": confidence,
                 }
             )
 
@@ -651,13 +841,19 @@ class AMemEngine:
     def search_memories(self, query: str, max_results: int = 10) -> List[MemoryNode]:
         """Search memories using A-Mem network traversal."""
 
-        results = []
+        self._ensure_feature_index()
         query_features = self._extract_features(query)
 
-        # Calculate similarity with all memories
+        # Candidates from the inverted index (mutated by writers under self.lock)
+        with self.lock:
+            candidate_ids = self._candidate_node_ids(query_features)
+
+        # Calculate similarity with memories sharing query tokens
         similarities = []
-        for node_id, node in self.memory_nodes.items():
-            similarity = self._calculate_similarity(query_features, node.content)
+        for node_id in candidate_ids:
+            similarity = self._feature_similarity(
+                query_features, self._get_node_features(self.memory_nodes[node_id])
+            )
             similarities.append((node_id, similarity))
 
         # Sort by similarity
@@ -684,31 +880,20 @@ class AMemEngine:
 
     def _calculate_network_importance(self, node_id: str) -> float:
         """Calculate importance based on network position."""
-        if node_id not in self.memory_graph:
+        idx = self.graph_store.index_of(node_id)
+        if idx is None:
             return 0.0
 
-        # Degree centrality
-        degree = self.memory_graph.degree(node_id)
-        degree_centrality = (
-            degree / (len(self.memory_graph) - 1) if len(self.memory_graph) > 1 else 0
-        )
+        snapshot = self.get_centrality_snapshot()
 
-        # PageRank
-        try:
-            pagerank = nx.pagerank(self.memory_graph).get(node_id, 0)
-        except:
-            pagerank = 0
+        # Degree centrality (cheap, always current)
+        node_count = self.graph_store.node_count
+        degree = self.graph_store.degree(idx)
+        degree_centrality = degree / (node_count - 1) if node_count > 1 else 0
 
-        # Betweenness centrality (for smaller graphs)
-        if len(self.memory_graph) < 1000:
-            try:
-                betweenness = nx.betweenness_centrality(self.memory_graph).get(
-                    node_id, 0
-                )
-            except:
-                betweenness = 0
-        else:
-            betweenness = 0
+        # PageRank and betweenness from the cached snapshot (arrays by node index)
+        pagerank = self._score_at(snapshot["pagerank"], idx)
+        betweenness = self._score_at(snapshot["betweenness"], idx)
 
         # Combine measures
         network_importance = (
@@ -717,26 +902,162 @@ class AMemEngine:
 
         return network_importance
 
+    # ================================
+    # CENTRALITY CACHE
+    # ================================
+
+    @staticmethod
+    def _score_at(scores: np.ndarray, idx: int) -> float:
+        """Snapshot score of a node (0 for nodes added after the snapshot)."""
+        return float(scores[idx]) if idx < len(scores) else 0.0
+
+    @staticmethod
+    def _empty_centrality_snapshot() -> Dict:
+        """Snapshot placeholder before the first computation."""
+        return {
+            "version": -1,
+            "computed_at": None,
+            "pagerank": np.zeros(0),
+            "betweenness": np.zeros(0),
+            "graph_stats": {
+                "network_density": 0.0,
+                "connected_components": 0,
+                "clustering_coefficient": 0,
+            },
+        }
+
+    def _mark_graph_changed(self):
+        """Record a graph mutation (caller holds self.lock)."""
+        now = time.monotonic()
+        if not self._mutation_times or self.graph_version == self._refresh_started_version:
+            self._mutation_times.append((self.graph_version + 1, now))
+        self.graph_version += 1
+        if self._graph_dirty_since is None:
+            self._graph_dirty_since = now
+
+    def get_centrality_snapshot(self) -> Dict:
+        """
+        Return cached centrality scores for the current graph.
+
+        Değişiklikten sonra en fazla centrality_max_staleness saniye eski
+        snapshot döndürülür ve arka planda yenilenir; sınır aşılırsa veya
+        henüz snapshot yoksa hesaplama senkron yapılır.
+        """
+        with self.lock:
+            snapshot = self._centrality
+            if snapshot["version"] == self.graph_version:
+                return snapshot
+
+            within_bound = (
+                snapshot["version"] >= 0
+                and self._graph_dirty_since is not None
+                and time.monotonic() - self._graph_dirty_since
+                <= self.centrality_max_staleness
+            )
+
+        if within_bound and self.centrality_background_refresh:
+            self._schedule_centrality_refresh()
+            return snapshot
+
+        return self.refresh_centrality()
+
+    def _schedule_centrality_refresh(self):
+        """Start a background refresh unless one is already running."""
+        with self.lock:
+            thread = self._centrality_refresh_thread
+            if thread is not None and thread.is_alive():
+                return
+            self._centrality_refresh_thread = threading.Thread(
+                target=self.refresh_centrality, name="amem-centrality", daemon=True
+            )
+            self._centrality_refresh_thread.start()
+
+    def refresh_centrality(self) -> Dict:
+        """Compute centrality for the current graph version and cache it."""
+        with self.lock:
+            version = self.graph_version
+            self._refresh_started_version = max(self._refresh_started_version, version)
+            node_count = self.graph_store.node_count
+            edges = self.graph_store.edge_list()
+
+        # Global hesaplamalar kilit dışında, kenar listesinden kurulan
+        # (yalnızca indeksli) graph üzerinde yapılır
+        graph = nx.DiGraph()
+        graph.add_nodes_from(range(node_count))
+        graph.add_edges_from(zip(edges["source"].tolist(), edges["target"].tolist()))
+
+        try:
+            pagerank = nx.pagerank(graph) if len(graph) > 0 else {}
+        except Exception:
+            pagerank = {}
+
+        # Betweenness centrality (for smaller graphs)
+        betweenness = {}
+        if 0 < len(graph) < 1000:
+            try:
+                betweenness = nx.betweenness_centrality(graph)
+            except Exception:
+                betweenness = {}
+
+        def as_array(scores: Dict[int, float]) -> np.ndarray:
+            array = np.zeros(node_count)
+            for idx, score in scores.items():
+                array[idx] = score
+            return array
+
+        undirected = graph.to_undirected()
+        snapshot = {
+            "version": version,
+            "computed_at": datetime.now(),
+            "pagerank": as_array(pagerank),
+            "betweenness": as_array(betweenness),
+            "graph_stats": {
+                "network_density": nx.density(graph) if len(graph) > 0 else 0.0,
+                "connected_components": nx.number_connected_components(undirected),
+                "clustering_coefficient": (
+                    nx.average_clustering(undirected) if len(graph) > 0 else 0
+                ),
+            },
+        }
+
+        with self.lock:
+            if version > self._centrality["version"]:
+                self._centrality = snapshot
+                # Staleness now starts at the first mutation after this version
+                while self._mutation_times and self._mutation_times[0][0] <= version:
+                    self._mutation_times.popleft()
+                if version < self.graph_version:
+                    self._graph_dirty_since = (
+                        self._mutation_times[0][1]
+                        if self._mutation_times
+                        else time.monotonic()
+                    )
+                else:
+                    self._graph_dirty_since = None
+            return self._centrality
+
     def get_statistics(self) -> Dict:
         """Get engine statistics."""
+        snapshot = self.get_centrality_snapshot()
         return {
             **self.stats,
-            "network_density": nx.density(self.memory_graph),
-            "connected_components": nx.number_connected_components(
-                self.memory_graph.to_undirected()
-            ),
-            "clustering_coefficient": (
-                nx.average_clustering(self.memory_graph.to_undirected())
-                if len(self.memory_graph) > 0
-                else 0
-            ),
+            "indexed_tokens": len(self.feature_index),
+            **snapshot["graph_stats"],
+            "centrality_version": snapshot["version"],
+            "graph_version": self.graph_version,
+            "graph_store": self.graph_store.get_stats(),
+            "cached_nodes": self.memory_nodes.cached,
         }
 
+    def close(self):
+        """Flush the graph store (links log and node payloads)."""
+        self.graph_store.close()
+
 
 class PatternDetector:
     """Detects patterns in memory networks."""
 
-    def detect_patterns(self, node: MemoryNode, graph: nx.DiGraph) -> List[Dict]:
+    def detect_patterns(self, node: MemoryNode, graph: CSRGraphStore) -> List[Dict]:
         """Detect patterns involving the given node."""
         patterns = []
 
@@ -754,17 +1075,17 @@ class PatternDetector:
 
         return patterns
 
-    def _detect_clusters(self, node: MemoryNode, graph: nx.DiGraph) -> List[Dict]:
+    def _detect_clusters(self, node: MemoryNode, graph: CSRGraphStore) -> List[Dict]:
         """Detect clustering patterns."""
         # Implementation for cluster detection
         return []
 
-    def _detect_sequences(self, node: MemoryNode, graph: nx.DiGraph) -> List[Dict]:
+    def _detect_sequences(self, node: MemoryNode, graph: CSRGraphStore) -> List[Dict]:
         """Detect sequential patterns."""
         # Implementation for sequence detection
         return []
 
-    def _detect_hierarchies(self, node: MemoryNode, graph: nx.DiGraph) -> List[Dict]:
+    def _detect_hierarchies(self, node: MemoryNode, graph: CSRGraphStore) -> List[Dict]:
         """Detect hierarchical patterns."""
         # Implementation for hierarchy detection
         return []
@@ -0,0 +1,519 @@
+"""
+Graph Store for Collective Memory v3.0
+CSR adjacency arrays (memory-mapped on load) + append log for A-Mem links;
+node payloads stay in SQLite and are referenced by a dense node index
+"""
+
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# One append-log record per link (also the row layout of edge arrays)
+EDGE_DTYPE = np.dtype(
+    [
+        ("source", "<i4"),
+        ("target", "<i4"),
+        ("kind", "u1"),
+        ("strength", "<f4"),
+        ("confidence", "<f4"),
+    ]
+)
+
+# Files of one CSR generation (csr-<n>/<name>.npy)
+CSR_ARRAYS = ("indptr", "indices", "kinds", "strength", "confidence", "in_degree")
+
+NODE_COLUMNS = (
+    "node_id",
+    "memory_id",
+    "node_type",
+    "importance",
+    "created_at",
+    "last_accessed",
+    "access_count",
+    "tags",
+    "context",
+    "metadata",
+    "content",
+    "features",
+)
+
+# IN (...) parameter chunk (SQLite variable limit)
+SQL_CHUNK_SIZE = 500
+
+
+class CSRGraphStore:
+    """
+    Compact directed graph for the A-Mem memory network
+
+    Features:
+    - Nodes get dense indexes 0..n-1; payloads (content, tags, features, ...)
+      live in the graph_nodes SQLite table and are loaded on demand
+    - Links are CSR arrays (indptr/indices + kind/strength/confidence columns)
+      saved as .npy files and opened with mmap_mode="r": cold start only maps
+      the files, nothing is parsed
+    - New links are appended to links.log (fixed-size binary records) and kept
+      in a small in-memory delta; compact() merges the delta into a new CSR
+      generation and switches the CURRENT pointer atomically
+    - Neighbourhood queries are array slicing over indptr ranges
+    - graph_path=None keeps everything in memory (same code path, no files)
+    """
+
+    def __init__(self, graph_path: Optional[str] = None, compact_threshold: int = 100000):
+        """Open (or create) the store; persisted arrays are memory-mapped."""
+        self.graph_path = Path(graph_path) if graph_path else None
+        self.compact_threshold = compact_threshold
+
+        self.lock = threading.RLock()
+
+        if self.graph_path is not None:
+            self.graph_path.mkdir(parents=True, exist_ok=True)
+            database = str(self.graph_path / "graph.db")
+        else:
+            database = ":memory:"
+        self.conn = sqlite3.connect(database, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._init_schema()
+
+        self.node_count = self.conn.execute(
+            "SELECT COALESCE(MAX(idx) + 1, 0) FROM graph_nodes"
+        ).fetchone()[0]
+        self._index_of: Dict[str, int] = {}
+
+        self.generation = 0
+        self._log_file = None
+        self._reset_delta()
+        self._load_generation()
+
+        logger.info(
+            f"Graph store loaded: {self.node_count} nodes, {self.edge_count} links "
+            f"({self.delta_edges} from log)"
+        )
+
+    # ================================
+    # FILE HANDLING
+    # ================================
+
+    def _init_schema(self):
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS graph_nodes (
+                idx INTEGER PRIMARY KEY,
+                node_id TEXT NOT NULL UNIQUE,
+                memory_id INTEGER,
+                node_type TEXT,
+                importance REAL,
+                created_at TEXT,
+                last_accessed TEXT,
+                access_count INTEGER DEFAULT 0,
+                tags TEXT,
+                context TEXT,
+                metadata TEXT,
+                content TEXT,
+                features TEXT
+            )
+        """
+        )
+        self.conn.commit()
+
+    @property
+    def _current_file(self) -> Path:
+        return self.graph_path / "CURRENT"
+
+    def _generation_dir(self, generation: int) -> Path:
+        return self.graph_path / f"csr-{generation:06d}"
+
+    def _reset_delta(self):
+        """Empty CSR base and delta (before loading or after compaction)."""
+        self._base_nodes = 0
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._kinds = np.zeros(0, dtype=np.uint8)
+        self._strength = np.zeros(0, dtype=np.float32)
+        self._confidence = np.zeros(0, dtype=np.float32)
+        self._in_degree = np.zeros(0, dtype=np.int64)
+
+        self._delta: List[Tuple[int, int, int, float, float]] = []
+        self._delta_out: Dict[int, List[int]] = defaultdict(list)  # source -> delta rows
+        self._delta_new_out: Counter = Counter()
+        self._delta_new_in: Counter = Counter()
+        self._delta_new_edges = 0
+
+    def _load_generation(self):
+        """Map the current CSR generation and replay its append log."""
+        if self.graph_path is None:
+            return
+
+        # Generation 0 has no arrays yet, only a log
+        if self._current_file.exists():
+            self.generation = int(self._current_file.read_text(encoding="utf-8").strip())
+            directory = self._generation_dir(self.generation)
+            arrays = {
+                name: np.load(directory / f"{name}.npy", mmap_mode="r")
+                for name in CSR_ARRAYS
+            }
+            self._indptr = arrays["indptr"]
+            self._indices = arrays["indices"]
+            self._kinds = arrays["kinds"]
+            self._strength = arrays["strength"]
+            self._confidence = arrays["confidence"]
+            self._in_degree = arrays["in_degree"]
+            self._base_nodes = len(self._indptr) - 1
+
+        log_path = self._generation_dir(self.generation) / "links.log"
+        if log_path.exists():
+            size = log_path.stat().st_size
+            whole = size - size % EDGE_DTYPE.itemsize
+            if whole != size:
+                # Torn last record from a crash mid-write
+                with open(log_path, "r+b") as f:
+                    f.truncate(whole)
+            for record in np.fromfile(log_path, dtype=EDGE_DTYPE).tolist():
+                self._apply_edge(*record)
+        self._open_log()
+
+    def _open_log(self):
+        directory = self._generation_dir(self.generation)
+        directory.mkdir(parents=True, exist_ok=True)
+        self._log_file = open(directory / "links.log", "ab")
+
+    def flush(self):
+        """Flush the append log and node payloads to disk."""
+        with self.lock:
+            if self._log_file is not None:
+                self._log_file.flush()
+                os.fsync(self._log_file.fileno())
+            self.conn.commit()
+
+    def close(self):
+        """Flush and release files (mapped arrays are dropped)."""
+        with self.lock:
+            self.flush()
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+            self.conn.close()
+
+    # ================================
+    # NODES
+    # ================================
+
+    def add_node(self, node_id: str, payload: Dict) -> int:
+        """Store a node payload and return its dense index."""
+        with self.lock:
+            existing = self.index_of(node_id)
+            if existing is not None:
+                return existing
+
+            idx = self.node_count
+            columns = [column for column in NODE_COLUMNS if column in payload]
+            self.conn.execute(
+                f"""
+                INSERT INTO graph_nodes (idx, node_id, {", ".join(columns)})
+                VALUES (?, ?, {", ".join("?" * len(columns))})
+            """,
+                [idx, node_id, *(payload[column] for column in columns)],
+            )
+            self.conn.commit()
+            self.node_count += 1
+            self._index_of[node_id] = idx
+            return idx
+
+    def set_memory_id(self, idx: int, memory_id: int):
+        """Reference the memories table row that mirrors this node."""
+        with self.lock:
+            self.conn.execute(
+                "UPDATE graph_nodes SET memory_id = ? WHERE idx = ?", (memory_id, idx)
+            )
+            self.conn.commit()
+
+    def index_of(self, node_id: str) -> Optional[int]:
+        """Dense index of a node id (None if unknown)."""
+        idx = self._index_of.get(node_id)
+        if idx is not None:
+            return idx
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT idx FROM graph_nodes WHERE node_id = ?", (node_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        self._index_of[node_id] = row[0]
+        return row[0]
+
+    def get_node(self, idx: int) -> Optional[sqlite3.Row]:
+        """Payload row of one node."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT * FROM graph_nodes WHERE idx = ?", (int(idx),)
+            ).fetchone()
+
+    def get_nodes(
+        self, indexes: Iterable[int], columns: Sequence[str] = NODE_COLUMNS
+    ) -> List[sqlite3.Row]:
+        """Payload rows (selected columns) of many nodes, in index order."""
+        indexes = sorted({int(idx) for idx in indexes})
+        select = ", ".join(("idx",) + tuple(columns))
+        rows = []
+        with self.lock:
+            for start in range(0, len(indexes), SQL_CHUNK_SIZE):
+                chunk = indexes[start : start + SQL_CHUNK_SIZE]
+                rows.extend(
+                    self.conn.execute(
+                        f"SELECT {select} FROM graph_nodes "
+                        f"WHERE idx IN ({','.join('?' * len(chunk))}) ORDER BY idx",
+                        chunk,
+                    ).fetchall()
+                )
+        return rows
+
+    def iter_nodes(
+        self, columns: Sequence[str] = NODE_COLUMNS, chunk_size: int = 5000
+    ) -> Iterator[sqlite3.Row]:
+        """Stream payload rows in index order (keyset chunks)."""
+        select = ", ".join(("idx",) + tuple(columns))
+        last_idx = -1
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    f"SELECT {select} FROM graph_nodes WHERE idx > ? ORDER BY idx LIMIT ?",
+                    (last_idx, chunk_size),
+                ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_idx = rows[-1]["idx"]
+
+    # ================================
+    # LINKS
+    # ================================
+
+    @property
+    def delta_edges(self) -> int:
+        return len(self._delta)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._indices) + self._delta_new_edges
+
+    def _base_row(self, source: int) -> slice:
+        if source >= self._base_nodes:
+            return slice(0, 0)
+        return slice(int(self._indptr[source]), int(self._indptr[source + 1]))
+
+    def has_edge(self, source: int, target: int) -> bool:
+        """True if the link source -> target exists."""
+        with self.lock:
+            if np.any(self._indices[self._base_row(source)] == target):
+                return True
+            return any(self._delta[row][1] == target for row in self._delta_out.get(source, ()))
+
+    def _apply_edge(
+        self, source: int, target: int, kind: int, strength: float, confidence: float
+    ):
+        """Add a link to the in-memory delta (no log write)."""
+        is_new = not self.has_edge(source, target)
+        self._delta_out[source].append(len(self._delta))
+        self._delta.append((source, target, kind, strength, confidence))
+        if is_new:
+            self._delta_new_out[source] += 1
+            self._delta_new_in[target] += 1
+            self._delta_new_edges += 1
+
+    def add_edge(
+        self, source: int, target: int, kind: int, strength: float, confidence: float
+    ):
+        """Add (or overwrite) a directed link; appended to the log."""
+        # Same precision in memory as after a log replay
+        strength = float(np.float32(strength))
+        confidence = float(np.float32(confidence))
+        with self.lock:
+            self._apply_edge(source, target, kind, strength, confidence)
+            if self._log_file is not None:
+                record = np.array(
+                    [(source, target, kind, strength, confidence)], dtype=EDGE_DTYPE
+                )
+                self._log_file.write(record.tobytes())
+                self._log_file.flush()
+
+            if len(self._delta) >= self.compact_threshold:
+                self.compact()
+
+    def out_degree(self, idx: int) -> int:
+        row = self._base_row(idx)
+        return (row.stop - row.start) + self._delta_new_out.get(idx, 0)
+
+    def in_degree(self, idx: int) -> int:
+        base = int(self._in_degree[idx]) if idx < self._base_nodes else 0
+        return base + self._delta_new_in.get(idx, 0)
+
+    def degree(self, idx: int) -> int:
+        """In + out degree (like nx.DiGraph.degree)."""
+        with self.lock:
+            return self.out_degree(idx) + self.in_degree(idx)
+
+    # ================================
+    # ARRAY QUERIES
+    # ================================
+
+    def _base_positions(self, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR positions of all out-links of nodes, with their source nodes."""
+        nodes = nodes[nodes < self._base_nodes]
+        starts = np.asarray(self._indptr[nodes], dtype=np.int64)
+        lengths = np.asarray(self._indptr[nodes + 1], dtype=np.int64) - starts
+        total = int(lengths.sum())
+        if not total:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return offsets + np.arange(total), np.repeat(nodes, lengths)
+
+    def _delta_array(self, sources: Optional[Iterable[int]] = None) -> np.ndarray:
+        """Delta links (all, or of the given sources) in log order."""
+        if sources is None:
+            records = self._delta
+        else:
+            rows = sorted(
+                row for source in sources for row in self._delta_out.get(int(source), ())
+            )
+            records = [self._delta[row] for row in rows]
+        return np.array(records, dtype=EDGE_DTYPE)
+
+    def _edges_of(self, nodes: Optional[np.ndarray]) -> np.ndarray:
+        """Out-links of nodes (None = all), deduplicated with the last write winning."""
+        if nodes is None:
+            positions = np.arange(len(self._indices), dtype=np.int64)
+            sources = np.repeat(
+                np.arange(self._base_nodes, dtype=np.int64), np.diff(self._indptr)
+            )
+            delta = self._delta_array()
+        else:
+            positions, sources = self._base_positions(nodes)
+            delta = self._delta_array(nodes.tolist())
+
+        edges = np.empty(len(positions) + len(delta), dtype=EDGE_DTYPE)
+        base = edges[: len(positions)]
+        base["source"] = sources
+        base["target"] = self._indices[positions]
+        base["kind"] = self._kinds[positions]
+        base["strength"] = self._strength[positions]
+        base["confidence"] = self._confidence[positions]
+        edges[len(positions) :] = delta
+
+        if not len(delta):
+            return edges
+        keys = edges["source"].astype(np.int64) * max(self.node_count, 1) + edges["target"]
+        _, last_reversed = np.unique(keys[::-1], return_index=True)
+        return edges[len(edges) - 1 - last_reversed]
+
+    def neighbors(self, idx: int) -> np.ndarray:
+        """Out-neighbour indexes of one node."""
+        with self.lock:
+            return self._edges_of(np.array([idx], dtype=np.int64))["target"].astype(np.int64)
+
+    def neighborhood(self, center: int, depth: int = 2) -> np.ndarray:
+        """Sorted indexes of nodes reachable from center in <= depth hops."""
+        with self.lock:
+            visited = np.array([center], dtype=np.int64)
+            frontier = visited
+            for _ in range(depth):
+                targets = self._edges_of(frontier)["target"].astype(np.int64)
+                frontier = np.setdiff1d(targets, visited)
+                if not len(frontier):
+                    break
+                visited = np.union1d(visited, frontier)
+            return visited
+
+    def edges_among(self, nodes: np.ndarray) -> np.ndarray:
+        """Links whose source and target are both in nodes (induced subgraph)."""
+        with self.lock:
+            edges = self._edges_of(np.asarray(nodes, dtype=np.int64))
+            return edges[np.isin(edges["target"], nodes)]
+
+    def edge_list(self) -> np.ndarray:
+        """All links as an EDGE_DTYPE array sorted by (source, target)."""
+        with self.lock:
+            return self._edges_of(None)
+
+    # ================================
+    # COMPACTION
+    # ================================
+
+    def compact(self):
+        """Merge the append log into a new CSR generation."""
+        with self.lock:
+            edges = self.edge_list()
+            order = np.lexsort((edges["target"], edges["source"]))
+            edges = edges[order]
+            node_count = self.node_count
+
+            arrays = {
+                "indptr": np.concatenate(
+                    ([0], np.cumsum(np.bincount(edges["source"], minlength=node_count)))
+                ).astype(np.int64),
+                "indices": edges["target"].astype(np.int32),
+                "kinds": edges["kind"].astype(np.uint8),
+                "strength": edges["strength"].astype(np.float32),
+                "confidence": edges["confidence"].astype(np.float32),
+                "in_degree": np.bincount(edges["target"], minlength=node_count).astype(
+                    np.int64
+                ),
+            }
+
+            merged = len(self._delta)
+            if self.graph_path is None:
+                self._reset_delta()
+                self._indptr = arrays["indptr"]
+                self._indices = arrays["indices"]
+                self._kinds = arrays["kinds"]
+                self._strength = arrays["strength"]
+                self._confidence = arrays["confidence"]
+                self._in_degree = arrays["in_degree"]
+                self._base_nodes = node_count
+                return
+
+            old_generation = self.generation
+            new_generation = old_generation + 1
+            directory = self._generation_dir(new_generation)
+            directory.mkdir(parents=True, exist_ok=True)
+            for name, array in arrays.items():
+                np.save(directory / f"{name}.npy", array)
+
+            # Switch the pointer atomically; the old generation stays valid until then
+            tmp_file = self._current_file.with_suffix(".tmp")
+            tmp_file.write_text(str(new_generation), encoding="utf-8")
+            os.replace(tmp_file, self._current_file)
+
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+            self._reset_delta()
+            self._load_generation()
+            shutil.rmtree(self._generation_dir(old_generation), ignore_errors=True)
+
+            logger.info(
+                f"Graph store compacted: generation {new_generation}, "
+                f"{len(edges)} links ({merged} merged from log)"
+            )
+
+    def get_stats(self) -> Dict:
+        """Store statistics."""
+        with self.lock:
+            return {
+                "nodes": self.node_count,
+                "links": self.edge_count,
+                "csr_links": len(self._indices),
+                "log_links": len(self._delta),
+                "generation": self.generation,
+                "persistent": self.graph_path is not None,
+            }
@@ -0,0 +1,313 @@
+"""
+Bulk Importance Rescoring for Collective Memory v3.0
+Streams active memories in id order, keeps time-independent factors in
+memory_importance_factors and recomputes the time-dependent part vectorized
+"""
+
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Project imports (relative)
+from .importance_scorer import ImportanceScorer
+from .memory_database import MemoryDatabase
+from ..relevance_scoring import parse_timestamps
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FACTOR_COLUMNS = (
+    "base_type",
+    "content_quality",
+    "context_relevance",
+    "user_interaction",
+    "code_complexity",
+    "error_criticality",
+    "decision_impact",
+    "keyword_bonus",
+)
+
+# ImportanceScorer time constants (recency e^(-age/30), usage decay e^(-idle/30))
+RECENCY_DECAY_DAYS = 30.0
+USAGE_DECAY_DAYS = 30.0
+FREQUENCY_SATURATION = 100
+SECONDS_PER_DAY = 86400
+
+# Scores closer than this to the stored value are not rewritten
+SCORE_EPSILON = 1e-6
+
+
+class ImportanceRescorer:
+    """
+    Periodic importance rescoring job
+
+    - Content factors are computed once per content_hash and stored
+    - Caller-set scores (memories.importance_base) are not replaced; only the
+      usage decay and access boost are applied on top of them
+    - Recency, frequency, usage decay and access boost are array operations
+      over each chunk (same formulas as ImportanceScorer)
+    - Only changed scores are written, with one executemany per chunk; the
+      writes set importance_rescored_at so triggers don't count them as
+      accesses or edits
+    """
+
+    def __init__(
+        self,
+        database: MemoryDatabase,
+        scorer: Optional[ImportanceScorer] = None,
+        chunk_size: int = 5000,
+    ):
+        self.database = database
+        self.scorer = scorer or ImportanceScorer()
+        self.chunk_size = chunk_size
+
+        self.last_run: Optional[Dict] = None
+
+    # ================================
+    # FACTORS
+    # ================================
+
+    def _refresh_factors(self, conn, stale_ids: List[int]) -> Dict[int, Dict[str, float]]:
+        """Compute and store content factors for new or changed memories."""
+        placeholders = ",".join("?" * len(stale_ids))
+        rows = conn.execute(
+            f"""
+            SELECT id, content, context, memory_type, content_hash, metadata
+            FROM memories WHERE id IN ({placeholders})
+        """,
+            stale_ids,
+        ).fetchall()
+
+        factors_by_id = {}
+        upserts = []
+        for row in rows:
+            try:
+                metadata = json.loads(row["metadata"]) if row["metadata"] else None
+            except (TypeError, ValueError):
+                metadata = None
+            factors = self.scorer.content_factors(
+                row["content"] or "",
+                row["memory_type"] or "fact",
+                row["context"] or "",
+                metadata if isinstance(metadata, dict) else None,
+            )
+            factors_by_id[row["id"]] = factors
+            upserts.append(
+                (
+                    row["id"],
+                    row["content_hash"],
+                    row["memory_type"],
+                    *(factors[column] for column in FACTOR_COLUMNS),
+                )
+            )
+
+        columns = ", ".join(FACTOR_COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in FACTOR_COLUMNS)
+        conn.executemany(
+            f"""
+            INSERT INTO memory_importance_factors
+                (memory_id, content_hash, memory_type, {columns})
+            VALUES (?, ?, ?, {", ".join("?" * len(FACTOR_COLUMNS))})
+            ON CONFLICT(memory_id) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                memory_type = excluded.memory_type,
+                {updates},
+                scored_at = CURRENT_TIMESTAMP
+        """,
+            upserts,
+        )
+        return factors_by_id
+
+    # ================================
+    # VECTORIZED SCORING
+    # ================================
+
+    @staticmethod
+    def _days_since(timestamps: np.ndarray, now: np.datetime64) -> np.ndarray:
+        """Whole days elapsed (floored like timedelta.days), NaN if unknown."""
+        seconds = (now - timestamps) / np.timedelta64(1, "s")
+        return np.floor(seconds / SECONDS_PER_DAY)
+
+    def compute_scores(
+        self,
+        factors: Dict[str, np.ndarray],
+        created_at: np.ndarray,
+        accessed_at: np.ndarray,
+        access_counts: np.ndarray,
+        now: np.datetime64,
+        base_scores: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """calculate_importance + update_importance_based_on_usage over arrays.
+
+        Where base_scores is not NaN it replaces calculate_importance, so only
+        the usage step is applied.
+        """
+        weights = self.scorer.weights
+
+        # Recency (e^(-age/30), 0.5 if created_at is unreadable)
+        age_days = self._days_since(created_at, now)
+        recency = np.where(
+            np.isnan(age_days), 0.5, np.exp(-np.nan_to_num(age_days) / RECENCY_DECAY_DAYS)
+        )
+
+        # Frequency (logarithmic, normalized to log(101))
+        counts = access_counts.astype(np.float64)
+        frequency = np.where(
+            counts > 0,
+            np.minimum(
+                1.0,
+                np.log(np.maximum(counts, 0) + 1) / np.log(FREQUENCY_SATURATION + 1),
+            ),
+            0.0,
+        )
+
+        score = (
+            factors["base_type"] * weights["base_type"]
+            + factors["content_quality"] * weights["content_quality"]
+            + recency * weights["recency"]
+            + frequency * weights["frequency"]
+            + factors["context_relevance"] * weights["context_relevance"]
+            + factors["user_interaction"] * weights["user_interaction"]
+            + factors["code_complexity"] * weights["code_complexity"]
+        )
+        score = np.clip(score + factors["keyword_bonus"], 0.0, 1.0)
+        if base_scores is not None:
+            score = np.where(np.isnan(base_scores), score, base_scores)
+
+        # Usage: decay by days since last access, boost by access count
+        idle_days = np.nan_to_num(self._days_since(accessed_at, now))
+        score = np.where(idle_days > 0, score * np.exp(-idle_days / USAGE_DECAY_DAYS), score)
+        score = score + np.minimum(0.1, counts * 0.01)
+
+        return np.clip(score, 0.0, 1.0)
+
+    # ================================
+    # JOB
+    # ================================
+
+    def run(
+        self, now: Optional[datetime] = None, memory_ids: Optional[List[int]] = None
+    ) -> Dict[str, float]:
+        """Rescore all active memories (or only memory_ids); returns run statistics.
+
+        Timestamps in the database are UTC (CURRENT_TIMESTAMP).
+        """
+        started = time.time()
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        now64 = np.datetime64(now, "us")
+        rescored_at = now.isoformat(sep=" ")
+
+        stats = {"scanned": 0, "factors_computed": 0, "updated": 0}
+        factor_select = ", ".join(f"f.{column}" for column in FACTOR_COLUMNS)
+        id_filter = ""
+        if memory_ids is not None:
+            if not memory_ids:
+                return dict(stats, duration=0.0)
+            id_filter = f"AND m.id IN ({','.join(str(int(i)) for i in memory_ids)})"
+        last_id = 0
+
+        while True:
+            with self.database.get_connection() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT m.id, m.content_hash, m.memory_type, m.importance_score,
+                           m.importance_base, m.access_count, m.created_at,
+                           m.accessed_at,
+                           f.memory_id IS NOT NULL
+                               AND f.content_hash IS m.content_hash
+                               AND m.content_hash IS NOT NULL
+                               AND f.memory_type IS m.memory_type AS fresh,
+                           {factor_select}
+                    FROM memories m
+                    LEFT JOIN memory_importance_factors f ON f.memory_id = m.id
+                    WHERE m.status = 'active' AND m.id > ? {id_filter}
+                    ORDER BY m.id
+                    LIMIT ?
+                """,
+                    (last_id, self.chunk_size),
+                ).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1]["id"]
+
+                # Content factors are only needed for derived scores
+                stale_ids = [
+                    row["id"]
+                    for row in rows
+                    if not row["fresh"] and row["importance_base"] is None
+                ]
+                refreshed = self._refresh_factors(conn, stale_ids) if stale_ids else {}
+                stats["factors_computed"] += len(refreshed)
+
+                factors = {
+                    column: np.array(
+                        [
+                            refreshed[row["id"]][column]
+                            if row["id"] in refreshed
+                            else row[column] if row[column] is not None else 0.0
+                            for row in rows
+                        ],
+                        dtype=np.float64,
+                    )
+                    for column in FACTOR_COLUMNS
+                }
+                scores = self.compute_scores(
+                    factors,
+                    parse_timestamps(row["created_at"] for row in rows),
+                    parse_timestamps(row["accessed_at"] for row in rows),
+                    np.array([row["access_count"] or 0 for row in rows], dtype=np.int64),
+                    now64,
+                    np.array(
+                        [
+                            row["importance_base"]
+                            if row["importance_base"] is not None
+                            else np.nan
+                            for row in rows
+                        ],
+                        dtype=np.float64,
+                    ),
+                )
+
+                ids = np.array([row["id"] for row in rows], dtype=np.int64)
+                current = np.array(
+                    [
+                        row["importance_score"] if row["importance_score"] is not None else -1
+                        for row in rows
+                    ],
+                    dtype=np.float64,
+                )
+                changed = np.abs(scores - current) > SCORE_EPSILON
+                conn.executemany(
+                    """
+                    UPDATE memories SET importance_score = ?, importance_rescored_at = ?
+                    WHERE id = ?
+                """,
+                    [
+                        (score, rescored_at, memory_id)
+                        for score, memory_id in zip(
+                            scores[changed].tolist(), ids[changed].tolist()
+                        )
+                    ],
+                )
+
+                stats["scanned"] += len(rows)
+                stats["updated"] += int(changed.sum())
+
+        stats["duration"] = time.time() - started
+        if memory_ids is not None:
+            # Targeted runs score new memories; they are not job runs
+            return stats
+        self.last_run = dict(stats, finished_at=now.isoformat())
+        logger.info(
+            "Rescored %d memories (%d updated, %d factor rows computed) in %.2fs",
+            stats["scanned"],
+            stats["updated"],
+            stats["factors_computed"],
+            stats["duration"],
+        )
+        return stats
@@ -6,12 +6,15 @@ A-Mem + Mem0 inspired memory importance calculation
 import re
 import math
 import logging
-from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
 import json
 
+from ..keyword_matcher import get_keyword_matcher, is_whole_word
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -40,6 +43,13 @@ class ContentCategory(Enum):
     GENERAL = 0.4
 
 
+class KeywordScan(NamedTuple):
+    """Keyword hits of one content string (single Aho–Corasick pass)."""
+
+    substrings: Set[str]
+    words: Counter
+
+
 @dataclass
 class ScoringFactors:
     """Factors that influence importance scoring."""
@@ -115,71 +125,139 @@ class ImportanceScorer:
             "decorator": 0.04,
         }
 
+        # Error severity / system impact indicators (whole words)
+        self.severity_indicators = {
+            ("fatal", "critical", "severe"): 0.4,
+            ("error", "exception", "fail"): 0.3,
+            ("warning", "warn"): 0.2,
+            ("info", "debug"): 0.1,
+        }
+        self.impact_indicators = {
+            ("crash", "hang", "freeze", "deadlock"): 0.3,
+            ("memory", "leak", "overflow", "corruption"): 0.25,
+            ("security", "vulnerability", "breach"): 0.35,
+            ("data", "loss", "corruption"): 0.3,
+            ("performance", "slow", "timeout"): 0.2,
+        }
+
+        # Decision strength / scope / timeline indicators (whole words)
+        self.decision_indicators = {
+            ("decided", "chosen", "selected", "will use", "adopted"): 0.3,
+            ("prefer", "recommend", "suggest"): 0.2,
+            ("might", "could", "maybe", "perhaps"): 0.1,
+        }
+        self.scope_indicators = {
+            ("architecture", "design", "framework", "library"): 0.3,
+            ("project", "team", "company", "organization"): 0.25,
+            ("feature", "module", "component"): 0.2,
+            ("function", "method", "variable"): 0.1,
+        }
+        self.timeline_indicators = {
+            ("permanent", "forever", "always"): 0.3,
+            ("long-term", "long term", "long_term", "strategic"): 0.25,
+            ("short-term", "short term", "short_term", "temporary", "quick"): 0.1,
+        }
+
+        self.build_keyword_matcher()
+
+    def build_keyword_matcher(self):
+        """(Re)build the shared matcher over every keyword table."""
+        keywords = set(self.important_keywords) | set(self.complexity_indicators)
+        for table in (
+            self.severity_indicators,
+            self.impact_indicators,
+            self.decision_indicators,
+            self.scope_indicators,
+            self.timeline_indicators,
+        ):
+            for group in table:
+                keywords.update(group)
+        self.keyword_matcher = get_keyword_matcher(keywords)
+
+    def scan_keywords(self, content: str) -> KeywordScan:
+        """All keyword hits of content in one pass (substring and whole-word)."""
+        substrings = set()
+        words = Counter()
+        for hit in self.keyword_matcher.iter_hits(content or ""):
+            substrings.add(hit.keyword)
+            if is_whole_word(content, hit):
+                words[hit.keyword] += 1
+        return KeywordScan(substrings, words)
+
     def calculate_importance(
         self, content: str, memory_type: str, context: str = None, metadata: Dict = None
     ) -> float:
         """Calculate importance score for a memory."""
 
-        factors = ScoringFactors()
-
-        # 1. Base type score
-        base_score = self._get_base_type_score(memory_type)
-
-        # 2. Content quality score
-        factors.content_quality = self._calculate_content_quality(content)
-
-        # 3. Context relevance score
-        factors.context_relevance = self._calculate_context_relevance(content, context)
+        # 1-3, 6-9: time-independent factors (content, type, context)
+        factors = self.content_factors(content, memory_type, context, metadata)
 
         # 4. Recency score (if metadata available)
+        recency = 0.0
         if metadata and "created_at" in metadata:
-            factors.recency = self._calculate_recency_score(metadata["created_at"])
+            recency = self._calculate_recency_score(metadata["created_at"])
 
         # 5. Frequency score (if metadata available)
+        frequency = 0.0
         if metadata and "access_count" in metadata:
-            factors.frequency = self._calculate_frequency_score(
-                metadata["access_count"]
-            )
-
-        # 6. User interaction score
-        factors.user_interaction = self._calculate_user_interaction_score(
-            content, metadata
-        )
+            frequency = self._calculate_frequency_score(metadata["access_count"])
 
-        # 7. Code complexity score (if it's code)
-        if memory_type == "code":
-            factors.code_complexity = self._calculate_code_complexity(content)
+        final_score = self.combine_factors(factors, recency, frequency)
 
-        # 8. Error criticality score (if it's an error)
-        if memory_type == "error":
-            factors.error_criticality = self._calculate_error_criticality(content)
+        logger.debug(
+            f"Importance score calculated: {final_score:.3f} for type: {memory_type}"
+        )
+        return final_score
 
-        # 9. Decision impact score (if it's a decision)
-        if memory_type == "decision":
-            factors.decision_impact = self._calculate_decision_impact(content)
+    def content_factors(
+        self, content: str, memory_type: str, context: str = None, metadata: Dict = None
+    ) -> Dict[str, float]:
+        """Time-independent scoring factors (stable until the content changes)."""
+        scan = self.scan_keywords(content)
+        return {
+            "base_type": self._get_base_type_score(memory_type),
+            "content_quality": self._calculate_content_quality(content),
+            "context_relevance": self._calculate_context_relevance(content, context),
+            "user_interaction": self._calculate_user_interaction_score(
+                content, metadata
+            ),
+            "code_complexity": (
+                self._calculate_code_complexity(content, scan)
+                if memory_type == "code"
+                else 0.0
+            ),
+            "error_criticality": (
+                self._calculate_error_criticality(content, scan)
+                if memory_type == "error"
+                else 0.0
+            ),
+            "decision_impact": (
+                self._calculate_decision_impact(content, scan)
+                if memory_type == "decision"
+                else 0.0
+            ),
+            "keyword_bonus": self._calculate_keyword_bonus(content, scan),
+        }
 
-        # Calculate weighted final score
+    def combine_factors(
+        self, factors: Dict[str, float], recency: float = 0.0, frequency: float = 0.0
+    ) -> float:
+        """Weighted final score from content factors and temporal factors."""
         final_score = (
-            base_score * self.weights["base_type"]
-            + factors.content_quality * self.weights["content_quality"]
-            + factors.recency * self.weights["recency"]
-            + factors.frequency * self.weights["frequency"]
-            + factors.context_relevance * self.weights["context_relevance"]
-            + factors.user_interaction * self.weights["user_interaction"]
-            + factors.code_complexity * self.weights["code_complexity"]
+            factors["base_type"] * self.weights["base_type"]
+            + factors["content_quality"] * self.weights["content_quality"]
+            + recency * self.weights["recency"]
+            + frequency * self.weights["frequency"]
+            + factors["context_relevance"] * self.weights["context_relevance"]
+            + factors["user_interaction"] * self.weights["user_interaction"]
+            + factors["code_complexity"] * self.weights["code_complexity"]
         )
 
         # Apply keyword bonuses
-        keyword_bonus = self._calculate_keyword_bonus(content)
-        final_score += keyword_bonus
+        final_score += factors["keyword_bonus"]
 
         # Normalize to 0-1 range
-        final_score = max(0.0, min(1.0, final_score))
-
-        logger.debug(
-            f"Importance score calculated: {final_score:.3f} for type: {memory_type}"
-        )
-        return final_score
+        return max(0.0, min(1.0, final_score))
 
     def _get_base_type_score(self, memory_type: str) -> float:
         """Get base importance score for memory type."""
@@ -332,14 +410,16 @@ class ImportanceScorer:
 
         return min(1.0, interaction_score)
 
-    def _calculate_code_complexity(self, content: str) -> float:
+    def _calculate_code_complexity(
+        self, content: str, scan: Optional[KeywordScan] = None
+    ) -> float:
         """Calculate code complexity score."""
         complexity_score = 0.0
+        scan = scan or self.scan_keywords(content)
 
         # Count complexity indicators
         for indicator, weight in self.complexity_indicators.items():
-            count = len(re.findall(rf"\b{indicator}\b", content, re.IGNORECASE))
-            complexity_score += count * weight
+            complexity_score += scan.words[indicator] * weight
 
         # Nesting level (approximate)
         nesting_indicators = ["{", "(", "["]
@@ -361,34 +441,24 @@ class ImportanceScorer:
 
         return min(1.0, complexity_score)
 
-    def _calculate_error_criticality(self, content: str) -> float:
-        """Calculate error criticality score."""
-        criticality_score = 0.0
-
-        # Error severity indicators
-        severity_patterns = {
-            r"\b(fatal|critical|severe)\b": 0.4,
-            r"\b(error|exception|fail)\b": 0.3,
-            r"\b(warning|warn)\b": 0.2,
-            r"\b(info|debug)\b": 0.1,
-        }
+    @staticmethod
+    def _group_score(scan: KeywordScan, table: Dict[Tuple[str, ...], float]) -> float:
+        """Sum the weights of groups with at least one whole-word hit."""
+        return sum(
+            weight
+            for group, weight in table.items()
+            if any(scan.words[keyword] for keyword in group)
+        )
 
-        for pattern, weight in severity_patterns.items():
-            if re.search(pattern, content, re.IGNORECASE):
-                criticality_score += weight
-
-        # System impact indicators
-        impact_patterns = {
-            r"\b(crash|hang|freeze|deadlock)\b": 0.3,
-            r"\b(memory|leak|overflow|corruption)\b": 0.25,
-            r"\b(security|vulnerability|breach)\b": 0.35,
-            r"\b(data|loss|corruption)\b": 0.3,
-            r"\b(performance|slow|timeout)\b": 0.2,
-        }
+    def _calculate_error_criticality(
+        self, content: str, scan: Optional[KeywordScan] = None
+    ) -> float:
+        """Calculate error criticality score."""
+        scan = scan or self.scan_keywords(content)
 
-        for pattern, weight in impact_patterns.items():
-            if re.search(pattern, content, re.IGNORECASE):
-                criticality_score += weight
+        # Error severity and system impact indicators
+        criticality_score = self._group_score(scan, self.severity_indicators)
+        criticality_score += self._group_score(scan, self.impact_indicators)
 
         # Stack trace presence
         if re.search(r"Traceback|Stack trace|at \w+\.\w+", content):
@@ -396,53 +466,29 @@ class ImportanceScorer:
 
         return min(1.0, criticality_score)
 
-    def _calculate_decision_impact(self, content: str) -> float:
+    def _calculate_decision_impact(
+        self, content: str, scan: Optional[KeywordScan] = None
+    ) -> float:
         """Calculate decision impact score."""
-        impact_score = 0.0
-
-        # Decision strength indicators
-        decision_patterns = {
-            r"\b(decided|chosen|selected|will use|adopted)\b": 0.3,
-            r"\b(prefer|recommend|suggest)\b": 0.2,
-            r"\b(might|could|maybe|perhaps)\b": 0.1,
-        }
+        scan = scan or self.scan_keywords(content)
 
-        for pattern, weight in decision_patterns.items():
-            if re.search(pattern, content, re.IGNORECASE):
-                impact_score += weight
-
-        # Scope indicators
-        scope_patterns = {
-            r"\b(architecture|design|framework|library)\b": 0.3,
-            r"\b(project|team|company|organization)\b": 0.25,
-            r"\b(feature|module|component)\b": 0.2,
-            r"\b(function|method|variable)\b": 0.1,
-        }
-
-        for pattern, weight in scope_patterns.items():
-            if re.search(pattern, content, re.IGNORECASE):
-                impact_score += weight
-
-        # Timeline indicators
-        timeline_patterns = {
-            r"\b(permanent|forever|always)\b": 0.3,
-            r"\b(long.term|strategic)\b": 0.25,
-            r"\b(short.term|temporary|quick)\b": 0.1,
-        }
-
-        for pattern, weight in timeline_patterns.items():
-            if re.search(pattern, content, re.IGNORECASE):
-                impact_score += weight
+        # Decision strength, scope and timeline indicators
+        impact_score = self._group_score(scan, self.decision_indicators)
+        impact_score += self._group_score(scan, self.scope_indicators)
+        impact_score += self._group_score(scan, self.timeline_indicators)
 
         return min(1.0, impact_score)
 
-    def _calculate_keyword_bonus(self, content: str) -> float:
+    def _calculate_keyword_bonus(
+        self, content: str, scan: Optional[KeywordScan] = None
+    ) -> float:
         """Calculate bonus score based on important keywords."""
-        bonus_score = 0.0
-
-        for keyword, weight in self.important_keywords.items():
-            if keyword in content.lower():
-                bonus_score += weight
+        scan = scan or self.scan_keywords(content)
+        bonus_score = sum(
+            weight
+            for keyword, weight in self.important_keywords.items()
+            if keyword in scan.substrings
+        )
 
         # Cap the bonus to prevent over-weighting
         return min(0.2, bonus_score)
@@ -6,21 +6,54 @@ Dynamic memory evolution with ADD/UPDATE/DELETE/NOOP operations
 import json
 import logging
 import re
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, List, Optional, Sequence, Tuple, Set
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
 import hashlib
 import difflib
 from collections import defaultdict
-import spacy
-from sentence_transformers import SentenceTransformer
+from itertools import islice
 import numpy as np
 
+try:
+    import spacy
+except ImportError:
+    spacy = None
+
+# Project imports (relative)
+from ..embedding_service import get_embedding_service
+from ..keyword_matcher import get_keyword_matcher
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Line length guards for pattern extraction (minified code, base64 blobs etc.)
+MIN_FACT_LINE_CHARS = 4
+MAX_FACT_LINE_CHARS = 2000
+
+# spaCy components needed for entities and noun chunks; the rest are disabled
+SPACY_COMPONENTS = ("tok2vec", "tagger", "attribute_ruler", "parser", "ner")
+SPACY_BATCH_SIZE = 64
+
+# Entity and keyword extraction
+FILE_PATH_PATTERNS = [
+    re.compile(r"[a-zA-Z]:[\\/][\w\\/.-]+\.\w+"),
+    re.compile(r"[/~][\w/.-]+\.\w+"),
+    re.compile(r"[\w.-]+\.py|[\w.-]+\.js|[\w.-]+\.html"),
+]
+FUNCTION_PATTERN = re.compile(r"\b[a-zA-Z_][a-zA-Z0-9_]*\(")
+WORD_PATTERN = re.compile(r"\b\w+\b")
+KEYWORD_STOP_WORDS = frozenset(
+    {
+        "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of",
+        "with", "by", "this", "that", "these", "those", "is", "are", "was", "were",
+        "be", "been", "being", "have", "has", "had", "do", "does", "did", "will",
+        "would", "could", "should", "may", "might",
+    }
+)  # fmt: skip
+
 
 class EvolutionAction(Enum):
     """Types of evolution actions."""
@@ -73,6 +106,7 @@ class EvolutionDecision:
     confidence: float
     reasoning: str
     metadata: Dict
+    fact_embedding: Optional[np.ndarray] = None  # normalized, reused on write
 
 
 @dataclass
@@ -86,16 +120,82 @@ class EvolutionResult:
     processing_time: float
 
 
+def _name_capture_groups(pattern: str, prefix: str) -> Tuple[str, List[str]]:
+    """Rename unnamed capture groups to (?P<prefix_i>...)."""
+    parts: List[str] = []
+    names: List[str] = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            parts.append(pattern[i : i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(" and not pattern.startswith("?", i + 1):
+            name = f"{prefix}_{len(names)}"
+            names.append(name)
+            parts.append(f"(?P<{name}>")
+            i += 1
+            continue
+        parts.append(char)
+        i += 1
+
+    named = "".join(parts)
+    if not names:
+        names.append(f"{prefix}_0")
+        named = f"(?P<{names[0]}>{named})"
+    return named, names
+
+
+def compile_fact_patterns(
+    fact_patterns: Dict["FactType", List[str]]
+) -> Tuple["re.Pattern", List[Tuple["FactType", List[str]]]]:
+    """Merge all fact patterns into one regex applied once per line.
+
+    Every pattern becomes an optional lookahead with named groups
+    (<fact_type>_<pattern>_<group>), so a single match at the start of a line
+    captures the first match of every pattern. Because `.` never crosses a
+    newline, that is exactly what re.findall returned per line. Patterns that
+    start with `(.*)` are already anchored at the line start and get no `.*?`
+    prefix, which avoids findall's retry-from-every-offset backtracking.
+    """
+    branches = []
+    specs = []
+    for fact_type, patterns in fact_patterns.items():
+        for index, pattern in enumerate(patterns):
+            named, groups = _name_capture_groups(
+                pattern, f"{fact_type.name.lower()}_{index}"
+            )
+            prefix = "" if pattern.startswith("(.*)") else ".*?"
+            branches.append(f"(?:(?={prefix}{named}))?")
+            specs.append((fact_type, groups))
+
+    return re.compile("^" + "".join(branches), re.IGNORECASE), specs
+
+
 class FactExtractor:
     """Extracts facts from user-AI interactions."""
 
     def __init__(self):
         """Initialize fact extractor."""
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            logger.warning("spaCy English model not found. Using basic extraction.")
-            self.nlp = None
+        self.nlp = None
+        if spacy is None:
+            logger.warning("spaCy not installed. Using basic extraction.")
+        else:
+            try:
+                self.nlp = spacy.load("en_core_web_sm")
+                self.nlp.select_pipes(
+                    disable=[
+                        name for name in self.nlp.pipe_names if name not in SPACY_COMPONENTS
+                    ]
+                )
+            except OSError:
+                logger.warning("spaCy English model not found. Using basic extraction.")
 
         # Fact patterns
         self.fact_patterns = {
@@ -166,71 +266,119 @@ class FactExtractor:
             "trivial": 0.2,
         }
 
+        self.compile_patterns()
+        self.lines_skipped = 0
+
+    def compile_patterns(self):
+        """(Re)build the single-pass matcher from fact_patterns."""
+        self.fact_matcher, self._pattern_specs = compile_fact_patterns(self.fact_patterns)
+
     def extract_facts(
         self, user_input: str, ai_response: str, context: Dict
     ) -> List[ExtractedFact]:
         """Extract facts from user-AI interaction."""
-        facts = []
+        return self.extract_facts_batch([(user_input, ai_response, context)])[0]
+
+    def extract_facts_batch(
+        self, interactions: Sequence[Tuple[str, str, Dict]]
+    ) -> List[List[ExtractedFact]]:
+        """Extract facts from many (user_input, ai_response, context) interactions.
+
+        spaCy parses all texts with one nlp.pipe call.
+        """
+        texts = [
+            text for user_input, ai_response, _ in interactions
+            for text in (user_input, ai_response)
+        ]  # fmt: skip
+        docs = self._parse_texts(texts)
+
+        results = []
+        for i, (user_input, ai_response, context) in enumerate(interactions):
+            facts = self._extract_from_text(user_input, "user", context, docs[2 * i])
+            facts.extend(
+                self._extract_from_text(ai_response, "assistant", context, docs[2 * i + 1])
+            )
+            results.append(self._post_process_facts(facts))
 
-        # Extract from user input
-        user_facts = self._extract_from_text(user_input, "user", context)
-        facts.extend(user_facts)
+        return results
 
-        # Extract from AI response
-        ai_facts = self._extract_from_text(ai_response, "assistant", context)
-        facts.extend(ai_facts)
+    def _parse_texts(self, texts: List[str]) -> List:
+        """spaCy docs for texts (None entries without a model)."""
+        if not self.nlp:
+            return [None] * len(texts)
 
-        # Post-process facts
-        facts = self._post_process_facts(facts)
+        try:
+            return list(self.nlp.pipe(texts, batch_size=SPACY_BATCH_SIZE))
+        except Exception as e:
+            logger.debug(f"NLP extraction error: {e}")
+            return [None] * len(texts)
 
-        return facts
+    def _match_patterns(self, text: str) -> List[List[str]]:
+        """Pattern matches per fact pattern, in line order."""
+        matches: List[List[str]] = [[] for _ in self._pattern_specs]
+
+        for line in text.split("\n"):
+            if len(line) < MIN_FACT_LINE_CHARS:
+                continue
+            if len(line) > MAX_FACT_LINE_CHARS:
+                self.lines_skipped += 1
+                continue
+
+            match = self.fact_matcher.match(line)
+            for index, (_, groups) in enumerate(self._pattern_specs):
+                if match.group(groups[0]) is not None:
+                    matches[index].append(" ".join(match.group(g) for g in groups))
+
+        return matches
 
     def _extract_from_text(
-        self, text: str, source: str, context: Dict
+        self, text: str, source: str, context: Dict, doc=None
     ) -> List[ExtractedFact]:
-        """Extract facts from a single text."""
+        """Extract facts from a single text (doc: its spaCy parse, if any)."""
         facts = []
-
-        # Extract using patterns
-        for fact_type, patterns in self.fact_patterns.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        content = " ".join(match)
-                    else:
-                        content = match
-
-                    if len(content.strip()) > 3:  # Ignore very short matches
-                        fact = ExtractedFact(
-                            content=content.strip(),
-                            fact_type=fact_type,
-                            confidence=0.7,
-                            importance=self._calculate_importance(content, context),
-                            context=context,
-                            entities=self._extract_entities(content),
-                            keywords=self._extract_keywords(content),
-                            timestamp=datetime.now(),
-                            source=source,
-                        )
-                        facts.append(fact)
+        timestamp = datetime.now()
+        analyzed: Dict[str, Tuple[float, List[str], List[str]]] = {}
+
+        # Extract using patterns (same order as pattern-by-pattern findall)
+        matches = self._match_patterns(text)
+        for (fact_type, _), contents in zip(self._pattern_specs, matches):
+            for content in contents:
+                if len(content.strip()) <= 3:  # Ignore very short matches
+                    continue
+
+                if content not in analyzed:
+                    analyzed[content] = (
+                        self._calculate_importance(content, context),
+                        self._extract_entities(content),
+                        self._extract_keywords(content),
+                    )
+                importance, entities, keywords = analyzed[content]
+
+                facts.append(
+                    ExtractedFact(
+                        content=content.strip(),
+                        fact_type=fact_type,
+                        confidence=0.7,
+                        importance=importance,
+                        context=context,
+                        entities=list(entities),
+                        keywords=list(keywords),
+                        timestamp=timestamp,
+                        source=source,
+                    )
+                )
 
         # Extract using NLP if available
-        if self.nlp:
-            nlp_facts = self._extract_using_nlp(text, source, context)
-            facts.extend(nlp_facts)
+        if doc is not None:
+            facts.extend(self._facts_from_doc(doc, source, context))
 
         return facts
 
-    def _extract_using_nlp(
-        self, text: str, source: str, context: Dict
-    ) -> List[ExtractedFact]:
-        """Extract facts using NLP."""
+    def _facts_from_doc(self, doc, source: str, context: Dict) -> List[ExtractedFact]:
+        """Extract facts from a spaCy doc."""
         facts = []
 
         try:
-            doc = self.nlp(text)
-
             # Extract entities
             for ent in doc.ents:
                 if ent.label_ in ["PERSON", "ORG", "PRODUCT", "EVENT"]:
@@ -273,8 +421,9 @@ class FactExtractor:
         importance = 0.5  # Base importance
 
         # Check for importance indicators
+        matched = get_keyword_matcher(self.importance_indicators).matched(content)
         for indicator, weight in self.importance_indicators.items():
-            if indicator in content.lower():
+            if indicator in matched:
                 importance = max(importance, weight)
 
         # Context-based importance
@@ -298,70 +447,21 @@ class FactExtractor:
         entities = []
 
         # Extract file paths
-        file_patterns = [
-            r"[a-zA-Z]:[\\/][\w\\/.-]+\.\w+",
-            r"[/~][\w/.-]+\.\w+",
-            r"[\w.-]+\.py|[\w.-]+\.js|[\w.-]+\.html",
-        ]
-
-        for pattern in file_patterns:
-            matches = re.findall(pattern, text)
-            entities.extend(matches)
+        for pattern in FILE_PATH_PATTERNS:
+            entities.extend(pattern.findall(text))
 
         # Extract function names
-        function_pattern = r"\b[a-zA-Z_][a-zA-Z0-9_]*\("
-        functions = re.findall(function_pattern, text)
-        entities.extend([f[:-1] for f in functions])
+        entities.extend(f[:-1] for f in FUNCTION_PATTERN.findall(text))
 
         return list(set(entities))
 
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract keywords from text."""
-        # Simple keyword extraction
-        words = re.findall(r"\b\w+\b", text.lower())
-
-        # Filter out common words
-        stop_words = {
-            "the",
-            "a",
-            "an",
-            "and",
-            "or",
-            "but",
-            "in",
-            "on",
-            "at",
-            "to",
-            "for",
-            "of",
-            "with",
-            "by",
-            "this",
-            "that",
-            "these",
-            "those",
-            "is",
-            "are",
-            "was",
-            "were",
-            "be",
-            "been",
-            "being",
-            "have",
-            "has",
-            "had",
-            "do",
-            "does",
-            "did",
-            "will",
-            "would",
-            "could",
-            "should",
-            "may",
-            "might",
-        }
-
-        keywords = [word for word in words if word not in stop_words and len(word) > 2]
+        # Simple keyword extraction, common words filtered out
+        words = WORD_PATTERN.findall(text.lower())
+        keywords = [
+            word for word in words if word not in KEYWORD_STOP_WORDS and len(word) > 2
+        ]
 
         return list(set(keywords))
 
@@ -386,35 +486,220 @@ class FactExtractor:
 class EvolutionDecisionMaker:
     """Makes decisions about how to evolve memory based on extracted facts."""
 
-    def __init__(self, memory_database=None):
-        """Initialize decision maker."""
+    def __init__(self, memory_database=None, sentence_model=None, vector_index=None):
+        """Initialize decision maker.
+
+        sentence_model: any object with encode(texts) -> (n, dim) matrix;
+        defaults to the shared, preloaded embedding service.
+        vector_index: optional VectorIndex over the same model's memory
+        embeddings; candidates then come from its top-k search instead of
+        streaming every stored embedding.
+        """
         self.memory_database = memory_database
+        self.vector_index = vector_index
         self.similarity_threshold = 0.7
         self.update_threshold = 0.8
         self.delete_threshold = 0.9
+        self.min_similarity = 0.3
+        self.max_candidates = 10
+        # Embeddings scored per chunk while streaming (bounds memory use)
+        self.candidate_chunk_size = 4096
+        # Index hits fetched per fact, before filtering by memory type
+        self.index_oversample = 4
+        self.embedding_model_name = getattr(
+            sentence_model, "model_name", "all-MiniLM-L6-v2"
+        )
 
-        # Initialize sentence transformer for semantic similarity
-        try:
-            self.sentence_model = SentenceTransformer("all-MiniLM-L6-v2")
-        except Exception as e:
-            logger.warning(f"Could not load sentence transformer: {e}")
-            self.sentence_model = None
+        # Shared sentence transformer for semantic similarity
+        if sentence_model is None:
+            try:
+                sentence_model = get_embedding_service(self.embedding_model_name)
+            except Exception as e:
+                logger.warning(f"Could not load sentence transformer: {e}")
+        self.sentence_model = sentence_model
 
     def make_decisions(self, facts: List[ExtractedFact]) -> List[EvolutionDecision]:
-        """Make evolution decisions for extracted facts."""
-        decisions = []
+        """Make evolution decisions for extracted facts.
 
-        for fact in facts:
-            decision = self._make_decision_for_fact(fact)
+        All facts are embedded in one model call and compared against stored
+        memory embeddings with a single (facts x candidates) matrix product.
+        Without a model, falls back to LIKE lookup + word overlap per fact.
+        """
+        if not facts:
+            return []
+
+        fact_vectors = self._encode_facts(facts)
+        if fact_vectors is None:
+            return [self._make_decision_for_fact(fact) for fact in facts]
+
+        similar_by_fact = self._find_similar_memories_batch(facts, fact_vectors)
+
+        decisions = []
+        for fact, vector, similar_memories in zip(facts, fact_vectors, similar_by_fact):
+            decision = self._make_decision_for_fact(fact, similar_memories)
+            decision.fact_embedding = vector
             decisions.append(decision)
 
         return decisions
 
-    def _make_decision_for_fact(self, fact: ExtractedFact) -> EvolutionDecision:
+    def _encode_facts(self, facts: List[ExtractedFact]) -> Optional[np.ndarray]:
+        """Embed all fact contents in one call (rows unit-normalized)."""
+        if not self.sentence_model:
+            return None
+
+        try:
+            vectors = np.asarray(
+                self.sentence_model.encode(
+                    [fact.content for fact in facts], convert_to_numpy=True
+                ),
+                dtype=np.float32,
+            )
+        except Exception as e:
+            logger.debug(f"Sentence transformer error: {e}")
+            return None
+
+        return self._normalize(vectors)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _stream_top_candidates(
+        self, memory_type: str, vectors: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Running top-max_candidates (ids, scores) per row of vectors.
+
+        Stored embeddings are streamed in chunks of candidate_chunk_size, so
+        only one chunk is held in memory regardless of the number of memories.
+        """
+        n = len(vectors)
+        best_ids = np.empty((n, 0), dtype=np.int64)
+        best_scores = np.empty((n, 0), dtype=np.float32)
+
+        stream = self.memory_database.iter_embeddings(
+            self.embedding_model_name,
+            batch_size=self.candidate_chunk_size,
+            memory_types=[memory_type],
+        )
+        while True:
+            chunk = list(islice(stream, self.candidate_chunk_size))
+            if not chunk:
+                break
+            chunk = [
+                (memory_id, vector)
+                for memory_id, vector in chunk
+                if vector.shape[0] == vectors.shape[1]
+            ]
+            if not chunk:
+                continue
+
+            ids = np.array([memory_id for memory_id, _ in chunk], dtype=np.int64)
+            scores = vectors @ self._normalize(np.vstack([v for _, v in chunk])).T
+
+            best_scores = np.hstack([best_scores, scores.astype(np.float32)])
+            best_ids = np.hstack([best_ids, np.broadcast_to(ids, (n, len(ids)))])
+            if best_scores.shape[1] > self.max_candidates:
+                keep = np.argpartition(-best_scores, self.max_candidates - 1, axis=1)
+                keep = keep[:, : self.max_candidates]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_ids = np.take_along_axis(best_ids, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        return (
+            np.take_along_axis(best_ids, order, axis=1),
+            np.take_along_axis(best_scores, order, axis=1),
+        )
+
+    def _use_vector_index(self, dimension: int) -> bool:
+        return (
+            self.vector_index is not None
+            and len(self.vector_index) > 0
+            and self.vector_index.dimension == dimension
+        )
+
+    def _find_similar_memories_batch(
+        self, facts: List[ExtractedFact], fact_vectors: np.ndarray
+    ) -> List[List[Dict]]:
+        """Top similar memories of the same type for every fact.
+
+        Candidates come from the vector index when one is attached, otherwise
+        from a chunked scan keeping a running top-k per fact.
+        """
+        if not self.memory_database:
+            return [[] for _ in facts]
+
+        try:
+            hits_by_fact: List[List[Tuple[int, float]]] = [[] for _ in facts]
+            if self._use_vector_index(fact_vectors.shape[1]):
+                # Over-fetch: hits of other memory types are filtered out below
+                k = self.max_candidates * self.index_oversample
+                for row, vector in enumerate(fact_vectors):
+                    hits_by_fact[row] = self.vector_index.search(vector, k=k)
+            else:
+                rows_by_type: Dict[str, List[int]] = defaultdict(list)
+                for row, fact in enumerate(facts):
+                    rows_by_type[fact.fact_type.value].append(row)
+                for memory_type, rows in rows_by_type.items():
+                    ids, scores = self._stream_top_candidates(
+                        memory_type, fact_vectors[rows]
+                    )
+                    for row, row_ids, row_scores in zip(rows, ids, scores):
+                        hits_by_fact[row] = list(
+                            zip(row_ids.tolist(), row_scores.tolist())
+                        )
+
+            memories = self.memory_database.get_memories_by_ids(
+                sorted(
+                    {
+                        memory_id
+                        for hits in hits_by_fact
+                        for memory_id, score in hits
+                        if score > self.min_similarity
+                    }
+                )
+            )
+
+            similar_by_fact = []
+            for fact, hits in zip(facts, hits_by_fact):
+                similar_memories = []
+                for memory_id, score in hits:
+                    memory = memories.get(memory_id)
+                    # Only active memories of the fact's own type compete
+                    if (
+                        score <= self.min_similarity
+                        or memory is None
+                        or memory["status"] != "active"
+                        or memory["memory_type"] != fact.fact_type.value
+                    ):
+                        continue
+                    similar_memories.append(
+                        {
+                            "id": memory["id"],
+                            "content": memory["content"],
+                            "similarity": float(score),
+                            "memory": memory,
+                        }
+                    )
+                    if len(similar_memories) >= self.max_candidates:
+                        break
+                similar_by_fact.append(similar_memories)
+
+            return similar_by_fact
+
+        except Exception as e:
+            logger.error(f"Error finding similar memories: {e}")
+            return [[] for _ in facts]
+
+    def _make_decision_for_fact(
+        self, fact: ExtractedFact, similar_memories: Optional[List[Dict]] = None
+    ) -> EvolutionDecision:
         """Make evolution decision for a single fact."""
 
         # Find similar existing memories
-        similar_memories = self._find_similar_memories(fact)
+        if similar_memories is None:
+            similar_memories = self._find_similar_memories(fact)
 
         if not similar_memories:
             # No similar memory found, add new one
@@ -477,7 +762,7 @@ class EvolutionDecisionMaker:
         )
 
     def _find_similar_memories(self, fact: ExtractedFact) -> List[Dict]:
-        """Find similar memories in the database."""
+        """Find similar memories in the database (keyword fallback without a model)."""
         if not self.memory_database:
             return []
 
@@ -492,8 +777,8 @@ class EvolutionDecisionMaker:
             # Calculate similarity with each memory
             similar_memories = []
             for memory in memories:
-                similarity = self._calculate_similarity(fact.content, memory["content"])
-                if similarity > 0.3:  # Minimum similarity threshold
+                similarity = self._simple_similarity(fact.content, memory["content"])
+                if similarity > self.min_similarity:
                     similar_memories.append(
                         {
                             "id": memory["id"],
@@ -589,11 +874,13 @@ class EvolutionDecisionMaker:
 class Mem0EvolutionEngine:
     """Main Mem0-inspired evolution engine."""
 
-    def __init__(self, memory_database=None):
+    def __init__(self, memory_database=None, sentence_model=None, vector_index=None):
         """Initialize evolution engine."""
         self.memory_database = memory_database
         self.fact_extractor = FactExtractor()
-        self.decision_maker = EvolutionDecisionMaker(memory_database)
+        self.decision_maker = EvolutionDecisionMaker(
+            memory_database, sentence_model, vector_index
+        )
 
         # Statistics
         self.stats = {
@@ -683,6 +970,7 @@ class Mem0EvolutionEngine:
                         "keywords": decision.fact.keywords,
                     },
                 )
+                self._store_fact_embedding(memory_id, decision)
 
                 return {
                     "action": "ADD",
@@ -702,6 +990,7 @@ class Mem0EvolutionEngine:
                 )
 
                 if success:
+                    self._store_fact_embedding(decision.existing_memory_id, decision)
                     return {
                         "action": "UPDATE",
                         "memory_id": decision.existing_memory_id,
@@ -737,6 +1026,19 @@ class Mem0EvolutionEngine:
             logger.error(f"Error executing decision {decision.action}: {e}")
             return None
 
+    def _store_fact_embedding(self, memory_id: Optional[int], decision: EvolutionDecision):
+        """Persist the fact vector computed during decisions (no second model call)."""
+        if memory_id is None or decision.fact_embedding is None:
+            return
+        if hasattr(self.memory_database, "store_embedding"):
+            self.memory_database.store_embedding(
+                memory_id,
+                decision.fact_embedding,
+                self.decision_maker.embedding_model_name,
+            )
+        if self.decision_maker.vector_index is not None:
+            self.decision_maker.vector_index.add(memory_id, decision.fact_embedding)
+
     def _update_statistics(
         self, facts: List[ExtractedFact], actions: List[Dict], processing_time: float
     ):
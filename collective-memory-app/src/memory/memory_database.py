@@ -4,18 +4,181 @@ A-Mem + Mem0 Hybrid Memory System
 """
 
 # Standard library imports
+import hashlib
 import logging
 import os
 import json
-from typing import Optional, Dict, List, Any
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, List, Any, Iterator, Callable, Tuple
 import sqlite3
 from datetime import datetime, timedelta
 
+import numpy as np
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def normalize_content(content: str) -> str:
+    """Normalize memory content for deduplication (case and whitespace)."""
+    return " ".join((content or "").split()).casefold()
+
+
+def content_hash(content: str) -> str:
+    """Hash of the normalized memory content."""
+    return hashlib.sha256(normalize_content(content).encode("utf-8")).hexdigest()
+
+
+class ConnectionPool:
+    """
+    Bounded SQLite connection pool with thread-local reuse
+
+    Features:
+    - PRAGMA'lar bağlantı başına yalnızca bir kez uygulanır
+    - Aynı thread içindeki iç içe çağrılar aynı bağlantıyı paylaşır
+    - sqlite3 prepared statement cache (cached_statements)
+    - Read-only mod (mode=ro, query_only) ile paralel okuma
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_connections: int = 1,
+        read_only: bool = False,
+        timeout: float = 30.0,
+        statement_cache_size: int = 256,
+    ):
+        self.db_path = db_path
+        self.max_connections = max(1, max_connections)
+        self.read_only = read_only
+        self.timeout = timeout
+        self.statement_cache_size = statement_cache_size
+
+        self._idle: List[sqlite3.Connection] = []
+        self._connections: List[sqlite3.Connection] = []
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection and apply PRAGMAs once."""
+        if self.read_only:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(
+                uri,
+                uri=True,
+                timeout=self.timeout,
+                check_same_thread=False,
+                cached_statements=self.statement_cache_size,
+            )
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.timeout,
+                check_same_thread=False,
+                cached_statements=self.statement_cache_size,
+            )
+            conn.execute("PRAGMA journal_mode = WAL")  # Better concurrency
+            conn.execute("PRAGMA synchronous = NORMAL")
+
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA cache_size = 10000")  # Increase cache
+        return conn
+
+    def held_connection(self) -> Optional[sqlite3.Connection]:
+        """Return the connection held by the current thread, if any."""
+        return getattr(self._local, "connection", None)
+
+    def acquire(self) -> sqlite3.Connection:
+        """Acquire a connection, reusing the one this thread already holds."""
+        held = self.held_connection()
+        if held is not None:
+            self._local.depth += 1
+            return held
+
+        deadline = time.monotonic() + self.timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection pool is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if len(self._connections) < self.max_connections:
+                    conn = self._connect()
+                    self._connections.append(conn)
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"No database connection available within {self.timeout}s"
+                    )
+                self._condition.wait(remaining)
+
+        self._local.connection = conn
+        self._local.depth = 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        """Release a connection acquired by the current thread."""
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+
+        self._local.connection = None
+        with self._condition:
+            if self._closed:
+                conn.close()
+                self._connections.remove(conn)
+            else:
+                self._idle.append(conn)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Context manager: commit/rollback only at the outermost level."""
+        conn = self.acquire()
+        outermost = self._local.depth == 1
+        try:
+            yield conn
+            if outermost:
+                conn.commit()
+        except BaseException:
+            if outermost:
+                conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close idle connections; busy ones are closed on release."""
+        with self._condition:
+            self._closed = True
+            for conn in self._idle:
+                conn.close()
+                self._connections.remove(conn)
+            self._idle.clear()
+            self._condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        with self._condition:
+            return {
+                "max_connections": self.max_connections,
+                "open_connections": len(self._connections),
+                "idle_connections": len(self._idle),
+                "read_only": self.read_only,
+                "closed": self._closed,
+            }
+
+
 class MemoryDatabase:
     """
     Advanced Memory Database Manager
@@ -26,15 +189,35 @@ class MemoryDatabase:
     - Conversation context tracking
     - Entity relationship management
     - Performance optimization with indexes
+    - Connection pooling (single writer + read-only reader pool)
     """
 
-    def __init__(self, db_path: str = "../data/memory_system.db"):
+    # Columns added to memories after the first release: (name, declaration)
+    MIGRATED_MEMORY_COLUMNS = (
+        ("content_hash", "TEXT"),
+        ("importance_rescored_at", "TIMESTAMP"),
+        ("importance_base", "REAL"),
+    )
+
+    def __init__(self, db_path: str = "../data/memory_system.db", read_pool_size: int = 4):
         """Initialize the memory database."""
         self.db_path = db_path
-        self.schema_path = "src/database/memory_schema.sql"
+        self.schema_path = str(
+            Path(__file__).resolve().parent.parent / "database" / "memory_schema.sql"
+        )
 
         # Ensure database directory exists
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        # SQLite tek yazıcıya izin verir; okumalar WAL ile paralel çalışır
+        self.writer_pool = ConnectionPool(db_path, max_connections=1)
+        self.reader_pool = ConnectionPool(
+            db_path, max_connections=read_pool_size, read_only=True
+        )
+
+        # Change listeners: callback(event_type, memory_id, data)
+        self._listeners: List[Callable[[str, int, Dict], None]] = []
 
         # Initialize database
         self._init_database()
@@ -44,18 +227,19 @@ class MemoryDatabase:
     def _init_database(self):
         """Initialize database with schema."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 # Read and execute schema
                 if os.path.exists(self.schema_path):
                     with open(self.schema_path, "r", encoding="utf-8") as f:
                         schema_sql = f.read()
 
-                    # Execute schema in parts (SQLite doesn't like multiple statements)
-                    for statement in schema_sql.split(";"):
-                        if statement.strip():
-                            conn.execute(statement)
-
-                    conn.commit()
+                    # Columns first: the schema's triggers and indexes reference them
+                    self._migrate_columns(conn)
+                    # executescript handles trigger bodies that contain ';'
+                    conn.executescript(schema_sql)
+                    # Triggers before backfills, so UPDATEs fire the current triggers
+                    self._migrate_importance_rescoring(conn)
+                    self._migrate_content_hash(conn)
                     logger.info("Database schema initialized successfully")
                 else:
                     logger.warning(f"Schema file not found: {self.schema_path}")
@@ -64,67 +248,260 @@ class MemoryDatabase:
             logger.error(f"Database initialization error: {e}")
             raise
 
-    def get_connection(self) -> sqlite3.Connection:
-        """Get database connection with optimized settings."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA journal_mode = WAL")  # Better concurrency
-        conn.execute("PRAGMA cache_size = 10000")  # Increase cache
-        return conn
+    def _migrate_columns(self, conn: sqlite3.Connection):
+        """Add columns missing from an existing memories table (no-op on a new database)."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(memories)")}
+        if not columns:
+            return
+        for name, declaration in self.MIGRATED_MEMORY_COLUMNS:
+            if name not in columns:
+                conn.execute(f"ALTER TABLE memories ADD COLUMN {name} {declaration}")
+                logger.info(f"Added memories.{name} column")
+
+    def _migrate_content_hash(self, conn: sqlite3.Connection):
+        """
+        Add/backfill memories.content_hash and its unique index.
+
+        Mevcut kopyaların yalnızca ilki hash alır; diğerleri compact_duplicates()
+        ile birleştirilene kadar NULL kalır, böylece unique index her zaman kurulur.
+        """
+        rows = conn.execute(
+            "SELECT id, content, status FROM memories WHERE content_hash IS NULL ORDER BY id"
+        ).fetchall()
+        if rows:
+            taken = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT content_hash FROM memories "
+                    "WHERE status = 'active' AND content_hash IS NOT NULL"
+                )
+            }
+            updates = []
+            for row in rows:
+                memory_hash = content_hash(row["content"])
+                if row["status"] == "active":
+                    if memory_hash in taken:
+                        continue
+                    taken.add(memory_hash)
+                updates.append((memory_hash, row["id"]))
+
+            conn.executemany("UPDATE memories SET content_hash = ? WHERE id = ?", updates)
+            if len(updates) < len(rows):
+                logger.warning(
+                    f"{len(rows) - len(updates)} duplicate memories found, "
+                    "run compact_duplicates() to merge them"
+                )
+
+        conn.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_memories_content_hash
+            ON memories(content_hash) WHERE status = 'active'
+        """
+        )
+
+    def _migrate_importance_rescoring(self, conn: sqlite3.Connection):
+        """
+        Exempt rescoring writes from the access/timestamp triggers (older
+        databases have triggers without WHEN; the column is added by
+        _migrate_columns).
+        """
+
+        triggers = {
+            "update_memories_timestamp": """
+                CREATE TRIGGER update_memories_timestamp
+                    AFTER UPDATE ON memories
+                    FOR EACH ROW
+                    WHEN NEW.importance_rescored_at IS OLD.importance_rescored_at
+                    BEGIN
+                        UPDATE memories SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+                    END
+            """,
+            "update_memory_access": """
+                CREATE TRIGGER update_memory_access
+                    AFTER UPDATE OF importance_score, relevance_score ON memories
+                    FOR EACH ROW
+                    WHEN NEW.importance_rescored_at IS OLD.importance_rescored_at
+                    BEGIN
+                        UPDATE memories SET
+                            accessed_at = CURRENT_TIMESTAMP,
+                            access_count = access_count + 1
+                        WHERE id = NEW.id;
+                    END
+            """,
+        }
+        for name, create_sql in triggers.items():
+            row = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)
+            ).fetchone()
+            if row is None or "importance_rescored_at" not in row[0]:
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                conn.execute(create_sql)
+
+    def get_connection(self):
+        """Get pooled writer connection (context manager, commits on exit)."""
+        return self.writer_pool.connection()
+
+    def get_read_connection(self):
+        """Get pooled read-only connection for search traffic."""
+        # Yazma işlemi içindeki okumalar commit edilmemiş veriyi görmeli
+        if self.writer_pool.held_connection() is not None:
+            return self.writer_pool.connection()
+        return self.reader_pool.connection()
 
     # ================================
     # MEMORY OPERATIONS (A-Mem inspired)
     # ================================
 
-    def store_memory(
+    def _upsert_memory(
         self,
+        cursor: sqlite3.Cursor,
         content: str,
         context: Optional[str] = None,
         memory_type: str = "fact",
-        importance_score: float = 0.5,
+        importance_score: Optional[float] = None,
         project_path: Optional[str] = None,
         cursor_session_id: Optional[str] = None,
         metadata: Optional[Dict] = None,
-    ) -> Optional[int]:
-        """Store a new memory in the database."""
+    ) -> Tuple[int, bool]:
+        """Insert a memory or bump access stats of its active duplicate.
+
+        An explicit importance_score is also kept as importance_base, which the
+        rescoring job decays instead of replacing; without one the memory starts
+        at 0.5 and is scored from its content.
+        """
+
+        # Generate summary (truncate content if too long)
+        summary = content[:200] + "..." if len(content) > 200 else content
+
+        # Prepare metadata
+        metadata_json = json.dumps(metadata) if metadata else None
+
+        # Yeni kayıtta access_count 0'dır; kopyada ON CONFLICT ile artırılır
+        cursor.execute(
+            """
+            INSERT INTO memories (
+                content, context, summary, memory_type, importance_score,
+                importance_base, project_path, cursor_session_id, metadata,
+                content_hash
+            ) VALUES (?, ?, ?, ?, COALESCE(?, 0.5), ?, ?, ?, ?, ?)
+            ON CONFLICT(content_hash) WHERE status = 'active' DO UPDATE SET
+                access_count = access_count + 1,
+                accessed_at = CURRENT_TIMESTAMP
+            RETURNING id, access_count
+        """,
+            (
+                content,
+                context,
+                summary,
+                memory_type,
+                importance_score,
+                importance_score,
+                project_path,
+                cursor_session_id,
+                metadata_json,
+                content_hash(content),
+            ),
+        )
+        row = cursor.fetchone()
+        return row["id"], row["access_count"] > 0
+
+    def upsert_memory(
+        self,
+        content: str,
+        context: Optional[str] = None,
+        memory_type: str = "fact",
+        importance_score: Optional[float] = None,
+        project_path: Optional[str] = None,
+        cursor_session_id: Optional[str] = None,
+        metadata: Optional[Dict] = None,
+    ) -> Tuple[Optional[int], bool]:
+        """Store a memory; returns (memory_id, is_duplicate)."""
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            # Generate summary (truncate content if too long)
-            summary = content[:200] + "..." if len(content) > 200 else content
+            memory_id, is_duplicate = self._upsert_memory(
+                cursor,
+                content,
+                context=context,
+                memory_type=memory_type,
+                importance_score=importance_score,
+                project_path=project_path,
+                cursor_session_id=cursor_session_id,
+                metadata=metadata,
+            )
 
-            # Prepare metadata
-            metadata_json = json.dumps(metadata) if metadata else None
+            # Log event
+            if not is_duplicate:
+                self._log_event("memory_stored", {"memory_id": memory_id})
+
+        if is_duplicate:
+            self._notify("memory_deduplicated", memory_id)
+            logger.debug(f"Duplicate memory, access count bumped: {memory_id}")
+        else:
+            self._notify("memory_stored", memory_id, content=content)
+            logger.info(f"Memory stored with ID: {memory_id}")
+        return memory_id, is_duplicate
 
-            # Insert memory
-            cursor.execute(
-                """
-                INSERT INTO memories (
-                    content, context, summary, memory_type, importance_score,
-                    project_path, cursor_session_id, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    content,
-                    context,
-                    summary,
-                    memory_type,
-                    importance_score,
-                    project_path,
-                    cursor_session_id,
-                    metadata_json,
-                ),
-            )
+    def store_memory(
+        self,
+        content: str,
+        context: Optional[str] = None,
+        memory_type: str = "fact",
+        importance_score: Optional[float] = None,
+        project_path: Optional[str] = None,
+        cursor_session_id: Optional[str] = None,
+        metadata: Optional[Dict] = None,
+    ) -> Optional[int]:
+        """Store a new memory in the database (duplicates return the existing id)."""
+        memory_id, _ = self.upsert_memory(
+            content,
+            context=context,
+            memory_type=memory_type,
+            importance_score=importance_score,
+            project_path=project_path,
+            cursor_session_id=cursor_session_id,
+            metadata=metadata,
+        )
+        return memory_id
+
+    def store_memories(self, memories: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """
+        Store many memories in one transaction.
+
+        Each item takes store_memory() keyword arguments; duplicates (within the
+        batch or against existing memories) resolve to the same id.
+        """
+        memory_ids: List[Optional[int]] = []
+        stored: Dict[int, str] = {}
+        duplicates: List[int] = []
 
-            memory_id = cursor.lastrowid
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
 
-            # Log event
-            self._log_event("memory_stored", {"memory_id": memory_id})
+            for item in memories:
+                memory_id, is_duplicate = self._upsert_memory(cursor, **item)
+                memory_ids.append(memory_id)
+                if is_duplicate and memory_id not in stored:
+                    duplicates.append(memory_id)
+                elif not is_duplicate:
+                    stored[memory_id] = item["content"]
 
-            logger.info(f"Memory stored with ID: {memory_id}")
-            return memory_id
+            if stored:
+                self._log_event(
+                    "memories_stored",
+                    {"count": len(stored), "duplicates": len(memories) - len(stored)},
+                )
+
+        for memory_id, content in stored.items():
+            self._notify("memory_stored", memory_id, content=content)
+        for memory_id in dict.fromkeys(duplicates):
+            self._notify("memory_deduplicated", memory_id)
+
+        logger.info(
+            f"Stored {len(stored)} memories ({len(memories) - len(stored)} duplicates)"
+        )
+        return memory_ids
 
     def retrieve_memories(
         self,
@@ -136,7 +513,7 @@ class MemoryDatabase:
     ) -> List[Dict]:
         """Retrieve memories based on criteria."""
 
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
 
             # Build query
@@ -173,17 +550,39 @@ class MemoryDatabase:
             rows = cursor.fetchall()
 
             # Convert to dictionaries
-            memories = []
-            for row in rows:
-                memory = dict(row)
-                # Parse JSON fields
-                if memory["metadata"]:
-                    memory["metadata"] = json.loads(memory["metadata"])
-                memories.append(memory)
+            memories = [self._row_to_memory(row) for row in rows]
 
             logger.info("Retrieved %d memories", len(memories))
             return memories
 
+    @staticmethod
+    def _row_to_memory(row: sqlite3.Row) -> Dict:
+        """Convert a memories row to a dictionary (without the embedding BLOB)."""
+        memory = dict(row)
+        memory.pop("embedding_vector", None)
+        # Parse JSON fields
+        if memory.get("metadata"):
+            memory["metadata"] = json.loads(memory["metadata"])
+        return memory
+
+    def get_memories_by_ids(self, memory_ids: List[int]) -> Dict[int, Dict]:
+        """Fetch memories by id (used by vector search)."""
+        memories: Dict[int, Dict] = {}
+        if not memory_ids:
+            return memories
+
+        with self.get_read_connection() as conn:
+            for i in range(0, len(memory_ids), 500):
+                chunk = memory_ids[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT * FROM memories WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+                for row in rows:
+                    memories[row["id"]] = self._row_to_memory(row)
+
+        return memories
+
     def update_memory(
         self,
         memory_id: int,
@@ -208,10 +607,14 @@ class MemoryDatabase:
                 summary = content[:200] + "..." if len(content) > 200 else content
                 updates.append("summary = ?")
                 params.append(summary)
+                updates.append("content_hash = ?")
+                params.append(content_hash(content))
 
             if importance_score is not None:
                 updates.append("importance_score = ?")
                 params.append(importance_score)
+                updates.append("importance_base = ?")
+                params.append(importance_score)
 
             if status is not None:
                 updates.append("status = ?")
@@ -230,7 +633,14 @@ class MemoryDatabase:
 
             # Execute update
             sql = f"UPDATE memories SET {', '.join(updates)} WHERE id = ?"
-            cursor.execute(sql, params)
+            try:
+                cursor.execute(sql, params)
+            except sqlite3.IntegrityError:
+                # Aynı içeriğe sahip başka bir aktif memory var
+                logger.warning(
+                    "Memory %d not updated: duplicate of an active memory", memory_id
+                )
+                return False
 
             success = cursor.rowcount > 0
 
@@ -238,7 +648,15 @@ class MemoryDatabase:
                 self._log_event("memory_updated", {"memory_id": memory_id})
                 logger.info("Memory %d updated successfully", memory_id)
 
-            return success
+        if success:
+            self._notify(
+                "memory_updated",
+                memory_id,
+                content=content,
+                importance_score=importance_score,
+                status=status,
+            )
+        return success
 
     def delete_memory(self, memory_id: int, soft_delete: bool = True) -> bool:
         """Delete a memory (soft or hard delete)."""
@@ -264,7 +682,114 @@ class MemoryDatabase:
                 )
                 logger.info(f"Memory {memory_id} deleted (soft: {soft_delete})")
 
-            return success
+        if success:
+            self._notify("memory_deleted", memory_id, soft_delete=soft_delete)
+        return success
+
+    # ================================
+    # EMBEDDINGS
+    # ================================
+
+    def store_embedding(
+        self, memory_id: int, vector: np.ndarray, model_name: str
+    ) -> bool:
+        """Store a float32 embedding in memories.embedding_vector."""
+        blob = np.asarray(vector, dtype=np.float32).tobytes()
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE memories SET embedding_vector = ?, embedding_model = ?
+                WHERE id = ?
+            """,
+                (blob, model_name, memory_id),
+            )
+            return cursor.rowcount > 0
+
+    def store_embeddings(
+        self, items: List[Tuple[int, np.ndarray]], model_name: str
+    ) -> int:
+        """Store many embeddings with one executemany (returns rows updated)."""
+        if not items:
+            return 0
+        with self.get_connection() as conn:
+            cursor = conn.executemany(
+                """
+                UPDATE memories SET embedding_vector = ?, embedding_model = ?
+                WHERE id = ?
+            """,
+                [
+                    (np.asarray(vector, dtype=np.float32).tobytes(), model_name, memory_id)
+                    for memory_id, vector in items
+                ],
+            )
+            return cursor.rowcount
+
+    def iter_embeddings(
+        self,
+        model_name: Optional[str] = None,
+        batch_size: int = 1000,
+        memory_types: Optional[List[str]] = None,
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """Stream (memory_id, vector) pairs of active memories with embeddings."""
+        sql = """
+            SELECT id, embedding_vector FROM memories
+            WHERE status = 'active' AND embedding_vector IS NOT NULL AND id > ?
+        """
+        params: List[Any] = []
+        if model_name:
+            sql += " AND embedding_model = ?"
+            params.append(model_name)
+        if memory_types:
+            sql += f" AND memory_type IN ({','.join('?' * len(memory_types))})"
+            params.extend(memory_types)
+        sql += " ORDER BY id LIMIT ?"
+
+        last_id = 0
+        while True:
+            with self.get_read_connection() as conn:
+                rows = conn.execute(sql, [last_id, *params, batch_size]).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row["id"], np.frombuffer(row["embedding_vector"], dtype=np.float32)
+            last_id = rows[-1]["id"]
+
+    def iter_unembedded_memories(
+        self, model_name: str, batch_size: int = 1000
+    ) -> Iterator[List[Tuple[int, str]]]:
+        """Stream (memory_id, content) chunks of active memories lacking a model embedding."""
+        sql = """
+            SELECT id, content FROM memories
+            WHERE status = 'active' AND id > ?
+              AND (embedding_vector IS NULL OR embedding_model IS NOT ?)
+            ORDER BY id LIMIT ?
+        """
+        last_id = 0
+        while True:
+            with self.get_read_connection() as conn:
+                rows = conn.execute(sql, (last_id, model_name, batch_size)).fetchall()
+            if not rows:
+                return
+            yield [(row["id"], row["content"]) for row in rows]
+            last_id = rows[-1]["id"]
+
+    # ================================
+    # CHANGE LISTENERS
+    # ================================
+
+    def add_listener(self, callback: Callable[[str, int, Dict], None]):
+        """Register a callback for memory_stored/updated/deleted events."""
+        self._listeners.append(callback)
+
+    def _notify(self, event_type: str, memory_id: Optional[int], **data):
+        """Notify listeners after a memory change."""
+        if memory_id is None:
+            return
+        for callback in self._listeners:
+            try:
+                callback(event_type, memory_id, data)
+            except Exception as e:
+                logger.error(f"Memory listener error ({event_type}): {e}")
 
     # ================================
     # MEMORY LINKING (Zettelkasten inspired)
@@ -313,7 +838,6 @@ class MemoryDatabase:
                 )
 
                 logger.info(f"Memory link created: {memory_id_1} -> {memory_id_2}")
-                return link_id
 
             except sqlite3.IntegrityError:
                 # Link already exists
@@ -322,10 +846,13 @@ class MemoryDatabase:
                 )
                 return None
 
+        self._notify("memory_linked", memory_id_1, linked_memory_id=memory_id_2)
+        return link_id
+
     def get_memory_links(self, memory_id: int) -> List[Dict]:
         """Get all links for a specific memory."""
 
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
 
             cursor.execute(
@@ -459,7 +986,7 @@ class MemoryDatabase:
     def get_system_stats(self) -> Dict:
         """Get system statistics."""
 
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
 
             stats = {}
@@ -507,7 +1034,11 @@ class MemoryDatabase:
             context_stats = dict(cursor.fetchone())
             stats["conversations"] = context_stats
 
-            return stats
+        stats["connection_pool"] = {
+            "writer": self.writer_pool.get_stats(),
+            "reader": self.reader_pool.get_stats(),
+        }
+        return stats
 
     def cleanup_old_memories(self, days_old: int = 30):
         """Clean up old, inactive memories."""
@@ -520,16 +1051,21 @@ class MemoryDatabase:
             # Archive old memories with low importance
             cursor.execute(
                 """
-                UPDATE memories
-                SET status = 'archived'
+                SELECT id FROM memories
                 WHERE status = 'active'
                 AND importance_score < 0.3
                 AND accessed_at < ?
             """,
                 (cutoff_date,),
             )
+            archived_ids = [row["id"] for row in cursor.fetchall()]
+
+            cursor.executemany(
+                "UPDATE memories SET status = 'archived' WHERE id = ?",
+                [(memory_id,) for memory_id in archived_ids],
+            )
 
-            archived_count = cursor.rowcount
+            archived_count = len(archived_ids)
 
             self._log_event(
                 "memory_cleanup",
@@ -540,10 +1076,106 @@ class MemoryDatabase:
             )
 
             logger.info("Archived %d old memories", archived_count)
-            return archived_count
+
+        for memory_id in archived_ids:
+            self._notify("memory_updated", memory_id, status="archived")
+        return archived_count
+
+    def compact_duplicates(self) -> Dict[str, int]:
+        """
+        Merge active memories with the same normalized content.
+
+        The oldest memory of each group is kept; access counts are summed,
+        the highest importance is kept and links/references are re-pointed
+        to the kept memory before the duplicates are removed.
+        """
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, content, content_hash, access_count, importance_score
+                FROM memories WHERE status = 'active' ORDER BY id
+            """
+            ).fetchall()
+
+            groups: Dict[str, List[sqlite3.Row]] = {}
+            for row in rows:
+                groups.setdefault(content_hash(row["content"]), []).append(row)
+            groups = {h: group for h, group in groups.items() if len(group) > 1}
+
+            merges: List[Tuple[int, int]] = []  # (duplicate_id, keeper_id)
+            for memory_hash, group in groups.items():
+                # Hash'i zaten atanmış kayıt (unique index'teki) korunur
+                keeper = next((r for r in group if r["content_hash"] == memory_hash), group[0])
+                duplicates = [r for r in group if r["id"] != keeper["id"]]
+                merges.extend((r["id"], keeper["id"]) for r in duplicates)
+
+                conn.execute(
+                    "UPDATE memories SET access_count = ?, content_hash = ? WHERE id = ?",
+                    (
+                        sum(r["access_count"] or 0 for r in group) + len(duplicates),
+                        memory_hash,
+                        keeper["id"],
+                    ),
+                )
+                # importance_score güncellemesi update_memory_access trigger'ını
+                # tetikler; yalnızca gerçekten artıyorsa yazılır
+                importance = max(r["importance_score"] or 0.0 for r in group)
+                if importance > (keeper["importance_score"] or 0.0):
+                    conn.execute(
+                        "UPDATE memories SET importance_score = ? WHERE id = ?",
+                        (importance, keeper["id"]),
+                    )
+
+            links_before = conn.execute("SELECT COUNT(*) FROM memory_links").fetchone()[0]
+            if merges:
+                params = [(keeper_id, duplicate_id) for duplicate_id, keeper_id in merges]
+                # Çakışan (zaten var olan) linkler OR IGNORE ile atlanır, sonra silinir
+                conn.executemany(
+                    "UPDATE OR IGNORE memory_links SET memory_id_1 = ? WHERE memory_id_1 = ?",
+                    params,
+                )
+                conn.executemany(
+                    "UPDATE OR IGNORE memory_links SET memory_id_2 = ? WHERE memory_id_2 = ?",
+                    params,
+                )
+                for table, column in (
+                    ("memories", "parent_memory_id"),
+                    ("entities", "source_memory_id"),
+                    ("memory_events", "memory_id"),
+                ):
+                    conn.executemany(
+                        f"UPDATE {table} SET {column} = ? WHERE {column} = ?", params
+                    )
+
+                duplicate_ids = [(duplicate_id,) for duplicate_id, _ in merges]
+                conn.executemany(
+                    "DELETE FROM memory_links WHERE memory_id_1 = ? OR memory_id_2 = ?",
+                    [(memory_id, memory_id) for (memory_id,) in duplicate_ids],
+                )
+                conn.execute("DELETE FROM memory_links WHERE memory_id_1 = memory_id_2")
+                conn.executemany("DELETE FROM memories WHERE id = ?", duplicate_ids)
+
+            links_after = conn.execute("SELECT COUNT(*) FROM memory_links").fetchone()[0]
+            result = {
+                "groups": len(groups),
+                "merged": len(merges),
+                "links_removed": links_before - links_after,
+            }
+            self._log_event("memory_compaction", result)
+
+        for duplicate_id, keeper_id in merges:
+            self._notify("memory_deleted", duplicate_id, soft_delete=False)
+            self._notify("memory_merged", keeper_id, merged_memory_id=duplicate_id)
+
+        logger.info(
+            "Compacted %d duplicate memories in %d groups", result["merged"], result["groups"]
+        )
+        return result
 
     def close(self):
-        """Close database connection."""
+        """Close all pooled database connections."""
+        self.reader_pool.close()
+        self.writer_pool.close()
         logger.info("Memory Database closed")
 
 
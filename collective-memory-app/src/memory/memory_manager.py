@@ -3,17 +3,24 @@ Memory Manager Core for Collective Memory v3.0
 A-Mem + Mem0 Hybrid Memory System
 """
 
-import json
 import logging
+import os
 import threading
-from typing import Dict, List, Optional, Any
+import time
+from typing import Callable, Dict, List, Optional, Any, Set
 from datetime import datetime
-import hashlib
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+import numpy as np
 
 # Project imports (relative)
+from .amem_engine import AMemEngine
 from .memory_database import MemoryDatabase, MemoryEvolutionEngine
 from .importance_scorer import ImportanceScorer
+from .importance_rescoring import ImportanceRescorer
+from .vector_index import VectorIndex
+from ..embedding_service import get_embedding_service
+from ..result_cache import ResultCache
 from ..cursor.cursor_integration import CursorIntegrationManager, CursorConversation
 
 # Configure logging
@@ -74,26 +81,47 @@ class MemoryManager:
     - Performance optimization
     """
 
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        encoder: Optional[Callable[[List[str]], np.ndarray]] = None,
+    ):
         """Initialize Memory Manager."""
         self.config = config or self._load_default_config()
 
         # Initialize core components
-        self.database = MemoryDatabase(
-            self.config.get("database_path", "../data/memory_system.db")
-        )
+        database_path = self.config.get("database_path", "../data/memory_system.db")
+        self.database = MemoryDatabase(database_path)
         self.importance_scorer = ImportanceScorer()
+        self.importance_rescorer = ImportanceRescorer(
+            self.database,
+            self.importance_scorer,
+            chunk_size=self.config.get("importance_rescoring_chunk_size", 5000),
+        )
         self.evolution_engine = MemoryEvolutionEngine(self.database)
 
+        # A-Mem network, persisted next to the memory database (opened lazily)
+        self.amem_graph_path = self.config.get(
+            "amem_graph_path", os.path.join(os.path.dirname(database_path), "amem_graph")
+        )
+        self._amem_engine: Optional[AMemEngine] = None
+        self._amem_lock = threading.Lock()
+
         # Initialize Cursor integration
         self.cursor_integration = CursorIntegrationManager(
-            memory_database=self.database
+            memory_database=self.database,
+            state_path=self.config.get(
+                "cursor_state_path",
+                os.path.join(os.path.dirname(database_path), "cursor_ingest_state.json"),
+            ),
         )
 
-        # Memory cache for performance
-        self.memory_cache: Dict[str, List[Dict[str, Any]]] = {}
+        # Search result cache (LRU + TTL, invalidated by database change events)
         self.cache_size = self.config.get("cache_size", 1000)
-        self.cache_lock = threading.Lock()
+        self.result_cache = ResultCache(
+            max_entries=self.cache_size,
+            ttl_seconds=self.config.get("cache_ttl_seconds", 300),
+        )
 
         # Performance metrics
         self.metrics = {
@@ -102,12 +130,46 @@ class MemoryManager:
             "avg_search_time": 0.0,
             "cache_hits": 0,
             "cache_misses": 0,
+            "duplicates_merged": 0,
         }
 
         # Auto-linking settings
         self.auto_linking_enabled = self.config.get("auto_linking_enabled", True)
         self.linking_threshold = self.config.get("linking_threshold", 0.7)
 
+        # Semantic search: embedding encoder + vector index (loaded lazily)
+        self.embedding_model = self.config.get("embedding_model", "all-MiniLM-L6-v2")
+        self.embedding_encoder = encoder
+        self._encoder_load_failed = False
+        self.embedding_batch_size = self.config.get("embedding_batch_size", 64)
+        self.embedding_batch_wait = self.config.get("embedding_batch_wait_ms", 10) / 1000.0
+
+        # Memories waiting to be embedded (id -> content); a worker thread
+        # encodes them in batches so writes never wait on the model
+        self._pending_embeddings: Dict[int, str] = {}
+        self._embedding_in_flight: Set[int] = set()
+        self._embedding_cancelled: Set[int] = set()
+        self._embedding_condition = threading.Condition()
+        self._embedding_running = True
+        # Until the startup backfill has embedded older memories, vector hits
+        # are merged with LIKE results so unembedded memories stay findable
+        self._embedding_backfill_pending = False
+        self.vector_index = VectorIndex(
+            self.config.get(
+                "vector_index_path",
+                os.path.join(os.path.dirname(database_path), "memory_vectors"),
+            ),
+            mode=self.config.get("vector_index_mode", "flat"),
+            compact_ratio=self.config.get("vector_index_compact_ratio", 0.25),
+            rebuild_source=lambda: self.database.iter_embeddings(self.embedding_model),
+        )
+        self.database.add_listener(self._on_memory_changed)
+        self.database.add_listener(self._invalidate_cache)
+
+        # Preload the shared embedding model in the background
+        if encoder is None and self.config.get("semantic_search_enabled", True):
+            get_embedding_service(self.embedding_model)
+
         # Start background tasks
         self._start_background_tasks()
 
@@ -118,14 +180,30 @@ class MemoryManager:
         return {
             "database_path": "../data/memory_system.db",
             "cache_size": 1000,
+            "cache_ttl_seconds": 300,
             "auto_linking_enabled": True,
             "linking_threshold": 0.7,
             "cleanup_interval_hours": 24,
             "cursor_monitoring_enabled": True,
             "semantic_search_enabled": True,
+            "embedding_model": "all-MiniLM-L6-v2",
+            "vector_index_mode": "flat",
             "max_memories": 10000,
+            "importance_rescoring_enabled": True,
+            "importance_rescoring_chunk_size": 5000,
         }
 
+    @property
+    def amem_engine(self) -> AMemEngine:
+        """A-Mem engine on the persistent graph store (network survives restarts)."""
+        if self._amem_engine is None:
+            with self._amem_lock:
+                if self._amem_engine is None:
+                    # Node payloads live in the graph store; A-Mem node types are
+                    # not valid memories.memory_type values
+                    self._amem_engine = AMemEngine(graph_path=self.amem_graph_path)
+        return self._amem_engine
+
     def _start_background_tasks(self):
         """Start background tasks."""
         # Start periodic cleanup
@@ -134,6 +212,23 @@ class MemoryManager:
         )
         cleanup_thread.start()
 
+        # Start batched embedding worker
+        self._embedding_thread = threading.Thread(
+            target=self._embedding_worker, name="memory-embeddings", daemon=True
+        )
+        self._embedding_thread.start()
+
+        # Embed memories stored before the index existed or while the model was down
+        if self.embedding_encoder is not None or self.config.get(
+            "semantic_search_enabled", True
+        ):
+            self._embedding_backfill_pending = True
+            threading.Thread(
+                target=self._backfill_embeddings,
+                name="memory-embedding-backfill",
+                daemon=True,
+            ).start()
+
         # Start Cursor monitoring if enabled
         if self.config.get("cursor_monitoring_enabled", True):
             self._start_cursor_monitoring()
@@ -157,12 +252,23 @@ class MemoryManager:
                 interval = self.config.get("cleanup_interval_hours", 24) * 3600
                 threading.Event().wait(interval)
 
+                # Rescore first so cleanup sees decayed importance
+                if self.config.get("importance_rescoring_enabled", True):
+                    self.rescore_importance()
+
                 # Perform cleanup
                 self._cleanup_old_memories()
 
             except Exception as e:
                 logger.error("Error in periodic cleanup: %s", e)
 
+    def rescore_importance(self) -> Dict[str, Any]:
+        """Recompute importance scores of all active memories."""
+        stats = self.importance_rescorer.run()
+        if stats["updated"]:
+            self._clear_cache()
+        return stats
+
     def _cleanup_old_memories(self):
         """Clean up old, low-importance memories."""
         try:
@@ -193,17 +299,8 @@ class MemoryManager:
         try:
             start_time = datetime.now()
 
-            # Calculate importance score if not provided
-            if request.importance_score is None:
-                request.importance_score = self.importance_scorer.calculate_importance(
-                    content=request.content,
-                    memory_type=request.memory_type,
-                    context=request.context or "",
-                    metadata=request.metadata or {},
-                )
-
-            # Store memory in database
-            memory_id = self.database.store_memory(
+            # Store memory in database (duplicates resolve to the existing memory)
+            memory_id, is_duplicate = self.database.upsert_memory(
                 content=request.content,
                 memory_type=request.memory_type,
                 importance_score=request.importance_score,
@@ -213,16 +310,21 @@ class MemoryManager:
                 metadata=request.metadata,
             )
 
+            if is_duplicate:
+                self.metrics["duplicates_merged"] += 1
+                return memory_id or 0
+
+            # Without an explicit score, score from content the way the
+            # rescoring job will (the score stays derived, not a base)
+            if request.importance_score is None and memory_id is not None:
+                self.importance_rescorer.run(memory_ids=[memory_id])
+
             # Auto-link if enabled
             if request.auto_link and memory_id is not None:
                 self._auto_link_memory(
                     memory_id, request.content, request.context
                 )
 
-            # Update cache
-            if memory_id is not None:
-                self._update_memory_cache(memory_id)
-
             # Update metrics
             self.metrics["total_memories"] += 1
 
@@ -244,12 +346,17 @@ class MemoryManager:
         try:
             start_time = datetime.now()
 
+            # Normalize whitespace so equivalent queries share a cache entry
+            if request.query:
+                request = replace(request, query=" ".join(request.query.split()))
+
             # Check cache first
             cache_key = self._generate_cache_key(request)
-            cached_result = self._get_from_cache(cache_key)
+            generation = self.result_cache.generation
+            cached_result = self.result_cache.get(cache_key)
             if cached_result is not None:
                 self.metrics["cache_hits"] += 1
-                return cached_result
+                return [dict(memory) for memory in cached_result]
 
             self.metrics["cache_misses"] += 1
 
@@ -265,14 +372,29 @@ class MemoryManager:
             # Remove None values
             search_params = {k: v for k, v in search_params.items() if v is not None}
 
-            # Search database
-            memories = self.database.retrieve_memories(**search_params)
-
-            # Enhance with semantic search if enabled
+            # Vector search (top-k cosine) when embeddings are available
+            memories = None
             if request.semantic_search and request.query:
-                memories = self._enhance_with_semantic_search(
-                    memories, request.query
-                )
+                memories = self._vector_search(request)
+
+            if memories is not None and self._embedding_backfill_pending:
+                # Older memories may not be embedded yet: fill up with LIKE matches
+                found = {memory["id"] for memory in memories}
+                for memory in self.database.retrieve_memories(**search_params):
+                    if len(memories) >= request.max_results:
+                        break
+                    if memory["id"] not in found:
+                        memories.append(memory)
+
+            if memories is None:
+                # Search database
+                memories = self.database.retrieve_memories(**search_params)
+
+                # Enhance with semantic search if enabled
+                if request.semantic_search and request.query:
+                    memories = self._enhance_with_semantic_search(
+                        memories, request.query
+                    )
 
             # Include links if requested
             if request.include_links:
@@ -281,8 +403,17 @@ class MemoryManager:
                         memory["id"]
                     )
 
-            # Cache results
-            self._add_to_cache(cache_key, memories)
+            # Cache results, tagged with every memory id they contain
+            memory_ids = {memory["id"] for memory in memories}
+            for memory in memories:
+                for link in memory.get("links", []):
+                    memory_ids.update((link["memory_id_1"], link["memory_id_2"]))
+            self.result_cache.put(
+                cache_key,
+                [dict(memory) for memory in memories],
+                tags=memory_ids,
+                generation=generation,
+            )
 
             # Update metrics
             self.metrics["search_requests"] += 1
@@ -307,23 +438,20 @@ class MemoryManager:
         """Update an existing memory."""
         try:
             # Get current memory
-            current_memory = self.database.retrieve_memory(request.memory_id)
+            current_memory = self.database.get_memories_by_ids([request.memory_id]).get(
+                request.memory_id
+            )
             if not current_memory:
                 logger.warning("Memory %d not found", request.memory_id)
                 return False
 
-            # Prepare update data
-            updates = []
-            if request.content is not None:
-                updates.append(("content", request.content))
-            if request.importance_score is not None:
-                updates.append(("importance_score", request.importance_score))
-            if request.status is not None:
-                updates.append(("status", request.status))
-
-            # Update in database
+            # Update in database (an explicit importance_score becomes the
+            # base that importance rescoring decays)
             success = self.database.update_memory(
-                request.memory_id, updates
+                request.memory_id,
+                content=request.content,
+                importance_score=request.importance_score,
+                status=request.status,
             )
 
             if success and request.auto_relink:
@@ -333,10 +461,6 @@ class MemoryManager:
                     request.memory_id, content, current_memory.get("context")
                 )
 
-            # Update cache
-            if success:
-                self._update_memory_cache(request.memory_id)
-
             logger.info("Memory %d updated successfully", request.memory_id)
             return success
 
@@ -349,7 +473,6 @@ class MemoryManager:
         try:
             success = self.database.delete_memory(memory_id, soft_delete)
             if success:
-                self._remove_from_cache(memory_id)
                 logger.info("Memory %d deleted successfully", memory_id)
             return success
 
@@ -550,77 +673,228 @@ class MemoryManager:
             logger.error("Error in semantic search enhancement: %s", e)
             return memories
 
-    def _generate_cache_key(self, request: MemorySearchRequest) -> str:
-        """Generate cache key for search request."""
-        try:
-            key_data = {
-                "query": request.query,
-                "memory_type": request.memory_type,
-                "project_path": request.project_path,
-                "min_importance": request.min_importance,
-                "max_results": request.max_results,
-                "include_links": request.include_links,
-                "semantic_search": request.semantic_search,
-            }
-
-            # Create hash of key data
-            key_string = json.dumps(key_data, sort_keys=True)
-            return hashlib.md5(key_string.encode()).hexdigest()
+    # ================================
+    # VECTOR INDEX
+    # ================================
 
-        except Exception as e:
-            logger.error("Error generating cache key: %s", e)
-            return ""
+    def _get_encoder(self) -> Optional[Callable[[List[str]], np.ndarray]]:
+        """Return the embedding encoder backed by the shared EmbeddingService.
 
-    def _get_from_cache(self, key: str) -> Optional[List[Dict[str, Any]]]:
-        """Get data from cache."""
-        try:
-            with self.cache_lock:
-                return self.memory_cache.get(key)
-        except Exception as e:
-            logger.error("Error getting from cache: %s", e)
+        The model is loaded once per process and shared with the query engines.
+        """
+        if self.embedding_encoder is not None or self._encoder_load_failed:
+            return self.embedding_encoder
+        if not self.config.get("semantic_search_enabled", True):
             return None
 
-    def _add_to_cache(self, key: str, data: List[Dict[str, Any]]):
-        """Add data to cache."""
-        try:
-            with self.cache_lock:
-                # Check cache size
-                if len(self.memory_cache) >= self.cache_size:
-                    # Remove oldest entry
-                    oldest_key = next(iter(self.memory_cache))
-                    del self.memory_cache[oldest_key]
+        service = get_embedding_service(self.embedding_model)
+        if service.wait_until_ready(timeout=self.config.get("embedding_load_timeout", 120)):
+            self.embedding_encoder = service.encode
+        elif service.load_error is not None:
+            logger.warning(
+                "Embedding model unavailable, using keyword search: %s", service.load_error
+            )
+            self._encoder_load_failed = True
+
+        return self.embedding_encoder
+
+    def _on_memory_changed(self, event_type: str, memory_id: int, data: Dict):
+        """Keep stored embeddings and the vector index in sync with the database.
+
+        New content is only queued here; _embedding_worker encodes it in batches.
+        """
+        if event_type == "memory_deleted" or (
+            data.get("status") not in (None, "active")
+        ):
+            with self._embedding_condition:
+                self._pending_embeddings.pop(memory_id, None)
+                if memory_id in self._embedding_in_flight:
+                    self._embedding_cancelled.add(memory_id)
+                self.vector_index.remove(memory_id)
+            return
 
-                self.memory_cache[key] = data
+        content = data.get("content")
+        if content is None and data.get("status") == "active":
+            # Reactivated memory: it was dropped from the index on deactivation
+            memory = self.database.get_memories_by_ids([memory_id]).get(memory_id)
+            content = memory["content"] if memory else None
+        if content is None or self._encoder_load_failed:
+            return
+        if self.embedding_encoder is None and not self.config.get(
+            "semantic_search_enabled", True
+        ):
+            return
 
-        except Exception as e:
-            logger.error("Error adding to cache: %s", e)
+        with self._embedding_condition:
+            self._pending_embeddings[memory_id] = content
+            self._embedding_cancelled.discard(memory_id)
+            self._embedding_condition.notify_all()
 
-    def _update_memory_cache(self, memory_id: int):
-        """Update cache when memory is modified."""
-        try:
-            with self.cache_lock:
-                # Remove cache entries that might be affected
-                keys_to_remove = []
-                for key in self.memory_cache:
-                    # Simple heuristic: remove if key contains memory_id
-                    if str(memory_id) in key:
-                        keys_to_remove.append(key)
+    def _embedding_worker(self):
+        """Encode queued memories in batches (one model call per batch)."""
+        while True:
+            with self._embedding_condition:
+                while self._embedding_running and not self._pending_embeddings:
+                    self._embedding_condition.wait()
+                if not self._pending_embeddings:
+                    return
+
+                # Let the rest of a store_memories batch arrive before encoding
+                deadline = time.monotonic() + self.embedding_batch_wait
+                while len(self._pending_embeddings) < self.embedding_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._embedding_running:
+                        break
+                    self._embedding_condition.wait(remaining)
+
+                batch = []
+                for memory_id in list(self._pending_embeddings)[: self.embedding_batch_size]:
+                    batch.append((memory_id, self._pending_embeddings.pop(memory_id)))
+                self._embedding_in_flight.update(memory_id for memory_id, _ in batch)
 
-                for key in keys_to_remove:
-                    del self.memory_cache[key]
+            try:
+                self._embed_batch(batch)
+            except Exception as e:
+                logger.error("Error embedding %d memories: %s", len(batch), e)
+            finally:
+                with self._embedding_condition:
+                    self._embedding_in_flight.clear()
+                    self._embedding_cancelled.clear()
+                    self._embedding_condition.notify_all()
+
+    def _embed_batch(self, batch: List[tuple]):
+        encoder = self._get_encoder()
+        if encoder is None:
+            return
 
+        matrix = np.asarray(encoder([content for _, content in batch]), dtype=np.float32)
+
+        # Memories deleted while the batch was encoding are skipped
+        with self._embedding_condition:
+            items = [
+                (memory_id, vector)
+                for (memory_id, _), vector in zip(batch, matrix)
+                if memory_id not in self._embedding_cancelled
+                and memory_id not in self._pending_embeddings
+            ]
+            self.database.store_embeddings(items, self.embedding_model)
+            self.vector_index.add_many(items)
+
+    def _backfill_embeddings(self):
+        """Queue active memories without an embedding for the current model.
+
+        Chunks are queued only as the worker drains the previous ones, so the
+        backlog of a large database is never held in memory at once.
+        """
+        queued = 0
+        try:
+            if self._get_encoder() is None:
+                return
+            chunk_size = self.config.get("embedding_backfill_chunk_size", 1000)
+            for chunk in self.database.iter_unembedded_memories(
+                self.embedding_model, batch_size=chunk_size
+            ):
+                with self._embedding_condition:
+                    self._embedding_condition.wait_for(
+                        lambda: not self._embedding_running
+                        or len(self._pending_embeddings) < self.embedding_batch_size
+                    )
+                    if not self._embedding_running:
+                        return
+                    for memory_id, content in chunk:
+                        # Content queued by a concurrent write is newer
+                        if (
+                            memory_id not in self._pending_embeddings
+                            and memory_id not in self._embedding_in_flight
+                        ):
+                            self._pending_embeddings[memory_id] = content
+                            queued += 1
+                    self._embedding_condition.notify_all()
         except Exception as e:
-            logger.error("Error updating memory cache: %s", e)
+            logger.error("Error backfilling embeddings: %s", e)
+        finally:
+            with self._embedding_condition:
+                self._embedding_condition.wait_for(
+                    lambda: not self._embedding_running
+                    or (not self._pending_embeddings and not self._embedding_in_flight)
+                )
+                self._embedding_backfill_pending = False
+                self._embedding_condition.notify_all()
+            if queued:
+                logger.info("Embedding backfill queued %d memories", queued)
+
+    def flush_embeddings(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued memories (and the startup backfill) are embedded."""
+        with self._embedding_condition:
+            return self._embedding_condition.wait_for(
+                lambda: not self._pending_embeddings
+                and not self._embedding_in_flight
+                and not self._embedding_backfill_pending,
+                timeout,
+            )
 
-    def _remove_from_cache(self, memory_id: int):
-        """Remove memory from cache."""
-        self._update_memory_cache(memory_id)
+    def _vector_search(
+        self, request: MemorySearchRequest
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Top-k memories by cosine similarity (None -> fall back to LIKE search)."""
+        encoder = self._get_encoder()
+        if encoder is None or len(self.vector_index) == 0:
+            return None
+
+        query_vector = np.asarray(encoder([request.query]), dtype=np.float32)[0]
+
+        # Filtreler sonradan uygulandığı için fazladan aday çekilir
+        hits = self.vector_index.search(query_vector, k=max(request.max_results * 4, 20))
+        by_id = self.database.get_memories_by_ids([memory_id for memory_id, _ in hits])
+
+        memories = []
+        for memory_id, score in hits:
+            memory = by_id.get(memory_id)
+            if (
+                memory is None
+                or memory["status"] != "active"
+                or memory["importance_score"] < request.min_importance
+                or (request.memory_type and memory["memory_type"] != request.memory_type)
+                or (request.project_path and memory["project_path"] != request.project_path)
+            ):
+                continue
+            memory["semantic_relevance"] = score
+            memories.append(memory)
+            if len(memories) >= request.max_results:
+                break
+
+        return memories
+
+    def _generate_cache_key(self, request: MemorySearchRequest) -> tuple:
+        """Generate cache key for a (normalized) search request."""
+        return (
+            request.query,
+            request.memory_type,
+            request.project_path,
+            float(request.min_importance),
+            request.max_results,
+            request.include_links,
+            request.semantic_search,
+        )
+
+    def _invalidate_cache(self, event_type: str, memory_id: int, data: Dict):
+        """Invalidate cached search results after a database write."""
+        if event_type == "memory_stored" or (
+            event_type == "memory_updated"
+            and (data.get("content") is not None or data.get("importance_score") is not None)
+        ):
+            # Yeni/değişen içerik herhangi bir sorguya girebilir
+            self.result_cache.bump_generation()
+        elif event_type == "memory_linked":
+            self.result_cache.invalidate_tags([memory_id, data.get("linked_memory_id")])
+        else:
+            # Silme/arşivleme yalnızca bu memory'yi içeren sonuçları etkiler
+            self.result_cache.invalidate_tags([memory_id])
 
     def _clear_cache(self):
         """Clear entire cache."""
         try:
-            with self.cache_lock:
-                self.memory_cache.clear()
+            self.result_cache.clear()
         except Exception as e:
             logger.error("Error clearing cache: %s", e)
 
@@ -697,18 +971,15 @@ class MemoryManager:
                 "last_sync": getattr(
                     self.cursor_integration, "get_last_sync_time", lambda: None
                 )(),
+                "ingest": self.cursor_integration.get_ingest_stats(),
             }
 
             return {
                 "database": db_stats,
                 "cursor_integration": cursor_status,
-                "cache": {
-                    "size": len(self.memory_cache),
-                    "max_size": self.cache_size,
-                    "hits": self.metrics["cache_hits"],
-                    "misses": self.metrics["cache_misses"],
-                },
+                "cache": self.result_cache.get_stats(),
                 "metrics": self.metrics,
+                "vector_index": self.vector_index.get_stats(),
                 "config": {
                     "auto_linking_enabled": self.auto_linking_enabled,
                     "linking_threshold": self.linking_threshold,
@@ -729,6 +1000,17 @@ class MemoryManager:
             # Clear cache
             self._clear_cache()
 
+            # Embed queued memories, then persist the vector index
+            self.flush_embeddings(timeout=self.config.get("shutdown_timeout", 30))
+            with self._embedding_condition:
+                self._embedding_running = False
+                self._embedding_condition.notify_all()
+            self.vector_index.flush()
+
+            # Flush the A-Mem graph store (links log and node payloads)
+            if self._amem_engine is not None:
+                self._amem_engine.close()
+
             # Close database connections
             if hasattr(self.database, "close"):
                 self.database.close()
@@ -0,0 +1,409 @@
+"""
+Vector Index for Collective Memory v3.0
+Memory-mapped flat / IVF nearest-neighbour index over memory embeddings
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tombstone id for deleted rows
+DELETED_ID = -1
+
+
+class VectorIndex:
+    """
+    Approximate nearest-neighbour index (numpy only)
+
+    Features:
+    - On-disk float32 matrix opened with np.memmap (vectors.f32)
+    - Row -> memory id map (ids.i64), deleted rows become tombstones
+    - Incremental add/remove, O(1) disk writes per change
+    - Tombstones are compacted away once they exceed compact_ratio of the rows
+    - Optional IVF mode: k-means centroids + inverted lists, nprobe lists searched
+    - Lazy load on first use; rebuild from a vector source when files are missing
+    """
+
+    def __init__(
+        self,
+        index_path: str,
+        mode: str = "flat",
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        ivf_min_vectors: int = 1024,
+        rebuild_source: Optional[Callable[[], Iterable[Tuple[int, np.ndarray]]]] = None,
+        compact_ratio: float = 0.25,
+        compact_min_tombstones: int = 1024,
+    ):
+        """Initialize the vector index (files are opened lazily)."""
+        self.index_path = Path(index_path)
+        self.mode = mode
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.ivf_min_vectors = ivf_min_vectors
+        self.rebuild_source = rebuild_source
+        self.compact_ratio = compact_ratio
+        self.compact_min_tombstones = compact_min_tombstones
+
+        self.lock = threading.RLock()
+        self._loaded = False
+
+        self.dimension: Optional[int] = None
+        self.count = 0  # Rows used (including tombstones)
+        self.capacity = 0
+        self._vectors: Optional[np.memmap] = None
+        self._ids: Optional[np.memmap] = None
+        self._row_of: Dict[int, int] = {}
+
+        # IVF state
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments: Optional[np.memmap] = None
+        self._lists: Dict[int, List[int]] = {}
+
+    # ================================
+    # FILE HANDLING
+    # ================================
+
+    @property
+    def _meta_file(self) -> Path:
+        return self.index_path / "meta.json"
+
+    def _open_arrays(self, capacity: int, mode: str = "r+"):
+        """(Re)open the memory-mapped arrays with the given capacity."""
+        self._vectors = np.memmap(
+            self.index_path / "vectors.f32",
+            dtype=np.float32,
+            mode=mode,
+            shape=(capacity, self.dimension),
+        )
+        self._ids = np.memmap(
+            self.index_path / "ids.i64", dtype=np.int64, mode=mode, shape=(capacity,)
+        )
+        self._assignments = np.memmap(
+            self.index_path / "lists.i32", dtype=np.int32, mode=mode, shape=(capacity,)
+        )
+        self.capacity = capacity
+
+    def _write_meta(self):
+        """Persist row count, dimension and mode."""
+        meta = {
+            "dimension": self.dimension,
+            "count": self.count,
+            "capacity": self.capacity,
+            "mode": self.mode,
+            "ivf_trained": self._centroids is not None,
+        }
+        tmp_file = self._meta_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp_file, self._meta_file)
+
+    def _ensure_loaded(self):
+        """Load the persisted index on first use."""
+        if self._loaded:
+            return
+
+        with self.lock:
+            if self._loaded:
+                return
+
+            self.index_path.mkdir(parents=True, exist_ok=True)
+
+            if self._meta_file.exists():
+                try:
+                    meta = json.loads(self._meta_file.read_text(encoding="utf-8"))
+                    self.dimension = meta["dimension"]
+                    self.count = meta["count"]
+                    if self.dimension:
+                        self._open_arrays(meta["capacity"])
+                        self._row_of = {
+                            int(memory_id): row
+                            for row, memory_id in enumerate(self._ids[: self.count])
+                            if memory_id != DELETED_ID
+                        }
+                        if meta.get("ivf_trained"):
+                            self._centroids = np.load(self.index_path / "centroids.npy")
+                            self._rebuild_lists()
+                    self._loaded = True
+                    logger.info(
+                        f"Vector index loaded: {len(self._row_of)} vectors ({self.mode})"
+                    )
+                    return
+                except Exception as e:
+                    logger.warning(f"Vector index unreadable, rebuilding: {e}")
+                    self._reset()
+
+            self._loaded = True
+            if self.rebuild_source is not None:
+                self.add_many(self.rebuild_source())
+
+    def _reset(self):
+        """Drop in-memory state (files are overwritten on next add)."""
+        self.dimension = None
+        self.count = 0
+        self.capacity = 0
+        self._vectors = None
+        self._ids = None
+        self._assignments = None
+        self._row_of = {}
+        self._centroids = None
+        self._lists = {}
+
+    def _grow(self, needed: int):
+        """Grow the memory-mapped files (capacity doubling)."""
+        if self.count + needed <= self.capacity:
+            return
+
+        new_capacity = max(1024, self.capacity * 2, self.count + needed)
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._ids.flush()
+            self._assignments.flush()
+            self._vectors = self._ids = self._assignments = None
+
+        for name, itemsize in (
+            ("vectors.f32", 4 * self.dimension),
+            ("ids.i64", 8),
+            ("lists.i32", 4),
+        ):
+            with open(self.index_path / name, "ab") as f:
+                f.truncate(new_capacity * itemsize)
+
+        self._open_arrays(new_capacity)
+
+    def flush(self):
+        """Flush memory-mapped data and metadata to disk."""
+        with self.lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._ids.flush()
+                self._assignments.flush()
+            if self._loaded:
+                self._write_meta()
+
+    # ================================
+    # MUTATIONS
+    # ================================
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def add(self, memory_id: int, vector: np.ndarray):
+        """Add or replace a single memory vector."""
+        self.add_many([(memory_id, vector)])
+
+    def add_many(self, items: Iterable[Tuple[int, np.ndarray]]):
+        """Add or replace vectors in one pass."""
+        items = list(items)
+        if not items:
+            return
+
+        self._ensure_loaded()
+        with self.lock:
+            memory_ids = [int(memory_id) for memory_id, _ in items]
+            matrix = self._normalize(np.vstack([vector for _, vector in items]))
+
+            if self.dimension is None:
+                self.dimension = matrix.shape[1]
+            if matrix.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Vector dimension {matrix.shape[1]} != index dimension {self.dimension}"
+                )
+
+            for memory_id in memory_ids:
+                self._remove_row(memory_id)
+
+            self._grow(len(memory_ids))
+            start = self.count
+            rows = range(start, start + len(memory_ids))
+
+            self._vectors[start : start + len(memory_ids)] = matrix
+            self._ids[start : start + len(memory_ids)] = memory_ids
+            if self._centroids is not None:
+                assignments = self._assign(matrix)
+                self._assignments[start : start + len(memory_ids)] = assignments
+                for row, list_id in zip(rows, assignments):
+                    self._lists.setdefault(int(list_id), []).append(row)
+
+            self.count += len(memory_ids)
+            self._row_of.update(zip(memory_ids, rows))
+            if not self._maybe_compact():
+                self._write_meta()
+
+    def _remove_row(self, memory_id: int) -> bool:
+        row = self._row_of.pop(int(memory_id), None)
+        if row is None:
+            return False
+        self._ids[row] = DELETED_ID
+        return True
+
+    def remove(self, memory_id: int) -> bool:
+        """Remove a memory vector (tombstone, reclaimed by compact())."""
+        self._ensure_loaded()
+        with self.lock:
+            removed = self._remove_row(memory_id)
+            if removed and not self._maybe_compact():
+                self._write_meta()
+            return removed
+
+    @property
+    def tombstones(self) -> int:
+        return self.count - len(self._row_of)
+
+    def _maybe_compact(self) -> bool:
+        """Compact when tombstones pass the threshold (True if compacted).
+
+        Updates re-append vectors, so without this the files and every flat /
+        IVF scan keep growing and post-filtered searches lose recall.
+        """
+        tombstones = self.tombstones
+        if (
+            tombstones < self.compact_min_tombstones
+            or tombstones <= self.compact_ratio * self.count
+        ):
+            return False
+        self.compact()
+        return True
+
+    def compact(self):
+        """Rewrite the index without tombstones."""
+        self._ensure_loaded()
+        with self.lock:
+            if self._vectors is None:
+                return
+            live_rows = np.flatnonzero(self._ids[: self.count] != DELETED_ID)
+            vectors = np.array(self._vectors[live_rows])
+            ids = np.array(self._ids[live_rows])
+            tombstones = self.tombstones
+
+            self.count = 0
+            self._row_of = {}
+            self._lists = {}
+            if len(ids):
+                self.add_many(zip(ids.tolist(), vectors))
+            else:
+                self._write_meta()
+            logger.info(f"Vector index compacted: {tombstones} tombstones removed")
+
+    # ================================
+    # IVF
+    # ================================
+
+    def _assign(self, matrix: np.ndarray) -> np.ndarray:
+        return np.argmax(matrix @ self._centroids.T, axis=1).astype(np.int32)
+
+    def _rebuild_lists(self):
+        self._lists = {}
+        if self._centroids is None or self.count == 0:
+            return
+        assignments = np.asarray(self._assignments[: self.count])
+        for row in self._row_of.values():
+            self._lists.setdefault(int(assignments[row]), []).append(row)
+
+    def train(self, iterations: int = 10, sample_size: int = 20000, seed: int = 0):
+        """Train IVF centroids with spherical k-means over live vectors."""
+        self._ensure_loaded()
+        with self.lock:
+            live_rows = np.fromiter(self._row_of.values(), dtype=np.int64)
+            if len(live_rows) == 0:
+                return
+
+            n_lists = self.n_lists or max(1, int(np.sqrt(len(live_rows))))
+            rng = np.random.default_rng(seed)
+            sample_rows = np.sort(
+                rng.choice(live_rows, min(sample_size, len(live_rows)), replace=False)
+            )
+            sample = np.array(self._vectors[sample_rows])
+
+            centroids = sample[rng.choice(len(sample), min(n_lists, len(sample)), replace=False)]
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                for k in range(len(centroids)):
+                    members = sample[labels == k]
+                    if len(members):
+                        centroids[k] = members.mean(axis=0)
+                centroids = self._normalize(centroids)
+
+            self._centroids = centroids
+            np.save(self.index_path / "centroids.npy", centroids)
+
+            self._assignments[: self.count] = self._assign(
+                np.asarray(self._vectors[: self.count])
+            )
+            self._rebuild_lists()
+            self._write_meta()
+            logger.info(f"IVF index trained: {len(centroids)} lists")
+
+    # ================================
+    # SEARCH
+    # ================================
+
+    def _candidate_rows(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """IVF probe rows, or None for a flat scan."""
+        if self.mode != "ivf":
+            return None
+        if self._centroids is None:
+            if len(self._row_of) < self.ivf_min_vectors:
+                return None
+            self.train()
+
+        probes = np.argsort(-(self._centroids @ query))[: self.n_probe]
+        rows = [row for list_id in probes for row in self._lists.get(int(list_id), [])]
+        return np.asarray(rows, dtype=np.int64)
+
+    def search(self, query_vector: np.ndarray, k: int = 10) -> List[Tuple[int, float]]:
+        """Top-k (memory_id, cosine similarity) pairs."""
+        self._ensure_loaded()
+        with self.lock:
+            if not self._row_of or k <= 0:
+                return []
+
+            query = self._normalize(query_vector)[0]
+            rows = self._candidate_rows(query)
+
+            if rows is None:
+                ids = np.asarray(self._ids[: self.count])
+                scores = np.asarray(self._vectors[: self.count]) @ query
+            else:
+                ids = np.asarray(self._ids[rows])
+                scores = np.asarray(self._vectors[rows]) @ query
+
+            scores = np.where(ids == DELETED_ID, -np.inf, scores)
+            k = min(k, len(self._row_of), len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            return [
+                (int(ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])
+            ]
+
+    def __contains__(self, memory_id: int) -> bool:
+        self._ensure_loaded()
+        return int(memory_id) in self._row_of
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._row_of)
+
+    def get_stats(self) -> Dict:
+        """Index statistics."""
+        return {
+            "loaded": self._loaded,
+            "vectors": len(self._row_of),
+            "tombstones": self.tombstones,
+            "dimension": self.dimension,
+            "mode": self.mode,
+            "ivf_lists": 0 if self._centroids is None else len(self._centroids),
+        }
@@ -4,16 +4,44 @@ Query Engine - Full-text search ve filtreleme sistemi
 Veritabanından gelişmiş arama ve filtreleme işlemleri yapar
 """
 
+import base64
+import codecs
+import itertools
+import json
 import re
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from colorama import init, Fore, Style
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+try:
+    from .relevance_scoring import RelevanceScorer, ResultFeatures
+except ImportError:
+    # Fallback for when running as main module
+    from relevance_scoring import RelevanceScorer, ResultFeatures
 
 # Colorama initialize
 init()
 
+# Relevance sıralamasında aday satırlar bu boyutta parçalar halinde okunur
+FETCH_CHUNK_SIZE = 256
+
+# Highlight taramasında blob'dan okunan parça boyutu
+CONTENT_CHUNK_BYTES = 64 * 1024
+
+# Terim başına toplanan en fazla eşleşme (_find_highlights sınırları için yeterli)
+MAX_MATCHES_PER_TERM = 5
+
+# sort_by -> (SQL kolonu, SearchResult alanı)
+SORT_COLUMNS = {
+    "date": ("f.modified_at", "modified_at"),
+    "size": ("f.file_size", "file_size"),
+    "name": ("f.file_name", "file_name"),
+}
+
 
 @dataclass
 class SearchQuery:
@@ -32,6 +60,9 @@ class SearchQuery:
     sort_by: str = "relevance"  # relevance, date, size, name
     sort_order: str = "desc"  # asc, desc
     limit: int = 50
+    offset: int = 0  # cursor yoksa kullanılır
+    cursor: Optional[str] = None  # Keyset sayfalama token'ı (SearchPage.next_cursor)
+    include_content: bool = False  # Sayfadaki sonuçlara tam içerik eklensin mi
     use_semantic_search: bool = False  # Semantic search option
     use_caching: bool = True  # Caching option
     semantic_similarity_threshold: float = 0.7  # Semantic similarity threshold
@@ -59,6 +90,20 @@ class SearchResult:
     content_type: str
     line_count: int
     word_count: int
+    text_rank: float = 0.0  # FTS5 bm25 skoru (düşük = daha alakalı)
+    content_hash: str = ""  # Embedding deposu anahtarı
+    content: Optional[str] = None  # Yalnızca include_content=True ise dolu
+    content_id: Optional[int] = None  # file_contents.id (ikinci aşama okuması)
+
+
+@dataclass
+class SearchPage:
+    """Tek arama sayfası ve bir sonraki sayfanın cursor'ı"""
+
+    results: List[SearchResult]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    scanned: int = 0  # İncelenen aday satır sayısı
 
 
 class QueryEngine:
@@ -73,6 +118,9 @@ class QueryEngine:
         )
         self.logger = logging.getLogger(__name__)
 
+        # Vectorized relevance scoring (shared with EnhancedQueryEngine)
+        self.scorer = RelevanceScorer()
+
         # Stopwords for relevance scoring
         self.stopwords = {
             "the",
@@ -109,82 +157,397 @@ class QueryEngine:
         }
 
     def search(self, query: SearchQuery) -> List[SearchResult]:
-        """Ana arama fonksiyonu"""
+        """Ana arama fonksiyonu (ilk sayfa veya query.cursor'dan sonraki sayfa)"""
+        return self._fetch_page(query).results
+
+    def search_page(self, query: SearchQuery) -> SearchPage:
+        """Keyset sayfalamalı arama (sonuçlar + next_cursor)"""
+        return self._fetch_page(query)
+
+    def _fetch_page(self, query: SearchQuery) -> SearchPage:
+        """Keyset sayfalamalı arama
+
+        Sonuçlar (skor, id) çiftine göre kararlı şekilde sıralanır ve
+        next_cursor son sonucun anahtarını taşır. Relevance sıralamasında aday
+        satırlar parça parça okunup skorlanır, bellekte yalnızca sayfa kadar
+        sonuç tutulur; diğer sıralamalarda keyset koşulu ve LIMIT SQL'e eklenir.
+
+        İki aşamalı: sıralama yalnızca hafif kolonlarla (id, metadata, preview,
+        bm25) yapılır; content_text sadece son sayfa için okunur.
+
+        Geçersiz cursor için ValueError fırlatır.
+        """
+
+        after = None
+        if query.cursor:
+            after = self.decode_cursor(query.cursor, query.sort_by, query.sort_order)
 
         if not self.db_manager.connection:
             print(f"{Fore.RED}❌ Database connection required{Style.RESET_ALL}")
-            return []
+            return SearchPage(results=[])
 
         try:
             # SQL sorgusu oluştur
-            sql_query, params = self._build_sql_query(query)
+            sql_query, params = self._build_sql_query(query, after)
 
-            # Veritabanından sonuçları al
             cursor = self.db_manager.connection.cursor()
             cursor.execute(sql_query, params)
-            raw_results = cursor.fetchall()
 
-            # Sonuçları işle
-            results = []
-            for row in raw_results:
-                result = self._process_search_result(row, query)
-                if result:
-                    results.append(result)
-
-            # Relevance scoring
             if query.sort_by == "relevance":
-                results = self._calculate_relevance_scores(results, query)
-
-            # Sıralama
-            results = self._sort_results(results, query)
+                ranked, scanned = self._rank_candidates(cursor, query, after)
+            else:
+                # SQL zaten sıralı ve limit + 1 satırla sınırlı
+                rows = cursor.fetchall()
+                scanned = len(rows)
+                ranked = []
+                for row in rows:
+                    result = self._process_search_result(row, query)
+                    if result:
+                        ranked.append(result)
+
+            has_more = len(ranked) > query.limit
+            results = ranked[: query.limit]
+
+            # İkinci aşama: highlight ve (istenirse) tam içerik yalnızca bu sayfa için
+            self._attach_page_content(results, query)
+
+            next_cursor = None
+            if has_more and results:
+                last = results[-1]
+                next_cursor = self.encode_cursor(
+                    query.sort_by,
+                    query.sort_order,
+                    self._sort_value(last, query),
+                    last.file_id,
+                )
 
-            # Limit uygula
-            return results[: query.limit]
+            return SearchPage(
+                results=results,
+                next_cursor=next_cursor,
+                has_more=has_more,
+                scanned=scanned,
+            )
 
         except Exception as e:
             self.logger.error(f"Search error: {e}")
             print(f"{Fore.RED}❌ Search failed: {e}{Style.RESET_ALL}")
-            return []
+            return SearchPage(results=[])
 
-    def _build_sql_query(self, query: SearchQuery) -> Tuple[str, List]:
-        """SQL sorgusu oluşturur"""
+    def iter_results(self, query: SearchQuery, page_size: int = 100) -> Iterator[SearchResult]:
+        """Tüm sonuçları search_page ile aynı sırada döndürür (export için)
 
-        base_query = """
-            SELECT DISTINCT f.*, fc.content_text, fc.content_preview, 
+        Relevance sıralamasında adaylar tek geçişte skorlanır; bellekte yalnızca
+        (skor, id, bm25) dizileri tutulur. Sonuçlar bu sıralamadan page_size'lık
+        parçalar halinde id ile okunur, böylece her sayfa için tüm adaylar
+        yeniden skorlanmaz. Diğer sıralamalar SQL keyset sayfalarıyla ilerler.
+        """
+        if query.sort_by != "relevance":
+            page_query = replace(query, limit=page_size, cursor=None)
+            while True:
+                page = self.search_page(page_query)
+                yield from page.results
+                if not page.next_cursor:
+                    return
+                page_query.cursor = page.next_cursor
+
+        if not self.db_manager.connection:
+            print(f"{Fore.RED}❌ Database connection required{Style.RESET_ALL}")
+            return
+
+        sql_query, params = self._build_sql_query(query)
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute(sql_query, params)
+
+        search_terms = self._scoring_terms(query)
+        score_parts, id_parts, rank_parts = [], [], []
+        for rows in self._iter_row_chunks(cursor):
+            chunk = [
+                result
+                for result in (self._process_search_result(row, query) for row in rows)
+                if result is not None
+            ]
+            if not chunk:
+                continue
+            features = ResultFeatures.from_results(chunk)
+            if search_terms:
+                score_parts.append(self.scorer.relevance_scores(features, search_terms))
+            else:
+                score_parts.append(np.zeros(len(chunk), dtype=np.float64))
+            id_parts.append(features.ids)
+            rank_parts.append(np.array([r.text_rank for r in chunk], dtype=np.float64))
+
+        if not id_parts:
+            return
+        scores = np.concatenate(score_parts)
+        ids = np.concatenate(id_parts)
+        ranks = np.concatenate(rank_parts)
+
+        keys = -scores if query.sort_order == "desc" else scores
+        order = np.lexsort((ids, keys))[max(query.offset, 0) :]
+
+        for start in range(0, len(order), page_size):
+            selected = order[start : start + page_size]
+            rows = self._load_result_rows(ids[selected].tolist())
+            results = []
+            for index in selected.tolist():
+                row = rows.get(int(ids[index]))
+                result = self._process_search_result(row, query) if row else None
+                if result is None:
+                    continue
+                result.relevance_score = float(scores[index])
+                result.text_rank = float(ranks[index])
+                results.append(result)
+            self._attach_page_content(results, query)
+            yield from results
+
+    def _load_result_rows(self, file_ids: List[int]) -> Dict[int, Any]:
+        """files.id -> sonuç satırı (hafif kolonlar, tek IN sorgusu)"""
+        placeholders = ",".join("?" * len(file_ids))
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute(
+            f"""
+            SELECT f.*, fc.id AS content_id, fc.content_preview,
                    fc.line_count, fc.word_count, fc.char_count
             FROM files f
             LEFT JOIN file_contents fc ON f.id = fc.file_id
-            WHERE f.is_active = 1
+            WHERE f.id IN ({placeholders})
+        """,
+            file_ids,
+        )
+        return {row["id"]: row for row in cursor.fetchall()}
+
+    def _iter_row_chunks(self, cursor) -> Iterator[List[Any]]:
+        """Sonuç satırlarını fetchmany ile parça parça döndürür"""
+        while True:
+            rows = cursor.fetchmany(FETCH_CHUNK_SIZE)
+            if not rows:
+                return
+            yield rows
+
+    def _rank_candidates(
+        self, cursor, query: SearchQuery, after: Optional[Tuple[Any, int]]
+    ) -> Tuple[List[SearchResult], int]:
+        """Adayları skorlar ve cursor'dan sonraki ilk limit + 1 sonucu seçer
+
+        Her parça RelevanceScorer ile dizi olarak skorlanır ve eldeki en iyi
+        sonuçlarla birleştirilip argpartition ile yeniden kırpılır; bellek
+        kullanımı aday sayısından değil sayfa boyutundan bağımsızdır.
+        """
+        search_terms = self._scoring_terms(query)
+        descending = query.sort_order == "desc"
+        keep = query.limit + 1
+        if after is None:
+            keep += max(query.offset, 0)
+
+        top: List[SearchResult] = []
+        top_scores = np.empty(0, dtype=np.float64)
+        top_ids = np.empty(0, dtype=np.int64)
+        scanned = 0
+
+        for rows in self._iter_row_chunks(cursor):
+            scanned += len(rows)
+            chunk = [
+                result
+                for result in (self._process_search_result(row, query) for row in rows)
+                if result is not None
+            ]
+            if not chunk:
+                continue
+
+            features = ResultFeatures.from_results(chunk)
+            if search_terms:
+                scores = self.scorer.relevance_scores(features, search_terms)
+            else:
+                scores = np.zeros(len(chunk), dtype=np.float64)
+            ids = features.ids
+
+            if after is not None:
+                after_score, after_id = after
+                beyond = scores < after_score if descending else scores > after_score
+                mask = beyond | ((scores == after_score) & (ids > after_id))
+                chunk = [result for result, keep_row in zip(chunk, mask) if keep_row]
+                scores, ids = scores[mask], ids[mask]
+
+            pool = top + chunk
+            pool_scores = np.concatenate([top_scores, scores])
+            pool_ids = np.concatenate([top_ids, ids])
+            selected = RelevanceScorer.top_k(pool_scores, pool_ids, keep, descending)
+
+            top = [pool[i] for i in selected]
+            top_scores, top_ids = pool_scores[selected], pool_ids[selected]
+
+        for result, score in zip(top, top_scores.tolist()):
+            result.relevance_score = score
+
+        if after is None:
+            top = top[max(query.offset, 0) :]
+        return top, scanned
+
+    def _attach_page_content(self, results: List[SearchResult], query: SearchQuery):
+        """Sayfadaki sonuçlara highlight ve istenirse tam içerik ekler
+
+        include_content ise gövdeler tek sorguyla okunur. Aksi halde her dosya
+        SQLite incremental blob I/O ile parça parça taranır; tarama yeterli
+        highlight bulununca durur ve bellekte en fazla bir parça tutulur.
+        """
+        if not results:
+            return
+
+        has_terms = bool(query.text or query.keywords)
+
+        if query.include_content:
+            contents = self._load_contents([r.content_id for r in results])
+            for result in results:
+                result.content = contents.get(result.content_id, "")
+                if has_terms:
+                    result.match_highlights = self._find_highlights(result.content, query)
+            return
+
+        if not has_terms:
+            return
+
+        for result in results:
+            if result.content_id is not None:
+                result.match_highlights = self._find_highlights_streaming(
+                    self._iter_content_chunks(result.content_id), query
+                )
+
+    def _load_contents(self, content_ids: List[Optional[int]]) -> Dict[int, str]:
+        """file_contents.id -> content_text (tek IN sorgusu)"""
+        ids = [content_id for content_id in content_ids if content_id is not None]
+        if not ids:
+            return {}
+
+        placeholders = ",".join("?" * len(ids))
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute(
+            f"SELECT id, content_text FROM file_contents WHERE id IN ({placeholders})",
+            ids,
+        )
+        return {row[0]: row[1] or "" for row in cursor.fetchall()}
+
+    def _iter_content_chunks(self, content_id: int) -> Iterator[str]:
+        """content_text'i parça parça okur (blobopen yoksa tek parça)"""
+        connection = self.db_manager.connection
+
+        if hasattr(connection, "blobopen"):
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            with connection.blobopen(
+                "file_contents", "content_text", content_id, readonly=True
+            ) as blob:
+                while True:
+                    data = blob.read(CONTENT_CHUNK_BYTES)
+                    if not data:
+                        break
+                    yield decoder.decode(data)
+            yield decoder.decode(b"", final=True)
+        else:
+            yield self._load_contents([content_id]).get(content_id, "")
+
+    @staticmethod
+    def _sort_value(result: SearchResult, query: SearchQuery) -> Any:
+        """Cursor'a yazılan sıralama değeri"""
+        if query.sort_by == "relevance":
+            return result.relevance_score
+        _, field_name = SORT_COLUMNS.get(query.sort_by, SORT_COLUMNS["date"])
+        return getattr(result, field_name)
+
+    @staticmethod
+    def encode_cursor(sort_by: str, sort_order: str, value: Any, file_id: int) -> str:
+        """Opak sayfalama token'ı (url-safe base64 JSON)"""
+        payload = json.dumps([sort_by, sort_order, value, file_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(token: str, sort_by: str, sort_order: str) -> Tuple[Any, int]:
+        """Token'ı (değer, id) çiftine çevirir; başka bir sıralamaya aitse ValueError"""
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            cursor_sort_by, cursor_order, value, file_id = json.loads(
+                base64.urlsafe_b64decode(padded.encode("ascii"))
+            )
+        except (ValueError, TypeError, UnicodeError) as e:
+            raise ValueError(f"Invalid search cursor: {token!r}") from e
+
+        if (cursor_sort_by, cursor_order) != (sort_by, sort_order) or not isinstance(
+            file_id, int
+        ):
+            raise ValueError(f"Search cursor does not match query ordering: {token!r}")
+        return value, file_id
+
+    def _build_sql_query(
+        self, query: SearchQuery, after: Optional[Tuple[Any, int]] = None
+    ) -> Tuple[str, List]:
+        """SQL sorgusu oluşturur
+
+        after: cursor'dan çözülen (sıralama değeri, id); relevance dışındaki
+        sıralamalarda keyset koşulu olarak eklenir.
         """
 
+        use_fts = getattr(self.db_manager, "fts_enabled", False)
+
         conditions = []
         params = []
+        match_parts = []
 
         # Text search
         if query.text:
-            text_conditions = []
             search_terms = self._extract_search_terms(query.text)
 
-            for term in search_terms:
-                like_term = f"%{term}%"
-                text_conditions.append(
-                    "(f.file_name LIKE ? OR f.file_path LIKE ? OR fc.content_text LIKE ?)"
-                )
-                params.extend([like_term, like_term, like_term])
+            if use_fts:
+                match_parts.append(self.db_manager.build_fts_query(search_terms))
+            else:
+                text_conditions = []
+                for term in search_terms:
+                    like_term = f"%{term}%"
+                    text_conditions.append(
+                        "(f.file_name LIKE ? OR f.file_path LIKE ? OR fc.content_text LIKE ?)"
+                    )
+                    params.extend([like_term, like_term, like_term])
 
-            if text_conditions:
-                conditions.append(f"({' AND '.join(text_conditions)})")
+                if text_conditions:
+                    conditions.append(f"({' AND '.join(text_conditions)})")
 
         # Keywords search
         if query.keywords:
-            keyword_conditions = []
-            for keyword in query.keywords:
-                like_keyword = f"%{keyword}%"
-                keyword_conditions.append("fc.content_text LIKE ?")
-                params.append(like_keyword)
-
-            if keyword_conditions:
-                conditions.append(f"({' AND '.join(keyword_conditions)})")
+            if use_fts:
+                match_parts.append(
+                    self.db_manager.build_fts_query(
+                        query.keywords, column="content_text"
+                    )
+                )
+            else:
+                keyword_conditions = []
+                for keyword in query.keywords:
+                    like_keyword = f"%{keyword}%"
+                    keyword_conditions.append("fc.content_text LIKE ?")
+                    params.append(like_keyword)
+
+                if keyword_conditions:
+                    conditions.append(f"({' AND '.join(keyword_conditions)})")
+
+        match_expression = " AND ".join(part for part in match_parts if part)
+
+        if match_expression:
+            # FTS5 MATCH - bm25 ile sıralanmış aday kümesi
+            base_query = """
+                SELECT DISTINCT f.*, fc.id AS content_id, fc.content_preview,
+                       fc.line_count, fc.word_count, fc.char_count,
+                       bm25(files_fts, ?, ?, ?) AS text_rank
+                FROM files_fts
+                JOIN files f ON f.id = files_fts.rowid
+                LEFT JOIN file_contents fc ON f.id = fc.file_id
+                WHERE files_fts MATCH ? AND f.is_active = 1
+            """
+            params = [*self.db_manager.fts_weights, match_expression] + params
+        else:
+            base_query = """
+                SELECT DISTINCT f.*, fc.id AS content_id, fc.content_preview,
+                       fc.line_count, fc.word_count, fc.char_count
+                FROM files f
+                LEFT JOIN file_contents fc ON f.id = fc.file_id
+                WHERE f.is_active = 1
+            """
 
         # File types
         if query.file_types:
@@ -232,21 +595,26 @@ class QueryEngine:
                 conditions.append("f.file_path NOT LIKE ?")
                 params.append(f"%{path}%")
 
+        # Keyset sayfalama (SQL tarafında sıralanan alanlar)
+        order_field, _ = SORT_COLUMNS.get(query.sort_by, SORT_COLUMNS["date"])
+        order_dir = "DESC" if query.sort_order == "desc" else "ASC"
+        if query.sort_by != "relevance" and after is not None:
+            op = "<" if order_dir == "DESC" else ">"
+            conditions.append(
+                f"({order_field} {op} ? OR ({order_field} = ? AND f.id > ?))"
+            )
+            params.extend([after[0], after[0], after[1]])
+
         # Add conditions to query
         if conditions:
             base_query += " AND " + " AND ".join(conditions)
 
         # Add basic ordering (relevance scoring yapılacaksa daha sonra sıralanır)
         if query.sort_by != "relevance":
-            order_map = {
-                "date": "f.modified_at",
-                "size": "f.file_size",
-                "name": "f.file_name",
-            }
-
-            order_field = order_map.get(query.sort_by, "f.modified_at")
-            order_dir = "DESC" if query.sort_order == "desc" else "ASC"
-            base_query += f" ORDER BY {order_field} {order_dir}"
+            base_query += f" ORDER BY {order_field} {order_dir}, f.id ASC LIMIT ? OFFSET ?"
+            params.extend([query.limit + 1, 0 if after is not None else max(query.offset, 0)])
+        elif match_expression:
+            base_query += " ORDER BY text_rank"
 
         return base_query, params
 
@@ -273,12 +641,12 @@ class QueryEngine:
         return list(set(terms))  # Unique terms
 
     def _process_search_result(self, row, query: SearchQuery) -> Optional[SearchResult]:
-        """Raw veritabanı sonucunu SearchResult'a çevirir"""
+        """Raw veritabanı sonucunu SearchResult'a çevirir
 
-        try:
-            # Highlight matches
-            highlights = self._find_highlights(row, query)
+        Highlight'lar sayfa seçildikten sonra search_page içinde eklenir.
+        """
 
+        try:
             # Content type belirleme (basit)
             content_type = self._determine_content_type(row)
 
@@ -291,61 +659,116 @@ class QueryEngine:
                 modified_at=row["modified_at"],
                 content_preview=row["content_preview"] or "",
                 relevance_score=0.0,  # Sonra hesaplanacak
-                match_highlights=highlights,
+                match_highlights=[],
                 content_type=content_type,
                 line_count=row["line_count"] or 0,
                 word_count=row["word_count"] or 0,
+                text_rank=row["text_rank"] if "text_rank" in row.keys() else 0.0,
+                content_hash=row["content_hash"] or "",
+                content_id=row["content_id"] if "content_id" in row.keys() else None,
             )
 
         except Exception as e:
             self.logger.error(f"Error processing search result: {e}")
             return None
 
-    def _find_highlights(self, row, query: SearchQuery) -> List[str]:
+    def _find_highlights(self, content: str, query: SearchQuery) -> List[str]:
         """Eşleşen kısımları vurgular"""
+        return self._find_highlights_streaming([content], query)
 
-        highlights = []
-        content = row["content_text"] or ""
+    def _highlight_specs(self, query: SearchQuery) -> List[Tuple[Any, int, str, int, int]]:
+        """(pattern, bağlam genişliği, renk, highlight sınırı, terim uzunluğu) listesi"""
+        specs = []
 
-        # Text search highlights
+        # Text search highlights (toplam 3'e kadar)
         if query.text:
-            terms = self._extract_search_terms(query.text)
-            for term in terms:
-                pattern = re.compile(re.escape(term), re.IGNORECASE)
-                matches = pattern.finditer(content)
-
-                for match in matches:
-                    start = max(0, match.start() - 50)
-                    end = min(len(content), match.end() + 50)
-                    context = content[start:end]
-
-                    # Highlight the term
-                    highlighted = pattern.sub(
-                        f"{Fore.YELLOW}\\g<0>{Style.RESET_ALL}", context
-                    )
-                    highlights.append(highlighted)
+            for term in self._extract_search_terms(query.text):
+                if term:
+                    pattern = re.compile(re.escape(term), re.IGNORECASE)
+                    specs.append((pattern, 50, Fore.YELLOW, 3, len(term)))
+
+        # Keyword highlights (toplam 5'e kadar)
+        for keyword in query.keywords or []:
+            if keyword:
+                pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+                specs.append((pattern, 30, Fore.CYAN, 5, len(keyword)))
 
-                    if len(highlights) >= 3:  # Max 3 highlights per term
-                        break
+        return specs
 
-        # Keyword highlights
-        if query.keywords:
-            for keyword in query.keywords:
-                pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-                matches = pattern.finditer(content)
+    def _find_highlights_streaming(
+        self, chunks: Iterable[str], query: SearchQuery
+    ) -> List[str]:
+        """Eşleşen kısımları vurgular (içerik parçalar halinde gelir)
 
-                for match in matches:
-                    start = max(0, match.start() - 30)
-                    end = min(len(content), match.end() + 30)
-                    context = content[start:end]
+        Her terim için ilk MAX_MATCHES_PER_TERM eşleşme bağlamıyla toplanır;
+        bütün terimler dolunca okuma durur. Tamponda yalnızca taranmamış kısım
+        ve bağlam payı tutulur, bu yüzden bellek dosya boyutundan bağımsızdır.
+        """
+        specs = self._highlight_specs(query)
+        if not specs:
+            return []
 
-                    highlighted = pattern.sub(
-                        f"{Fore.CYAN}\\g<0>{Style.RESET_ALL}", context
-                    )
-                    highlights.append(highlighted)
+        found: List[List[str]] = [[] for _ in specs]
+        next_pos = [0] * len(specs)  # Her terim için taramanın devam edeceği mutlak konum
+        margin = max(spec[1] for spec in specs)
+        buffer = ""
+        base = 0  # buffer[0]'ın mutlak konumu
 
-                    if len(highlights) >= 5:  # Max total highlights
-                        break
+        chunks = iter(chunks)
+        try:
+            for chunk in itertools.chain(chunks, [None]):
+                final = chunk is None
+                if not final:
+                    buffer += chunk
+
+                for i, (pattern, width, color, _, term_len) in enumerate(specs):
+                    if len(found[i]) >= MAX_MATCHES_PER_TERM:
+                        continue
+
+                    pos = next_pos[i] - base
+                    for match in pattern.finditer(buffer, pos):
+                        if not final and match.end() + width > len(buffer):
+                            # Bağlamın sağ tarafı sonraki parçada
+                            pos = match.start()
+                            break
+
+                        start = max(0, match.start() - width)
+                        end = min(len(buffer), match.end() + width)
+                        found[i].append(
+                            pattern.sub(f"{color}\\g<0>{Style.RESET_ALL}", buffer[start:end])
+                        )
+                        pos = match.end()
+                        if len(found[i]) >= MAX_MATCHES_PER_TERM:
+                            break
+                    else:
+                        # Parça sınırına taşan bir eşleşme buradan başlayabilir
+                        pos = max(pos, len(buffer) - term_len + 1)
+
+                    next_pos[i] = base + pos
+
+                active = [
+                    next_pos[i]
+                    for i in range(len(specs))
+                    if len(found[i]) < MAX_MATCHES_PER_TERM
+                ]
+                if not active:
+                    break
+
+                cut = min(active) - margin - base
+                if cut > 0:
+                    buffer = buffer[cut:]
+                    base += cut
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+        # Orijinal sınırlar: metin terimleri toplam 3'e, anahtar kelimeler 5'e kadar
+        highlights = []
+        for (_, _, _, limit, _), matches in zip(specs, found):
+            for highlighted in matches:
+                highlights.append(highlighted)
+                if len(highlights) >= limit:
+                    break
 
         return highlights[:5]  # Max 5 highlights
 
@@ -370,6 +793,15 @@ class QueryEngine:
         else:
             return "general"
 
+    def _scoring_terms(self, query: SearchQuery) -> List[str]:
+        """Relevance skorlamasında kullanılan terimler"""
+        search_terms = []
+        if query.text:
+            search_terms.extend(self._extract_search_terms(query.text))
+        if query.keywords:
+            search_terms.extend(query.keywords)
+        return search_terms
+
     def _calculate_relevance_scores(
         self, results: List[SearchResult], query: SearchQuery
     ) -> List[SearchResult]:
@@ -378,59 +810,13 @@ class QueryEngine:
         if not query.text and not query.keywords:
             return results
 
-        search_terms = []
-        if query.text:
-            search_terms.extend(self._extract_search_terms(query.text))
-        if query.keywords:
-            search_terms.extend(query.keywords)
-
-        for result in results:
-            score = 0.0
-
-            # File name matching (yüksek ağırlık)
-            for term in search_terms:
-                if term.lower() in result.file_name.lower():
-                    score += 10.0
-
-            # File path matching (orta ağırlık)
-            for term in search_terms:
-                if term.lower() in result.file_path.lower():
-                    score += 5.0
-
-            # Content matching (normal ağırlık)
-            content = result.content_preview.lower()
-            for term in search_terms:
-                term_count = content.count(term.lower())
-                score += term_count * 2.0
-
-            # File size normalization (küçük dosyalar biraz daha yüksek skor)
-            if result.file_size > 0:
-                size_factor = min(1.0, 10000 / result.file_size)
-                score *= 0.5 + size_factor * 0.5
-
-            # Content type bonus
-            type_bonus = {
-                "readme": 1.2,
-                "documentation": 1.1,
-                "guide": 1.1,
-                "todo": 1.0,
-                "report": 1.0,
-                "configuration": 0.9,
-                "general": 1.0,
-            }
-            score *= type_bonus.get(result.content_type, 1.0)
-
-            # Recent files bonus (son 7 gün)
-            try:
-                modified_date = datetime.fromisoformat(
-                    result.modified_at.replace("Z", "+00:00")
-                )
-                days_ago = (datetime.now(timezone.utc) - modified_date).days
-                if days_ago <= 7:
-                    score *= 1.1
-            except:
-                pass
+        if not results:
+            return results
 
+        scores = self.scorer.relevance_scores(
+            ResultFeatures.from_results(results), self._scoring_terms(query)
+        )
+        for result, score in zip(results, scores.tolist()):
             result.relevance_score = score
 
         return results
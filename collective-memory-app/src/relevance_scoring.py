@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Relevance Scoring - Arama sonuçları için sütunsal (NumPy) skorlama
+Özellikler bir kez dizilere toplanır; terim eşleşmesi, boyut normalizasyonu,
+içerik tipi bonusu, güncellik ve AI bileşenleri dizi işlemleriyle hesaplanır
+"""
+
+import warnings
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# İçerik tipi çarpanları (QueryEngine._determine_content_type)
+TYPE_BONUS = {
+    "readme": 1.2,
+    "documentation": 1.1,
+    "guide": 1.1,
+    "todo": 1.0,
+    "report": 1.0,
+    "configuration": 0.9,
+    "general": 1.0,
+}
+
+# Popülerlik sezgileri
+IMPORTANT_KEYWORDS = ("readme", "index", "main", "config", "setup", "guide")
+POPULAR_EXTENSIONS = {".md": 0.8, ".txt": 0.6, ".py": 0.7, ".js": 0.6, ".json": 0.5}
+DEFAULT_EXTENSION_POPULARITY = 0.3
+
+# Güncellik basamakları: (en fazla gün, freshness skoru)
+FRESHNESS_STEPS = ((1, 1.0), (7, 0.8), (30, 0.6), (90, 0.4), (365, 0.2))
+SECONDS_PER_DAY = 86400
+
+
+def parse_timestamps(values: Iterable[Optional[str]]) -> np.ndarray:
+    """ISO tarihleri datetime64[us] dizisine çevirir (okunamayanlar NaT)
+
+    Saat dilimi bilgisi atılır; veritabanındaki değerler yerel saattir.
+    """
+    values = ["" if value is None else str(value) for value in values]
+    try:
+        # NumPy saat dilimli değerleri UTC'ye çevirip uyarır; o durumda yavaş yol
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            return np.array(
+                [value or "NaT" for value in values], dtype="datetime64[us]"
+            )
+    except (ValueError, UserWarning, DeprecationWarning):
+        pass
+
+    parsed = []
+    for value in values:
+        try:
+            moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            parsed.append(np.datetime64(moment.replace(tzinfo=None), "us"))
+        except ValueError:
+            parsed.append(np.datetime64("NaT"))
+    return np.array(parsed, dtype="datetime64[us]")
+
+
+@dataclass
+class ResultFeatures:
+    """Skorlamada kullanılan sonuç özellikleri (sütunlar)"""
+
+    ids: np.ndarray
+    names: np.ndarray  # küçük harf
+    paths: np.ndarray  # küçük harf
+    previews: np.ndarray  # orijinal
+    previews_lower: np.ndarray
+    extensions: np.ndarray  # küçük harf
+    sizes: np.ndarray
+    text_ranks: np.ndarray
+    word_counts: np.ndarray
+    type_bonus: np.ndarray
+    modified: np.ndarray  # datetime64[us]
+
+    @classmethod
+    def from_results(cls, results: Sequence) -> "ResultFeatures":
+        """SearchResult listesinden tek geçişte sütunlar oluşturur"""
+        previews = np.array([r.content_preview or "" for r in results], dtype=str)
+        return cls(
+            ids=np.array([r.file_id for r in results], dtype=np.int64),
+            names=np.char.lower(np.array([r.file_name or "" for r in results], dtype=str)),
+            paths=np.char.lower(np.array([r.file_path or "" for r in results], dtype=str)),
+            previews=previews,
+            previews_lower=np.char.lower(previews),
+            extensions=np.char.lower(
+                np.array([r.file_extension or "" for r in results], dtype=str)
+            ),
+            sizes=np.array([r.file_size or 0 for r in results], dtype=np.float64),
+            text_ranks=np.array([r.text_rank or 0.0 for r in results], dtype=np.float64),
+            word_counts=np.array([r.word_count or 0 for r in results], dtype=np.int64),
+            type_bonus=np.array(
+                [TYPE_BONUS.get(r.content_type, 1.0) for r in results], dtype=np.float64
+            ),
+            modified=parse_timestamps(r.modified_at for r in results),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class RelevanceScorer:
+    """
+    Vectorized relevance scoring shared by QueryEngine and EnhancedQueryEngine
+
+    Bileşenler eski satır satır hesaplamayla aynı işlem sırasını izler,
+    bu yüzden skorlar (ve sıralama) birebir aynıdır.
+    """
+
+    def __init__(self, now: Optional[datetime] = None):
+        self._now = now
+
+    def _days_ago(self, features: ResultFeatures) -> np.ndarray:
+        """Gün farkı (timedelta.days gibi aşağı yuvarlanır), okunamayan tarih için NaN"""
+        now = np.datetime64(self._now or datetime.now(), "us")
+        seconds = (now - features.modified) / np.timedelta64(1, "s")
+        return np.floor(seconds / SECONDS_PER_DAY)
+
+    # ================================
+    # BASE RELEVANCE
+    # ================================
+
+    def relevance_scores(
+        self, features: ResultFeatures, search_terms: List[str]
+    ) -> np.ndarray:
+        """QueryEngine relevance skoru (terim, boyut, tip ve güncellik)"""
+        scores = np.zeros(len(features), dtype=np.float64)
+        terms = [term.lower() for term in search_terms]
+
+        # File name matching (yüksek ağırlık)
+        for term in terms:
+            scores += np.where(np.char.find(features.names, term) >= 0, 10.0, 0.0)
+
+        # File path matching (orta ağırlık)
+        for term in terms:
+            scores += np.where(np.char.find(features.paths, term) >= 0, 5.0, 0.0)
+
+        # Content matching (normal ağırlık)
+        for term in terms:
+            scores += np.char.count(features.previews_lower, term) * 2.0
+
+        # FTS5 bm25 (negatif = daha alakalı)
+        scores += -features.text_ranks
+
+        # File size normalization (küçük dosyalar biraz daha yüksek skor)
+        sized = features.sizes > 0
+        size_factor = np.minimum(
+            1.0, 10000 / np.where(sized, features.sizes, 1.0)
+        )
+        scores = np.where(sized, scores * (0.5 + size_factor * 0.5), scores)
+
+        # Content type bonus
+        scores *= features.type_bonus
+
+        # Recent files bonus (son 7 gün)
+        days_ago = self._days_ago(features)
+        scores = np.where(days_ago <= 7, scores * 1.1, scores)
+
+        return scores
+
+    # ================================
+    # AI SCORING (EnhancedQueryEngine)
+    # ================================
+
+    def content_quality(self, features: ResultFeatures) -> np.ndarray:
+        """Kelime sayısı, yapı ve cümle uzunluğu sezgileri"""
+        previews = features.previews
+        score = np.where(features.word_counts > 50, 0.3, 0.0)
+        score = score + np.where(features.word_counts > 200, 0.2, 0.0)
+
+        # Has headings / code examples / links or references
+        score = score + np.where(np.char.find(previews, "#") >= 0, 0.2, 0.0)
+        has_code = (np.char.find(previews, "`") >= 0) | (
+            np.char.find(previews, "code") >= 0
+        )
+        score = score + np.where(has_code, 0.1, 0.0)
+        has_links = (
+            (np.char.find(previews, "http") >= 0)
+            | (np.char.find(previews, "[") >= 0)
+            | (np.char.find(previews, "]") >= 0)
+        )
+        score = score + np.where(has_links, 0.1, 0.0)
+
+        # Language quality: ortalama cümle uzunluğu 10-25 kelime
+        sentences = np.char.count(previews, ".") + 1
+        words = np.fromiter(
+            (len(text.replace(".", " ").split()) for text in previews.tolist()),
+            dtype=np.float64,
+            count=len(previews),
+        )
+        average = words / sentences
+        good_sentences = (sentences > 3) & (average >= 10) & (average <= 25)
+        score = score + np.where(good_sentences, 0.1, 0.0)
+
+        return np.minimum(score, 1.0)
+
+    def freshness(self, features: ResultFeatures) -> np.ndarray:
+        """Değiştirilme tarihine göre güncellik (tarih yoksa 0.5)"""
+        days_ago = self._days_ago(features)
+        score = np.full(len(features), 0.1)
+        for max_days, step_score in reversed(FRESHNESS_STEPS):
+            score = np.where(days_ago <= max_days, step_score, score)
+        return np.where(np.isnan(days_ago), 0.5, score)
+
+    def popularity(self, features: ResultFeatures) -> np.ndarray:
+        """Dosya adı ve uzantısına göre popülerlik"""
+        score = np.zeros(len(features), dtype=np.float64)
+        for keyword in IMPORTANT_KEYWORDS:
+            score += np.where(np.char.find(features.names, keyword) >= 0, 0.2, 0.0)
+
+        score += np.array(
+            [
+                POPULAR_EXTENSIONS.get(ext, DEFAULT_EXTENSION_POPULARITY)
+                for ext in features.extensions.tolist()
+            ],
+            dtype=np.float64,
+        )
+        return np.minimum(score, 1.0)
+
+    def context_relevance(self, features: ResultFeatures, query_text: str) -> np.ndarray:
+        """Sorgu ve önizleme kelime kümeleri arasında Jaccard benzerliği"""
+        if not query_text:
+            return np.full(len(features), 0.5)
+
+        query_terms = set(query_text.lower().split())
+        values = []
+        for preview in features.previews_lower.tolist():
+            content_terms = set(preview.split())
+            union = len(query_terms | content_terms)
+            values.append(len(query_terms & content_terms) / union if union else 0.0)
+        return np.array(values, dtype=np.float64)
+
+    def ai_components(
+        self, features: ResultFeatures, query_text: str
+    ) -> Dict[str, np.ndarray]:
+        """AI skor bileşenleri ve birleşik boost"""
+        components = {
+            "content_quality": self.content_quality(features),
+            "freshness": self.freshness(features),
+            "popularity": self.popularity(features),
+            "context_relevance": self.context_relevance(features, query_text),
+        }
+        components["boost"] = (
+            components["content_quality"] * 0.3
+            + components["freshness"] * 0.2
+            + components["popularity"] * 0.2
+            + components["context_relevance"] * 0.3
+        )
+        return components
+
+    # ================================
+    # TOP-K
+    # ================================
+
+    @staticmethod
+    def top_k(
+        scores: np.ndarray, ids: np.ndarray, k: int, descending: bool = True
+    ) -> np.ndarray:
+        """(skor, id) sırasında ilk k indeks; argpartition + yalnızca adayların sıralanması
+
+        Eşit skorlar id'ye göre artan sıralanır, sınırdaki eşitlikler de dahil.
+        """
+        if k <= 0 or len(scores) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        keys = -scores if descending else scores
+        if k < len(keys):
+            kth = keys[np.argpartition(keys, k - 1)[k - 1]]
+            candidates = np.flatnonzero(keys <= kth)
+        else:
+            candidates = np.arange(len(keys))
+
+        order = np.lexsort((ids[candidates], keys[candidates]))
+        return candidates[order][:k]
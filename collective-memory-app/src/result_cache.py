@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Result Cache - Thread-safe LRU + TTL sonuç önbelleği
+Generation sayacı ve tag (ör. memory id) bazlı hedefli invalidation
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+
+
+@dataclass
+class CacheEntry:
+    """Önbellek kaydı"""
+
+    value: Any
+    generation: int
+    expires_at: float
+    tags: Set[Hashable] = field(default_factory=set)
+    weight: int = 1
+
+
+class ResultCache:
+    """
+    LRU + TTL result cache
+
+    - Her yazma işleminde bump_generation() çağrılabilir; eski generation'a ait
+      kayıtlar okunurken geçersiz sayılır
+    - Kayıtlar içerdikleri tag'leri (memory id'leri) saklar; invalidate_tags()
+      yalnızca ilgili kayıtları siler
+    - max_weight verilirse kayıt ağırlıklarının (ör. sonuç sayısı) toplamı da
+      sınırlanır
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: float = 300.0,
+        max_weight: Optional[int] = None,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.max_weight = max_weight
+        self.total_weight = 0
+
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._tag_index: Dict[Hashable, Set[Hashable]] = {}
+        self._lock = threading.RLock()
+        self.generation = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def bump_generation(self) -> int:
+        """Mark every existing entry as stale"""
+        with self._lock:
+            self.generation += 1
+            return self.generation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a cached value or None (expired/stale entries are dropped)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.generation != self.generation:
+                self._remove(key)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        tags: Iterable[Hashable] = (),
+        generation: Optional[int] = None,
+        weight: int = 1,
+    ):
+        """
+        Store a value.
+
+        generation: sonuç hesaplanmaya başlamadan önce okunan generation;
+        hesaplama sırasında bir yazma olduysa sonuç önbelleğe alınmaz.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            entry = CacheEntry(
+                value=value,
+                generation=self.generation,
+                expires_at=time.monotonic() + self.ttl_seconds,
+                tags=set(tags),
+                weight=max(0, weight),
+            )
+            self._entries[key] = entry
+            self.total_weight += entry.weight
+            for tag in entry.tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries or (
+                self.max_weight is not None and self.total_weight > self.max_weight
+            ):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate_tags(self, tags: Iterable[Hashable]) -> int:
+        """Remove every entry that contains one of the tags"""
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tag_index.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.total_weight -= entry.weight
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+            self.total_weight = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache metrics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_entries,
+                "weight": self.total_weight,
+                "max_weight": self.max_weight,
+                "ttl_seconds": self.ttl_seconds,
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
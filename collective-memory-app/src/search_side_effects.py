@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Search Side Effects - Arama sonrası yan etkilerin arka planda işlenmesi
+Sınırlı kuyruk + worker thread (prompt kaydı, ilişki güncellemesi, event fan-out)
+ve artımlı güncellenen prompt öneri önbelleği
+"""
+
+import logging
+import queue
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class SideEffectQueue:
+    """
+    Bounded background task queue drained by a single worker thread
+
+    - submit() never blocks the request path; tasks are dropped (and counted)
+      when the queue is full
+    - Task hataları loglanır, worker'ı durdurmaz
+    - Sayaçlar istek thread'leri ve worker arasında kilitle paylaşılır
+    """
+
+    def __init__(self, max_size: int = 1000, name: str = "search-side-effects"):
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_size)
+        self.max_size = max_size
+
+        # Metrics
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self._stats_lock = threading.Lock()
+
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, task: Callable, *args, **kwargs) -> bool:
+        """Queue a task; returns False if it was dropped"""
+        if not self._running:
+            return False
+        try:
+            self._queue.put_nowait((task, args, kwargs))
+            with self._stats_lock:
+                self.submitted += 1
+            return True
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            logger.warning(f"Side effect queue full, dropped {getattr(task, '__name__', task)}")
+            return False
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                task, args, kwargs = item
+                task(*args, **kwargs)
+                with self._stats_lock:
+                    self.processed += 1
+            except Exception as e:
+                with self._stats_lock:
+                    self.errors += 1
+                logger.error(f"Side effect task failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued tasks are processed (True if drained)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def stop(self, timeout: float = 5.0):
+        """Drain remaining tasks and stop the worker"""
+        if not self._running:
+            return
+        self._running = False
+        self._queue.put(None)
+        self._worker.join(timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue metrics"""
+        with self._stats_lock:
+            return {
+                "queue_size": self._queue.qsize(),
+                "max_size": self.max_size,
+                "submitted": self.submitted,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "errors": self.errors,
+            }
+
+
+# A-Z -> a-z (SQLite'ın LOWER() ve LIKE karşılaştırması)
+ASCII_LOWER = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"
+)
+
+
+class PromptSuggestionCache:
+    """
+    In-memory prompt history for similar-prompt and context suggestions
+
+    prompt_history / prompt_relationships tablolarından bir kez yüklenir,
+    sonra her kaydedilen prompt ile artımlı güncellenir. Okumalar veritabanına
+    gitmez.
+
+    - En fazla max_prompts prompt tutulur; en uzun süredir kullanılmayan
+      prompt (ve ilişkileri) çıkarılır
+    - Eşleşme DatabaseManager.get_similar_prompts ile aynıdır: önemli
+      kelimeler prompt metninde alt dizi olarak aranır (LIKE '%kelime%',
+      yalnızca ASCII harflerde büyük/küçük harf duyarsız)
+    - Alt dizi eşleşmesi için artımlı bir trigram -> prompt id indeksi
+      tutulur; yalnızca kelimenin tüm trigramlarını içeren promptlar
+      LIKE eşleştiricisiyle doğrulanır
+    """
+
+    def __init__(self, stopwords: Iterable[str] = (), max_prompts: int = 10000):
+        self.stopwords = set(stopwords)
+        self.max_prompts = max_prompts
+        self.ready = False
+
+        # id -> prompt, en eski kullanılan başta
+        self._prompts: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._folded: Dict[int, str] = {}
+        self._id_by_text: Dict[str, int] = {}
+        self._relations: Dict[int, Dict[int, float]] = {}
+        # trigram (katlanmış metin) -> onu içeren prompt id'leri
+        self._grams: Dict[str, Set[int]] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _fold(text: str) -> str:
+        """SQLite LOWER/LIKE gibi yalnızca ASCII harfleri küçültür"""
+        return text.translate(ASCII_LOWER)
+
+    @staticmethod
+    def _trigrams(folded: str) -> Set[str]:
+        return {folded[i : i + 3] for i in range(len(folded) - 2)}
+
+    def _index(self, prompt_id: int, folded: str):
+        for gram in self._trigrams(folded):
+            self._grams.setdefault(gram, set()).add(prompt_id)
+
+    def _unindex(self, prompt_id: int, folded: str):
+        for gram in self._trigrams(folded):
+            ids = self._grams.get(gram)
+            if ids is not None:
+                ids.discard(prompt_id)
+                if not ids:
+                    del self._grams[gram]
+
+    def _candidate_ids(self, word: str) -> Optional[Set[int]]:
+        """Prompts containing every trigram of word's literal parts (None: no trigram)"""
+        grams = set()
+        for segment in re.split("[%_]", self._fold(word)):
+            grams |= self._trigrams(segment)
+        if not grams:
+            return None
+
+        postings = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            if not candidates:
+                break
+            candidates &= ids
+        return candidates
+
+    @classmethod
+    def _like_matcher(cls, word: str) -> Callable[[str], bool]:
+        """'%word%' LIKE karşılığı (word içindeki % ve _ joker olarak kalır)"""
+        pattern = cls._fold(word)
+        if "%" not in pattern and "_" not in pattern:
+            return lambda folded: pattern in folded
+        regex = re.compile(
+            "".join(
+                ".*" if char == "%" else "." if char == "_" else re.escape(char)
+                for char in pattern
+            ),
+            re.DOTALL,
+        )
+        return lambda folded: regex.search(folded) is not None
+
+    def _important_words(self, text: str) -> List[str]:
+        """Same keyword selection as DatabaseManager.get_similar_prompts"""
+        words = text.lower().split()
+        if len(words) < 2:
+            return []
+        return [w for w in words if len(w) > 3 and w not in self.stopwords][:5]
+
+    # ================================
+    # UPDATES
+    # ================================
+
+    def load(self, db_manager, limit: int = 10000):
+        """Load recent prompts and their relationships from the database"""
+        cursor = db_manager.connection.cursor()
+        cursor.execute(
+            """
+            SELECT id, prompt_text, last_used_at, results_count, search_type
+            FROM prompt_history ORDER BY last_used_at DESC LIMIT ?
+        """,
+            (limit,),
+        )
+        prompts = [dict(row) for row in cursor.fetchall()]
+
+        cursor.execute(
+            "SELECT prompt_id_1, prompt_id_2, similarity_score FROM prompt_relationships"
+        )
+        relations = cursor.fetchall()
+
+        with self._lock:
+            # En son kullanılan en sona (LRU sırası)
+            for prompt in reversed(prompts):
+                self.upsert_prompt(**prompt)
+            for row in relations:
+                self.add_relationship(row[0], row[1], row[2])
+            self.ready = True
+
+        logger.info(f"Prompt suggestion cache loaded: {len(prompts)} prompts")
+
+    def upsert_prompt(
+        self,
+        id: int,
+        prompt_text: str,
+        last_used_at: Any = None,
+        results_count: int = 0,
+        search_type: str = "basic",
+    ):
+        """Add or refresh a prompt (marks it most recently used)"""
+        with self._lock:
+            self._prompts[id] = {
+                "id": id,
+                "prompt_text": prompt_text,
+                "last_used_at": last_used_at,
+                "results_count": results_count,
+                "search_type": search_type,
+            }
+            self._prompts.move_to_end(id)
+            folded = self._fold(prompt_text)
+            previous = self._folded.get(id)
+            if previous != folded:
+                if previous is not None:
+                    self._unindex(id, previous)
+                self._index(id, folded)
+            self._folded[id] = folded
+            self._id_by_text[prompt_text] = id
+
+            while len(self._prompts) > self.max_prompts:
+                self._evict(next(iter(self._prompts)))
+
+    def _evict(self, prompt_id: int):
+        prompt = self._prompts.pop(prompt_id)
+        self._unindex(prompt_id, self._folded.pop(prompt_id))
+        if self._id_by_text.get(prompt["prompt_text"]) == prompt_id:
+            del self._id_by_text[prompt["prompt_text"]]
+        for other_id in self._relations.pop(prompt_id, {}):
+            related = self._relations.get(other_id)
+            if related is not None:
+                related.pop(prompt_id, None)
+                if not related:
+                    del self._relations[other_id]
+
+    def add_relationship(self, prompt_id_1: int, prompt_id_2: int, similarity_score: float):
+        """Record a (symmetric) relationship between two cached prompts"""
+        with self._lock:
+            if prompt_id_1 not in self._prompts or prompt_id_2 not in self._prompts:
+                return
+            self._relations.setdefault(prompt_id_1, {})[prompt_id_2] = similarity_score
+            self._relations.setdefault(prompt_id_2, {})[prompt_id_1] = similarity_score
+
+    # ================================
+    # READS
+    # ================================
+
+    def get_prompt_id(self, prompt_text: str) -> Optional[int]:
+        """Id of an already recorded prompt"""
+        return self._id_by_text.get(prompt_text)
+
+    def get_similar_prompts(
+        self, prompt_text: str, limit: int = 5, similarity_threshold: float = 0.6
+    ) -> List[Dict]:
+        """Prompts sharing the important keywords of prompt_text"""
+        important = self._important_words(prompt_text)
+        if not important:
+            return []
+
+        with self._lock:
+            # Her kelime yalnızca trigram adaylarında doğrulanır
+            counts: Counter = Counter()
+            for word in important:
+                matches = self._like_matcher(word)
+                ids = self._candidate_ids(word)
+                for prompt_id in self._folded if ids is None else ids:
+                    if matches(self._folded[prompt_id]):
+                        counts[prompt_id] += 1
+
+            candidates = [
+                (count / len(important), self._prompts[prompt_id])
+                for prompt_id, count in counts.items()
+                if self._prompts[prompt_id]["prompt_text"] != prompt_text
+            ]
+
+        candidates.sort(
+            key=lambda item: (item[0], str(item[1]["last_used_at"] or "")), reverse=True
+        )
+        return [
+            dict(prompt, similarity_score=min(score, 1.0))
+            for score, prompt in candidates
+            if score >= similarity_threshold
+        ][:limit]
+
+    def get_related_prompts(self, prompt_id: int, limit: int = 5) -> List[Dict]:
+        """Related prompts ordered by similarity"""
+        with self._lock:
+            related = sorted(
+                self._relations.get(prompt_id, {}).items(), key=lambda item: -item[1]
+            )
+            return [
+                dict(self._prompts[other_id], similarity_score=score)
+                for other_id, score in related
+                if other_id in self._prompts
+            ][:limit]
+
+    def get_context_suggestions(self, current_prompt: str, limit: int = 3) -> List[Dict]:
+        """Same logic as DatabaseManager.get_prompt_context_suggestions, from memory"""
+        suggestions = []
+        for prompt in self.get_similar_prompts(current_prompt, limit=limit * 2):
+            for rel in self.get_related_prompts(prompt["id"], limit=2):
+                if rel["similarity_score"] > 0.7:
+                    suggestions.append(
+                        {
+                            "suggested_prompt": rel["prompt_text"],
+                            "context_reason": f"'{prompt['prompt_text'][:50]}...' ile ilişkili",
+                            "confidence": rel["similarity_score"],
+                            "last_used": rel["last_used_at"],
+                        }
+                    )
+
+        seen = set()
+        unique_suggestions = []
+        for sugg in sorted(suggestions, key=lambda x: x["confidence"], reverse=True):
+            if sugg["suggested_prompt"] not in seen:
+                seen.add(sugg["suggested_prompt"])
+                unique_suggestions.append(sugg)
+                if len(unique_suggestions) >= limit:
+                    break
+
+        return unique_suggestions
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "prompts": len(self._prompts),
+                "max_prompts": self.max_prompts,
+                "relationships": sum(len(r) for r in self._relations.values()) // 2,
+                "indexed_trigrams": len(self._grams),
+            }
+
+
+class PromptTracker:
+    """
+    Prompt kaydı ve ilişki güncellemesi (yalnızca worker thread'inde çalışır)
+
+    SQLite bağlantısı thread'e bağlı olduğu için worker kendi DatabaseManager
+    bağlantısını ilk görevde açar.
+    """
+
+    def __init__(self, db_path: str, suggestion_cache: PromptSuggestionCache):
+        self.db_path = str(db_path)
+        self.suggestion_cache = suggestion_cache
+        self._db = None
+
+    def _get_db(self):
+        if self._db is None:
+            try:
+                from .database_manager import DatabaseManager
+            except ImportError:
+                from database_manager import DatabaseManager
+
+            db = DatabaseManager(self.db_path)
+            if not db.connect() or not db.initialize_database():
+                raise RuntimeError(f"Prompt database unavailable: {self.db_path}")
+            self._db = db
+        return self._db
+
+    def warm_up(self):
+        """Load the suggestion cache (queued once at startup)"""
+        self.suggestion_cache.load(self._get_db())
+
+    def record(
+        self,
+        prompt_text: str,
+        search_type: str,
+        results_count: int,
+        response_time_ms: int,
+        user_session: Optional[str] = None,
+    ) -> Optional[int]:
+        """Store the prompt, update relationships and refresh the cache"""
+        db = self._get_db()
+        prompt_id = db.add_prompt(
+            prompt_text=prompt_text,
+            search_type=search_type,
+            results_count=results_count,
+            response_time_ms=response_time_ms,
+            user_session=user_session,
+        )
+        if prompt_id is None:
+            return None
+
+        self.suggestion_cache.upsert_prompt(
+            id=prompt_id,
+            prompt_text=prompt_text,
+            last_used_at=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+            results_count=results_count,
+            search_type=search_type,
+        )
+        for related in db.get_related_prompts(prompt_id, limit=10):
+            self.suggestion_cache.add_relationship(
+                prompt_id, related["id"], related["similarity_score"]
+            )
+        return prompt_id
+
+    def close(self):
+        if self._db is not None:
+            self._db.disconnect()
+            self._db = None
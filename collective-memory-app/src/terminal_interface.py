@@ -901,6 +901,22 @@ Examples:
             # Set up cancellation handler
             self.progress_manager.set_cancellation_handler(lambda: print("Cleaning up indexing operation..."))
             
+            # Batched ingestion - one transaction per batch
+            batch_size = 500
+            pending_files = []
+
+            def flush_pending():
+                nonlocal indexed_count, skipped_count, bytes_processed
+                if not pending_files:
+                    return
+                summary = self.database_manager.add_or_update_files(
+                    pending_files, batch_size=batch_size
+                )
+                indexed_count += len(summary["file_ids"])
+                skipped_count += summary["failed"]
+                bytes_processed += summary["bytes"]
+                pending_files.clear()
+
             for root, dirs, files in os.walk(self.data_path):
                 for file in files:
                     file_path = Path(root) / file
@@ -925,14 +941,10 @@ Examples:
                                 message=f"{relative_path} ({size_str})"
                             )
                             
-                            # Perform indexing
-                            file_id = self.database_manager.add_or_update_file(str(file_path))
-                            
-                            if file_id:
-                                indexed_count += 1
-                                bytes_processed += file_size
-                            else:
-                                skipped_count += 1
+                            # Perform indexing in batched transactions
+                            pending_files.append(str(file_path))
+                            if len(pending_files) >= batch_size:
+                                flush_pending()
                             
                         except KeyboardInterrupt:
                             self.progress_manager.cancel_operation()
@@ -951,6 +963,13 @@ Examples:
                 if self.progress_manager.is_cancelled():
                     break
 
+            # Write the remaining files (also keeps work done before a cancel)
+            flush_pending()
+
+            # Document embeddings only for new or changed content
+            if self.use_enhanced and not self.progress_manager.is_cancelled():
+                self.query_engine.index_embeddings()
+
             # Phase 3: Finish with comprehensive statistics
             if self.progress_manager.is_cancelled():
                 self.progress_manager.finish_operation(
@@ -1001,6 +1020,28 @@ Examples:
             )
             print(f"❌ Reindexing failed: {e}")
 
+    def _rescan_changed_files(self, since: Optional[datetime] = None):
+        """Yalnızca değişen dosyaları indeksler (scan manifest fast path)"""
+        try:
+            monitor = DataFolderMonitor(
+                str(self.data_path), database_manager=self.database_manager
+            )
+
+            if since:
+                print(f"🔍 Rescanning files modified since {since:%Y-%m-%d %H:%M}...")
+            else:
+                print("🔍 Rescanning for changed files...")
+
+            summary = monitor.rescan(since=since)
+            if summary and summary["removed"]:
+                print(f"🗑️  {summary['removed']} deleted files removed from index")
+
+            if self.use_enhanced:
+                self.query_engine.index_embeddings()
+
+        except Exception as e:
+            print(f"❌ Rescan failed: {e}")
+
     def _start_file_monitoring(self):
         """Dosya izlemeyi başlatır"""
         if self.file_monitor and self.file_monitor.is_running:
@@ -1009,7 +1050,9 @@ Examples:
 
         try:
             self.file_monitor = DataFolderMonitor(
-                str(self.data_path), callback=self._on_file_change
+                str(self.data_path),
+                callback=self._on_file_change,
+                database_manager=self.database_manager,
             )
 
             print("Starting file monitoring...")
@@ -1313,6 +1356,9 @@ Examples:
         elif args.command == "index":
             self._reindex_all_files()
 
+        elif args.command == "rescan":
+            self._rescan_changed_files(since=args.since)
+
         elif args.command == "stats":
             self._show_statistics()
 
@@ -1806,6 +1852,7 @@ class CommandProcessor:
             'stats': self._cmd_stats,
             'history': self._cmd_history,
             'index': self._cmd_index,
+            'rescan': self._cmd_rescan,
             'monitor': self._cmd_monitor,
             'quit': self._cmd_quit,
             'exit': self._cmd_quit,
@@ -2101,6 +2148,23 @@ class CommandProcessor:
         self.terminal_interface._reindex_all_files()
         return True
     
+    def _cmd_rescan(self, args: list) -> bool:
+        """Handle rescan command"""
+        since = None
+        if "--since" in args:
+            index = args.index("--since")
+            if index + 1 >= len(args):
+                print("❌ Usage: rescan [--since YYYY-MM-DD[THH:MM]]")
+                return False
+            try:
+                since = datetime.fromisoformat(args[index + 1])
+            except ValueError:
+                print(f"❌ Invalid date: {args[index + 1]}")
+                return False
+
+        self.terminal_interface._rescan_changed_files(since=since)
+        return True
+    
     def _cmd_monitor(self, args: list) -> bool:
         """Handle monitor command"""
         print("👁️  Starting file monitoring...")
@@ -2139,6 +2203,7 @@ class CommandProcessor:
             'stats': 'Show database statistics',
             'history': 'Show command history',
             'index': 'Reindex all files',
+            'rescan': 'Index only changed files (rescan --since <date>)',
             'monitor': 'Start file monitoring',
             'quit': 'Exit the application',
             'exit': 'Exit the application',
@@ -2367,6 +2432,14 @@ def main():
 
     # Other commands
     subparsers.add_parser("index", help="Reindex all files")
+    rescan_parser = subparsers.add_parser(
+        "rescan", help="Index only files changed since the last scan"
+    )
+    rescan_parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="Only check files modified after this time (e.g. 2025-07-18T10:00)",
+    )
     subparsers.add_parser("stats", help="Show statistics")
     subparsers.add_parser("monitor", help="Start file monitoring")
 
@@ -6,11 +6,14 @@ Handles WebSocket connections with Windows-specific optimizations and fallback m
 
 import os
 import sys
+import json
 import logging
 import platform
 import threading
 import time
-from typing import Dict, List, Optional, Any, Callable
+from collections import deque
+from itertools import islice
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
@@ -418,33 +421,161 @@ class WebSocketConnectionManager:
         logger.info("WebSocket connection manager stopped")
 
 
+class EventLog:
+    """Ring-buffer event log with monotonic sequence numbers
+    
+    Events get strictly increasing sequence numbers (never reused after the
+    buffer wraps). Readers keep a cursor (last seen sequence) and block on a
+    condition variable until a newer event is published or a timeout passes.
+    """
+    
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._events: deque = deque(maxlen=capacity)
+        self._last_seq = 0
+        self._condition = threading.Condition()
+        self._closed = False
+    
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest event (0 if none)"""
+        return self._last_seq
+    
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest buffered event"""
+        return self._events[0]["id"] if self._events else self._last_seq + 1
+    
+    def publish(self, event_type: str, data: Dict, target_clients: List[str] = None) -> int:
+        """Append an event and wake up all waiting readers"""
+        with self._condition:
+            self._last_seq += 1
+            self._events.append({
+                "id": self._last_seq,
+                "type": event_type,
+                "data": data,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "target_clients": target_clients or []
+            })
+            self._condition.notify_all()
+            return self._last_seq
+    
+    def read_since(self, cursor: int, client_id: str = None,
+                   limit: int = 100) -> Tuple[List[Dict], int, bool]:
+        """Events after cursor visible to client
+        
+        Returns (events, new_cursor, truncated). truncated is True when events
+        after the cursor were already dropped from the ring buffer.
+        """
+        with self._condition:
+            cursor = max(0, min(cursor, self._last_seq))
+            first_seq = self.first_seq
+            truncated = cursor < first_seq - 1
+            start = max(0, cursor - first_seq + 1)
+            
+            events = []
+            for event in islice(self._events, start, None):
+                cursor = event["id"]
+                targets = event["target_clients"]
+                if not targets or client_id in targets:
+                    events.append(event)
+                    if len(events) >= limit:
+                        break
+            
+            return events, cursor, truncated
+    
+    def wait_for_events(self, cursor: int, client_id: str = None, timeout: float = 25.0,
+                        limit: int = 100) -> Tuple[List[Dict], int, bool]:
+        """Long-poll: block until events for client arrive or timeout passes"""
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            events, cursor, truncated = self.read_since(cursor, client_id, limit)
+            remaining = deadline - time.monotonic()
+            if events or truncated or remaining <= 0 or self._closed:
+                return events, cursor, truncated
+            
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._last_seq > cursor or self._closed, timeout=remaining
+                )
+    
+    def close(self):
+        """Wake up and release all waiting readers"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+    
+    def __len__(self) -> int:
+        return len(self._events)
+
+
 class TransportFallbackManager:
     """Manages transport fallback mechanisms for WebSocket connections"""
     
-    def __init__(self, app):
+    def __init__(self, app, max_events: int = 1000, max_poll_timeout: float = 30.0,
+                 sse_keepalive: float = 15.0):
         self.app = app
         self.fallback_endpoints = {}
         self.polling_clients = {}
-        self.event_queue = []
+        self.event_log = EventLog(capacity=max_events)
+        self.max_poll_timeout = max_poll_timeout
+        self.sse_keepalive = sse_keepalive
+        self._clients_lock = threading.Lock()
         
         self._setup_fallback_endpoints()
     
+    @staticmethod
+    def _parse_event_id(value: Optional[str]) -> Optional[int]:
+        """Parse a client supplied event id/cursor"""
+        try:
+            return int(value) if value not in (None, "") else None
+        except (TypeError, ValueError):
+            return None
+    
+    def _parse_timeout(self, value: Optional[str]) -> Optional[float]:
+        """Parse a long-poll timeout, clamped to [0, max_poll_timeout]"""
+        if value in (None, ""):
+            return 0.0
+        try:
+            timeout = float(value)
+        except (TypeError, ValueError):
+            return None
+        if timeout != timeout:  # NaN
+            return None
+        return max(0.0, min(timeout, self.max_poll_timeout))
+    
     def _setup_fallback_endpoints(self):
         """Setup fallback HTTP endpoints"""
         
         @self.app.route("/api/events/poll", methods=["GET"])
         def events_poll():
-            """HTTP polling endpoint for events"""
+            """HTTP long-polling endpoint for events"""
+            client_id = request.args.get("client_id") or None
+            last_event_id = self._parse_event_id(request.args.get("last_event_id"))
+            timeout = self._parse_timeout(request.args.get("timeout"))
+            if timeout is None:
+                return {"success": False, "error": "timeout must be a number of seconds"}, 400
+            
+            # Only registered clients keep a server-side cursor
+            with self._clients_lock:
+                tracked = client_id in self.polling_clients
+            if not tracked and last_event_id is None:
+                return {
+                    "success": False,
+                    "error": "last_event_id is required for unregistered clients"
+                }, 400
+            
             try:
-                client_id = request.args.get("client_id", "anonymous")
-                last_event_id = request.args.get("last_event_id", "0")
-                
-                # Get new events for this client
-                events = self._get_events_for_client(client_id, last_event_id)
+                # Get new events for this client (blocks up to timeout)
+                events, cursor, truncated = self._get_events_for_client(
+                    client_id, last_event_id, timeout=timeout
+                )
                 
                 return {
                     "success": True,
                     "events": events,
+                    "last_event_id": cursor,
+                    "truncated": truncated,
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 }
                 
@@ -454,20 +585,28 @@ class TransportFallbackManager:
         
         @self.app.route("/api/events/stream", methods=["GET"])
         def events_stream():
-            """Server-Sent Events stream endpoint"""
+            """Server-Sent Events stream endpoint (woken by publishes)"""
             try:
                 from flask import Response, stream_with_context
                 
+                client_id = request.args.get("client_id") or None
+                cursor = self._parse_event_id(
+                    request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+                )
+                if cursor is None:
+                    cursor = self.event_log.last_seq
+                
                 def generate():
-                    client_id = request.args.get("client_id", "anonymous")
-                    while True:
-                        # Get new events
-                        events = self._get_events_for_client(client_id)
-                        if events:
-                            for event in events:
-                                yield f"data: {event}\n\n"
-                        
-                        time.sleep(1)  # Check every second
+                    nonlocal cursor
+                    while not self.event_log._closed:
+                        events, cursor, _ = self.event_log.wait_for_events(
+                            cursor, client_id, timeout=self.sse_keepalive
+                        )
+                        if not events:
+                            yield ": keep-alive\n\n"
+                            continue
+                        for event in events:
+                            yield f"id: {event['id']}\ndata: {json.dumps(event)}\n\n"
                 
                 return Response(
                     stream_with_context(generate()),
@@ -483,42 +622,54 @@ class TransportFallbackManager:
                 logger.error(f"Error in events stream: {e}")
                 return {"success": False, "error": str(e)}, 500
     
-    def _get_events_for_client(self, client_id: str, last_event_id: str = "0") -> List[Dict]:
-        """Get events for specific client"""
-        # This is a simplified implementation
-        # In a real system, you would maintain a proper event queue per client
-        return []
-    
-    def add_event(self, event_type: str, data: Dict, target_clients: List[str] = None):
-        """Add event to queue for polling clients"""
-        event = {
-            "id": str(len(self.event_queue) + 1),
-            "type": event_type,
-            "data": data,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "target_clients": target_clients or []
-        }
+    def _get_events_for_client(self, client_id: Optional[str], last_event_id: Optional[int] = None,
+                               timeout: float = 0.0) -> Tuple[List[Dict], int, bool]:
+        """Get events after the client's cursor and advance the cursor
         
-        self.event_queue.append(event)
+        An explicit last_event_id overrides the stored cursor (e.g. after a
+        client restart). Only registered clients have a stored cursor; other
+        callers are stateless and start from last_event_id (or the oldest
+        buffered event), so arbitrary client ids cannot grow polling_clients.
+        """
+        with self._clients_lock:
+            client = self.polling_clients.get(client_id)
+            if last_event_id is None:
+                last_event_id = client["cursor"] if client else 0
         
-        # Keep only last 1000 events
-        if len(self.event_queue) > 1000:
-            self.event_queue = self.event_queue[-1000:]
+        events, cursor, truncated = self.event_log.wait_for_events(
+            last_event_id, client_id, timeout=timeout
+        )
         
-        logger.debug(f"Added event {event['id']} of type {event_type}")
+        with self._clients_lock:
+            # Re-check: the client may have unregistered while we were blocked
+            client = self.polling_clients.get(client_id)
+            if client is not None:
+                client["cursor"] = cursor
+                client["last_poll"] = datetime.now(timezone.utc).isoformat()
+        
+        return events, cursor, truncated
+    
+    def add_event(self, event_type: str, data: Dict, target_clients: List[str] = None) -> int:
+        """Publish event to polling/SSE clients"""
+        event_id = self.event_log.publish(event_type, data, target_clients)
+        logger.debug(f"Added event {event_id} of type {event_type}")
+        return event_id
     
     def register_polling_client(self, client_id: str):
-        """Register client for polling"""
-        self.polling_clients[client_id] = {
-            "registered_at": datetime.now(timezone.utc).isoformat(),
-            "last_poll": datetime.now(timezone.utc).isoformat()
-        }
+        """Register client for polling (cursor starts at the newest event)"""
+        with self._clients_lock:
+            self.polling_clients[client_id] = {
+                "registered_at": datetime.now(timezone.utc).isoformat(),
+                "last_poll": datetime.now(timezone.utc).isoformat(),
+                "cursor": self.event_log.last_seq
+            }
         logger.info(f"Registered polling client: {client_id}")
     
     def unregister_polling_client(self, client_id: str):
         """Unregister polling client"""
-        if client_id in self.polling_clients:
-            del self.polling_clients[client_id]
+        with self._clients_lock:
+            removed = self.polling_clients.pop(client_id, None)
+        if removed is not None:
             logger.info(f"Unregistered polling client: {client_id}")
     
     def get_polling_client_count(self) -> int:
@@ -527,4 +678,8 @@ class TransportFallbackManager:
     
     def get_event_queue_size(self) -> int:
         """Get current event queue size"""
-        return len(self.event_queue) 
\ No newline at end of file
+        return len(self.event_log)
+    
+    def stop(self):
+        """Release all blocked long-poll and SSE requests"""
+        self.event_log.close()
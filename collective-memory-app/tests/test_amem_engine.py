@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+A-Mem Engine Test Suite - Otomatik bağlantı ve arama testleri
+"""
+
+import time
+import unittest
+from unittest.mock import patch
+
+import networkx as nx
+
+from src.memory.amem_engine import AMemEngine
+
+
+class TestFeatureIndex(unittest.TestCase):
+    """Inverted index candidate generation test cases"""
+
+    def setUp(self):
+        """Set up an engine with a few memories"""
+        self.engine = AMemEngine()
+        self.contents = [
+            "React components use the useState hook for state management.",
+            "The useEffect hook handles side effects in React components.",
+            "PostgreSQL database migrations run before deployment.",
+            "Database indexes improve query performance in PostgreSQL.",
+        ]
+        self.nodes = [self.engine.create_memory_node(c) for c in self.contents]
+
+    def test_features_extracted_once_per_node(self):
+        """Test that existing nodes are not re-analyzed on insert or search"""
+        with patch.object(
+            self.engine, "_extract_features", wraps=self.engine._extract_features
+        ) as extract:
+            self.engine.create_memory_node("React hook rules for components.")
+            self.engine.search_memories("React hook")
+
+        self.assertEqual(extract.call_count, 2)
+        self.assertTrue(all(node.features for node in self.nodes))
+
+    def test_candidates_share_tokens(self):
+        """Test that only nodes sharing a token become candidates"""
+        features = self.engine._extract_features("PostgreSQL performance tuning")
+        candidates = set(self.engine._candidate_node_ids(features))
+
+        self.assertEqual(candidates, {self.nodes[2].id, self.nodes[3].id})
+        # Features are persisted with the node payload
+        store = self.engine.graph_store
+        row = store.get_node(store.index_of(self.nodes[0].id))
+        self.assertIsNotNone(row["features"])
+
+    def test_search_matches_full_scan(self):
+        """Test that indexed search ranks like a full similarity scan"""
+        query = "useEffect hook side effects"
+        features = self.engine._extract_features(query)
+        expected = max(
+            self.nodes,
+            key=lambda node: self.engine._calculate_similarity(features, node.content),
+        )
+
+        results = self.engine.search_memories(query, max_results=1)
+        self.assertEqual(results[0].id, expected.id)
+
+    def test_search_reads_index_under_lock(self):
+        """Test that search collects candidates while holding the engine lock"""
+        owned = []
+        collect = self.engine._candidate_node_ids
+
+        def spy(*args, **kwargs):
+            owned.append(self.engine.lock._is_owned())
+            return collect(*args, **kwargs)
+
+        with patch.object(self.engine, "_candidate_node_ids", side_effect=spy):
+            self.engine.search_memories("useEffect hook", max_results=1)
+
+        self.assertEqual(owned, [True])
+
+class TestCentralityCache(unittest.TestCase):
+    """Cached network centrality test cases"""
+
+    def setUp(self):
+        """Set up an engine with linked memories"""
+        self.engine = AMemEngine()
+        self.engine.linking_threshold = 0.3
+        for content in (
+            "UserService api calls the database server for performance tests.",
+            "UserService api calls the database server for security tests.",
+            "UserService api calls the database server for deployment tests.",
+        ):
+            self.engine.create_memory_node(content)
+
+    def test_centrality_computed_once_per_version(self):
+        """Test that searches reuse one PageRank computation"""
+        with patch(
+            "src.memory.amem_engine.nx.pagerank", wraps=nx.pagerank
+        ) as pagerank:
+            self.engine.search_memories("UserService database")
+            self.engine.search_memories("api server")
+            stats = self.engine.get_statistics()
+
+        self.assertEqual(pagerank.call_count, 1)
+        self.assertEqual(stats["centrality_version"], self.engine.graph_version)
+        self.assertGreater(self.engine.stats["total_links"], 0)
+
+        snapshot = self.engine.get_centrality_snapshot()
+        self.assertEqual(len(snapshot["pagerank"]), len(self.engine.memory_nodes))
+        self.assertAlmostEqual(float(snapshot["pagerank"].sum()), 1.0, places=6)
+
+    def test_stale_snapshot_refreshed_in_background(self):
+        """Test staleness bound and background refresh after mutations"""
+        first = self.engine.get_centrality_snapshot()
+        self.engine.create_memory_node("UserService api calls the database server.")
+
+        stale = self.engine.get_centrality_snapshot()
+        self.assertEqual(stale["version"], first["version"])
+
+        self.engine._centrality_refresh_thread.join()
+        fresh = self.engine.get_centrality_snapshot()
+        self.assertEqual(fresh["version"], self.engine.graph_version)
+
+    def test_staleness_bound_forces_sync_refresh(self):
+        """Test that an expired snapshot is recomputed synchronously"""
+        self.engine.get_centrality_snapshot()
+        self.engine.centrality_max_staleness = 0
+        self.engine.create_memory_node("Unrelated database migration note.")
+        time.sleep(0.01)
+
+        snapshot = self.engine.get_centrality_snapshot()
+        self.assertEqual(snapshot["version"], self.engine.graph_version)
+
+    def test_mutation_during_refresh_restarts_staleness(self):
+        """Test that a snapshot older than the graph is stale from the next mutation"""
+        self.engine.get_centrality_snapshot()
+        self.engine.create_memory_node("UserService api calls the database server.")
+        time.sleep(0.3)
+
+        mutated_at = []
+
+        def pagerank_with_mutation(graph, *args, **kwargs):
+            if not mutated_at:
+                mutated_at.append(time.monotonic())
+                self.engine.create_memory_node("Unrelated database migration note.")
+            return nx.pagerank(graph, *args, **kwargs)
+
+        with patch("src.memory.amem_engine.nx.pagerank", side_effect=pagerank_with_mutation):
+            snapshot = self.engine.refresh_centrality()
+
+        self.assertLess(snapshot["version"], self.engine.graph_version)
+        self.assertGreaterEqual(self.engine._graph_dirty_since, mutated_at[0])
+
+        # Within the bound since the mutation during refresh (not the first one):
+        # the snapshot is served and refreshed in the background
+        self.engine.centrality_max_staleness = time.monotonic() - mutated_at[0] + 0.2
+        served = self.engine.get_centrality_snapshot()
+        self.assertEqual(served["version"], snapshot["version"])
+        self.engine._centrality_refresh_thread.join()
+        self.assertEqual(self.engine._centrality["version"], self.engine.graph_version)
+        self.assertIsNone(self.engine._graph_dirty_since)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Cursor Integration Test Suite - Artımlı .vscdb okuma ve debounce testleri
+"""
+
+import json
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.cursor.cursor_integration import CursorDatabaseReader, CursorMonitor
+
+
+class TestIncrementalIngestion(unittest.TestCase):
+    """Incremental Cursor database ingestion test cases"""
+
+    def setUp(self):
+        """Set up a fake Cursor workspace database"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_path = str(self.temp_dir / "state.vscdb")
+        self.state_path = str(self.temp_dir / "cursor_ingest_state.json")
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+        self.chat = [
+            {"role": "user", "content": "How do I fix the login bug?"},
+            {"role": "assistant", "content": "Check the session token because it expires."},
+        ]
+        self._write("aiService.chatHistory", {"messages": self.chat})
+        self._write("workbench.prompts", {"messages": [{"role": "user", "content": "create a README file"}]})
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, key: str, value: dict):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO ItemTable VALUES (?, ?)", (key, json.dumps(value)))
+
+    def _contents(self, conversations):
+        return [m["content"] for c in conversations for m in c.messages]
+
+    def test_only_new_messages_are_emitted(self):
+        """Test watermark, per-key hashes and message diffing"""
+        reader = CursorDatabaseReader(state_path=self.state_path)
+
+        self.assertEqual(len(self._contents(reader.extract_new_conversations(self.db_path))), 3)
+        self.assertEqual(reader.extract_new_conversations(self.db_path), [])
+        self.assertEqual(reader.ingest_stats["unchanged_reads"], 1)
+
+        self.chat.append({"role": "user", "content": "Thanks, now add a logout button"})
+        self._write("aiService.chatHistory", {"messages": self.chat})
+
+        conversations = reader.extract_new_conversations(self.db_path, force=True)
+        self.assertEqual(self._contents(conversations), ["Thanks, now add a logout button"])
+        self.assertEqual(reader.ingest_stats["keys_skipped"], 1)
+
+    def test_state_persists_across_restarts(self):
+        """Test that a restarted reader does not re-emit history"""
+        CursorDatabaseReader(state_path=self.state_path).extract_new_conversations(self.db_path)
+
+        reader = CursorDatabaseReader(state_path=self.state_path)
+        self.assertEqual(reader.extract_new_conversations(self.db_path, force=True), [])
+
+    def test_write_bursts_are_coalesced(self):
+        """Test that bursts of events on the db and its WAL trigger one read"""
+        received = []
+        monitor = CursorMonitor(
+            callback_function=received.extend,
+            reader=CursorDatabaseReader(),
+            debounce_seconds=0.05,
+        )
+
+        for path in [self.db_path, self.db_path + "-wal"] * 5:
+            monitor.schedule_read(monitor._database_path(path))
+        time.sleep(0.3)
+
+        self.assertEqual(monitor.events_received, 10)
+        self.assertEqual(monitor.reads_performed, 1)
+        self.assertEqual(len(self._contents(received)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
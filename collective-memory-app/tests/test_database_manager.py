@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Database Manager Test Suite - Dosya indeksleme ve full-text arama testleri
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.database_manager import DatabaseManager
+from src.query_engine import QueryEngine, SearchQuery
+
+
+class TestFullTextSearch(unittest.TestCase):
+    """FTS5 index and search test cases"""
+
+    def setUp(self):
+        """Set up a temporary database with a few markdown files"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.db_manager.connect()
+        self.db_manager.initialize_database()
+
+        self.guide = self._write("guide.md", "# Database guide\nSQLite full text search.\n")
+        self.todo = self._write("todo.md", "todo list\nimplement authentication\n")
+        for path in (self.guide, self.todo):
+            self.db_manager.add_or_update_file(str(path))
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.db_manager.disconnect()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name: str, content: str) -> Path:
+        path = self.temp_dir / name
+        path.write_text(content, encoding="utf-8")
+        return path.resolve()
+
+    def _names(self, query: str):
+        return [row["file_name"] for row in self.db_manager.search_files(query)]
+
+    def test_fts_enabled(self):
+        """Test that the FTS5 index is created"""
+        self.assertTrue(self.db_manager.fts_enabled)
+
+    def test_prefix_and_phrase_queries(self):
+        """Test prefix and quoted phrase matching"""
+        self.assertEqual(self._names("datab"), ["guide.md"])
+        self.assertEqual(self._names('"full text"'), ["guide.md"])
+        self.assertEqual(self._names('"text full"'), [])
+
+    def test_fts_operators_are_escaped(self):
+        """Test that FTS5 syntax in user input does not raise"""
+        self.assertEqual(self._names('todo OR "unterminated'), [])
+        self.assertEqual(self._names("authentication:"), ["todo.md"])
+
+    def test_index_follows_updates_and_removal(self):
+        """Test incremental sync from add_or_update_file and remove_file"""
+        self.todo.write_text("shopping list\n", encoding="utf-8")
+        self.db_manager.add_or_update_file(str(self.todo))
+        self.assertEqual(self._names("authentication"), [])
+        self.assertEqual(self._names("shopping"), ["todo.md"])
+
+        self.db_manager.remove_file(str(self.todo))
+        self.assertEqual(self._names("shopping"), [])
+
+    def test_backfill_existing_database(self):
+        """Test one-time migration for databases created without FTS"""
+        self.db_manager.connection.execute("DROP TABLE files_fts")
+        self.db_manager.connection.commit()
+
+        self.db_manager.initialize_database()
+        self.assertEqual(self._names("authentication"), ["todo.md"])
+
+    def test_query_engine_uses_fts(self):
+        """Test QueryEngine text and keyword search through MATCH"""
+        engine = QueryEngine(self.db_manager)
+        results = engine.search(SearchQuery(text="authentication", keywords=["implem"]))
+
+        self.assertEqual([r.file_name for r in results], ["todo.md"])
+        self.assertTrue(results[0].match_highlights)
+
+
+class TestBulkIngestion(unittest.TestCase):
+    """add_or_update_files batch ingestion test cases"""
+
+    def setUp(self):
+        """Set up a temporary database and data folder"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.db_manager.connect()
+        self.db_manager.initialize_database()
+
+        self.paths = []
+        for i in range(7):
+            path = self.temp_dir / f"note_{i}.md"
+            path.write_text(f"note number {i}\nbatch ingestion\n", encoding="utf-8")
+            self.paths.append(str(path))
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.db_manager.disconnect()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_bulk_insert_and_update(self):
+        """Test chunked inserts, change detection and throughput report"""
+        missing = str(self.temp_dir / "missing.md")
+        summary = self.db_manager.add_or_update_files(
+            self.paths + [missing], batch_size=3
+        )
+
+        self.assertEqual(summary["added"], 7)
+        self.assertEqual(summary["failed"], 1)
+        self.assertEqual(len(summary["batches"]), 3)
+        self.assertEqual(len(summary["file_ids"]), 7)
+        self.assertIn("files_per_second", summary["batches"][0])
+        self.assertIn("mb_per_second", summary)
+        self.assertEqual(self.db_manager.get_total_file_count(), 7)
+
+        Path(self.paths[0]).write_text("rewritten content\n", encoding="utf-8")
+        summary = self.db_manager.add_or_update_files(self.paths, batch_size=3)
+
+        self.assertEqual(summary["updated"], 1)
+        self.assertEqual(summary["unchanged"], 6)
+        names = [r["file_name"] for r in self.db_manager.search_files("rewritten")]
+        self.assertEqual(names, ["note_0.md"])
+        self.assertEqual(len(self.db_manager.search_files("ingestion")), 6)
+
+    def test_bulk_matches_single_file_path(self):
+        """Test that bulk and single-file ingestion store the same record"""
+        single_id = self.db_manager.add_or_update_file(self.paths[0])
+        summary = self.db_manager.add_or_update_files(self.paths[:1])
+
+        self.assertEqual(summary["unchanged"], 1)
+        self.assertEqual(list(summary["file_ids"].values()), [single_id])
+
+
+class TestScanManifest(unittest.TestCase):
+    """mtime/size fast-path change detection test cases"""
+
+    def setUp(self):
+        """Set up a temporary database with one indexed file"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.db_manager.connect()
+        self.db_manager.initialize_database()
+
+        self.path = self.temp_dir / "note.md"
+        self.path.write_text("manifest fast path\n", encoding="utf-8")
+        self.file_id = self.db_manager.add_or_update_file(str(self.path))
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.db_manager.disconnect()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _stored_hash(self) -> str:
+        cursor = self.db_manager.connection.execute(
+            "SELECT content_hash FROM files WHERE id = ?", (self.file_id,)
+        )
+        return cursor.fetchone()[0]
+
+    def _poison_hash(self):
+        self.db_manager.connection.execute(
+            "UPDATE files SET content_hash = 'stale' WHERE id = ?", (self.file_id,)
+        )
+        self.db_manager.connection.commit()
+
+    def test_manifest_recorded(self):
+        """Test that size, mtime_ns and inode are stored"""
+        manifest = self.db_manager.get_scan_manifest()
+        entry = manifest[str(self.path.resolve())]
+        stat = self.path.stat()
+
+        self.assertEqual(entry["mtime_ns"], stat.st_mtime_ns)
+        self.assertEqual(entry["inode"], stat.st_ino)
+        self.assertTrue(DatabaseManager.manifest_matches(entry, stat))
+
+    def test_unchanged_stat_skips_read_and_hash(self):
+        """Test fast path for single and bulk ingestion"""
+        self._poison_hash()
+
+        self.assertEqual(self.db_manager.add_or_update_file(str(self.path)), self.file_id)
+        summary = self.db_manager.add_or_update_files([str(self.path)])
+        self.assertEqual(summary["unchanged"], 1)
+        self.assertEqual(summary["bytes"], 0)
+        self.assertEqual(self._stored_hash(), "stale")
+
+    def test_changed_stat_rehashes(self):
+        """Test that a new mtime triggers a read and hash"""
+        self._poison_hash()
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.db_manager.add_or_update_file(str(self.path))
+        self.assertNotEqual(self._stored_hash(), "stale")
+
+    def test_migration_adds_manifest_columns(self):
+        """Test that databases without manifest columns are migrated"""
+        connection = sqlite3.connect(str(self.temp_dir / "old.db"))
+        connection.execute(
+            """
+            CREATE TABLE files (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_path TEXT UNIQUE NOT NULL, file_name TEXT NOT NULL,
+                file_extension TEXT NOT NULL, directory_path TEXT NOT NULL,
+                file_size INTEGER NOT NULL, content_hash TEXT NOT NULL,
+                created_at TIMESTAMP NOT NULL, modified_at TIMESTAMP NOT NULL,
+                indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                is_active INTEGER DEFAULT 1
+            )
+        """
+        )
+        connection.commit()
+        connection.close()
+
+        old_db = DatabaseManager(str(self.temp_dir / "old.db"))
+        self.assertTrue(old_db.initialize_database())
+        self.assertIsNotNone(old_db.add_or_update_file(str(self.path)))
+        self.assertIn(str(self.path.resolve()), old_db.get_scan_manifest())
+        old_db.disconnect()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Embedding Service Test Suite - Önceden yüklenen model ve mikro-batch testleri
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from src import embedding_service
+from src.embedding_service import EmbeddingService, ensure_nltk_data
+from src.enhanced_query_engine import EnhancedQueryEngine
+from src.memory.memory_manager import MemoryCreationRequest, MemoryManager
+
+
+class FakeModel:
+    """Encodes text length; blocks until released so requests can queue up"""
+
+    def __init__(self):
+        self.calls = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def encode(self, texts, **kwargs):
+        self.entered.set()
+        self.release.wait(5)
+        self.calls.append(list(texts))
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+class TestEmbeddingService(unittest.TestCase):
+    """EmbeddingService test cases"""
+
+    def setUp(self):
+        """Set up a service with a counting fake loader"""
+        self.model = FakeModel()
+        self.loads = []
+
+        def loader(name):
+            self.loads.append(name)
+            return self.model
+
+        self.service = EmbeddingService("fake-model", loader=loader, max_wait_ms=50)
+
+    def tearDown(self):
+        """Stop the worker"""
+        self.service.stop()
+
+    def test_preload_and_encode(self):
+        """Test that the model is loaded once at start, before any request"""
+        self.service.start()
+        self.assertTrue(self.service.wait_until_ready(5))
+        self.assertEqual(self.loads, ["fake-model"])
+
+        matrix = self.service.encode(["ab", "abcd"])
+        self.assertEqual(matrix[:, 0].tolist(), [2.0, 4.0])
+        self.service.encode(["x"])
+        self.assertEqual(self.loads, ["fake-model"])
+
+    def test_concurrent_requests_are_coalesced(self):
+        """Test that queued requests share one model call and get their own rows"""
+        self.service.start()
+        self.service.wait_until_ready(5)
+
+        # First request occupies the worker; the rest queue behind it
+        self.model.release.clear()
+        first = self.service.submit(["warm"])
+        self.assertTrue(self.model.entered.wait(5))
+        futures = [self.service.submit(["q" * i, "r" * (i + 10)]) for i in range(1, 6)]
+        self.model.release.set()
+
+        self.assertEqual(first.result(5)[0, 0], 4.0)
+        for i, future in enumerate(futures, start=1):
+            self.assertEqual(future.result(5)[:, 0].tolist(), [i, i + 10])
+        self.assertEqual(len(self.model.calls), 2)
+        self.assertEqual(self.service.get_stats()["max_coalesced"], 5)
+
+    def test_load_failure_fails_requests(self):
+        """Test that a failed preload is reported to callers"""
+
+        def broken(name):
+            raise OSError("no model")
+
+        service = EmbeddingService("broken", loader=broken).start()
+        self.assertFalse(service.wait_until_ready(5))
+        with self.assertRaises(OSError):
+            service.encode(["text"])
+        service.stop()
+
+    def test_engine_uses_injected_service(self):
+        """Test that the engine encodes through the shared service"""
+        engine = EnhancedQueryEngine(database_manager=None, embedding_service=self.service)
+        engine.ml_available = True
+        engine._ensure_models_loaded()
+
+        self.assertIs(engine.sentence_model, self.service)
+        self.assertEqual(engine._encode_texts(["abc"])[0, 0], 3.0)
+        self.assertEqual(engine.embedding_model_name, "fake-model")
+
+
+    def test_memory_manager_shares_process_service(self):
+        """Test that MemoryManager encodes through the per-process shared service"""
+        shared = embedding_service.get_embedding_service(
+            "fake-shared-model", loader=lambda name: self.model
+        )
+        temp_dir = tempfile.mkdtemp()
+        try:
+            manager = MemoryManager(
+                {
+                    "database_path": os.path.join(temp_dir, "memory.db"),
+                    "cursor_monitoring_enabled": False,
+                    "auto_linking_enabled": False,
+                    "embedding_model": "fake-shared-model",
+                }
+            )
+            manager.create_memory(MemoryCreationRequest(content="shared model text"))
+            self.assertTrue(manager.flush_embeddings(timeout=5))
+            manager.shutdown()
+
+            self.assertIs(embedding_service.get_embedding_service("fake-shared-model"), shared)
+            self.assertEqual(manager.embedding_encoder, shared.encode)
+            self.assertEqual(self.model.calls, [["shared model text"]])
+            self.assertEqual(len(manager.vector_index), 1)
+        finally:
+            shared.stop()
+            embedding_service._services.pop("fake-shared-model", None)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+class TestNltkData(unittest.TestCase):
+    """One-time NLTK data check test cases"""
+
+    def test_checked_once_per_process(self):
+        """Test that present data is not downloaded and the check is cached"""
+        fake_nltk = mock.MagicMock()
+        with mock.patch.dict("sys.modules", {"nltk": fake_nltk}), mock.patch.object(
+            embedding_service, "_nltk_checked", False
+        ):
+            self.assertTrue(ensure_nltk_data())
+            self.assertTrue(ensure_nltk_data())
+
+        self.assertEqual(fake_nltk.data.find.call_count, len(embedding_service.NLTK_RESOURCES))
+        fake_nltk.download.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
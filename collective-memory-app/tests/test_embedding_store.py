@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Embedding Store Test Suite - Kalıcı doküman embedding testleri
+"""
+
+import shutil
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from src.database_manager import DatabaseManager
+from src.embedding_store import EmbeddingStore
+from src.enhanced_query_engine import EnhancedQueryEngine, EnhancedSearchQuery
+from src.query_engine import QueryEngine, SearchQuery
+
+
+class FakeEncoder:
+    """Deterministic bag-of-words encoder that counts encoded texts"""
+
+    def __init__(self, dimension: int = 64):
+        self.dimension = dimension
+        self.encoded = []
+
+    def __call__(self, texts):
+        self.encoded.extend(texts)
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                matrix[i, zlib.crc32(word.encode()) % self.dimension] += 1.0
+        return matrix
+
+    def encode(self, texts, **kwargs):
+        return self(texts)
+
+
+class TestEmbeddingStore(unittest.TestCase):
+    """content_hash keyed embedding storage test cases"""
+
+    def setUp(self):
+        """Set up a temporary database with indexed files"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.db_manager.initialize_database()
+
+        self.paths = {}
+        for name, text in {
+            "react.md": "react hooks state components",
+            "sql.md": "database index query planner",
+            "copy.md": "database index query planner",
+        }.items():
+            path = self.temp_dir / name
+            path.write_text(text, encoding="utf-8")
+            self.paths[name] = path
+            self.db_manager.add_or_update_file(str(path))
+
+        self.encoder = FakeEncoder()
+        self.store = EmbeddingStore(self.db_manager, self.encoder)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.db_manager.disconnect()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_index_once_per_content_hash(self):
+        """Test that identical and unchanged content is embedded once"""
+        self.assertEqual(self.store.index_pending(), 2)
+        self.assertEqual(self.store.index_pending(), 0)
+        self.assertEqual(self.store.get_stats()["stored_vectors"], 2)
+
+        self.paths["react.md"].write_text("react router navigation", encoding="utf-8")
+        self.db_manager.add_or_update_file(str(self.paths["react.md"]))
+
+        self.assertEqual(self.store.index_pending(), 1)
+        self.assertEqual(self.encoder.encoded[-1], "react router navigation")
+        self.assertEqual(self.store.prune(), 1)
+
+    def test_similarities_embed_only_query(self):
+        """Test that search embeds the query text only"""
+        self.store.index_pending()
+        encoded_before = len(self.encoder.encoded)
+
+        hashes = [
+            self.db_manager.get_scan_manifest()[str(p.resolve())]["content_hash"]
+            for p in (self.paths["react.md"], self.paths["sql.md"])
+        ]
+        scores = self.store.similarities("database query", hashes + [""])
+
+        self.assertEqual(len(self.encoder.encoded), encoded_before + 1)
+        self.assertEqual(scores.shape, (3,))
+        self.assertGreater(scores[1], scores[0])
+        self.assertEqual(scores[2], 0.0)
+
+    def test_enhanced_engine_uses_store(self):
+        """Test EnhancedQueryEngine semantic scoring through stored vectors"""
+        engine = EnhancedQueryEngine(self.db_manager)
+        engine.ml_available = True
+        engine._models_initialized = True
+        engine.sentence_model = self.encoder
+
+        self.assertEqual(engine.index_embeddings(), 2)
+        encoded_before = len(self.encoder.encoded)
+
+        results = engine._apply_semantic_search(
+            [
+                engine._convert_to_enhanced_result(r)
+                for r in QueryEngine.search(engine, SearchQuery(text="database"))
+            ],
+            EnhancedSearchQuery(text="database planner"),
+        )
+
+        self.assertEqual(len(self.encoder.encoded), encoded_before + 1)
+        self.assertTrue(all(r.semantic_score > 0.5 for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+File Monitor Test Suite - İlk tarama ve paralel indeksleme testleri
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from src.database_manager import DatabaseManager
+from src.file_monitor import DataFolderMonitor, ScanPipeline
+
+
+class TestScanPipeline(unittest.TestCase):
+    """Parallel scan pipeline test cases"""
+
+    def setUp(self):
+        """Set up a temporary data folder with markdown files"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.data_dir = self.temp_dir / "data"
+        (self.data_dir / "notes").mkdir(parents=True)
+
+        for i in range(12):
+            (self.data_dir / "notes" / f"note_{i}.md").write_text(
+                f"# Note {i}\nPipeline indexing of markdown notes.\n", encoding="utf-8"
+            )
+        (self.data_dir / "image.png").write_bytes(b"\x89PNG")
+
+        self.db_manager = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.db_manager.initialize_database()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.db_manager.disconnect()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _keyword_count(self) -> int:
+        cursor = self.db_manager.connection.execute("SELECT COUNT(*) FROM search_index")
+        return cursor.fetchone()[0]
+
+    def test_process_pool_scan(self):
+        """Test scan with a process pool and a single writer thread"""
+        monitor = DataFolderMonitor(
+            str(self.data_dir), database_manager=self.db_manager, scan_workers=2
+        )
+        summary = monitor.scan_directory(background=False)
+
+        self.assertEqual(summary["total_files"], 12)
+        self.assertEqual(summary["added"], 12)
+        self.assertEqual(self.db_manager.get_total_file_count(), 12)
+        self.assertGreater(self._keyword_count(), 0)
+        self.assertEqual(len(self.db_manager.search_files("pipeline")), 12)
+        self.assertFalse(monitor._indexing)
+
+    def test_start_monitoring_indexes_in_background(self):
+        """Test that the initial index does not block start_monitoring"""
+        monitor = DataFolderMonitor(str(self.data_dir), database_manager=self.db_manager)
+        release = threading.Event()
+        index_files = monitor._index_files
+
+        def blocked_index(file_paths):
+            release.wait(5)
+            return index_files(file_paths)
+
+        with patch.object(monitor, "_index_files", side_effect=blocked_index):
+            try:
+                self.assertTrue(monitor.start_monitoring())
+                self.assertTrue(monitor._indexing)
+                self.assertEqual(len(monitor.get_file_stats()), 12)
+            finally:
+                release.set()
+                monitor._scan_thread.join(timeout=30)
+                monitor.stop_monitoring()
+
+        self.assertFalse(monitor._indexing)
+        self.assertEqual(monitor.last_scan_summary["added"], 12)
+
+    def test_inline_scan_with_backpressure(self):
+        """Test single-worker mode with a tiny queue and batch size"""
+        paths = sorted(str(p) for p in (self.data_dir / "notes").glob("*.md"))
+        processed = []
+
+        pipeline = ScanPipeline(
+            self.db_manager.db_path,
+            max_workers=1,
+            queue_size=1,
+            batch_size=5,
+            progress_callback=lambda count, path: processed.append(count),
+        )
+        summary = pipeline.run(paths + [str(self.data_dir / "missing.md")])
+
+        self.assertEqual(summary["added"], 12)
+        self.assertEqual(summary["failed"], 1)
+        self.assertEqual(processed[-1], 13)
+
+        summary = pipeline.run(paths)
+        self.assertEqual(summary["unchanged"], 12)
+
+    def test_rescan_touches_only_dirty_files(self):
+        """Test rescan with manifest skip, deletions and --since"""
+        monitor = DataFolderMonitor(
+            str(self.data_dir), database_manager=self.db_manager, scan_workers=1
+        )
+        monitor.scan_directory(background=False)
+
+        (self.data_dir / "notes" / "note_0.md").write_text("changed\n", encoding="utf-8")
+        (self.data_dir / "notes" / "note_1.md").unlink()
+
+        summary = monitor.rescan()
+        self.assertEqual(summary["updated"], 1)
+        self.assertEqual(summary["unchanged"], 10)
+        self.assertEqual(summary["removed"], 1)
+        self.assertEqual(self.db_manager.get_total_file_count(), 11)
+
+        summary = monitor.rescan(since=datetime.now() + timedelta(days=1))
+        self.assertEqual(summary["total_files"], 0)
+
+    def test_restored_file_is_reindexed(self):
+        """Test delete -> rescan -> restore -> rescan reactivates the same row"""
+        monitor = DataFolderMonitor(
+            str(self.data_dir), database_manager=self.db_manager, scan_workers=1
+        )
+        monitor.scan_directory(background=False)
+
+        note = self.data_dir / "notes" / "note_2.md"
+        original = note.read_text(encoding="utf-8")
+        stat = note.stat()
+        note.unlink()
+        self.assertEqual(monitor.rescan()["removed"], 1)
+        self.assertEqual(len(self.db_manager.search_files("pipeline")), 11)
+
+        # Same content and mtime (e.g. restored from trash), --since skips old files
+        note.write_text(original, encoding="utf-8")
+        os.utime(note, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        summary = monitor.rescan(since=datetime.now() + timedelta(days=1))
+
+        self.assertEqual(summary["updated"], 1)
+        row = self.db_manager.connection.execute(
+            "SELECT id, is_active FROM files WHERE file_path = ?", (str(note.resolve()),)
+        ).fetchone()
+        self.assertEqual(row["is_active"], 1)
+        self.assertEqual(len(self.db_manager.search_files("pipeline")), 12)
+
+        # Single-file path reactivates as well
+        self.db_manager.remove_file(str(note.resolve()))
+        self.assertEqual(self.db_manager.add_or_update_file(str(note)), row["id"])
+        self.assertEqual(len(self.db_manager.search_files("pipeline")), 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Graph Store Test Suite - CSR dizileri, ekleme günlüğü ve soğuk başlangıç testleri
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.memory.amem_engine import AMemEngine
+from src.memory.graph_store import CSRGraphStore
+from src.memory.memory_manager import MemoryManager
+
+
+class TestCSRGraphStore(unittest.TestCase):
+    """CSRGraphStore test cases"""
+
+    def setUp(self):
+        """Set up a temporary graph directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.graph_path = Path(self.temp_dir) / "graph"
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def build_store(self, **kwargs) -> CSRGraphStore:
+        store = CSRGraphStore(str(self.graph_path), **kwargs)
+        for i in range(5):
+            store.add_node(f"node-{i}", {"content": f"memory {i}", "importance": 0.5})
+        for source, target in [(0, 1), (1, 2), (2, 3), (0, 4)]:
+            store.add_edge(source, target, 0, 0.8, 0.7)
+        return store
+
+    def test_log_replayed_after_reopen(self):
+        """Test that links written only to the append log survive a reopen"""
+        store = self.build_store()
+        store.close()
+
+        reopened = CSRGraphStore(str(self.graph_path))
+        self.assertEqual(reopened.node_count, 5)
+        self.assertEqual(reopened.edge_count, 4)
+        self.assertEqual(reopened.delta_edges, 4)
+        self.assertEqual(reopened.neighbors(0).tolist(), [1, 4])
+        row = reopened.get_node(reopened.index_of("node-3"))
+        self.assertEqual(row["content"], "memory 3")
+        reopened.close()
+
+    def test_compaction_memory_maps_arrays(self):
+        """Test that compacted links are served from memory-mapped CSR arrays"""
+        store = self.build_store()
+        store.add_edge(0, 1, 1, 0.3, 0.2)  # overwrites the earlier 0 -> 1 link
+        store.compact()
+        store.add_edge(3, 4, 0, 0.6, 0.6)  # lands in the new generation's log
+        expected = store.edge_list()
+        store.close()
+
+        reopened = CSRGraphStore(str(self.graph_path))
+        self.assertIsInstance(reopened._indices, np.memmap)
+        self.assertEqual(reopened.get_stats()["csr_links"], 4)
+        self.assertEqual(reopened.delta_edges, 1)
+        self.assertEqual(reopened.edge_list().tolist(), expected.tolist())
+        self.assertEqual(reopened.degree(3), 2)
+        self.assertEqual(sorted(reopened.neighborhood(0, depth=2).tolist()), [0, 1, 2, 4])
+        self.assertEqual(len(list(self.graph_path.glob("csr-*"))), 1)
+
+        edges = reopened.edges_among(np.array([0, 1]))
+        self.assertEqual(edges.tolist(), [(0, 1, 1, np.float32(0.3), np.float32(0.2))])
+        reopened.close()
+
+    def test_torn_log_record_is_dropped(self):
+        """Test that a partially written log record is truncated on load"""
+        store = self.build_store()
+        store.close()
+        log_path = self.graph_path / "csr-000000" / "links.log"
+        with open(log_path, "ab") as f:
+            f.write(b"\x01\x02\x03")
+
+        reopened = CSRGraphStore(str(self.graph_path))
+        self.assertEqual(reopened.edge_count, 4)
+        reopened.add_edge(4, 0, 0, 0.5, 0.5)
+        reopened.close()
+
+        final = CSRGraphStore(str(self.graph_path))
+        self.assertEqual(final.edge_count, 5)
+        final.close()
+
+
+class TestPersistentEngine(unittest.TestCase):
+    """AMemEngine on top of a persistent graph store"""
+
+    def setUp(self):
+        """Set up a temporary graph directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.graph_path = str(Path(self.temp_dir) / "amem")
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_network_survives_cold_start(self):
+        """Test that a reloaded engine serves the same network and keeps linking"""
+        engine = AMemEngine(graph_path=self.graph_path)
+        engine.linking_threshold = 0.3
+        nodes = [
+            engine.create_memory_node(content)
+            for content in [
+                "UserService api calls the database server for performance tests.",
+                "UserService api calls the database server for security tests.",
+                "UserService api calls the database server for deployment tests.",
+            ]
+        ]
+        network = engine.get_memory_network(nodes[0].id)
+        links = engine.stats["total_links"]
+        engine.close()
+        self.assertGreater(links, 0)
+
+        reloaded = AMemEngine(graph_path=self.graph_path, node_cache_size=2)
+        reloaded.linking_threshold = 0.3
+        self.assertEqual(reloaded.stats["total_links"], links)
+        self.assertEqual(reloaded.get_memory_network(nodes[0].id), network)
+        self.assertEqual(reloaded.memory_nodes[nodes[1].id].content, nodes[1].content)
+
+        # The feature index is rebuilt lazily, so new nodes link to old ones
+        node = reloaded.create_memory_node(
+            "UserService api calls the database server for load tests."
+        )
+        linked = {link["target"] for link in reloaded.get_memory_network(node.id)["links"]}
+        self.assertTrue(linked & {n.id for n in nodes})
+        self.assertLessEqual(reloaded.memory_nodes.cached, 2)
+        reloaded.close()
+
+
+    def test_memory_manager_reopens_network(self):
+        """Test restart round-trip through MemoryManager's graph directory"""
+        config = {
+            "database_path": str(Path(self.temp_dir) / "memory.db"),
+            "cursor_monitoring_enabled": False,
+            "auto_linking_enabled": False,
+            "semantic_search_enabled": False,
+        }
+        manager = MemoryManager(config)
+        manager.amem_engine.linking_threshold = 0.3
+        first = manager.amem_engine.create_memory_node(
+            "UserService api calls the database server for performance tests."
+        )
+        manager.amem_engine.create_memory_node(
+            "UserService api calls the database server for security tests."
+        )
+        network = manager.amem_engine.get_memory_network(first.id)
+        manager.shutdown()
+
+        self.assertTrue((Path(self.temp_dir) / "amem_graph" / "graph.db").exists())
+        self.assertTrue(network["links"])
+
+        restarted = MemoryManager(config)
+        self.assertEqual(restarted.amem_engine.get_memory_network(first.id), network)
+        restarted.shutdown()
+
+if __name__ == "__main__":
+    unittest.main()
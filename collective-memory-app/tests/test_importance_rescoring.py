@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Importance Rescoring Test Suite - Toplu, vektörel önem skoru yenileme testleri
+"""
+
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.memory.importance_rescoring import ImportanceRescorer
+from src.memory.importance_scorer import ImportanceScorer
+from src.memory.memory_database import MemoryDatabase
+from src.memory.memory_manager import MemoryCreationRequest, MemoryManager
+
+SAMPLES = [
+    ("Fixed the critical security bug in login", "error", "auth module", None, 2, 0),
+    ("def score(x):\n    if x:\n        return 1\n", "code", "python helpers", None, 45, 3),
+    ("We decided to use PostgreSQL for analytics", "decision", "", {"user_marked_important": True}, 10, 12),
+    ("The user prefers dark mode themes.", "preference", "UI preferences", None, 90, 0),
+    ("Plain note", "fact", None, None, 0, 150),
+]
+
+
+class TestImportanceRescorer(unittest.TestCase):
+    """ImportanceRescorer test cases"""
+
+    def setUp(self):
+        """Set up memories with known ages and access counts"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db = MemoryDatabase(str(self.temp_dir / "memory.db"))
+        self.scorer = ImportanceScorer()
+        self.rescorer = ImportanceRescorer(self.db, self.scorer, chunk_size=2)
+
+        # Half-day offsets keep floor(days) away from boundaries
+        self.now = datetime.now()
+        self.ids = []
+        for content, memory_type, context, metadata, age_days, access_count in SAMPLES:
+            memory_id = self.db.store_memory(
+                content, context=context, memory_type=memory_type, metadata=metadata
+            )
+            self._set_usage(memory_id, age_days, age_days / 2, access_count)
+            self.ids.append(memory_id)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _set_usage(self, memory_id, age_days, idle_days, access_count):
+        with self.db.get_connection() as conn:
+            conn.execute(
+                "UPDATE memories SET created_at = ?, accessed_at = ?, access_count = ? "
+                "WHERE id = ?",
+                (
+                    (self.now - timedelta(days=age_days, hours=12)).isoformat(sep=" "),
+                    (self.now - timedelta(days=idle_days, hours=12)).isoformat(sep=" "),
+                    access_count,
+                    memory_id,
+                ),
+            )
+
+    def _rows(self):
+        with self.db.get_connection() as conn:
+            return {
+                row["id"]: dict(row)
+                for row in conn.execute(
+                    "SELECT id, importance_score, access_count, accessed_at, updated_at, "
+                    "created_at FROM memories"
+                )
+            }
+
+    def _expected(self, memory_id, content, memory_type, context, metadata):
+        row = self._rows()[memory_id]
+        full_metadata = dict(
+            metadata or {}, created_at=row["created_at"], access_count=row["access_count"]
+        )
+        score = self.scorer.calculate_importance(content, memory_type, context, full_metadata)
+        idle_days = (self.now - datetime.fromisoformat(row["accessed_at"])).days
+        return self.scorer.update_importance_based_on_usage(
+            score, row["access_count"], idle_days
+        )
+
+    def test_matches_scalar_scorer(self):
+        """Test that vectorized scores equal calculate_importance + usage update"""
+        stats = self.rescorer.run(now=self.now)
+        self.assertEqual(stats["scanned"], len(SAMPLES))
+        self.assertEqual(stats["factors_computed"], len(SAMPLES))
+
+        rows = self._rows()
+        for memory_id, (content, memory_type, context, metadata, _, _) in zip(
+            self.ids, SAMPLES
+        ):
+            self.assertAlmostEqual(
+                rows[memory_id]["importance_score"],
+                self._expected(memory_id, content, memory_type, context, metadata),
+                places=9,
+            )
+
+    def test_rescoring_is_not_an_access(self):
+        """Test that score writes leave access counters and updated_at alone"""
+        before = self._rows()
+        self.rescorer.run(now=self.now)
+        after = self._rows()
+
+        for memory_id in self.ids:
+            self.assertNotEqual(
+                before[memory_id]["importance_score"], after[memory_id]["importance_score"]
+            )
+            for column in ("access_count", "accessed_at", "updated_at"):
+                self.assertEqual(before[memory_id][column], after[memory_id][column])
+
+    def test_factors_are_reused_until_content_changes(self):
+        """Test that only new or edited memories get their factors recomputed"""
+        self.rescorer.run(now=self.now)
+        stats = self.rescorer.run(now=self.now)
+        self.assertEqual(stats["factors_computed"], 0)
+        self.assertEqual(stats["updated"], 0)
+
+        self.db.update_memory(self.ids[4], content="Plain note, now CRITICAL and urgent")
+        stats = self.rescorer.run(now=self.now + timedelta(days=1))
+        self.assertEqual(stats["factors_computed"], 1)
+        self.assertEqual(stats["updated"], len(SAMPLES))
+
+    def test_explicit_scores_are_decayed_not_replaced(self):
+        """Test that caller-set scores only get usage decay and access boost"""
+        pinned = self.db.store_memory("Team decision: keep SQLite", importance_score=0.9)
+        self._set_usage(pinned, 10, 5, 2)
+        self.db.update_memory(self.ids[4], importance_score=0.2)
+        self._set_usage(self.ids[4], 3, 0, 0)
+
+        stats = self.rescorer.run(now=self.now)
+        self.assertEqual(stats["factors_computed"], len(SAMPLES) - 1)
+
+        rows = self._rows()
+        self.assertAlmostEqual(
+            rows[pinned]["importance_score"],
+            self.scorer.update_importance_based_on_usage(0.9, 2, 5),
+            places=9,
+        )
+        self.assertAlmostEqual(rows[self.ids[4]]["importance_score"], 0.2, places=9)
+
+    def test_decayed_memories_are_archived(self):
+        """Test that cleanup sees scores decayed by the rescoring job"""
+        self._set_usage(self.ids[3], 200, 120, 0)
+        self.assertEqual(self.db.cleanup_old_memories(days_old=30), 0)
+
+        self.rescorer.run(now=self.now)
+        self.assertEqual(self.db.cleanup_old_memories(days_old=30), 1)
+        with self.db.get_connection() as conn:
+            status = conn.execute(
+                "SELECT status FROM memories WHERE id = ?", (self.ids[3],)
+            ).fetchone()[0]
+        self.assertEqual(status, "archived")
+
+
+class TestManagerImportance(unittest.TestCase):
+    """MemoryManager importance on create"""
+
+    def setUp(self):
+        """Set up a memory manager without background model loading"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.manager = MemoryManager(
+            {
+                "database_path": str(self.temp_dir / "memory.db"),
+                "cursor_monitoring_enabled": False,
+                "auto_linking_enabled": False,
+                "semantic_search_enabled": False,
+            }
+        )
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_derived_and_explicit_scores(self):
+        """Test that only caller-supplied scores are kept as a base"""
+        derived = self.manager.create_memory(
+            MemoryCreationRequest(content="Fixed the critical security bug", memory_type="error")
+        )
+        explicit = self.manager.create_memory(
+            MemoryCreationRequest(content="Pinned team decision", importance_score=0.95)
+        )
+
+        memories = self.manager.database.get_memories_by_ids([derived, explicit])
+        self.assertIsNone(memories[derived]["importance_base"])
+        self.assertNotEqual(memories[derived]["importance_score"], 0.5)
+        self.assertEqual(memories[explicit]["importance_base"], 0.95)
+
+        self.manager.rescore_importance()
+        memories = self.manager.database.get_memories_by_ids([explicit])
+        self.assertAlmostEqual(memories[explicit]["importance_score"], 0.95)
+
+
+if __name__ == "__main__":
+    unittest.main()
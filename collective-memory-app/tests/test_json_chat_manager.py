@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+JSON Chat Manager Test Suite - SQLite konuşma deposu ve JSON import testleri
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.json_chat_manager import JSONChatManager
+
+
+class TestSQLiteChatStore(unittest.TestCase):
+    """SQLite-backed conversation store test cases"""
+
+    def setUp(self):
+        """Set up a temporary data folder"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.manager = JSONChatManager(str(self.temp_dir))
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_append_and_load(self):
+        """Test append-only messages and counters"""
+        conversation_id = self.manager.create_conversation(
+            "Deploy notes", "/projects/api", initial_message="How do we deploy?"
+        )
+        self.manager.add_message(conversation_id, "assistant", "Use the docker compose file")
+
+        conversation = self.manager.load_conversation(conversation_id)
+        self.assertEqual(
+            [m.content for m in conversation.messages],
+            ["How do we deploy?", "Use the docker compose file"],
+        )
+        self.assertEqual(self.manager.get_conversation_stats()["total_messages"], 2)
+
+        with self.assertRaises(ValueError):
+            self.manager.add_message("missing", "user", "lost message")
+
+    def test_search_filters(self):
+        """Test FTS content search with project and tag filters"""
+        api_id = self.manager.create_conversation("API", "/projects/api", tags=["backend"])
+        self.manager.add_message(api_id, "user", "The database migration failed")
+        web_id = self.manager.create_conversation("Web", "/projects/web")
+        self.manager.add_message(web_id, "user", "Migrations for the frontend cache")
+
+        ids = lambda **kwargs: [c["id"] for c in self.manager.search_conversations(**kwargs)]
+
+        self.assertEqual(set(ids(query="migration")), {api_id, web_id})
+        self.assertEqual(ids(query="migration", project_path="/projects/web"), [web_id])
+        self.assertEqual(ids(query="migration", tags=["backend"]), [api_id])
+        self.assertEqual(ids(query="web"), [web_id])
+        self.assertEqual(ids(query="kubernetes"), [])
+
+    def test_imports_daily_json_tree(self):
+        """Test one-shot import of conversations split across days"""
+        self.manager.close()
+        daily = self.temp_dir / ".collective-memory" / "conversations" / "daily"
+        message = lambda i: {"id": f"m{i}", "role": "user", "content": f"message {i}", "timestamp": f"t{i}"}
+        base = {
+            "id": "conv-1",
+            "title": "Old chat",
+            "project_path": "/projects/legacy",
+            "created_at": "2025-07-01T10:00:00",
+            "tags": ["legacy"],
+        }
+        for day, messages in (("2025-07-01", [message(1)]), ("2025-07-02", [message(1), message(2)])):
+            (daily / day).mkdir(parents=True)
+            data = dict(base, updated_at=f"{day}T12:00:00", messages=messages)
+            (daily / day / "conv-1.json").write_text(json.dumps(data), encoding="utf-8")
+        (self.temp_dir / ".collective-memory" / "conversations" / "conversations.db").unlink()
+
+        self.manager = JSONChatManager(str(self.temp_dir))
+        conversation = self.manager.load_conversation("conv-1")
+
+        self.assertEqual([m.id for m in conversation.messages], ["m1", "m2"])
+        self.assertEqual(conversation.updated_at, "2025-07-02T12:00:00")
+        self.assertEqual(self.manager.search_conversations(tags=["legacy"])[0]["message_count"], 2)
+        self.assertEqual(self.manager.import_json_tree(), 1)
+        self.assertEqual(len(self.manager.load_conversation("conv-1").messages), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Test Suite - Aho–Corasick tek geçiş tarama testleri
+"""
+
+import random
+import re
+import unittest
+
+from src import keyword_matcher
+from src.document_analyzer import DocumentAnalyzer
+from src.keyword_matcher import KeywordHit, KeywordMatcher, get_keyword_matcher
+from src.memory.importance_scorer import ImportanceScorer
+
+
+def brute_force_hits(keywords, text):
+    """Every (start, end, keyword) occurrence, ordered like the automaton"""
+    lowered = keyword_matcher.fold_case(text)
+    hits = [
+        (start, start + len(keyword), keyword)
+        for keyword in {k.lower() for k in keywords}
+        for start in range(len(lowered))
+        if lowered.startswith(keyword, start)
+    ]
+    return sorted(hits, key=lambda hit: (hit[1], hit[0]))
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """KeywordMatcher test cases"""
+
+    def test_overlapping_hits_with_positions(self):
+        """Test that nested and overlapping keywords are all reported"""
+        matcher = KeywordMatcher(["he", "she", "his", "hers"])
+        hits = matcher.find_all("uSHErs his")
+
+        self.assertEqual(
+            hits,
+            [
+                KeywordHit(1, 4, "she"),
+                KeywordHit(2, 4, "he"),
+                KeywordHit(2, 6, "hers"),
+                KeywordHit(7, 10, "his"),
+            ],
+        )
+
+    def test_whole_words_match_regex_boundaries(self):
+        """Test that whole-word counts equal re.findall(r'\\bkw\\b', re.I)"""
+        matcher = KeywordMatcher(["if", "for", "class", "will use"])
+        text = "If classy for_each for(x) class Class; if_ ( WILL USE ) will user"
+
+        counts = matcher.count(text, whole_words=True)
+        for keyword in matcher.keywords:
+            expected = len(re.findall(rf"\b{keyword}\b", text, re.IGNORECASE))
+            self.assertEqual(counts[keyword], expected, keyword)
+
+    def test_vectorized_scan_matches_loop(self):
+        """Test that the NumPy scan used for long texts finds the same hits"""
+        rng = random.Random(7)
+        for _ in range(200):
+            keywords = [
+                "".join(rng.choice("ab ş") for _ in range(rng.randint(1, 4)))
+                for _ in range(rng.randint(1, 5))
+            ]
+            text = "".join(rng.choice("abşİ x\n") for _ in range(rng.randint(1, 80)))
+            matcher = KeywordMatcher(keywords)
+
+            expected = brute_force_hits(matcher.keywords, text)
+            self.assertEqual([tuple(hit) for hit in matcher.iter_hits(text)], expected)
+            self.assertEqual(
+                [tuple(hit) for hit in matcher._scan_vectorized(text)], expected
+            )
+
+    def test_matchers_are_cached_per_keyword_set(self):
+        """Test that the same keyword set reuses one automaton"""
+        first = get_keyword_matcher(["Main", "core"])
+        self.assertIs(first, get_keyword_matcher(("core", "main", "core")))
+        self.assertIsNot(first, get_keyword_matcher(["core"]))
+
+
+class TestKeywordCallSites(unittest.TestCase):
+    """Scorer and analyzer behaviour on top of the shared matcher"""
+
+    def test_importance_scorer_factors(self):
+        """Test keyword-driven factors of ImportanceScorer"""
+        scorer = ImportanceScorer()
+        content = "CRITICAL fatal crash; long-term security fix. class Foo: if x: await y"
+        scan = scorer.scan_keywords(content)
+
+        self.assertAlmostEqual(scorer._calculate_keyword_bonus(content, scan), 0.2)
+        self.assertAlmostEqual(scorer._calculate_error_criticality(content, scan), 1.0)
+        self.assertAlmostEqual(scorer._calculate_decision_impact(content, scan), 0.25)
+        # class + if + await, plus one line
+        self.assertAlmostEqual(
+            scorer._calculate_code_complexity(content, scan), 0.1 + 0.01 + 0.05 + 0.01
+        )
+
+    def test_document_analyzer_scans_once(self):
+        """Test that only lines with anchor keywords produce errors and tasks"""
+        analyzer = DocumentAnalyzer()
+        content = "\n".join(
+            [
+                "intro line",
+                "Port 3000 already in use",
+                "12/20 tests fail",
+                "TODO: write migration notes",
+                "plain text",
+                "Fix the broken login flow (critical)",
+            ]
+        )
+
+        errors = analyzer._extract_errors(content, "doc.md")
+        tasks = analyzer._extract_tasks(content, "doc.md")
+
+        self.assertEqual([e["line_number"] for e in errors], [2, 3])
+        self.assertEqual([t["task_code"] for t in tasks], ["DOC_TODO_3", "DOC_FIX_5"])
+        self.assertEqual(tasks[1]["priority_level"], "YÜKSEK")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Mem0 Evolution Test Suite - Toplu embedding ile ADD/UPDATE/DELETE/NOOP kararları
+"""
+
+import re
+import shutil
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from src.memory.mem0_evolution import (
+    EvolutionAction,
+    EvolutionDecisionMaker,
+    ExtractedFact,
+    FactExtractor,
+    FactType,
+    Mem0EvolutionEngine,
+)
+from src.memory.memory_database import MemoryDatabase
+from src.memory.vector_index import VectorIndex
+
+
+class CountingModel:
+    """Bag-of-words encoder that records every encode call"""
+
+    model_name = "counting-model"
+
+    def __init__(self, dimension: int = 128):
+        self.dimension = dimension
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                matrix[i, zlib.crc32(word.encode()) % self.dimension] += 1.0
+        return matrix
+
+
+def make_fact(content: str, fact_type: FactType = FactType.DECISION, **kwargs):
+    values = dict(
+        content=content,
+        fact_type=fact_type,
+        confidence=0.7,
+        importance=0.5,
+        context={},
+        entities=[],
+        keywords=[],
+        timestamp=datetime.now(),
+        source="user",
+    )
+    values.update(kwargs)
+    return ExtractedFact(**values)
+
+
+class TestBatchedDecisions(unittest.TestCase):
+    """EvolutionDecisionMaker batched similarity test cases"""
+
+    def setUp(self):
+        """Set up a memory database with stored embeddings"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db = MemoryDatabase(str(self.temp_dir / "memory.db"))
+        self.model = CountingModel()
+
+        self.memories = {}
+        for content, memory_type in (
+            ("react uses virtual dom rendering", "decision"),
+            ("sqlite supports full text search", "decision"),
+            ("kubernetes schedules containers on nodes", "preference"),
+        ):
+            memory_id = self.db.store_memory(
+                content, memory_type=memory_type, importance_score=0.9
+            )
+            vector = self.model.encode([content])[0]
+            self.db.store_embedding(memory_id, vector, self.model.model_name)
+            self.memories[(content, memory_type)] = memory_id
+        self.model.calls.clear()
+
+        self.maker = EvolutionDecisionMaker(self.db, sentence_model=self.model)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_one_model_call_per_batch(self):
+        """Test that all facts are embedded together and matched by type"""
+        facts = [
+            make_fact("react uses virtual dom rendering"),
+            make_fact("sqlite supports full text search very well", confidence=0.9),
+            # Only a memory of another type is similar
+            make_fact("kubernetes schedules containers on nodes"),
+        ]
+        decisions = self.maker.make_decisions(facts)
+
+        self.assertEqual(len(self.model.calls), 1)
+        self.assertEqual(len(self.model.calls[0]), 3)
+        self.assertEqual(
+            [d.action for d in decisions],
+            [EvolutionAction.NOOP, EvolutionAction.UPDATE, EvolutionAction.ADD],
+        )
+        self.assertEqual(
+            decisions[0].existing_memory_id,
+            self.memories[("react uses virtual dom rendering", "decision")],
+        )
+        self.assertEqual(
+            decisions[1].existing_memory_id,
+            self.memories[("sqlite supports full text search", "decision")],
+        )
+        self.assertAlmostEqual(float(np.linalg.norm(decisions[2].fact_embedding)), 1.0, 5)
+
+    def test_candidates_streamed_in_chunks(self):
+        """Test that a chunked scan with a running top-k decides the same"""
+        facts = [
+            make_fact("react uses virtual dom rendering"),
+            make_fact("sqlite supports full text search very well", confidence=0.9),
+        ]
+        expected = [d.existing_memory_id for d in self.maker.make_decisions(facts)]
+
+        self.maker.candidate_chunk_size = 1
+        self.maker.max_candidates = 1
+        with patch.object(np, "vstack", wraps=np.vstack) as vstack:
+            decisions = self.maker.make_decisions(facts)
+
+        self.assertEqual([d.existing_memory_id for d in decisions], expected)
+        self.assertTrue(all(len(call.args[0]) == 1 for call in vstack.call_args_list))
+
+    def test_candidates_from_vector_index(self):
+        """Test top-k lookup through an attached vector index"""
+        index = VectorIndex(str(self.temp_dir / "vectors"))
+        index.add_many(
+            (memory_id, self.model.encode([content])[0])
+            for (content, _), memory_id in self.memories.items()
+        )
+        maker = EvolutionDecisionMaker(self.db, sentence_model=self.model, vector_index=index)
+
+        with patch.object(self.db, "iter_embeddings") as iter_embeddings:
+            decisions = maker.make_decisions(
+                [
+                    make_fact("react uses virtual dom rendering"),
+                    make_fact("kubernetes schedules containers on nodes"),
+                ]
+            )
+
+        iter_embeddings.assert_not_called()
+        self.assertEqual(
+            [d.action for d in decisions], [EvolutionAction.NOOP, EvolutionAction.ADD]
+        )
+
+    def test_fallback_without_model(self):
+        """Test keyword lookup when no embedding model is available"""
+        maker = EvolutionDecisionMaker(self.db, sentence_model=None)
+        maker.sentence_model = None
+
+        decisions = maker.make_decisions([make_fact("sqlite supports full text search")])
+
+        self.assertEqual(decisions[0].action, EvolutionAction.NOOP)
+        self.assertIsNone(decisions[0].fact_embedding)
+
+    def test_engine_stores_fact_embeddings(self):
+        """Test that added facts become candidates without re-encoding"""
+        engine = Mem0EvolutionEngine(self.db, sentence_model=self.model)
+
+        engine.process_interaction("We decided to adopt Postgres for analytics", "", {})
+        self.assertEqual(len(self.model.calls), 1)
+
+        stored = dict(self.db.iter_embeddings(self.model.model_name))
+        self.assertEqual(len(stored), 4)
+
+        result = engine.process_interaction("We decided to adopt Postgres for analytics", "", {})
+        self.assertEqual(len(self.model.calls), 2)
+        self.assertEqual(
+            [d.action for d in result.decisions_made],
+            [EvolutionAction.NOOP] * len(result.decisions_made),
+        )
+
+
+def findall_matches(extractor: FactExtractor, text: str):
+    """Pattern-by-pattern re.findall the single-pass matcher must reproduce"""
+    found = []
+    for fact_type, patterns in extractor.fact_patterns.items():
+        for pattern in patterns:
+            for match in re.findall(pattern, text, re.IGNORECASE):
+                content = " ".join(match) if isinstance(match, tuple) else match
+                if len(content.strip()) > 3:
+                    found.append((content.strip(), fact_type))
+    return found
+
+
+class FakeNlp:
+    """Records nlp.pipe calls and yields docs with one ORG entity"""
+
+    def __init__(self):
+        self.pipe_calls = []
+
+    def pipe(self, texts, batch_size=None):
+        self.pipe_calls.append(list(texts))
+        for text in texts:
+            ents = [SimpleNamespace(text=word, label_="ORG") for word in text.split()[:1]]
+            yield SimpleNamespace(ents=ents, noun_chunks=[])
+
+
+class TestFactExtractor(unittest.TestCase):
+    """Single-pass FactExtractor test cases"""
+
+    def setUp(self):
+        """Set up an extractor without spaCy"""
+        self.extractor = FactExtractor()
+        self.extractor.nlp = None
+
+    def test_matches_pattern_by_pattern_findall(self):
+        """Test that the merged matcher finds the same facts in the same order"""
+        text = (
+            "I use React and I like hooks. The parser does tokenizing\n"
+            "We decided to cache results; React is a UI library that uses JSX\n"
+            "error: connection refused in db.py, fix: retry with backoff\n"
+            "prefer sqlite over postgres\nshort\n\nWe will use FTS5 and chose bm25"
+        )
+        matches = self.extractor._match_patterns(text)
+        found = [
+            (content.strip(), fact_type)
+            for (fact_type, _), contents in zip(self.extractor._pattern_specs, matches)
+            for content in contents
+            if len(content.strip()) > 3
+        ]
+
+        self.assertEqual(found, findall_matches(self.extractor, text))
+        self.assertEqual(len(found), 11)
+
+    def test_long_lines_are_guarded(self):
+        """Test that no-match lines scan linearly and oversized lines are skipped"""
+        line = "x " * 900
+        start = time.perf_counter()
+        self.assertEqual(self.extractor._extract_from_text(line, "user", {}), [])
+        self.assertLess(time.perf_counter() - start, 0.05)
+
+        facts = self.extractor._extract_from_text("I use " + "y" * 5000, "user", {})
+        self.assertEqual(facts, [])
+        self.assertEqual(self.extractor.lines_skipped, 1)
+
+    def test_batch_parses_all_texts_with_one_pipe_call(self):
+        """Test that spaCy runs once per batch of interactions"""
+        self.extractor.nlp = FakeNlp()
+        results = self.extractor.extract_facts_batch(
+            [("Acme builds tools", "Globex ships", {}), ("Initech", "I use vim daily", {})]
+        )
+
+        self.assertEqual(len(self.extractor.nlp.pipe_calls), 1)
+        self.assertEqual(len(self.extractor.nlp.pipe_calls[0]), 4)
+        self.assertIn("Acme is a ORG", [f.content for f in results[0]])
+        self.assertEqual(
+            {f.content for f in results[1]}, {"Initech is a ORG", "I is a ORG", "vim daily"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
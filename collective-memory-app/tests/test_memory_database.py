@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Memory Database Test Suite - Bağlantı havuzu, deduplication ve bellek işlemleri testleri
+"""
+
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.memory.memory_database import ConnectionPool, MemoryDatabase
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Pooled connection reuse test cases"""
+
+    def setUp(self):
+        """Set up a temporary memory database"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db = MemoryDatabase(str(self.temp_dir / "memory.db"), read_pool_size=2)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_writes_reuse_single_connection(self):
+        """Test that store_memory and its event log share one connection"""
+        for i in range(5):
+            self.assertIsNotNone(self.db.store_memory(f"pooled memory number {i}"))
+
+        stats = self.db.get_system_stats()
+        self.assertEqual(stats["memories"]["total_memories"], 5)
+        self.assertEqual(stats["connection_pool"]["writer"]["open_connections"], 1)
+
+        with self.db.get_read_connection() as conn:
+            events = conn.execute("SELECT COUNT(*) FROM memory_events").fetchone()[0]
+        self.assertEqual(events, 5)
+
+    def test_reader_pool_is_read_only_and_parallel(self):
+        """Test read-only connections serving concurrent searches"""
+        self.db.store_memory("parallel search content")
+        results = []
+
+        def search():
+            results.append(len(self.db.retrieve_memories(query="parallel")))
+
+        threads = [threading.Thread(target=search) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [1] * 6)
+        self.assertLessEqual(self.db.reader_pool.get_stats()["open_connections"], 2)
+
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.db.reader_pool.connection() as conn:
+                conn.execute("DELETE FROM memories")
+
+    def test_nested_failure_rolls_back_outer_transaction(self):
+        """Test that commit/rollback happen only at the outermost level"""
+        with self.assertRaises(RuntimeError):
+            with self.db.get_connection() as conn:
+                conn.execute("INSERT INTO memories (content) VALUES ('rolled back')")
+                with self.db.get_connection() as inner:
+                    self.assertIs(inner, conn)
+                raise RuntimeError("abort")
+
+        self.assertEqual(self.db.retrieve_memories(query="rolled back"), [])
+
+    def test_close_closes_connections(self):
+        """Test that close() really closes pooled connections"""
+        self.db.store_memory("close test content")
+        with self.db.get_connection() as conn:
+            pass
+        self.db.close()
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        with self.assertRaises(sqlite3.ProgrammingError):
+            self.db.store_memory("after close")
+
+    def test_pool_timeout(self):
+        """Test bounded pool waits and times out"""
+        pool = ConnectionPool(str(self.temp_dir / "memory.db"), timeout=0.1)
+        errors = []
+        conn = pool.acquire()
+
+        def other_thread():
+            try:
+                pool.acquire()
+            except TimeoutError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+
+        pool.release(conn)
+        pool.close()
+        self.assertEqual(len(errors), 1)
+
+
+class TestDeduplication(unittest.TestCase):
+    """Content-hash deduplication test cases"""
+
+    def setUp(self):
+        """Set up a temporary memory database"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_path = str(self.temp_dir / "memory.db")
+        self.db = MemoryDatabase(self.db_path)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _memory(self, memory_id: int):
+        with self.db.get_read_connection() as conn:
+            return conn.execute("SELECT * FROM memories WHERE id = ?", (memory_id,)).fetchone()
+
+    def test_duplicate_store_bumps_access_count(self):
+        """Test upsert semantics for normalized duplicate content"""
+        first = self.db.store_memory("Use  WAL mode for SQLite")
+        second = self.db.store_memory("use wal mode for sqlite ")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self._memory(first)["access_count"], 1)
+        self.assertEqual(self.db.get_system_stats()["memories"]["total_memories"], 1)
+
+        # A deleted memory does not absorb new content
+        self.db.delete_memory(first)
+        self.assertNotEqual(self.db.store_memory("Use WAL mode for SQLite"), first)
+
+    def test_store_memories_batch(self):
+        """Test batch store deduplicating inside one transaction"""
+        existing = self.db.store_memory("existing decision")
+        ids = self.db.store_memories(
+            [
+                {"content": "batch fact one"},
+                {"content": "Batch fact one", "memory_type": "decision"},
+                {"content": "existing decision"},
+                {"content": "batch fact two", "importance_score": 0.9},
+            ]
+        )
+
+        self.assertEqual(ids[0], ids[1])
+        self.assertEqual(ids[2], existing)
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(self._memory(ids[0])["access_count"], 1)
+
+    def test_compact_merges_existing_duplicates(self):
+        """Test compaction of duplicates created before the unique index"""
+        self.db.close()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DROP INDEX idx_memories_content_hash")
+            conn.execute("UPDATE memories SET content_hash = NULL")
+            conn.executemany(
+                "INSERT INTO memories (id, content, access_count) VALUES (?, ?, ?)",
+                [(1, "duplicate fact", 2), (2, "Duplicate  fact", 3), (3, "other fact", 0)],
+            )
+            conn.executemany(
+                "INSERT INTO memory_links (memory_id_1, memory_id_2) VALUES (?, ?)",
+                [(2, 3), (1, 3), (1, 2)],
+            )
+
+        self.db = MemoryDatabase(self.db_path)
+        result = self.db.compact_duplicates()
+
+        self.assertEqual(result, {"groups": 1, "merged": 1, "links_removed": 2})
+        self.assertIsNone(self._memory(2))
+        self.assertEqual(self._memory(1)["access_count"], 6)
+        self.assertEqual(
+            [(link["memory_id_1"], link["memory_id_2"]) for link in self.db.get_memory_links(3)],
+            [(1, 3)],
+        )
+        self.assertEqual(self.db.store_memory("DUPLICATE FACT"), 1)
+
+
+class TestSchemaMigration(unittest.TestCase):
+    """Opening databases created by older schema versions"""
+
+    # memories table as created by the first release (its schema script stopped
+    # before the triggers), without content_hash/importance_rescored_at
+    LEGACY_SCHEMA = """
+        CREATE TABLE memories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content TEXT NOT NULL,
+            context TEXT,
+            summary TEXT,
+            memory_type TEXT NOT NULL DEFAULT 'fact',
+            importance_score REAL DEFAULT 0.5,
+            relevance_score REAL DEFAULT 0.5,
+            access_count INTEGER DEFAULT 0,
+            version INTEGER DEFAULT 1,
+            parent_memory_id INTEGER REFERENCES memories(id),
+            evolution_reason TEXT,
+            source_file TEXT,
+            source_line INTEGER,
+            project_path TEXT,
+            cursor_session_id TEXT,
+            embedding_vector BLOB,
+            embedding_model TEXT DEFAULT 'sentence-transformers',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP,
+            status TEXT DEFAULT 'active',
+            is_validated BOOLEAN DEFAULT FALSE,
+            is_public BOOLEAN DEFAULT FALSE,
+            tags TEXT,
+            metadata TEXT
+        );
+        INSERT INTO memories (content) VALUES ('first legacy memory'), ('second legacy memory');
+    """
+
+    def setUp(self):
+        """Create a database with the legacy schema"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_path = str(self.temp_dir / "memory.db")
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(self.LEGACY_SCHEMA)
+        conn.close()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_open_legacy_database(self):
+        """Test that columns are migrated before triggers and backfills run"""
+        db = MemoryDatabase(self.db_path)
+        try:
+            with db.get_read_connection() as conn:
+                rows = conn.execute(
+                    "SELECT content_hash, importance_rescored_at FROM memories ORDER BY id"
+                ).fetchall()
+                trigger_sql = conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE name = 'update_memories_timestamp'"
+                ).fetchone()[0]
+
+            self.assertEqual(len(rows), 2)
+            self.assertTrue(all(row[0] for row in rows))
+            self.assertIn("importance_rescored_at", trigger_sql)
+            self.assertEqual(db.store_memory("second legacy memory"), 2)
+        finally:
+            db.close()
+
+        # Re-opening the migrated database is a no-op
+        MemoryDatabase(self.db_path).close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Relevance Scoring Test Suite - Sütunsal skorlama ve top-k testleri
+"""
+
+import random
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.enhanced_query_engine import EnhancedQueryEngine, EnhancedSearchResult
+from src.query_engine import SearchQuery
+from src.relevance_scoring import RelevanceScorer, ResultFeatures
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+def make_result(file_id: int, **kwargs) -> EnhancedSearchResult:
+    values = dict(
+        file_id=file_id,
+        file_path=f"/docs/file_{file_id}.md",
+        file_name=f"file_{file_id}.md",
+        file_extension=".md",
+        file_size=5000,
+        modified_at=str(NOW - timedelta(days=30)),
+        content_preview="",
+        relevance_score=0.0,
+        match_highlights=[],
+        content_type="general",
+        line_count=1,
+        word_count=10,
+    )
+    values.update(kwargs)
+    return EnhancedSearchResult(**values)
+
+
+def reference_score(result, terms) -> float:
+    """Per-result scoring formula the vectorized scorer must reproduce"""
+    score = 0.0
+    for term in terms:
+        if term.lower() in result.file_name.lower():
+            score += 10.0
+    for term in terms:
+        if term.lower() in result.file_path.lower():
+            score += 5.0
+    for term in terms:
+        score += result.content_preview.lower().count(term.lower()) * 2.0
+    score += -result.text_rank
+    if result.file_size > 0:
+        score *= 0.5 + min(1.0, 10000 / result.file_size) * 0.5
+    score *= {"readme": 1.2, "guide": 1.1, "configuration": 0.9}.get(result.content_type, 1.0)
+    if (NOW - datetime.fromisoformat(result.modified_at)).days <= 7:
+        score *= 1.1
+    return score
+
+
+class TestRelevanceScorer(unittest.TestCase):
+    """RelevanceScorer test cases"""
+
+    def setUp(self):
+        """Set up a scorer with a fixed clock and random results"""
+        self.scorer = RelevanceScorer(now=NOW)
+        rng = random.Random(7)
+        words = ["api", "Guide", "cache", "sqlite", "index"]
+        self.results = [
+            make_result(
+                i,
+                file_name=f"{rng.choice(words)}_{i}.md",
+                file_size=rng.choice([0, 800, 20000, 150000]),
+                content_preview=" ".join(rng.choice(words) for _ in range(12)),
+                content_type=rng.choice(["general", "readme", "guide", "configuration"]),
+                text_rank=-rng.random() * 5,
+                modified_at=str(NOW - timedelta(days=rng.randint(0, 20), hours=rng.randint(0, 23))),
+            )
+            for i in range(200)
+        ]
+
+    def test_scores_match_per_result_formula(self):
+        """Test that array scoring reproduces the row-by-row scores exactly"""
+        terms = ["api", "guide"]
+        scores = self.scorer.relevance_scores(ResultFeatures.from_results(self.results), terms)
+
+        self.assertEqual(scores.tolist(), [reference_score(r, terms) for r in self.results])
+
+    def test_top_k_breaks_ties_by_id(self):
+        """Test argpartition top-k against a full sort, including boundary ties"""
+        scores = np.array([1.0, 3.0, 3.0, 2.0, 3.0, 1.0])
+        ids = np.array([6, 5, 4, 3, 2, 1])
+
+        self.assertEqual(RelevanceScorer.top_k(scores, ids, 2).tolist(), [4, 2])
+        self.assertEqual(RelevanceScorer.top_k(scores, ids, 4).tolist(), [4, 2, 1, 3])
+        self.assertEqual(
+            RelevanceScorer.top_k(scores, ids, 3, descending=False).tolist(), [5, 0, 3]
+        )
+
+    def test_ai_components(self):
+        """Test freshness steps, unparsable dates and quality heuristics"""
+        results = [
+            make_result(1, modified_at=str(NOW - timedelta(hours=3))),
+            make_result(2, modified_at=str(NOW - timedelta(days=100))),
+            make_result(3, modified_at="not a date"),
+            make_result(
+                4,
+                word_count=300,
+                content_preview="# Title with `code` and [link]",
+                file_name="readme.md",
+            ),
+        ]
+        components = self.scorer.ai_components(ResultFeatures.from_results(results), "title link")
+
+        self.assertEqual(components["freshness"].tolist()[:3], [1.0, 0.2, 0.5])
+        self.assertAlmostEqual(components["content_quality"][3], 0.9)
+        self.assertAlmostEqual(components["popularity"][3], 1.0)
+        self.assertAlmostEqual(components["context_relevance"][3], 1 / 7)
+
+
+class TestEngineScoring(unittest.TestCase):
+    """Shared scoring across QueryEngine and EnhancedQueryEngine"""
+
+    def test_enhanced_ai_scoring_boosts_relevance(self):
+        """Test that AI scoring applies the combined boost to every result"""
+        engine = EnhancedQueryEngine(database_manager=None)
+        engine.scorer = RelevanceScorer(now=NOW)
+        results = [
+            make_result(1, relevance_score=2.0, modified_at=str(NOW)),
+            make_result(2, relevance_score=2.0, file_extension=".bin"),
+        ]
+        query = SearchQuery(text="missing")
+
+        engine._apply_ai_scoring(results, query)
+
+        # freshness 1.0 vs 0.6, popularity 0.8 vs 0.3, context 0.0 for both
+        self.assertAlmostEqual(results[0].relevance_score, 2.0 * (1 + 0.2 + 0.16))
+        self.assertAlmostEqual(results[1].relevance_score, 2.0 * (1 + 0.12 + 0.06))
+        self.assertEqual(
+            [r.file_id for r in engine._sort_enhanced_results(results[::-1], query)], [1, 2]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Result Cache Test Suite - LRU/TTL önbellek ve invalidation testleri
+"""
+
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.database_manager import DatabaseManager
+from src.enhanced_query_engine import EnhancedQueryEngine
+from src.memory.memory_manager import (
+    MemoryCreationRequest,
+    MemoryManager,
+    MemorySearchRequest,
+)
+from src.query_engine import SearchQuery
+from src.result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    """ResultCache test cases"""
+
+    def test_lru_eviction_and_ttl(self):
+        """Test least-recently-used eviction and expiry"""
+        cache = ResultCache(max_entries=2, ttl_seconds=0.05)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("c"))
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["expirations"], 1)
+
+    def test_generation_and_tag_invalidation(self):
+        """Test generation bumps and targeted tag invalidation"""
+        cache = ResultCache()
+        cache.put("q1", [1, 2], tags={1, 2})
+        cache.put("q2", [3], tags={3})
+
+        self.assertEqual(cache.invalidate_tags([2]), 1)
+        self.assertIsNone(cache.get("q1"))
+        self.assertEqual(cache.get("q2"), [3])
+
+        generation = cache.generation
+        cache.bump_generation()
+        self.assertIsNone(cache.get("q2"))
+
+        # Results computed before the bump are not stored
+        cache.put("q3", [4], generation=generation)
+        self.assertIsNone(cache.get("q3"))
+
+    def test_weight_limit(self):
+        """Test eviction by total entry weight"""
+        cache = ResultCache(max_entries=10, max_weight=5)
+        cache.put("a", [1, 2, 3], weight=3)
+        cache.put("b", [4, 5], weight=2)
+        cache.put("c", [6], weight=1)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get_stats()["weight"], 3)
+
+
+class TestMemoryManagerCache(unittest.TestCase):
+    """MemoryManager search cache invalidation test cases"""
+
+    def setUp(self):
+        """Set up a memory manager on a temporary database"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.manager = MemoryManager(
+            {
+                "database_path": str(self.temp_dir / "memory.db"),
+                "cursor_monitoring_enabled": False,
+                "auto_linking_enabled": False,
+                "semantic_search_enabled": False,
+            }
+        )
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _search(self, query: str):
+        return self.manager.search_memories(MemorySearchRequest(query=query))
+
+    def test_writes_invalidate_cached_results(self):
+        """Test that create/delete are visible through the cache"""
+        first = self.manager.create_memory(MemoryCreationRequest(content="cache test alpha"))
+        self.assertEqual(len(self._search("cache  test")), 1)
+        self.assertEqual(len(self._search("cache test")), 1)
+
+        second = self.manager.create_memory(MemoryCreationRequest(content="cache test beta"))
+        self.assertEqual({m["id"] for m in self._search("cache test")}, {first, second})
+
+        self.manager.delete_memory(second)
+        self.assertEqual([m["id"] for m in self._search("cache test")], [first])
+
+        cache_stats = self.manager.get_system_status()["cache"]
+        self.assertEqual(cache_stats["hits"], 1)
+        self.assertGreaterEqual(cache_stats["invalidations"], 2)
+
+    def test_cached_results_are_copies(self):
+        """Test that callers cannot mutate cached entries"""
+        self.manager.create_memory(MemoryCreationRequest(content="immutable cache entry"))
+        self._search("immutable")[0]["content"] = "changed"
+
+        self.assertEqual(self._search("immutable")[0]["content"], "immutable cache entry")
+
+
+class TestEnhancedQueryEngineCache(unittest.TestCase):
+    """EnhancedQueryEngine result cache test cases"""
+
+    def setUp(self):
+        """Set up an engine over a temporary file index"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.db_manager.connect()
+        self.db_manager.initialize_database()
+
+        self.paths = []
+        for i in range(3):
+            path = self.temp_dir / f"cache_{i}.md"
+            path.write_text(f"cached search body {i}\n", encoding="utf-8")
+            self.db_manager.add_or_update_file(str(path))
+            self.paths.append(path)
+
+        self.cache = ResultCache()
+        self.engine = EnhancedQueryEngine(self.db_manager, result_cache=self.cache)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.db_manager.disconnect()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_hits_return_copies(self):
+        """Test that cache hits do not mutate or share cached results"""
+        first = self.engine.search(SearchQuery(text="cached"))
+        first[0].file_name = "changed"
+        second = self.engine.search(SearchQuery(text="cached"))
+
+        self.assertFalse(first[0].cache_hit)
+        self.assertTrue(second[0].cache_hit)
+        self.assertNotEqual(second[0].file_name, "changed")
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+
+    def test_key_covers_query_fields_and_index_generation(self):
+        """Test that limit changes and reindexing miss the cache"""
+        self.assertEqual(len(self.engine.search(SearchQuery(text="cached"))), 3)
+        self.assertEqual(len(self.engine.search(SearchQuery(text="cached", limit=2))), 2)
+        self.assertEqual(self.cache.get_stats()["hits"], 0)
+
+        self.db_manager.remove_file(str(self.paths[0]))
+        results = self.engine.search(SearchQuery(text="cached"))
+        self.assertEqual(len(results), 2)
+        self.assertFalse(results[0].cache_hit)
+
+        # Engines can share one cache
+        other = EnhancedQueryEngine(self.db_manager, result_cache=self.cache)
+        self.assertTrue(other.search(SearchQuery(text="cached"))[0].cache_hit)
+
+
+if __name__ == "__main__":
+    unittest.main()
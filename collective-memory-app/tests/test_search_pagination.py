@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Search Pagination Test Suite - Keyset cursor ve iki aşamalı (projection) arama testleri
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.database_manager import DatabaseManager
+from src import query_engine
+from src.query_engine import QueryEngine, SearchQuery
+
+
+class TestKeysetPagination(unittest.TestCase):
+    """QueryEngine.search_page test cases"""
+
+    def setUp(self):
+        """Set up a temporary database with many matching files"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.db_manager.connect()
+        self.db_manager.initialize_database()
+
+        for i in range(23):
+            path = self.temp_dir / f"note_{i:02d}.md"
+            # Identical bodies produce score ties that the id must break
+            body = "pagination topic\n" * (1 + i % 3)
+            path.write_text(body, encoding="utf-8")
+            self.db_manager.add_or_update_file(str(path))
+
+        self.engine = QueryEngine(self.db_manager)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.db_manager.disconnect()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _walk(self, **kwargs):
+        query = SearchQuery(limit=5, **kwargs)
+        pages = []
+        while True:
+            page = self.engine.search_page(query)
+            pages.append(page)
+            if not page.next_cursor:
+                return pages
+            query.cursor = page.next_cursor
+
+    def test_cursor_pages_cover_all_results_once(self):
+        """Test that cursor pages match a single large page"""
+        expected = [
+            r.file_id for r in self.engine.search(SearchQuery(text="pagination", limit=100))
+        ]
+        pages = self._walk(text="pagination")
+
+        self.assertEqual(len(expected), 23)
+        self.assertEqual([r.file_id for p in pages for r in p.results], expected)
+        self.assertEqual([len(p.results) for p in pages], [5, 5, 5, 5, 3])
+        self.assertTrue(all(p.has_more for p in pages[:-1]))
+        self.assertFalse(pages[-1].has_more)
+
+    def test_sql_keyset_for_column_sort(self):
+        """Test name ordering paged in SQL"""
+        pages = self._walk(sort_by="name", sort_order="asc")
+        names = [r.file_name for p in pages for r in p.results]
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(len(names), 23)
+
+    def test_offset_and_content_projection(self):
+        """Test offset pages and opt-in file bodies"""
+        first = self.engine.search(SearchQuery(text="pagination", limit=10))
+        second = self.engine.search(SearchQuery(text="pagination", limit=5, offset=5))
+        self.assertEqual([r.file_id for r in second], [r.file_id for r in first[5:]])
+        self.assertIsNone(first[0].content)
+
+        with_body = self.engine.search(
+            SearchQuery(text="pagination", limit=1, include_content=True)
+        )
+        self.assertIn("pagination topic", with_body[0].content)
+
+    def test_iter_results_ranks_once(self):
+        """Test that a full iteration matches the pages and scores candidates once"""
+        expected = [r.file_id for p in self._walk(text="pagination") for r in p.results]
+
+        with mock.patch.object(
+            self.engine.scorer,
+            "relevance_scores",
+            wraps=self.engine.scorer.relevance_scores,
+        ) as scores:
+            results = list(
+                self.engine.iter_results(SearchQuery(text="pagination"), page_size=4)
+            )
+
+        self.assertEqual([r.file_id for r in results], expected)
+        self.assertEqual(scores.call_count, 1)
+        self.assertTrue(all(r.content_preview for r in results))
+
+        names = [r.file_name for r in self.engine.iter_results(SearchQuery(sort_by="name"))]
+        self.assertEqual(len(names), 23)
+
+    def test_invalid_cursor(self):
+        """Test that malformed or mismatched cursors are rejected"""
+        page = self.engine.search_page(SearchQuery(text="pagination", limit=5))
+
+        with self.assertRaises(ValueError):
+            self.engine.search_page(SearchQuery(text="pagination", cursor="not-a-cursor"))
+        with self.assertRaises(ValueError):
+            self.engine.search_page(
+                SearchQuery(text="pagination", sort_by="name", cursor=page.next_cursor)
+            )
+
+
+class TestTwoPhaseSearch(unittest.TestCase):
+    """Projection-aware search test cases"""
+
+    def setUp(self):
+        """Set up a database with one large and one small file"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.db_manager.connect()
+        self.db_manager.initialize_database()
+
+        # Multi-byte text so chunk boundaries split UTF-8 sequences
+        self.large_body = (
+            "projection başlangıç\n"
+            + "çğüşöı dolgu metni " * 20000
+            + "\nson satırda PROJECTION ve keyword"
+        )
+        for name, body in (("large.md", self.large_body), ("small.md", "projection")):
+            path = self.temp_dir / name
+            path.write_text(body, encoding="utf-8")
+            self.db_manager.add_or_update_file(str(path))
+
+        self.engine = QueryEngine(self.db_manager)
+        self.statements = []
+        self.db_manager.connection.set_trace_callback(self.statements.append)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.db_manager.disconnect()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_ranking_does_not_read_bodies(self):
+        """Test that no SQL statement selects content_text without include_content"""
+        query = SearchQuery(text="projection", keywords=["keyword"], sort_by="name")
+        with mock.patch.object(query_engine, "CONTENT_CHUNK_BYTES", 997):
+            results = self.engine.search(query)
+
+        large = next(r for r in results if r.file_name == "large.md")
+        self.assertIsNone(large.content)
+        self.assertEqual(
+            large.match_highlights, self.engine._find_highlights(self.large_body, query)
+        )
+        self.assertEqual(len(large.match_highlights), 3)
+        self.assertFalse([sql for sql in self.statements if "fc.content_text" in sql])
+        self.assertFalse([sql for sql in self.statements if "SELECT id, content_text" in sql])
+
+    def test_include_content_fetches_page_bodies(self):
+        """Test that requested bodies are loaded for the final page only"""
+        results = self.engine.search(
+            SearchQuery(
+                text="projection",
+                limit=1,
+                include_content=True,
+                sort_by="name",
+                sort_order="asc",
+            )
+        )
+
+        self.assertEqual(results[0].content, self.large_body)
+        body_reads = [sql for sql in self.statements if "SELECT id, content_text" in sql]
+        self.assertEqual(len(body_reads), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
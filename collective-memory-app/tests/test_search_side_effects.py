@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Search Side Effects Test Suite - Arka plan kuyruğu ve prompt öneri önbelleği testleri
+"""
+
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.database_manager import DatabaseManager
+from src.search_side_effects import PromptSuggestionCache, PromptTracker, SideEffectQueue
+
+
+class TestSideEffectQueue(unittest.TestCase):
+    """Bounded background queue test cases"""
+
+    def test_bounded_queue_drops_and_survives_errors(self):
+        """Test that a full queue drops tasks and failing tasks do not stop the worker"""
+        started, gate = threading.Event(), threading.Event()
+        done = []
+        effects = SideEffectQueue(max_size=2)
+
+        # Block the worker
+        effects.submit(lambda: (started.set(), gate.wait()))
+        started.wait(timeout=2)
+        self.assertTrue(effects.submit(done.append, 1))
+        self.assertTrue(effects.submit(lambda: 1 / 0))
+        self.assertFalse(effects.submit(done.append, 2))
+
+        gate.set()
+        self.assertTrue(effects.join(timeout=2))
+        effects.submit(done.append, 3)
+        effects.stop()
+
+        self.assertEqual(done, [1, 3])
+        stats = effects.get_stats()
+        self.assertEqual((stats["dropped"], stats["errors"], stats["processed"]), (1, 1, 3))
+
+
+    def test_counters_are_consistent_under_concurrency(self):
+        """Test that submitted/processed counters add up across threads"""
+        effects = SideEffectQueue(max_size=10000)
+
+        def submit_many():
+            for _ in range(500):
+                effects.submit(int)
+
+        threads = [threading.Thread(target=submit_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(effects.join(timeout=5))
+        effects.stop()
+
+        stats = effects.get_stats()
+        self.assertEqual(stats["submitted"] + stats["dropped"], 4000)
+        self.assertEqual(stats["processed"], stats["submitted"])
+
+class TestPromptSuggestions(unittest.TestCase):
+    """Prompt tracking and cached suggestion test cases"""
+
+    def setUp(self):
+        """Set up a tracker on a temporary database"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_path = self.temp_dir / "collective_memory.db"
+        self.effects = SideEffectQueue()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.effects.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _tracker(self):
+        cache = PromptSuggestionCache(stopwords={"the", "for"})
+        tracker = PromptTracker(self.db_path, cache)
+        self.effects.submit(tracker.warm_up)
+        return cache, tracker
+
+    def _record(self, tracker, *prompts):
+        for prompt in prompts:
+            self.effects.submit(tracker.record, prompt, "basic", 3, 10)
+        self.assertTrue(self.effects.join(timeout=5))
+
+    def test_suggestions_are_maintained_incrementally(self):
+        """Test similar prompts and context suggestions without database reads"""
+        cache, tracker = self._tracker()
+        self._record(
+            tracker,
+            "react hooks state management",
+            "react hooks state management tips",
+            "react hooks effect cleanup",
+        )
+
+        similar = cache.get_similar_prompts("react hooks state guide", limit=3)
+        self.assertEqual(
+            {p["prompt_text"] for p in similar},
+            {"react hooks state management tips", "react hooks state management"},
+        )
+        self.assertIsNotNone(cache.get_prompt_id("react hooks effect cleanup"))
+        self.assertTrue(cache.get_context_suggestions("react hooks state guide"))
+        self.effects.submit(tracker.close)
+
+    def test_cache_reloads_from_database(self):
+        """Test that a new cache warms up from prompt history"""
+        _, tracker = self._tracker()
+        self._record(tracker, "docker compose volumes", "docker compose networks")
+        self.effects.submit(tracker.close)
+
+        cache, tracker = self._tracker()
+        self.assertTrue(self.effects.join(timeout=5))
+        self.assertTrue(cache.ready)
+        self.assertEqual(cache.get_stats()["prompts"], 2)
+        self.assertEqual(cache.get_stats()["relationships"], 1)
+        self.effects.submit(tracker.close)
+
+
+    def test_matches_database_substring_semantics(self):
+        """Test that cached suggestions equal DatabaseManager.get_similar_prompts"""
+        _, tracker = self._tracker()
+        self._record(
+            tracker,
+            "react hooks state management",
+            "Hooks, state and React",
+            "useState hook basics",
+            "docker compose volumes",
+            "foo_bar config loader",
+            "fooxbar config loader tips",
+        )
+        self.effects.submit(tracker.close)
+        self.assertTrue(self.effects.join(timeout=5))
+
+        db = DatabaseManager(str(self.db_path))
+        db.connect()
+        cache = PromptSuggestionCache(stopwords=db.stopwords)
+        cache.load(db)
+        try:
+            for text in (
+                "react hook state",
+                "REACT HOOKS, state",
+                "usestate basics guide",
+                "compose volume docker",
+                "foo_bar config",
+            ):
+                for threshold in (0.3, 0.6):
+                    expected = db.get_similar_prompts(text, 10, threshold)
+                    actual = cache.get_similar_prompts(text, 10, threshold)
+                    self.assertEqual(
+                        {(p["id"], p["similarity_score"]) for p in actual},
+                        {(p["id"], p["similarity_score"]) for p in expected},
+                        text,
+                    )
+        finally:
+            db.disconnect()
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the prompt cache is capped and drops evicted relationships"""
+        cache = PromptSuggestionCache(max_prompts=3)
+        for prompt_id in range(1, 5):
+            cache.upsert_prompt(prompt_id, f"cached prompt number{prompt_id}")
+            if prompt_id > 1:
+                cache.add_relationship(prompt_id - 1, prompt_id, 0.9)
+        cache.upsert_prompt(2, "cached prompt number2")  # refresh 2
+        cache.upsert_prompt(5, "cached prompt number5")  # evicts 3
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["prompts"], 3)
+        self.assertIsNone(cache.get_prompt_id("cached prompt number3"))
+        self.assertIsNotNone(cache.get_prompt_id("cached prompt number2"))
+        self.assertEqual(cache.get_related_prompts(2), [])
+        self.assertEqual(stats["relationships"], 0)
+
+    def test_similar_prompts_checks_indexed_candidates_only(self):
+        """Test that the trigram index limits LIKE checks to candidate prompts"""
+        cache = PromptSuggestionCache()
+        for prompt_id in range(1, 501):
+            cache.upsert_prompt(prompt_id, f"unrelated topic{prompt_id} notes")
+        cache.upsert_prompt(501, "kubernetes ingress routing")
+        cache.upsert_prompt(502, "Kubernetes pod scheduling")
+
+        checked = []
+        like_matcher = PromptSuggestionCache._like_matcher
+
+        def counting_matcher(word):
+            matches = like_matcher(word)
+            return lambda folded: checked.append(folded) or matches(folded)
+
+        with patch.object(PromptSuggestionCache, "_like_matcher", side_effect=counting_matcher):
+            similar = cache.get_similar_prompts("kubernetes ingress setup", 5, 0.3)
+
+        self.assertEqual([p["id"] for p in similar], [501, 502])
+        self.assertLessEqual(len(checked), 4)
+
+        # Re-texted and evicted prompts leave no stale postings
+        cache.upsert_prompt(501, "helm chart values")
+        self.assertEqual(
+            [p["id"] for p in cache.get_similar_prompts("kubernetes ingress setup", 5, 0.3)],
+            [502],
+        )
+        small = PromptSuggestionCache(max_prompts=1)
+        small.upsert_prompt(1, "abcd")
+        small.upsert_prompt(2, "wxyz")
+        self.assertEqual(small.get_stats()["indexed_trigrams"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
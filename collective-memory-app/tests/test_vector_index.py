@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Vector Index Test Suite - Bellek embedding'leri üzerinde vektör arama testleri
+"""
+
+import shutil
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from src.memory.memory_manager import (
+    MemoryCreationRequest,
+    MemoryManager,
+    MemorySearchRequest,
+)
+from src.memory.vector_index import VectorIndex
+
+
+def bag_of_words(texts, dimension: int = 64) -> np.ndarray:
+    """Deterministic test encoder"""
+    matrix = np.zeros((len(texts), dimension), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for word in text.lower().split():
+            matrix[i, zlib.crc32(word.encode()) % dimension] += 1.0
+    return matrix
+
+
+class TestVectorIndex(unittest.TestCase):
+    """Flat and IVF index test cases"""
+
+    def setUp(self):
+        """Set up a temporary index directory and random vectors"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        rng = np.random.default_rng(42)
+        self.vectors = rng.normal(size=(2000, 16)).astype(np.float32)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_add_search_remove_and_reload(self):
+        """Test incremental updates and lazy reload from disk"""
+        index = VectorIndex(str(self.temp_dir / "flat"))
+        index.add_many((i + 1, v) for i, v in enumerate(self.vectors[:50]))
+
+        self.assertEqual(index.search(self.vectors[7], k=1)[0][0], 8)
+        self.assertTrue(index.remove(8))
+        self.assertNotIn(8, [memory_id for memory_id, _ in index.search(self.vectors[7], k=5)])
+
+        index.add(8, self.vectors[9])
+        index.flush()
+
+        reloaded = VectorIndex(str(self.temp_dir / "flat"))
+        self.assertEqual(len(reloaded), 50)
+        top = [memory_id for memory_id, _ in reloaded.search(self.vectors[9], k=2)]
+        self.assertEqual(sorted(top), [8, 10])
+        self.assertEqual(reloaded.get_stats()["tombstones"], 1)
+
+        reloaded.compact()
+        self.assertEqual(reloaded.get_stats()["tombstones"], 0)
+
+    def test_updates_compact_tombstones(self):
+        """Test that repeated updates trigger compaction instead of growing rows"""
+        index = VectorIndex(
+            str(self.temp_dir / "compacted"), compact_ratio=0.5, compact_min_tombstones=10
+        )
+        index.add_many((i + 1, v) for i, v in enumerate(self.vectors[:20]))
+
+        for step in range(5):
+            for i in range(20):
+                index.add(i + 1, self.vectors[(i + step) % 20])
+            self.assertLessEqual(index.count, 40)
+
+        index.remove(1)
+        self.assertEqual(len(index), 19)
+        self.assertLessEqual(index.get_stats()["tombstones"], index.count // 2)
+        self.assertEqual(index.search(self.vectors[5], k=1)[0][0], 2)
+
+        reloaded = VectorIndex(str(self.temp_dir / "compacted"))
+        self.assertEqual(len(reloaded), 19)
+        self.assertEqual(reloaded.search(self.vectors[5], k=1)[0][0], 2)
+
+    def test_rebuild_from_source(self):
+        """Test that a missing index is rebuilt from stored embeddings"""
+        source = [(i + 1, v) for i, v in enumerate(self.vectors[:20])]
+        index = VectorIndex(str(self.temp_dir / "rebuilt"), rebuild_source=lambda: source)
+
+        self.assertEqual(len(index), 20)
+        self.assertEqual(index.search(self.vectors[3], k=1)[0][0], 4)
+
+    def test_ivf_recall(self):
+        """Test that IVF search finds the exact neighbour for indexed vectors"""
+        index = VectorIndex(
+            str(self.temp_dir / "ivf"), mode="ivf", n_probe=4, ivf_min_vectors=100
+        )
+        index.add_many((i + 1, v) for i, v in enumerate(self.vectors))
+
+        hits = [index.search(self.vectors[i], k=1)[0][0] for i in range(0, 2000, 100)]
+        self.assertEqual(hits, list(range(1, 2001, 100)))
+        self.assertGreater(index.get_stats()["ivf_lists"], 1)
+
+
+class TestSemanticMemorySearch(unittest.TestCase):
+    """MemoryManager vector search test cases"""
+
+    def setUp(self):
+        """Set up a memory manager with a test encoder"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.config = {
+            "database_path": str(self.temp_dir / "memory.db"),
+            "cursor_monitoring_enabled": False,
+            "auto_linking_enabled": False,
+        }
+        self.manager = MemoryManager(self.config, encoder=bag_of_words)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _create(self, content: str) -> int:
+        memory_id = self.manager.create_memory(MemoryCreationRequest(content=content))
+        self.assertTrue(self.manager.flush_embeddings(timeout=5))
+        return memory_id
+
+    def test_semantic_search_uses_vector_index(self):
+        """Test top-k retrieval without lexical LIKE matching"""
+        react_id = self._create("react hooks manage component state")
+        sql_id = self._create("postgres index speeds up query planner")
+
+        results = self.manager.search_memories(
+            MemorySearchRequest(query="state hooks", semantic_search=True)
+        )
+        self.assertEqual(results[0]["id"], react_id)
+        self.assertNotIn("embedding_vector", results[0])
+
+        self.manager.delete_memory(react_id)
+        results = self.manager.search_memories(
+            MemorySearchRequest(query="hooks planner", semantic_search=True)
+        )
+        self.assertEqual([m["id"] for m in results], [sql_id])
+
+    def test_batch_store_encodes_off_write_path(self):
+        """Test that a store_memories batch is embedded with batched encoder calls"""
+        calls = []
+
+        def counting_encoder(texts):
+            calls.append(len(texts))
+            return bag_of_words(texts)
+
+        self.manager.embedding_encoder = counting_encoder
+        contents = [f"batch memory {i} about topic{i}" for i in range(20)]
+        memory_ids = self.manager.database.store_memories(
+            [{"content": content} for content in contents]
+        )
+
+        self.assertTrue(self.manager.flush_embeddings(timeout=5))
+        self.assertEqual(sum(calls), 20)
+        self.assertLess(len(calls), 20)
+        self.assertEqual(len(self.manager.vector_index), 20)
+
+        results = self.manager.search_memories(
+            MemorySearchRequest(query="topic7", semantic_search=True)
+        )
+        self.assertEqual(results[0]["id"], memory_ids[7])
+
+    def test_index_persists_across_restarts(self):
+        """Test that embeddings are stored and the index reloads lazily"""
+        memory_id = self._create("react hooks manage component state")
+        self.manager.shutdown()
+
+        shutil.rmtree(self.temp_dir / "memory_vectors")
+        self.manager = MemoryManager(self.config, encoder=bag_of_words)
+
+        results = self.manager.search_memories(
+            MemorySearchRequest(query="component state", semantic_search=True)
+        )
+        self.assertEqual(results[0]["id"], memory_id)
+
+    def test_backfill_embeds_existing_memories(self):
+        """Test that memories stored without embeddings become searchable"""
+        self.manager.shutdown()
+        self.manager = MemoryManager(dict(self.config, semantic_search_enabled=False))
+        legacy_id = self.manager.create_memory(
+            MemoryCreationRequest(content="postgres index speeds up query planner")
+        )
+        other_id = self.manager.create_memory(
+            MemoryCreationRequest(content="react hooks manage component state")
+        )
+        self.manager.shutdown()
+
+        self.manager = MemoryManager(self.config, encoder=bag_of_words)
+        self.assertTrue(self.manager.flush_embeddings(timeout=5))
+        self.assertEqual(len(self.manager.vector_index), 2)
+
+        results = self.manager.search_memories(
+            MemorySearchRequest(query="planner speeds", semantic_search=True)
+        )
+        self.assertEqual(results[0]["id"], legacy_id)
+
+        # While coverage is incomplete, LIKE matches fill up vector hits
+        self.manager.vector_index.remove(legacy_id)
+        self.manager._embedding_backfill_pending = True
+        results = self.manager.search_memories(
+            MemorySearchRequest(query="query planner", semantic_search=True)
+        )
+        self.assertEqual({m["id"] for m in results}, {legacy_id, other_id})
+        self.manager._embedding_backfill_pending = False
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+WebSocket Manager Test Suite - Event log, long-polling ve SSE fallback testleri
+"""
+
+import threading
+import time
+import unittest
+
+from flask import Flask
+
+from src.websocket_manager import EventLog, TransportFallbackManager
+
+
+class TestEventLog(unittest.TestCase):
+    """Ring-buffer event log test cases"""
+
+    def test_sequence_numbers_survive_wraparound(self):
+        """Test monotonic ids and truncation reporting after the buffer wraps"""
+        log = EventLog(capacity=3)
+        for i in range(5):
+            log.publish("tick", {"i": i})
+
+        events, cursor, truncated = log.read_since(1)
+        self.assertEqual([e["id"] for e in events], [3, 4, 5])
+        self.assertEqual(cursor, 5)
+        self.assertTrue(truncated)
+        self.assertEqual(log.read_since(5), ([], 5, False))
+
+    def test_targeted_events(self):
+        """Test that targeted events are only visible to their clients"""
+        log = EventLog()
+        log.publish("private", {}, target_clients=["alice"])
+        log.publish("public", {})
+
+        bob_events, bob_cursor, _ = log.read_since(0, "bob")
+        self.assertEqual([e["type"] for e in bob_events], ["public"])
+        self.assertEqual(bob_cursor, 2)
+        self.assertEqual(len(log.read_since(0, "alice")[0]), 2)
+
+
+class TestTransportFallback(unittest.TestCase):
+    """HTTP long-poll and SSE endpoint test cases"""
+
+    def setUp(self):
+        """Set up a Flask app with fallback endpoints"""
+        self.app = Flask(__name__)
+        self.fallback = TransportFallbackManager(self.app, sse_keepalive=0.05)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        """Release blocked readers"""
+        self.fallback.stop()
+
+    def _publish_later(self, delay: float, *args):
+        timer = threading.Timer(delay, self.fallback.add_event, args=args)
+        timer.start()
+        return timer
+
+    def test_long_poll_wakes_on_publish(self):
+        """Test that a blocked poll returns right after a publish"""
+        self.fallback.register_polling_client("c1")
+        self._publish_later(0.05, "memory_stored", {"id": 1})
+
+        start = time.monotonic()
+        response = self.client.get("/api/events/poll?client_id=c1&timeout=5").get_json()
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual([e["type"] for e in response["events"]], ["memory_stored"])
+
+        # Per-client cursor: the same event is not delivered twice
+        response = self.client.get("/api/events/poll?client_id=c1").get_json()
+        self.assertEqual(response["events"], [])
+        self.assertEqual(response["last_event_id"], 1)
+
+    def test_unregistered_pollers_are_stateless(self):
+        """Test that unknown client ids keep no server-side cursor"""
+        self.fallback.add_event("memory_stored", {"id": 1})
+
+        for i in range(20):
+            response = self.client.get(f"/api/events/poll?client_id=x{i}&last_event_id=0")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.get_json()["events"]), 1)
+        self.assertEqual(self.fallback.get_polling_client_count(), 0)
+
+        # Without a stored cursor the caller has to say where to resume
+        response = self.client.get("/api/events/poll")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/events/poll?client_id=unknown")
+        self.assertEqual(response.status_code, 400)
+
+        # Anonymous callers do not share a cursor
+        for _ in range(2):
+            response = self.client.get("/api/events/poll?last_event_id=0").get_json()
+            self.assertEqual(response["last_event_id"], 1)
+            self.assertEqual(len(response["events"]), 1)
+
+    def test_invalid_timeout_rejected(self):
+        """Test that a malformed timeout is a client error, not a 500"""
+        self.fallback.register_polling_client("c1")
+        for value in ("abc", "nan"):
+            response = self.client.get(f"/api/events/poll?client_id=c1&timeout={value}")
+            self.assertEqual(response.status_code, 400)
+
+        response = self.client.get("/api/events/poll?client_id=c1&timeout=-5")
+        self.assertEqual(response.status_code, 200)
+
+    def test_sse_stream_pushes_events(self):
+        """Test SSE delivery with Last-Event-ID resume"""
+        self.fallback.add_event("old", {})
+        self._publish_later(0.05, "new", {"value": 42})
+
+        response = self.client.get(
+            "/api/events/stream?client_id=c2", headers={"Last-Event-ID": "1"}, buffered=False
+        )
+        chunks = response.response
+        received = ""
+        while "data:" not in received:
+            received += next(chunks).decode()
+        response.close()
+
+        self.assertIn("id: 2", received)
+        self.assertIn('"value": 42', received)
+
+
+if __name__ == "__main__":
+    unittest.main()